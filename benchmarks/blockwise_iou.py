@@ -0,0 +1,125 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the peak memory and latency of `compute_iou()` against the
+blockwise `compute_iou_top_k()` and `compute_iou_above_threshold()`.
+
+Each configuration runs in its own subprocess, and the peak memory is the
+growth of the maximum resident set size of the process while computing the
+ious. `compute_iou()` materializes several [N, N] float tensors, so it is
+skipped when a single one of them would exceed `--max_dense_mb`.
+
+Example:
+
+```
+python benchmarks/blockwise_iou.py --num_boxes=5000,20000,50000
+```
+"""
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import tensorflow as tf
+from absl import flags
+
+from keras_cv import bounding_box
+
+flags.DEFINE_list("num_boxes", ["5000", "20000", "50000"], "Numbers of boxes.")
+flags.DEFINE_integer("block_size", 256, "Block size of the blockwise ious.")
+flags.DEFINE_integer("k", 10, "Number of ious kept by compute_iou_top_k.")
+flags.DEFINE_float(
+    "threshold", 0.5, "Threshold of compute_iou_above_threshold."
+)
+flags.DEFINE_integer(
+    "max_matches", 10, "Number of ious kept by compute_iou_above_threshold."
+)
+flags.DEFINE_integer(
+    "max_dense_mb",
+    1024,
+    "Largest [N, N] float tensor to materialize with compute_iou.",
+)
+flags.DEFINE_string("fn", None, "Internal: the function run by this process.")
+flags.DEFINE_integer("n", None, "Internal: the number of boxes.")
+
+FLAGS = flags.FLAGS
+FLAGS(sys.argv)
+
+FUNCTIONS = {
+    "compute_iou": lambda boxes: bounding_box.compute_iou(boxes, boxes, "xyxy"),
+    "compute_iou_top_k": lambda boxes: bounding_box.compute_iou_top_k(
+        boxes, boxes, "xyxy", k=FLAGS.k, block_size=FLAGS.block_size
+    ),
+    "compute_iou_above_threshold": (
+        lambda boxes: bounding_box.compute_iou_above_threshold(
+            boxes,
+            boxes,
+            "xyxy",
+            threshold=FLAGS.threshold,
+            max_matches=FLAGS.max_matches,
+            block_size=FLAGS.block_size,
+        )
+    ),
+}
+
+
+def random_boxes(num_boxes):
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0, 1000, size=(num_boxes, 2))
+    wh = rng.uniform(10, 100, size=(num_boxes, 2))
+    return tf.constant(np.concatenate([xy, xy + wh], axis=-1), tf.float32)
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark_fn(name, num_boxes):
+    boxes = random_boxes(num_boxes)
+    fn = tf.function(FUNCTIONS[name])
+    fn.get_concrete_function(boxes)
+    baseline = max_rss_mb()
+    t0 = time.time()
+    tf.nest.map_structure(lambda x: x.numpy(), fn(boxes))
+    print(f"{max_rss_mb() - baseline} {time.time() - t0}")
+
+
+if __name__ == "__main__":
+    if FLAGS.fn:
+        benchmark_fn(FLAGS.fn, FLAGS.n)
+        sys.exit()
+
+    print("| Function | Boxes | Peak memory (MB) | Latency (s) |")
+    print("|---|---|---|---|")
+    for num_boxes in map(int, FLAGS.num_boxes):
+        for name in FUNCTIONS:
+            dense_mb = num_boxes**2 * 4 / 2**20
+            if name == "compute_iou" and dense_mb > FLAGS.max_dense_mb:
+                print(
+                    f"| {name} | {num_boxes} | skipped, {dense_mb:.0f} MB "
+                    "per [N, N] tensor | |"
+                )
+                continue
+            process = subprocess.run(
+                [sys.executable]
+                + sys.argv
+                + [f"--fn={name}", f"--n={num_boxes}"],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            memory, latency = map(
+                float, process.stdout.strip().splitlines()[-1].split()
+            )
+            print(f"| {name} | {num_boxes} | {memory:.0f} | {latency:.2f} |")
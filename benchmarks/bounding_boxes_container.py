@@ -0,0 +1,212 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Counts the bounding box conversions of a pipeline of 10 KerasCV
+augmentation layers, followed by consumers which read the augmented boxes in
+their own format, with bounding box dictionaries and with the lazily
+converting `BoundingBoxes`.
+
+The layers only accept dictionaries, which they convert themselves, so their
+conversions are the same in both cases. The consumers convert the boxes to
+their format and back to the format of the layers with
+`keras_cv.bounding_box.convert_format()`, which is only computed once per
+format for `BoundingBoxes`.
+"""
+import time
+import unittest
+
+import tensorflow as tf
+
+from keras_cv import bounding_box
+from keras_cv import layers
+from keras_cv.bounding_box import converters
+
+BOUNDING_BOX_FORMAT = "xywh"
+BATCH_SIZE = 8
+NUM_BOXES = 32
+IMAGE_SIZE = 256
+NUM_RUNS = 5
+# The formats of the consumers of the augmented boxes, e.g. the
+# visualization utilities, `BoxCOCOMetrics` and `NonMaxSuppression`.
+CONSUMER_FORMATS = ["xyxy", "yxyx", "xyxy", "yxyx"]
+
+
+def make_layers(bounding_box_format):
+    return [
+        layers.RandomFlip(bounding_box_format=bounding_box_format, seed=1),
+        layers.RandomTranslation(
+            0.1, 0.1, bounding_box_format=bounding_box_format, seed=2
+        ),
+        layers.RandomShear(
+            0.1, 0.1, bounding_box_format=bounding_box_format, seed=3
+        ),
+        layers.RandomRotation(
+            0.1, bounding_box_format=bounding_box_format, seed=4
+        ),
+        layers.RandomCrop(
+            IMAGE_SIZE - 32,
+            IMAGE_SIZE - 32,
+            bounding_box_format=bounding_box_format,
+            seed=5,
+        ),
+        layers.RandomAspectRatio(
+            (0.9, 1.1), bounding_box_format=bounding_box_format, seed=6
+        ),
+        layers.Resizing(
+            IMAGE_SIZE,
+            IMAGE_SIZE,
+            pad_to_aspect_ratio=True,
+            bounding_box_format=bounding_box_format,
+        ),
+        layers.RandomCropAndResize(
+            target_size=(IMAGE_SIZE, IMAGE_SIZE),
+            crop_area_factor=(0.8, 1.0),
+            aspect_ratio_factor=(0.9, 1.1),
+            bounding_box_format=bounding_box_format,
+            seed=7,
+        ),
+        layers.Mosaic(bounding_box_format=bounding_box_format, seed=8),
+        layers.JitteredResize(
+            target_size=(IMAGE_SIZE, IMAGE_SIZE),
+            scale_factor=(0.75, 1.3),
+            bounding_box_format=bounding_box_format,
+            seed=9,
+        ),
+    ]
+
+
+def run_pipeline(pipeline_layers, boxes, images):
+    inputs = {"images": images, "bounding_boxes": boxes}
+    for layer in pipeline_layers:
+        inputs = layer(inputs)
+    return inputs
+
+
+def run_consumers(boxes, images, layer_format):
+    for consumer_format in CONSUMER_FORMATS:
+        boxes = bounding_box.convert_format(
+            boxes, source=layer_format, target=consumer_format, images=images
+        )
+        # Reads the boxes, which converts a `BoundingBoxes`.
+        boxes["boxes"]
+        boxes = bounding_box.convert_format(
+            boxes, source=consumer_format, target=layer_format, images=images
+        )
+    return boxes
+
+
+def make_inputs():
+    images = tf.random.uniform((BATCH_SIZE, IMAGE_SIZE, IMAGE_SIZE, 3))
+    xy = tf.random.uniform((BATCH_SIZE, NUM_BOXES, 2), 0, IMAGE_SIZE // 2)
+    wh = tf.random.uniform((BATCH_SIZE, NUM_BOXES, 2), 10, IMAGE_SIZE // 2)
+    boxes = {
+        "boxes": tf.concat([xy, wh], axis=-1),
+        "classes": tf.zeros((BATCH_SIZE, NUM_BOXES)),
+    }
+    return boxes, images
+
+
+def make_container(boxes, images, bounding_box_format):
+    boxes = dict(boxes)
+    return bounding_box.BoundingBoxes(
+        boxes.pop("boxes"), bounding_box_format, images=images, **boxes
+    )
+
+
+def count_conversions(function):
+    """Returns the number of conversions computed by `function()`, in
+    `convert_format()` calls with different source and target formats."""
+    conversions = []
+    format_inputs = converters._format_inputs
+    converters._format_inputs = lambda *args: (
+        conversions.append(1) or format_inputs(*args)
+    )
+    try:
+        function()
+    finally:
+        converters._format_inputs = format_inputs
+    return len(conversions)
+
+
+class BoundingBoxesConsistencyTest(tf.test.TestCase):
+    def test_same_boxes(self):
+        boxes, images = make_inputs()
+        outputs = run_pipeline(
+            make_layers(BOUNDING_BOX_FORMAT), dict(boxes), images
+        )
+        container = run_consumers(
+            make_container(
+                outputs["bounding_boxes"],
+                outputs["images"],
+                BOUNDING_BOX_FORMAT,
+            ),
+            outputs["images"],
+            BOUNDING_BOX_FORMAT,
+        )
+        dictionary = run_consumers(
+            outputs["bounding_boxes"], outputs["images"], BOUNDING_BOX_FORMAT
+        )
+        self.assertIsInstance(container, bounding_box.BoundingBoxes)
+        self.assertAllClose(
+            bounding_box.to_dense(container.as_dict())["boxes"],
+            bounding_box.to_dense(dictionary)["boxes"],
+        )
+
+
+if __name__ == "__main__":
+    # Run benchmark
+    boxes, images = make_inputs()
+    print("| Layer format | Boxes | Conversions | Latency (ms) |")
+    print("|---|---|---|---|")
+    for layer_format in [BOUNDING_BOX_FORMAT, "xyxy"]:
+        pipeline_layers = make_layers(layer_format)
+        for name, make_boxes in [
+            ("dict", lambda boxes, images: boxes),
+            (
+                "BoundingBoxes",
+                lambda boxes, images: make_container(
+                    boxes, images, layer_format
+                ),
+            ),
+        ]:
+
+            def run():
+                # The dictionaries are converted to the layer format
+                # beforehand.
+                outputs = run_pipeline(
+                    pipeline_layers,
+                    bounding_box.convert_format(
+                        dict(boxes),
+                        source=BOUNDING_BOX_FORMAT,
+                        target=layer_format,
+                    ),
+                    images,
+                )
+                run_consumers(
+                    make_boxes(outputs["bounding_boxes"], outputs["images"]),
+                    outputs["images"],
+                    layer_format,
+                )
+
+            num_conversions = count_conversions(run)
+            t0 = time.time()
+            for _ in range(NUM_RUNS):
+                run()
+            runtime = (time.time() - t0) / NUM_RUNS * 1000
+            print(
+                f"| {layer_format} | {name} | {num_conversions} "
+                f"| {runtime:.0f} |"
+            )
+
+    # Run unit tests
+    unittest.main(argv=[""])
@@ -0,0 +1,92 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the latency of `YOLOV8Detector` on a stream of batches of images
+with varying sizes, with the `predict_step()` of the model and with
+`keras_cv.models.BucketedPredictor`.
+
+`predict_step()` is traced again for every new image size, while
+`BucketedPredictor` traces one function per bucket. The detector has random
+weights, as only the latency is measured.
+"""
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from keras_cv import models
+
+BATCH_SIZE = 2
+NUM_BATCHES = 40
+BUCKETS = [(320, 320), (320, 480), (480, 480), (480, 640), (640, 640)]
+
+
+def image_sizes():
+    rng = np.random.default_rng(0)
+    # Multiples of 32, as required by the strides of the detector.
+    return [tuple(rng.integers(6, 21, size=2) * 32) for _ in range(NUM_BATCHES)]
+
+
+def benchmark(predict, sizes):
+    latencies = []
+    for size in sizes:
+        images = np.random.uniform(size=(BATCH_SIZE,) + size + (3,)) * 255
+        t0 = time.time()
+        predict(images.astype("float32"))
+        latencies.append(time.time() - t0)
+    return np.array(latencies) * 1000
+
+
+if __name__ == "__main__":
+    model = models.YOLOV8Detector(
+        num_classes=20,
+        bounding_box_format="xywh",
+        backbone=models.YOLOV8Backbone.from_preset("yolo_v8_xs_backbone"),
+        fpn_depth=1,
+    )
+    sizes = image_sizes()
+    print(f"{len(set(sizes))} distinct image sizes in {len(sizes)} batches")
+
+    # The function traced by `model.predict()` for each new image size.
+    # `model.predict()` itself relaxes its function to unknown image sizes
+    # after a few sizes, from which `YOLOV8Detector` cannot build its anchors.
+    predict_function = tf.function(model.predict_step)
+
+    predictor = models.BucketedPredictor(model, BUCKETS)
+    results = {
+        "model.predict_step()": benchmark(
+            lambda images: predict_function(tf.constant(images)), sizes
+        ),
+        "BucketedPredictor": benchmark(predictor.predict, sizes),
+    }
+
+    print(
+        "| Method | Total (s) | Median latency (ms) | p95 latency (ms) "
+        "| Max latency (ms) |"
+    )
+    print("|---|---|---|---|---|")
+    for name, latencies in results.items():
+        print(
+            f"| {name} | {latencies.sum() / 1000:.1f} "
+            f"| {np.median(latencies):.0f} "
+            f"| {np.percentile(latencies, 95):.0f} "
+            f"| {latencies.max():.0f} |"
+        )
+    print(
+        "model.predict_step(): "
+        f"{predict_function.experimental_get_tracing_count()} traces"
+    )
+    print(
+        f"BucketedPredictor: {sum(predictor.num_traces.values())} traces, "
+        f"hit rate {predictor.hit_rate:.2f}"
+    )
@@ -0,0 +1,118 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the CPU inference latency of KerasCV backbones before and after
+folding their batch normalizations into the preceding convolutions.
+
+The backbones are built from their preset configurations with random weights
+and random batch normalization statistics, as only the latency and the
+consistency of the outputs are measured.
+"""
+import time
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+from keras_cv import models
+from keras_cv.backend import keras
+from keras_cv.models import fold_batch_normalization
+
+PRESETS = [
+    (models.ResNetBackbone, "resnet50"),
+    (models.ResNetV2Backbone, "resnet50_v2"),
+    (models.CSPDarkNetBackbone, "csp_darknet_s"),
+    (models.EfficientNetV2Backbone, "efficientnetv2_b0"),
+    (models.MobileNetV3Backbone, "mobilenet_v3_large"),
+    (models.YOLOV8Backbone, "yolo_v8_s_backbone"),
+]
+IMAGE_SIZE = 224
+BATCH_SIZE = 8
+NUM_RUNS = 10
+
+
+def build_backbone(backbone_cls, preset):
+    backbone = backbone_cls.from_preset(
+        preset,
+        load_weights=False,
+        input_shape=(IMAGE_SIZE, IMAGE_SIZE, 3),
+    )
+    rng = np.random.default_rng(0)
+    for layer in backbone._flatten_layers():
+        if isinstance(layer, keras.layers.BatchNormalization):
+            layer.set_weights(
+                [
+                    rng.uniform(0.5, 1.5, w.shape).astype("float32")
+                    if i in (0, 3)
+                    else rng.normal(0, 0.1, w.shape).astype("float32")
+                    for i, w in enumerate(layer.get_weights())
+                ]
+            )
+    return backbone
+
+
+def count_batch_normalization(model):
+    return sum(
+        isinstance(layer, keras.layers.BatchNormalization)
+        for layer in model._flatten_layers()
+    )
+
+
+def latency(model, images):
+    predict = tf.function(lambda x: model(x, training=False))
+    # warmup
+    predict(images)
+    t0 = time.time()
+    for _ in range(NUM_RUNS):
+        predict(images).numpy()
+    return (time.time() - t0) / NUM_RUNS * 1000
+
+
+class FoldBatchNormalizationConsistencyTest(tf.test.TestCase):
+    def test_same_outputs(self):
+        images = tf.random.uniform((2, IMAGE_SIZE, IMAGE_SIZE, 3), maxval=255)
+        for backbone_cls, preset in PRESETS:
+            backbone = build_backbone(backbone_cls, preset)
+            folded_backbone = fold_batch_normalization(backbone)
+            expected = backbone(images, training=False)
+            self.assertAllClose(
+                folded_backbone(images, training=False),
+                expected,
+                atol=1e-3 * float(tf.reduce_max(tf.abs(expected))),
+            )
+
+
+if __name__ == "__main__":
+    # Run benchmark
+    images = tf.random.uniform(
+        (BATCH_SIZE, IMAGE_SIZE, IMAGE_SIZE, 3), maxval=255
+    )
+
+    print(
+        "| Preset | BatchNormalization layers (before / after) "
+        "| Latency before (ms) | Latency after (ms) | Speedup |"
+    )
+    print("|---|---|---|---|---|")
+    for backbone_cls, preset in PRESETS:
+        backbone = build_backbone(backbone_cls, preset)
+        folded_backbone = fold_batch_normalization(backbone)
+        before = latency(backbone, images)
+        after = latency(folded_backbone, images)
+        print(
+            f"| {preset} | {count_batch_normalization(backbone)} / "
+            f"{count_batch_normalization(folded_backbone)} | {before:.1f} "
+            f"| {after:.1f} | {before / after:.2f}x |"
+        )
+
+    # Run unit tests
+    unittest.main(argv=[""])
@@ -0,0 +1,137 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the per-frame decode latency saved by caching the BEV reference
+grid of `HeatmapDecoder` at build time."""
+import time
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+from keras_cv.layers.object_detection_3d import voxel_utils
+from keras_cv.layers.object_detection_3d.heatmap_decoder import HeatmapDecoder
+from keras_cv.layers.object_detection_3d.heatmap_decoder import decode_bin_box
+
+# Production sized grid: 468 x 468 pillars.
+VOXEL_SIZE = [0.32, 0.32, 1000.0]
+SPATIAL_SIZE = [-74.88, 74.88, -74.88, 74.88, -5.0, 5.0]
+NUM_HEAD_BIN = 12
+DECODER_KWARGS = {
+    "class_id": 1,
+    "num_head_bin": NUM_HEAD_BIN,
+    "anchor_size": [4.5, 2.0, 1.6],
+    "max_pool_size": 3,
+    "max_num_box": 256,
+    "heatmap_threshold": 0.1,
+    "voxel_size": VOXEL_SIZE,
+    "spatial_size": SPATIAL_SIZE,
+}
+
+
+class OldHeatmapDecoder(HeatmapDecoder):
+    """HeatmapDecoder which rebuilds the reference grid on every call."""
+
+    def call(self, prediction):
+        heatmap = tf.nn.softmax(prediction[..., :2])[..., 1:2]
+        heatmap_pool = tf.nn.max_pool2d(heatmap, self.max_pool_size, 1, "SAME")
+        heatmap_mask = heatmap > self.heatmap_threshold
+        heatmap_local_maxima_mask = tf.math.equal(heatmap, heatmap_pool)
+        heatmap_mask = tf.math.logical_and(
+            heatmap_mask, heatmap_local_maxima_mask
+        )
+        heatmap = tf.where(heatmap_mask, heatmap, 0)
+        heatmap = tf.squeeze(heatmap, axis=-1)
+
+        b, h, w = voxel_utils.combined_static_and_dynamic_shape(heatmap)
+        heatmap = tf.reshape(heatmap, [b, h * w])
+        _, top_index = tf.math.top_k(heatmap, k=self.max_num_box)
+
+        box_prediction = prediction[:, :, :, 2:]
+        f = box_prediction.get_shape().as_list()[-1]
+        box_prediction = tf.reshape(box_prediction, [b, h * w, f])
+        box_prediction = tf.gather(box_prediction, top_index, batch_dims=1)
+        box_score = tf.gather(heatmap, top_index, batch_dims=1)
+        box_class = tf.ones_like(box_score, dtype=tf.int32) * self.class_id
+        box_prediction_reshape = tf.reshape(
+            box_prediction, [b * self.max_num_box, f]
+        )
+        box_decoded = decode_bin_box(
+            box_prediction_reshape, self.num_head_bin, self.anchor_size
+        )
+        box_decoded = tf.reshape(box_decoded, [b, self.max_num_box, 7])
+        global_xyz = tf.zeros([b, 3], dtype=box_decoded.dtype)
+        ref_xyz = voxel_utils.compute_feature_map_ref_xyz(
+            self.voxel_size, self.spatial_size, global_xyz
+        )
+        ref_xyz = tf.squeeze(ref_xyz, axis=-2)
+        f = ref_xyz.get_shape().as_list()[-1]
+        ref_xyz = tf.reshape(ref_xyz, [b, h * w, f])
+        ref_xyz = tf.gather(ref_xyz, top_index, batch_dims=1)
+
+        box_decoded_cxyz = ref_xyz + box_decoded[:, :, :3]
+        box_decoded = tf.concat(
+            [box_decoded_cxyz, box_decoded[:, :, 3:]], axis=-1
+        )
+        return box_decoded, box_class, box_score
+
+
+def make_prediction(batch_size):
+    grid_size = round((SPATIAL_SIZE[1] - SPATIAL_SIZE[0]) / VOXEL_SIZE[0])
+    return tf.random.normal(
+        [batch_size, grid_size, grid_size, 2 + 3 + 3 + 2 * NUM_HEAD_BIN]
+    )
+
+
+class HeatmapDecoderReferenceGridTest(tf.test.TestCase):
+    def test_consistency_with_old_implementation(self):
+        prediction = make_prediction(2)
+        old_outputs = OldHeatmapDecoder(**DECODER_KWARGS)(prediction)
+        new_outputs = HeatmapDecoder(**DECODER_KWARGS)(prediction)
+        for old_output, new_output in zip(old_outputs, new_outputs):
+            self.assertAllClose(old_output, new_output)
+
+
+if __name__ == "__main__":
+    # Run benchmark
+    batch_sizes = [1, 2, 4, 8]
+    num_runs = 20
+
+    for name, decoder_cls in [
+        ("Old HeatmapDecoder", OldHeatmapDecoder),
+        ("Cached HeatmapDecoder", HeatmapDecoder),
+    ]:
+        for jit_compile in [False, True]:
+            decoder = decoder_cls(**DECODER_KWARGS)
+            decode = tf.function(decoder, jit_compile=jit_compile)
+            runtimes = []
+            for batch_size in batch_sizes:
+                prediction = make_prediction(batch_size)
+                # warmup
+                decode(prediction)
+                t0 = time.time()
+                for _ in range(num_runs):
+                    outputs = decode(prediction)
+                outputs[0].numpy()
+                t1 = time.time()
+                runtimes.append((t1 - t0) / num_runs / batch_size)
+            mode = "XLA" if jit_compile else "graph"
+            for batch_size, runtime in zip(batch_sizes, runtimes):
+                print(
+                    f"{name} ({mode}), batch_size={batch_size}: "
+                    f"{np.round(runtime * 1000, 3)} ms per frame"
+                )
+
+    # Run unit tests
+    tf.config.run_functions_eagerly(True)
+    unittest.main(argv=[""])
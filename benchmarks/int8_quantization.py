@@ -0,0 +1,103 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the accuracy drift, CPU throughput and size of an
+`ImageClassifier` and a `YOLOV8Detector` quantized to INT8 with
+`keras_cv.models.quantize_int8()`.
+
+The models are built from their preset configurations with random weights,
+and are calibrated and evaluated on random images. The scores of a random
+detector are almost uniform, so its non max suppression keeps arbitrary boxes
+and the detection agreement is only meaningful for trained weights.
+"""
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from keras_cv import models
+
+NUM_CALIBRATION_STEPS = 8
+NUM_EVALUATION_STEPS = 8
+BATCH_SIZE = 8
+
+CONFIGS = [
+    (
+        "ImageClassifier (resnet50)",
+        lambda: models.ImageClassifier(
+            backbone=models.ResNetBackbone.from_preset(
+                "resnet50", input_shape=(224, 224, 3)
+            ),
+            num_classes=1000,
+            # The softmax of random weights is almost uniform, so the top-1
+            # class of the quantized probabilities would be arbitrary.
+            activation=None,
+        ),
+        224,
+    ),
+    (
+        "YOLOV8Detector (yolo_v8_s_backbone)",
+        lambda: models.YOLOV8Detector(
+            num_classes=20,
+            bounding_box_format="xywh",
+            backbone=models.YOLOV8Backbone.from_preset(
+                "yolo_v8_s_backbone", input_shape=(320, 320, 3)
+            ),
+            fpn_depth=1,
+        ),
+        320,
+    ),
+]
+
+
+def random_images(image_size, num_batches):
+    return tf.data.Dataset.from_tensor_slices(
+        tf.random.uniform(
+            (num_batches * BATCH_SIZE, image_size, image_size, 3), maxval=255
+        )
+    ).batch(BATCH_SIZE)
+
+
+if __name__ == "__main__":
+    print(
+        "| Model | Mean absolute error | Agreement | Float (images/s) "
+        "| INT8 (images/s) | Float size (MB) | INT8 size (MB) "
+        "| Conversion time (s) |"
+    )
+    print("|---|---|---|---|---|---|---|---|")
+    for name, build_model, image_size in CONFIGS:
+        model = build_model()
+        calibration_data = random_images(image_size, NUM_CALIBRATION_STEPS)
+        t0 = time.time()
+        quantized_model = models.quantize_int8(
+            model, calibration_data, NUM_CALIBRATION_STEPS
+        )
+        conversion_time = time.time() - t0
+        report = models.evaluate_quantization(
+            model,
+            quantized_model,
+            random_images(image_size, NUM_EVALUATION_STEPS),
+        )
+        agreement = report.get(
+            "top_1_agreement", report.get("detection_agreement")
+        )
+        float_size = sum(np.prod(w.shape) * 4 for w in model.weights) / 2**20
+        quantized_size = len(quantized_model.model_content) / 2**20
+        print(
+            f"| {name} | {report['mean_absolute_error']:.4f} "
+            f"| {agreement:.3f} "
+            f"| {report['float_images_per_second']:.1f} "
+            f"| {report['quantized_images_per_second']:.1f} "
+            f"| {float_size:.1f} | {quantized_size:.1f} "
+            f"| {conversion_time:.0f} |"
+        )
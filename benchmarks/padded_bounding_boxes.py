@@ -0,0 +1,121 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the throughput of a `tf.data` augmentation pipeline of bounding
+box layers, when the boxes are converted to ragged tensors by every layer, and
+when they stay padded with `keras_cv.bounding_box.to_padded()`.
+"""
+import time
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+from keras_cv import bounding_box
+from keras_cv import layers
+
+BOUNDING_BOX_FORMAT = "xyxy"
+BATCH_SIZE = 16
+IMAGE_SIZE = 256
+MAX_BOXES = 32
+NUM_IMAGES = 512
+NUM_RUNS = 3
+
+
+def make_layers():
+    return [
+        layers.RandomFlip(bounding_box_format=BOUNDING_BOX_FORMAT),
+        layers.RandomTranslation(
+            0.1, 0.1, bounding_box_format=BOUNDING_BOX_FORMAT
+        ),
+        layers.RandomRotation(0.1, bounding_box_format=BOUNDING_BOX_FORMAT),
+        layers.RandomShear(0.1, 0.1, bounding_box_format=BOUNDING_BOX_FORMAT),
+        layers.JitteredResize(
+            target_size=(IMAGE_SIZE, IMAGE_SIZE),
+            scale_factor=(0.75, 1.3),
+            bounding_box_format=BOUNDING_BOX_FORMAT,
+        ),
+    ]
+
+
+def make_dataset(padded):
+    rng = np.random.default_rng(0)
+    num_boxes = rng.integers(1, MAX_BOXES + 1, size=NUM_IMAGES)
+    xy = rng.uniform(0, IMAGE_SIZE / 2, size=(num_boxes.sum(), 2))
+    wh = rng.uniform(8, IMAGE_SIZE / 2, size=(num_boxes.sum(), 2))
+    boxes = tf.RaggedTensor.from_row_lengths(
+        np.concatenate([xy, xy + wh], axis=-1).astype("float32"), num_boxes
+    )
+    classes = tf.RaggedTensor.from_row_lengths(
+        rng.integers(0, 20, size=num_boxes.sum()).astype("float32"), num_boxes
+    )
+    images = tf.random.uniform((NUM_IMAGES, IMAGE_SIZE, IMAGE_SIZE, 3))
+    dataset = tf.data.Dataset.from_tensor_slices(
+        {
+            "images": images,
+            "bounding_boxes": {"boxes": boxes, "classes": classes},
+        }
+    ).ragged_batch(BATCH_SIZE)
+    if padded:
+        dataset = dataset.map(
+            lambda inputs: {
+                "images": inputs["images"],
+                "bounding_boxes": bounding_box.to_padded(
+                    inputs["bounding_boxes"], max_boxes=MAX_BOXES
+                ),
+            }
+        )
+    for layer in make_layers():
+        dataset = dataset.map(layer)
+    return dataset
+
+
+class PaddedBoundingBoxesConsistencyTest(tf.test.TestCase):
+    def test_same_number_of_boxes(self):
+        tf.random.set_seed(0)
+        ragged = next(iter(make_dataset(padded=False)))["bounding_boxes"]
+        tf.random.set_seed(0)
+        padded = next(iter(make_dataset(padded=True)))["bounding_boxes"]
+        self.assertIsInstance(padded["boxes"], tf.Tensor)
+        self.assertEqual(padded["boxes"].shape[1:], (MAX_BOXES, 4))
+        self.assertAllEqual(
+            padded["num_boxes"],
+            bounding_box.to_ragged(padded)["classes"].row_lengths(),
+        )
+        self.assertEqual(
+            ragged["classes"].row_lengths().shape,
+            padded["num_boxes"].shape,
+        )
+
+
+if __name__ == "__main__":
+    # Run benchmark
+    print("| Bounding boxes | Images per second |")
+    print("|---|---|")
+    for name, padded in [("ragged", False), ("padded", True)]:
+        dataset = make_dataset(padded)
+        # warmup
+        for _ in dataset:
+            pass
+        # The speed of this host varies between runs, so the fastest of a few
+        # runs is reported.
+        seconds = float("inf")
+        for _ in range(NUM_RUNS):
+            t0 = time.time()
+            for _ in dataset:
+                pass
+            seconds = min(seconds, time.time() - t0)
+        print(f"| {name} | {NUM_IMAGES / seconds:.0f} |")
+
+    # Run unit tests
+    unittest.main(argv=[""])
@@ -0,0 +1,115 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the multilevel ROIAlign on every installed Keras backend.
+
+The backend is selected with the `KERAS_BACKEND` environment variable when
+Keras is imported, so each backend is benchmarked in its own subprocess by
+running this script with `--backend`. Backends which are not installed are
+reported as skipped.
+
+Example:
+
+```
+python benchmarks/roi_align_backends.py --backends=tensorflow,jax,torch
+```
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+from absl import flags
+
+flags.DEFINE_list(
+    "backends",
+    ["tensorflow", "jax", "torch"],
+    "Backends to benchmark, each one in its own subprocess.",
+)
+flags.DEFINE_string(
+    "backend", None, "Internal: the backend benchmarked by this process."
+)
+flags.DEFINE_list("num_boxes", ["100", "500", "1000"], "Numbers of boxes.")
+flags.DEFINE_integer("batch_size", 2, "Number of images.")
+flags.DEFINE_integer("image_size", 640, "Height and width of the images.")
+flags.DEFINE_integer("num_filters", 256, "Channels of the feature maps.")
+flags.DEFINE_integer("crop_size", 7, "Output size of the crops.")
+flags.DEFINE_integer("num_runs", 10, "Number of timed runs.")
+
+FLAGS = flags.FLAGS
+FLAGS(sys.argv)
+
+
+def random_inputs(rng, num_boxes):
+    features = {
+        f"P{level}": rng.normal(
+            size=(
+                FLAGS.batch_size,
+                FLAGS.image_size // 2**level,
+                FLAGS.image_size // 2**level,
+                FLAGS.num_filters,
+            )
+        ).astype("float32")
+        for level in range(2, 7)
+    }
+    corners = rng.uniform(
+        0, FLAGS.image_size, size=(FLAGS.batch_size, num_boxes, 2, 2)
+    ).astype("float32")
+    boxes = np.concatenate([corners.min(axis=2), corners.max(axis=2)], -1)
+    return features, boxes
+
+
+def benchmark_backend():
+    # Imported here, after `KERAS_BACKEND` has been set by the parent process.
+    from keras_cv.backend import ops
+    from keras_cv.layers.object_detection.roi_align import _ROIAligner
+
+    aligner = _ROIAligner("yxyx", target_size=FLAGS.crop_size)
+    rng = np.random.default_rng(0)
+    results = {}
+    for num_boxes in map(int, FLAGS.num_boxes):
+        features, boxes = random_inputs(rng, num_boxes)
+        features = {k: ops.convert_to_tensor(v) for k, v in features.items()}
+        boxes = ops.convert_to_tensor(boxes)
+        # warmup
+        ops.convert_to_numpy(aligner(features, boxes))
+        t0 = time.time()
+        for _ in range(FLAGS.num_runs):
+            ops.convert_to_numpy(aligner(features, boxes))
+        results[num_boxes] = (time.time() - t0) / FLAGS.num_runs * 1000
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    if FLAGS.backend:
+        benchmark_backend()
+        sys.exit()
+
+    print("| Backend | Boxes | Latency (ms) |")
+    print("|---|---|---|")
+    for backend in FLAGS.backends:
+        process = subprocess.run(
+            [sys.executable] + sys.argv + [f"--backend={backend}"],
+            env=dict(os.environ, KERAS_BACKEND=backend),
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode != 0:
+            error = process.stderr.strip().splitlines()[-1:]
+            print(f"| {backend} | skipped: {' '.join(error)} | |")
+            continue
+        results = json.loads(process.stdout.strip().splitlines()[-1])
+        for num_boxes, latency in results.items():
+            print(f"| {backend} | {num_boxes} | {latency:.1f} |")
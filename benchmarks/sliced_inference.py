@@ -0,0 +1,139 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the CPU throughput, in megapixels per second, and the peak
+memory of `YOLOV8Detector` on 4K images, when the images are downscaled to
+640x640, when the detector runs on the full images, and with
+`keras_cv.models.sliced_predict()`.
+
+Every configuration runs in a subprocess, so that its peak memory is measured
+separately. The detector has random weights, as only the throughput and
+memory are measured.
+"""
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import tensorflow as tf
+from absl import app
+from absl import flags
+
+from keras_cv import models
+
+FLAGS = flags.FLAGS
+flags.DEFINE_string("config", None, "The configuration to run.")
+
+IMAGE_SHAPE = (2160, 3840, 3)
+BATCH_SIZE = 2
+NUM_RUNS = 3
+# The full images are padded to a multiple of the largest stride of the
+# detector.
+PADDED_SHAPE = (2176, 3840, 3)
+
+CONFIGS = {
+    "downscaled to 640x640": {},
+    "full image": {},
+    "sliced, 640 tiles, 20% overlap": {"tile_size": 640, "overlap": 0.2},
+    "sliced, 640 tiles, 20% overlap + full image": {
+        "tile_size": 640,
+        "overlap": 0.2,
+        "include_full_image": True,
+    },
+    "sliced, 1024 tiles, 20% overlap": {"tile_size": 1024, "overlap": 0.2},
+}
+
+
+def run(name):
+    model = models.YOLOV8Detector(
+        num_classes=20,
+        bounding_box_format="xywh",
+        backbone=models.YOLOV8Backbone.from_preset("yolo_v8_s_backbone"),
+        fpn_depth=1,
+    )
+    images = np.random.uniform(size=(BATCH_SIZE,) + IMAGE_SHAPE) * 255
+    images = images.astype("float32")
+    if name == "downscaled to 640x640":
+
+        def predict():
+            model.predict(
+                tf.image.resize(images, (640, 640)),
+                batch_size=BATCH_SIZE,
+                verbose=0,
+            )
+
+    elif name == "full image":
+        padded_images = tf.image.pad_to_bounding_box(
+            images, 0, 0, PADDED_SHAPE[0], PADDED_SHAPE[1]
+        )
+
+        def predict():
+            model.predict(padded_images, batch_size=BATCH_SIZE, verbose=0)
+
+    else:
+
+        def predict():
+            models.sliced_predict(model, images, batch_size=8, **CONFIGS[name])
+
+    # warmup
+    predict()
+    # The speed of this host varies between runs, so the fastest of a few
+    # runs is reported.
+    seconds = float("inf")
+    for _ in range(NUM_RUNS):
+        t0 = time.time()
+        predict()
+        seconds = min(seconds, time.time() - t0)
+    megapixels = BATCH_SIZE * IMAGE_SHAPE[0] * IMAGE_SHAPE[1] / 1e6
+    return {
+        "megapixels_per_second": megapixels / seconds,
+        "peak_memory_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        / 1024,
+    }
+
+
+def main(_):
+    if FLAGS.config:
+        print(json.dumps(run(FLAGS.config)))
+        return
+
+    print("| Configuration | Throughput (MP/s) | Peak memory (MB) |")
+    print("|---|---|---|")
+    for name in CONFIGS:
+        results = []
+        # The speed of this host also varies between processes, so the
+        # fastest of two processes is reported.
+        for _ in range(2):
+            output = subprocess.run(
+                [sys.executable, __file__, f"--config={name}"],
+                capture_output=True,
+                text=True,
+            )
+            if output.returncode == 0:
+                results.append(
+                    json.loads(output.stdout.strip().splitlines()[-1])
+                )
+        if not results:
+            print(f"| {name} | failed | failed |")
+            continue
+        result = max(results, key=lambda r: r["megapixels_per_second"])
+        print(
+            f"| {name} | {result['megapixels_per_second']:.2f} "
+            f"| {result['peak_memory_mb']:.0f} |"
+        )
+
+
+if __name__ == "__main__":
+    app.run(main)
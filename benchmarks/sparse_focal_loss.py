@@ -0,0 +1,108 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the peak memory and runtime of the RetinaNet classification loss
+with `FocalLoss` on one-hot targets against `SparseFocalLoss` on the integer
+targets.
+
+Each loss runs in its own subprocess, and the peak memory is the growth of the
+maximum resident set size of the process while computing the loss and its
+gradient, after the inputs were created.
+"""
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import tensorflow as tf
+from absl import flags
+
+from keras_cv.losses import FocalLoss
+from keras_cv.losses import SparseFocalLoss
+
+flags.DEFINE_string("loss", None, "Internal: the loss run by this process.")
+flags.DEFINE_integer("batch_size", 4, "Number of images.")
+flags.DEFINE_integer("num_anchors", 120000, "Number of anchors per image.")
+flags.DEFINE_integer("num_classes", 80, "Number of classes.")
+
+FLAGS = flags.FLAGS
+FLAGS(sys.argv)
+
+
+def focal_loss_fn(classes, logits):
+    # Mirrors `RetinaNet.compute_loss` before `SparseFocalLoss`.
+    one_hot = tf.one_hot(tf.cast(classes, tf.int32), FLAGS.num_classes)
+    weights = tf.cast(tf.not_equal(classes, -2.0), tf.float32)
+    return FocalLoss(from_logits=True, reduction="sum")(
+        one_hot, logits, sample_weight=weights
+    )
+
+
+def sparse_focal_loss_fn(classes, logits):
+    return SparseFocalLoss(from_logits=True, reduction="sum")(classes, logits)
+
+
+LOSSES = {"FocalLoss": focal_loss_fn, "SparseFocalLoss": sparse_focal_loss_fn}
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark_loss(name):
+    rng = np.random.default_rng(0)
+    classes = tf.constant(
+        rng.integers(
+            -2, FLAGS.num_classes, size=(FLAGS.batch_size, FLAGS.num_anchors)
+        ),
+        tf.float32,
+    )
+    logits = tf.Variable(
+        rng.normal(
+            size=(FLAGS.batch_size, FLAGS.num_anchors, FLAGS.num_classes)
+        ).astype("float32")
+    )
+
+    @tf.function
+    def loss_and_gradient():
+        with tf.GradientTape() as tape:
+            loss = LOSSES[name](classes, logits)
+        return loss, tape.gradient(loss, logits)
+
+    loss_and_gradient.get_concrete_function()
+    baseline = max_rss_mb()
+    t0 = time.time()
+    loss, _ = loss_and_gradient()
+    runtime = time.time() - t0
+    print(f"{max_rss_mb() - baseline} {runtime} {float(loss)}")
+
+
+if __name__ == "__main__":
+    if FLAGS.loss:
+        benchmark_loss(FLAGS.loss)
+        sys.exit()
+
+    print("| Loss | Peak memory (MB) | Runtime (s) | Loss |")
+    print("|---|---|---|---|")
+    for name in LOSSES:
+        process = subprocess.run(
+            [sys.executable] + sys.argv + [f"--loss={name}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        memory, runtime, loss = map(
+            float, process.stdout.strip().splitlines()[-1].split()
+        )
+        print(f"| {name} | {memory:.0f} | {runtime:.2f} | {loss:.2f} |")
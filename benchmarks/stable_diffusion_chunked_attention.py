@@ -0,0 +1,128 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks full attention against the chunked online-softmax attention used
+by the Stable Diffusion VAE decoder and diffusion model, across resolutions.
+
+Peak memory is measured on the first GPU when one is available. On CPU, the
+size of the largest score matrix materialized at once is reported instead.
+"""
+import time
+import unittest
+
+import tensorflow as tf
+
+from keras_cv.models.stable_diffusion.__internal__.layers import (
+    chunked_attention as chunked_attention_lib,
+)
+
+
+def full_attention(query, key, value, scale):
+    score = tf.matmul(query, key, transpose_b=True) * scale
+    return tf.matmul(tf.nn.softmax(score), value)
+
+
+def chunked_attention(query, key, value, scale):
+    return chunked_attention_lib.chunked_attention(query, key, value, scale)
+
+
+def score_matrix_megabytes(attention_fn, num_heads, sequence_length):
+    if attention_fn is full_attention:
+        num_scores = num_heads * sequence_length**2
+    else:
+        num_scores = (
+            num_heads
+            * min(sequence_length, chunked_attention_lib.QUERY_CHUNK_SIZE)
+            * min(sequence_length, chunked_attention_lib.KEY_CHUNK_SIZE)
+        )
+    return num_scores * 4 / 2**20
+
+
+def benchmark(attention_fn, num_heads, head_size, sequence_length, num_runs):
+    query = tf.random.normal((1, num_heads, sequence_length, head_size))
+    key = tf.random.normal((1, num_heads, sequence_length, head_size))
+    value = tf.random.normal((1, num_heads, sequence_length, head_size))
+    fn = tf.function(attention_fn)
+    has_gpu = bool(tf.config.list_physical_devices("GPU"))
+    if has_gpu:
+        tf.config.experimental.reset_memory_stats("GPU:0")
+    # warmup
+    fn(query, key, value, head_size**-0.5).numpy()
+    t0 = time.time()
+    for _ in range(num_runs):
+        outputs = fn(query, key, value, head_size**-0.5)
+    outputs.numpy()
+    runtime = (time.time() - t0) / num_runs
+    if has_gpu:
+        peak = tf.config.experimental.get_memory_info("GPU:0")["peak"] / 2**20
+    else:
+        peak = None
+    return runtime, peak
+
+
+class ChunkedAttentionConsistencyTest(tf.test.TestCase):
+    def test_consistency_with_full_attention(self):
+        query = tf.random.normal((1, 1, 4096, 64))
+        key = tf.random.normal((1, 1, 4096, 64))
+        value = tf.random.normal((1, 1, 4096, 64))
+        self.assertAllClose(
+            chunked_attention(query, key, value, 0.125),
+            full_attention(query, key, value, 0.125),
+            rtol=1e-4,
+            atol=1e-4,
+        )
+
+
+if __name__ == "__main__":
+    # Run benchmark
+    resolutions = [512, 768, 1024]
+    # (name, num_heads, head_size, latent downsampling factor)
+    attention_layers = [
+        ("VAE AttentionBlock", 1, 512, 8),
+        ("UNet CrossAttention (self)", 8, 40, 8),
+    ]
+    num_runs = 3
+
+    print(
+        "| Layer | Resolution | Attention | Latency (ms) "
+        "| Peak GPU memory (MB) | Score matrix (MB) |"
+    )
+    print("|---|---|---|---|---|---|")
+    for layer_name, num_heads, head_size, factor in attention_layers:
+        for resolution in resolutions:
+            sequence_length = (resolution // factor) ** 2
+            for attention_fn in [full_attention, chunked_attention]:
+                try:
+                    runtime, peak = benchmark(
+                        attention_fn,
+                        num_heads,
+                        head_size,
+                        sequence_length,
+                        num_runs,
+                    )
+                    latency = f"{runtime * 1000:.1f}"
+                    peak = "n/a" if peak is None else f"{peak:.0f}"
+                except tf.errors.ResourceExhaustedError:
+                    latency, peak = "OOM", "OOM"
+                score_mb = score_matrix_megabytes(
+                    attention_fn, num_heads, sequence_length
+                )
+                print(
+                    f"| {layer_name} | {resolution} | "
+                    f"{attention_fn.__name__} | {latency} | {peak} "
+                    f"| {score_mb:.0f} |"
+                )
+
+    # Run unit tests
+    tf.config.run_functions_eagerly(True)
+    unittest.main(argv=[""])
@@ -0,0 +1,181 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local load generator for the StableDiffusion BatchingServer.
+
+Submits requests with Poisson arrivals at a fixed rate, and reports the
+throughput and latency percentiles for several maximum batch sizes. A maximum
+batch size of 1 serves every request on its own, as a baseline.
+
+Example:
+
+```
+python benchmarks/stable_diffusion_serving.py --request_rate=2 \
+    --num_requests=32 --max_batch_sizes=1,4,8 --random_weights
+```
+"""
+import sys
+import time
+
+import numpy as np
+from absl import flags
+
+from keras_cv.models.stable_diffusion.decoder import Decoder
+from keras_cv.models.stable_diffusion.diffusion_model import DiffusionModel
+from keras_cv.models.stable_diffusion.serving import BatchingServer
+from keras_cv.models.stable_diffusion.stable_diffusion import MAX_PROMPT_LENGTH
+from keras_cv.models.stable_diffusion.stable_diffusion import StableDiffusion
+from keras_cv.models.stable_diffusion.text_encoder import TextEncoder
+
+flags.DEFINE_integer("num_requests", 32, "Number of requests to submit.")
+flags.DEFINE_float("request_rate", 2.0, "Mean number of requests per second.")
+flags.DEFINE_list(
+    "max_batch_sizes", ["1", "4", "8"], "Maximum batch sizes to benchmark."
+)
+flags.DEFINE_float(
+    "batch_window_seconds", 0.05, "Time window to collect requests in."
+)
+flags.DEFINE_integer("img_size", 512, "Height and width of the images.")
+flags.DEFINE_integer("num_steps", 25, "Number of diffusion steps.")
+flags.DEFINE_boolean(
+    "random_weights",
+    False,
+    "Whether to use random weights instead of downloading the pretrained "
+    "weights. Latencies do not depend on the weights.",
+)
+flags.DEFINE_boolean("jit_compile", False, "Whether to compile with XLA.")
+
+FLAGS = flags.FLAGS
+FLAGS(sys.argv)
+
+PROMPTS = [
+    "A photograph of a horse running through a field",
+    "An oil painting of a lighthouse at dusk",
+    "A watercolor of a cat sleeping on a windowsill",
+    "A cyberpunk city street at night, neon lights",
+]
+
+
+class RandomWeightsStableDiffusion(StableDiffusion):
+    @property
+    def text_encoder(self):
+        if self._text_encoder is None:
+            self._text_encoder = TextEncoder(
+                MAX_PROMPT_LENGTH, download_weights=False
+            )
+        return self._text_encoder
+
+    @property
+    def diffusion_model(self):
+        if self._diffusion_model is None:
+            self._diffusion_model = DiffusionModel(
+                self.img_height,
+                self.img_width,
+                MAX_PROMPT_LENGTH,
+                download_weights=False,
+            )
+        return self._diffusion_model
+
+    @property
+    def decoder(self):
+        if self._decoder is None:
+            self._decoder = Decoder(
+                self.img_height, self.img_width, download_weights=False
+            )
+        return self._decoder
+
+
+def run_load(server, num_requests, request_rate, rng):
+    submit_times = []
+    done_times = {}
+    futures = []
+    for i in range(num_requests):
+        submit_times.append(time.monotonic())
+        future = server.submit(
+            PROMPTS[i % len(PROMPTS)],
+            img_height=FLAGS.img_size,
+            img_width=FLAGS.img_size,
+            num_steps=FLAGS.num_steps,
+            seed=i,
+        )
+        future.add_done_callback(
+            lambda _, i=i: done_times.__setitem__(i, time.monotonic())
+        )
+        futures.append(future)
+        time.sleep(rng.exponential(1.0 / request_rate))
+    for future in futures:
+        future.result()
+    # Done callbacks may run right after the results are set.
+    while len(done_times) < num_requests:
+        time.sleep(0.01)
+    latencies = [done_times[i] - submit_times[i] for i in range(num_requests)]
+    total_time = max(done_times.values()) - submit_times[0]
+    return num_requests / total_time, latencies
+
+
+if __name__ == "__main__":
+    model_cls = (
+        RandomWeightsStableDiffusion
+        if FLAGS.random_weights
+        else StableDiffusion
+    )
+    models = {}
+
+    def model_fn(img_height, img_width):
+        # Shares the models across servers, so weights are only loaded once.
+        key = (img_height, img_width)
+        if key not in models:
+            models[key] = model_cls(
+                img_height, img_width, jit_compile=FLAGS.jit_compile
+            )
+        return models[key]
+
+    results = []
+    for max_batch_size in map(int, FLAGS.max_batch_sizes):
+        server = BatchingServer(
+            model_fn,
+            max_batch_size=max_batch_size,
+            batch_window_seconds=FLAGS.batch_window_seconds,
+        )
+        with server:
+            # warmup, also traces the model for each batch size.
+            for batch_size in range(1, max_batch_size + 1):
+                futures = [
+                    server.submit(
+                        PROMPTS[0],
+                        img_height=FLAGS.img_size,
+                        img_width=FLAGS.img_size,
+                        num_steps=1,
+                    )
+                    for _ in range(batch_size)
+                ]
+                for future in futures:
+                    future.result()
+            throughput, latencies = run_load(
+                server,
+                FLAGS.num_requests,
+                FLAGS.request_rate,
+                np.random.default_rng(0),
+            )
+        results.append((max_batch_size, throughput, latencies))
+
+    print(
+        "| Max batch size | Throughput (images/s) | p50 latency (s) "
+        "| p95 latency (s) |"
+    )
+    print("|---|---|---|---|")
+    for max_batch_size, throughput, latencies in results:
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(
+            f"| {max_batch_size} | {throughput:.3f} | {p50:.2f} | {p95:.2f} |"
+        )
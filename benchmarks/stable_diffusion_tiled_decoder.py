@@ -0,0 +1,89 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the peak memory and latency of the Stable Diffusion VAE decoder
+with and without tiled decoding, across output resolutions.
+
+Every configuration runs in a fresh process, so that its peak memory is not
+affected by the previous ones. Peak memory is the peak GPU memory when a GPU is
+available, and the peak resident set size of the process otherwise. The decoder
+uses random weights, as only memory and latency are measured.
+"""
+import multiprocessing
+import resource
+import time
+
+RESOLUTIONS = [512, 768, 1024, 1536]
+TILE_SIZES = [None, 512, 256]
+
+
+def run_config(resolution, tile_size, queue):
+    import numpy as np
+    import tensorflow as tf
+
+    from keras_cv.models.stable_diffusion.decoder import Decoder
+    from keras_cv.models.stable_diffusion.stable_diffusion import (
+        StableDiffusionBase,
+    )
+
+    model = StableDiffusionBase(
+        resolution, resolution, decoder_tile_size=tile_size
+    )
+    model._decoder = Decoder(resolution, resolution, download_weights=False)
+    latent = np.random.normal(size=(1, resolution // 8, resolution // 8, 4))
+    latent = latent.astype("float32")
+
+    has_gpu = bool(tf.config.list_physical_devices("GPU"))
+    try:
+        # warmup
+        model._decode(latent)
+        if has_gpu:
+            tf.config.experimental.reset_memory_stats("GPU:0")
+        t0 = time.time()
+        model._decode(latent)
+        runtime = time.time() - t0
+    except tf.errors.ResourceExhaustedError:
+        queue.put((None, None))
+        return
+    if has_gpu:
+        peak = tf.config.experimental.get_memory_info("GPU:0")["peak"]
+        peak = peak / 2**20
+    else:
+        # ru_maxrss is reported in kilobytes on Linux.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+    queue.put((runtime, peak))
+
+
+if __name__ == "__main__":
+    context = multiprocessing.get_context("spawn")
+    print("| Resolution | Tile size | Latency (s) | Peak memory (MB) |")
+    print("|---|---|---|---|")
+    for resolution in RESOLUTIONS:
+        for tile_size in TILE_SIZES:
+            if tile_size is not None and tile_size >= resolution:
+                continue
+            queue = context.Queue()
+            process = context.Process(
+                target=run_config, args=(resolution, tile_size, queue)
+            )
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                runtime, peak = None, None
+            else:
+                runtime, peak = queue.get()
+            latency = "OOM" if runtime is None else f"{runtime:.2f}"
+            peak = "OOM" if peak is None else f"{peak:.0f}"
+            print(
+                f"| {resolution} | {tile_size or 'full'} | {latency} | {peak} |"
+            )
@@ -0,0 +1,94 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks RandomApply, which runs the wrapped layer once on the batch,
+against the previous per-sample RandomApply, wrapping the layers used by the
+SimCLR augmenter."""
+import time
+import unittest
+
+import tensorflow as tf
+
+from keras_cv.layers import Grayscale
+from keras_cv.layers import RandomApply
+from keras_cv.layers import RandomColorJitter
+
+
+class OldRandomApply(RandomApply):
+    """RandomApply augmenting every sample separately."""
+
+    def _batch_augment(self, inputs):
+        return self._map_fn(self._augment, inputs)
+
+
+def build_layers(random_apply_cls):
+    return [
+        (
+            "Grayscale",
+            random_apply_cls(Grayscale(output_channels=3), rate=0.2),
+        ),
+        (
+            "RandomColorJitter",
+            random_apply_cls(
+                RandomColorJitter(
+                    value_range=(0, 255),
+                    brightness_factor=0.2,
+                    contrast_factor=0.8,
+                    saturation_factor=(0.3, 0.7),
+                    hue_factor=0.2,
+                ),
+                rate=0.8,
+            ),
+        ),
+    ]
+
+
+class RandomApplyConsistencyTest(tf.test.TestCase):
+    def test_same_results_with_rate_one(self):
+        images = tf.random.uniform((8, 32, 32, 3), maxval=255)
+        layer = Grayscale(output_channels=3)
+        self.assertAllClose(
+            RandomApply(layer, rate=1.0)(images),
+            OldRandomApply(layer, rate=1.0)(images),
+        )
+
+
+if __name__ == "__main__":
+    # Run benchmark
+    batch_sizes = [32, 128, 512]
+    image_size = 224
+
+    print("| Layer | Batch size | Per-sample (s) | Vectorized (s) |")
+    print("|---|---|---|---|")
+    for (name, old_layer), (_, layer) in zip(
+        build_layers(OldRandomApply), build_layers(RandomApply)
+    ):
+        for batch_size in batch_sizes:
+            images = tf.random.uniform(
+                (batch_size, image_size, image_size, 3), maxval=255
+            )
+            runtimes = []
+            for random_apply in [old_layer, layer]:
+                apply = tf.function(random_apply)
+                # warmup
+                apply(images)
+                t0 = time.time()
+                apply(images).numpy()
+                runtimes.append(time.time() - t0)
+            print(
+                f"| {name} | {batch_size} | {runtimes[0]:.3f} "
+                f"| {runtimes[1]:.3f} |"
+            )
+
+    # Run unit tests
+    unittest.main(argv=[""])
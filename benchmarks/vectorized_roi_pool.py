@@ -0,0 +1,169 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the trace time, latency and peak memory of ROIPooler against the
+previous implementation, which unrolled Python loops over the ROIs and bins,
+and against a sparse table with the blocks of every size, which the bins of
+ROIs within the image do not need.
+
+The previous implementation only pooled the first ROI of each image. The
+`OldROIPooler` below pools all of them with the same loops, so that both
+layers compute the same outputs. It also maps over the images with
+`tf.map_fn` instead of `tf.vectorized_map`, which fails when the bins of the
+images have different sizes. Its trace time grows linearly with the number
+of ROIs, at over 10 seconds per ROI for 7x7 bins on CPU, so it is only
+benchmarked with a few ROIs.
+"""
+import time
+import unittest
+
+import tensorflow as tf
+
+from keras_cv import bounding_box
+from keras_cv.layers.object_detection.roi_pool import ROIPooler
+
+
+class OldROIPooler(ROIPooler):
+    def call(self, feature_map, rois):
+        rois = bounding_box.convert_format(
+            rois,
+            source=self.bounding_box_format,
+            target="rel_yxyx",
+            image_shape=self.image_shape,
+        )
+        return tf.map_fn(
+            self._pool_single_sample,
+            (feature_map, rois),
+            fn_output_signature=feature_map.dtype,
+        )
+
+    def _pool_single_sample(self, args):
+        feature_map, rois = args
+        num_rois = rois.get_shape().as_list()[0]
+        height, width, channel = feature_map.get_shape().as_list()
+        pooled_rois = []
+        for n in range(num_rois):
+            roi = rois[n, :]
+            y_start = height * roi[0]
+            x_start = width * roi[1]
+            region_height = height * (roi[2] - roi[0])
+            region_width = width * (roi[3] - roi[1])
+            h_step = region_height / self.target_height
+            w_step = region_width / self.target_width
+            regions = []
+            for i in range(self.target_height):
+                for j in range(self.target_width):
+                    height_start = y_start + i * h_step
+                    height_end = height_start + h_step
+                    height_start = tf.cast(height_start, tf.int32)
+                    height_end = tf.cast(height_end, tf.int32)
+                    height_end = height_start + tf.maximum(
+                        1, height_end - height_start
+                    )
+                    width_start = x_start + j * w_step
+                    width_end = width_start + w_step
+                    width_start = tf.cast(width_start, tf.int32)
+                    width_end = tf.cast(width_end, tf.int32)
+                    width_end = width_start + tf.maximum(
+                        1, width_end - width_start
+                    )
+                    region = feature_map[
+                        height_start:height_end, width_start:width_end, :
+                    ]
+                    regions.append(tf.reduce_max(region, axis=[0, 1]))
+            pooled_rois.append(
+                tf.reshape(
+                    tf.stack(regions),
+                    [self.target_height, self.target_width, channel],
+                )
+            )
+        return tf.stack(pooled_rois)
+
+
+class FullSparseTableROIPooler(ROIPooler):
+    @staticmethod
+    def _get_num_levels(size, target_size):
+        return size.bit_length()
+
+
+def random_rois(batch_size, num_rois):
+    corners = tf.random.uniform((batch_size, num_rois, 2, 2))
+    return tf.concat(
+        [tf.reduce_min(corners, axis=2), tf.reduce_max(corners, axis=2)],
+        axis=-1,
+    )
+
+
+class ROIPoolerConsistencyTest(tf.test.TestCase):
+    def test_consistency_with_old_implementation(self):
+        feature_map = tf.random.normal((2, 14, 14, 8))
+        rois = random_rois(2, 4)
+        args = dict(
+            bounding_box_format="rel_yxyx",
+            target_size=[3, 5],
+            image_shape=[224, 224, 3],
+        )
+        self.assertAllClose(
+            ROIPooler(**args)(feature_map, rois),
+            OldROIPooler(**args)(feature_map, rois),
+        )
+
+
+if __name__ == "__main__":
+    # Run benchmark
+    batch_size = 2
+    feature_map_size = 50
+    channels = 256
+    target_size = [7, 7]
+    old_num_rois_list = [1, 4, 16]
+    num_rois_list = [256, 512, 1000, 2000]
+
+    feature_map = tf.random.normal(
+        (batch_size, feature_map_size, feature_map_size, channels)
+    )
+    print("| Layer | ROIs | Trace time (s) | Latency (ms) | Peak memory (MB) |")
+    print("|---|---|---|---|---|")
+    configs = [(OldROIPooler, num_rois) for num_rois in old_num_rois_list]
+    configs += [
+        (layer_cls, num_rois)
+        for layer_cls in [FullSparseTableROIPooler, ROIPooler]
+        for num_rois in old_num_rois_list + num_rois_list
+    ]
+    for layer_cls, num_rois in configs:
+        rois = random_rois(batch_size, num_rois)
+        layer = layer_cls(
+            bounding_box_format="rel_yxyx",
+            target_size=target_size,
+            image_shape=[800, 800, 3],
+        )
+        fn = tf.function(layer)
+        t0 = time.time()
+        fn.get_concrete_function(feature_map, rois)
+        trace_time = time.time() - t0
+        # warmup
+        fn(feature_map, rois).numpy()
+        tf.config.experimental.reset_memory_stats("CPU:0")
+        memory = tf.config.experimental.get_memory_info("CPU:0")["current"]
+        t0 = time.time()
+        fn(feature_map, rois).numpy()
+        latency = (time.time() - t0) * 1000
+        peak_memory = (
+            tf.config.experimental.get_memory_info("CPU:0")["peak"] - memory
+        ) / 2**20
+        print(
+            f"| {layer_cls.__name__} | {num_rois} | {trace_time:.2f} "
+            f"| {latency:.1f} | {peak_memory:.0f} |"
+        )
+
+    # Run unit tests
+    unittest.main(argv=[""])
@@ -62,6 +62,22 @@ flags.DEFINE_boolean(
     True,
     "Whether to include probing during training.",
 )
+flags.DEFINE_boolean(
+    "fuse_views",
+    False,
+    "Whether to run the encoder once on both augmented views.",
+)
+flags.DEFINE_boolean(
+    "probe_on_views",
+    False,
+    "Whether to train the probe on the features of the first augmented view "
+    "instead of running the encoder on the raw images.",
+)
+flags.DEFINE_integer(
+    "probe_update_frequency",
+    1,
+    "Number of training steps between updates of the probe.",
+)
 
 
 FLAGS = flags.FLAGS
@@ -103,6 +119,9 @@ with strategy.scope():
             value_range=(0, 255), target_size=IMAGE_SIZE
         ),
         probe=layers.Dense(NUM_CLASSES, name="linear_probe"),
+        fuse_views=FLAGS.fuse_views,
+        probe_on_views=FLAGS.probe_on_views,
+        probe_update_frequency=FLAGS.probe_update_frequency,
     )
 
     optimizer = optimizers.SGD(
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from keras_cv.bounding_box.bounding_boxes import BoundingBoxes
 from keras_cv.bounding_box.converters import _decode_deltas_to_boxes
 from keras_cv.bounding_box.converters import _encode_box_to_deltas
 from keras_cv.bounding_box.converters import convert_format
@@ -24,10 +25,13 @@ from keras_cv.bounding_box.formats import XYXY
 from keras_cv.bounding_box.formats import YXYX
 from keras_cv.bounding_box.iou import compute_ciou
 from keras_cv.bounding_box.iou import compute_iou
+from keras_cv.bounding_box.iou import compute_iou_above_threshold
+from keras_cv.bounding_box.iou import compute_iou_top_k
 from keras_cv.bounding_box.mask_invalid_detections import (
     mask_invalid_detections,
 )
 from keras_cv.bounding_box.to_dense import to_dense
+from keras_cv.bounding_box.to_padded import to_padded
 from keras_cv.bounding_box.to_ragged import to_ragged
 from keras_cv.bounding_box.utils import as_relative
 from keras_cv.bounding_box.utils import clip_to_image
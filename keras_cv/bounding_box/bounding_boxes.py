@@ -0,0 +1,235 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A bounding box container which converts between formats lazily."""
+
+from keras_cv.backend import ops
+from keras_cv.bounding_box import converters
+from keras_cv.bounding_box.utils import is_relative
+
+
+class BoundingBoxes:
+    """Bounding boxes which track their format and image shape.
+
+    `BoundingBoxes` is an opt-in replacement for the bounding box dictionaries
+    used throughout KerasCV. It supports the same `"boxes"` and `"classes"`
+    keys, and is accepted by `keras_cv.bounding_box.convert_format()`.
+
+    Unlike a dictionary, converting a `BoundingBoxes` to another format does
+    not compute anything: the boxes are only converted once they are read in
+    the new format. Every format the boxes were read in is cached until the
+    boxes are assigned, so converting boxes to a format and back, or to a
+    format that they were already read in, is free. The number of conversions
+    which were computed is counted in `num_conversions`, and is carried over
+    to the converted `BoundingBoxes`.
+
+    KerasCV layers expect bounding box dictionaries, which they convert
+    themselves: pass them `as_dict(layer.bounding_box_format)`.
+
+    Args:
+        boxes: a tensor of boxes in `bounding_box_format`.
+        bounding_box_format: the format of `boxes`. For detailed information
+            on the supported formats, see the [KerasCV bounding box
+            documentation](https://keras.io/api/keras_cv/bounding_box/formats/).
+        classes: (Optional) a tensor of the classes of the boxes.
+        images: (Optional) the images of the boxes, used to convert between
+            relative and absolute formats.
+        image_shape: (Optional) the shape `(height, width, channels)` of the
+            images of the boxes, used instead of `images`.
+        **kwargs: any other tensors to store along with the boxes, such as
+            `"confidence"`.
+
+    Usage:
+    ```python
+    boxes = keras_cv.bounding_box.BoundingBoxes(
+        boxes, "xywh", classes=classes, images=images
+    )
+    boxes = keras_cv.bounding_box.convert_format(
+        boxes, source="xywh", target="rel_xyxy"
+    )
+    # Converts the boxes to `"rel_xyxy"`.
+    boxes["boxes"]
+    boxes = keras_cv.bounding_box.convert_format(
+        boxes, source="rel_xyxy", target="xywh"
+    )
+    # Returns the original boxes without converting them.
+    boxes["boxes"]
+    boxes.num_conversions  # 1
+    ```
+    """
+
+    def __init__(
+        self,
+        boxes,
+        bounding_box_format,
+        classes=None,
+        images=None,
+        image_shape=None,
+        **kwargs,
+    ):
+        if images is not None and image_shape is not None:
+            raise ValueError(
+                "BoundingBoxes expects either `images` or `image_shape`, but "
+                f"not both. Received images={images} "
+                f"image_shape={image_shape}"
+            )
+        bounding_box_format = bounding_box_format.lower()
+        # Validates the format.
+        is_relative(bounding_box_format)
+        self._format = bounding_box_format
+        self._cache = {bounding_box_format: boxes}
+        self._data = dict(kwargs)
+        if classes is not None:
+            self._data["classes"] = classes
+        self._images = images
+        self._image_shape = image_shape
+        self.num_conversions = 0
+
+    @property
+    def format(self):
+        """The format of the boxes returned by `self["boxes"]`."""
+        return self._format
+
+    def to(self, bounding_box_format, dtype="float32"):
+        """Returns the boxes in `bounding_box_format`.
+
+        The boxes are converted from a cached format, which is preferably
+        relative if `bounding_box_format` is relative, or absolute otherwise,
+        so that the images are only needed to convert between relative and
+        absolute formats. Conversions are computed and cached in float32, and
+        cast to `dtype` when read, so that reading boxes in a lower precision
+        first does not lower the precision of later reads.
+        """
+        bounding_box_format = bounding_box_format.lower()
+        if bounding_box_format not in self._cache:
+            target_is_relative = is_relative(bounding_box_format)
+            source = next(
+                (
+                    f
+                    for f in self._cache
+                    if is_relative(f) == target_is_relative
+                ),
+                next(iter(self._cache)),
+            )
+            self._cache[bounding_box_format] = converters.convert_format(
+                self._cache[source],
+                source=source,
+                target=bounding_box_format,
+                images=self._images,
+                image_shape=self._image_shape,
+            )
+            self.num_conversions += 1
+        boxes = self._cache[bounding_box_format]
+        if boxes.dtype != dtype:
+            boxes = ops.cast(boxes, dtype)
+        return boxes
+
+    def convert(
+        self, source, target, images=None, image_shape=None, dtype="float32"
+    ):
+        """Returns a `BoundingBoxes` of the same boxes in `target` format.
+
+        The boxes are not converted until they are read. If `images` or
+        `image_shape` are passed and describe a different image size than the
+        ones of this `BoundingBoxes`, the boxes are considered to be correct in
+        the `source` format for the new images, and the cached boxes in the
+        other formats are discarded.
+        """
+        source = source.lower()
+        if source != self._format:
+            raise ValueError(
+                "convert_format() received a `source` format which does not "
+                "match the format of the `BoundingBoxes`. Received "
+                f"source={source}, but the boxes are in format={self._format}."
+            )
+        if images is not None and image_shape is not None:
+            raise ValueError(
+                "convert_format() expects either `images` or `image_shape`, "
+                f"but not both. Received images={images} "
+                f"image_shape={image_shape}"
+            )
+        result = BoundingBoxes.__new__(BoundingBoxes)
+        result._format = target.lower()
+        # Validates the format.
+        is_relative(result._format)
+        result._data = dict(self._data)
+        result.num_conversions = self.num_conversions
+        result._images = self._images
+        result._image_shape = self._image_shape
+        if (images is None and image_shape is None) or _image_size_key(
+            images, image_shape
+        ) == _image_size_key(self._images, self._image_shape):
+            result._cache = dict(self._cache)
+        else:
+            # Only the formats with the same relativity as `source` stay
+            # valid for the new image size.
+            boxes = self.to(source, dtype=dtype)
+            result.num_conversions = self.num_conversions
+            result._cache = {
+                f: b
+                for f, b in self._cache.items()
+                if is_relative(f) == is_relative(source)
+            }
+            result._cache[source] = boxes
+            result._images = images
+            result._image_shape = image_shape
+        return result
+
+    def as_dict(self, bounding_box_format=None):
+        """Returns the boxes as a bounding box dictionary, with the boxes in
+        `bounding_box_format`, which defaults to the format of the boxes."""
+        boxes = self.to(bounding_box_format or self._format)
+        return {"boxes": boxes, **self._data}
+
+    def copy(self):
+        return self.convert(self._format, self._format)
+
+    def keys(self):
+        return ["boxes"] + list(self._data.keys())
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __contains__(self, key):
+        return key == "boxes" or key in self._data
+
+    def __getitem__(self, key):
+        if key == "boxes":
+            return self.to(self._format)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if key == "boxes":
+            self._cache = {self._format: value}
+        else:
+            self._data[key] = value
+
+    def __repr__(self):
+        return (
+            f"<BoundingBoxes format={self._format} "
+            f"cached_formats={list(self._cache)} keys={self.keys()}>"
+        )
+
+
+def _image_size_key(images, image_shape):
+    """Returns a key to compare the image sizes of two `BoundingBoxes`."""
+    if images is not None:
+        size = tuple(images.shape[-3:-1])
+        return size if None not in size else id(images)
+    if image_shape is not None:
+        if ops.is_tensor(image_shape):
+            return id(image_shape)
+        return tuple(image_shape[:2])
+    return None
@@ -0,0 +1,109 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import tensorflow as tf
+
+from keras_cv import bounding_box
+
+
+class BoundingBoxesTest(tf.test.TestCase):
+    def setUp(self):
+        self.xyxy = np.array([[[10, 20, 30, 60], [0, 0, 50, 100]]], "float32")
+        self.images = np.zeros((1, 100, 200, 3), "float32")
+
+    def test_converts_lazily(self):
+        boxes = bounding_box.BoundingBoxes(
+            self.xyxy, "xyxy", classes=[[1, 2]], images=self.images
+        )
+        boxes = bounding_box.convert_format(
+            boxes, source="xyxy", target="rel_yxyx"
+        )
+        self.assertEqual(boxes.format, "rel_yxyx")
+        self.assertEqual(boxes.num_conversions, 0)
+
+        self.assertAllClose(
+            boxes["boxes"],
+            [[[0.2, 0.05, 0.6, 0.15], [0.0, 0.0, 1.0, 0.25]]],
+        )
+        self.assertEqual(boxes.num_conversions, 1)
+        self.assertAllEqual(boxes["classes"], [[1, 2]])
+
+    def test_conversion_back_is_free(self):
+        boxes = bounding_box.BoundingBoxes(self.xyxy, "xyxy")
+        boxes = bounding_box.convert_format(boxes, source="xyxy", target="xywh")
+        boxes["boxes"]
+        boxes = bounding_box.convert_format(boxes, source="xywh", target="xyxy")
+        boxes = bounding_box.convert_format(boxes, source="xyxy", target="xywh")
+
+        self.assertAllClose(
+            boxes["boxes"], [[[10, 20, 20, 40], [0, 0, 50, 100]]]
+        )
+        self.assertEqual(boxes.num_conversions, 1)
+
+    def test_assignment_discards_cached_formats(self):
+        boxes = bounding_box.BoundingBoxes(self.xyxy, "xyxy")
+        boxes = bounding_box.convert_format(boxes, source="xyxy", target="yxyx")
+        boxes["boxes"] = boxes["boxes"] * 2
+        boxes = bounding_box.convert_format(boxes, source="yxyx", target="xyxy")
+
+        self.assertAllClose(boxes["boxes"], self.xyxy * 2)
+        self.assertEqual(boxes.num_conversions, 2)
+
+    def test_new_image_size_keeps_source_format(self):
+        boxes = bounding_box.BoundingBoxes(
+            self.xyxy, "xyxy", images=self.images
+        )
+        boxes = bounding_box.convert_format(
+            boxes, source="xyxy", target="rel_xyxy"
+        )
+        boxes["boxes"]
+        # Resizing the images keeps the relative boxes.
+        resized = np.zeros((1, 50, 50, 3), "float32")
+        boxes = bounding_box.convert_format(
+            boxes, source="rel_xyxy", target="xyxy", images=resized
+        )
+
+        self.assertAllClose(
+            boxes["boxes"], [[[2.5, 10, 7.5, 30], [0, 0, 12.5, 50]]]
+        )
+        self.assertEqual(boxes.num_conversions, 2)
+
+    def test_conversions_are_cached_in_float32(self):
+        xyxy = np.array([[[0.1, 0.2, 1000.3, 2000.7]]], "float32")
+        boxes = bounding_box.BoundingBoxes(xyxy, "xyxy")
+        boxes = bounding_box.convert_format(boxes, source="xyxy", target="xywh")
+
+        self.assertEqual(boxes.to("xywh", dtype="float16").dtype, "float16")
+        self.assertAllClose(
+            boxes.to("xywh"), [[[0.1, 0.2, 1000.2, 2000.5]]], atol=1e-3
+        )
+        self.assertEqual(boxes.num_conversions, 1)
+
+    def test_mismatched_source_format(self):
+        boxes = bounding_box.BoundingBoxes(self.xyxy, "xyxy")
+        with self.assertRaisesRegex(ValueError, "does not match"):
+            bounding_box.convert_format(boxes, source="xywh", target="xyxy")
+
+    def test_as_dict(self):
+        boxes = bounding_box.BoundingBoxes(
+            self.xyxy, "xyxy", classes=[[1, 2]], confidence=[[0.5, 0.7]]
+        )
+        boxes = bounding_box.convert_format(boxes, source="xyxy", target="yxyx")
+        result = boxes.as_dict()
+
+        self.assertEqual(
+            sorted(result.keys()), ["boxes", "classes", "confidence"]
+        )
+        self.assertAllClose(result["boxes"], self.xyxy[..., [1, 0, 3, 2]])
@@ -353,7 +353,8 @@ def convert_format(
             dimensions stacked on the final axis to store metadata. boxes
             should be a 3D tensor, with the shape `[batch_size, num_boxes, 4]`.
             Alternatively, boxes can be a dictionary with key 'boxes' containing
-            a tensor matching the aforementioned spec.
+            a tensor matching the aforementioned spec, or a
+            `keras_cv.bounding_box.BoundingBoxes`, which is converted lazily.
         source:One of {" ".join([f'"{f}"' for f in TO_XYXY_CONVERTERS.keys()])}.
             Used to specify the original format of the `boxes` parameter.
         target:One of {" ".join([f'"{f}"' for f in TO_XYXY_CONVERTERS.keys()])}.
@@ -367,6 +368,17 @@ def convert_format(
         dtype: the data type to use when transforming the boxes, defaults to
             `"float32"`.
     """
+    # Imported here, as `BoundingBoxes` uses `convert_format()`.
+    from keras_cv.bounding_box.bounding_boxes import BoundingBoxes
+
+    if isinstance(boxes, BoundingBoxes):
+        return boxes.convert(
+            source,
+            target,
+            images=images,
+            image_shape=image_shape,
+            dtype=dtype,
+        )
     if isinstance(boxes, dict):
         boxes["boxes"] = convert_format(
             boxes["boxes"],
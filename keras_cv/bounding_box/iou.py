@@ -104,24 +104,159 @@ def compute_iou(
         boxes2.
     """  # noqa: E501
 
+    boxes1_rank = len(boxes1.shape)
+    _check_ranks(boxes1, boxes2, "compute_iou")
+    boxes1, boxes2 = _convert_boxes(
+        boxes1, boxes2, bounding_box_format, images, image_shape
+    )
+    res = _pairwise_iou(boxes1, boxes2)
+
+    if not use_masking:
+        return res
+    return _mask_iou(res, boxes1, boxes2, boxes1_rank, mask_val)
+
+
+def compute_iou_top_k(
+    boxes1,
+    boxes2,
+    bounding_box_format,
+    k,
+    block_size=256,
+    use_masking=False,
+    mask_val=-1,
+    images=None,
+    image_shape=None,
+):
+    """Computes the `k` highest ious of each box in `boxes1` with `boxes2`.
+
+    Unlike `compute_iou()`, the pairwise ious are never materialized at once.
+    `boxes2` is processed in a loop over blocks of `block_size` boxes, and only
+    the `k` highest ious of each row are kept between blocks, so the peak
+    memory use is proportional to `N * (k + block_size)` instead of `N * M`.
+    Batched and unbatched boxes are supported as in `compute_iou()`. The number
+    of boxes in `boxes2` must be known statically.
+
+    Args:
+      boxes1: a list of bounding boxes. Can be batched or unbatched.
+      boxes2: a list of bounding boxes. Can be batched or unbatched.
+      bounding_box_format: a case-insensitive string which is one of `"xyxy"`,
+        `"rel_xyxy"`, `"xyWH"`, `"center_xyWH"`, `"yxyx"`, `"rel_yxyx"`.
+      k: int, the number of ious to keep for each box in `boxes1`. If `boxes2`
+        has fewer than `k` boxes, all of them are kept.
+      block_size: int, the number of boxes of `boxes2` processed at once.
+        Defaults to 256.
+      use_masking: whether masking will be applied, as in `compute_iou()`.
+        Default to `False`.
+      mask_val: int to mask those returned IOUs if the masking is True, defaults
+        to -1.
+
+    Returns:
+      A tuple `(ious, indices)` of shape [N, k] or [batch_size, N, k], with the
+        ious sorted in descending order and the indices of the corresponding
+        boxes in `boxes2`.
+    """
+    ious, indices, _ = _blockwise_top_k(
+        boxes1,
+        boxes2,
+        bounding_box_format,
+        k,
+        None,
+        block_size,
+        use_masking,
+        mask_val,
+        images,
+        image_shape,
+        "compute_iou_top_k",
+    )
+    return ious, indices
+
+
+def compute_iou_above_threshold(
+    boxes1,
+    boxes2,
+    bounding_box_format,
+    threshold,
+    max_matches=100,
+    block_size=256,
+    use_masking=False,
+    mask_val=-1,
+    images=None,
+    image_shape=None,
+):
+    """Computes the ious of `boxes1` with `boxes2` above a threshold.
+
+    Like `compute_iou_top_k()`, `boxes2` is processed in a loop over blocks of
+    `block_size` boxes, so the pairwise ious are never materialized at once.
+    Up to `max_matches` ious above `threshold` are kept for each box in
+    `boxes1`, and the number of ious above `threshold` is counted, so that
+    truncated rows can be detected. The number of boxes in `boxes2` must be
+    known statically.
+
+    Args:
+      boxes1: a list of bounding boxes. Can be batched or unbatched.
+      boxes2: a list of bounding boxes. Can be batched or unbatched.
+      bounding_box_format: a case-insensitive string which is one of `"xyxy"`,
+        `"rel_xyxy"`, `"xyWH"`, `"center_xyWH"`, `"yxyx"`, `"rel_yxyx"`.
+      threshold: float, only the ious strictly greater than `threshold` are
+        returned.
+      max_matches: int, the maximum number of ious to keep for each box in
+        `boxes1`. When more ious are above `threshold`, the highest ones are
+        kept. Defaults to 100.
+      block_size: int, the number of boxes of `boxes2` processed at once.
+        Defaults to 256.
+      use_masking: whether masking will be applied, as in `compute_iou()`.
+        Default to `False`.
+      mask_val: int to mask those returned IOUs if the masking is True, defaults
+        to -1.
+
+    Returns:
+      A tuple `(ious, indices, num_matches)`. `ious` and `indices` have shape
+        [N, max_matches] or [batch_size, N, max_matches], with the ious above
+        `threshold` sorted in descending order and the indices of the
+        corresponding boxes in `boxes2`, padded with -1. `num_matches` has
+        shape [N] or [batch_size, N], and holds the number of ious above
+        `threshold`, including the ones which were not kept.
+    """
+    ious, indices, num_matches = _blockwise_top_k(
+        boxes1,
+        boxes2,
+        bounding_box_format,
+        max_matches,
+        threshold,
+        block_size,
+        use_masking,
+        mask_val,
+        images,
+        image_shape,
+        "compute_iou_above_threshold",
+    )
+    matched = ious > threshold
+    ious = ops.where(matched, ious, ops.cast(-1, ious.dtype))
+    indices = ops.where(matched, indices, -1)
+    return ious, indices, num_matches
+
+
+def _check_ranks(boxes1, boxes2, fn_name):
     boxes1_rank = len(boxes1.shape)
     boxes2_rank = len(boxes2.shape)
 
     if boxes1_rank not in [2, 3]:
         raise ValueError(
-            "compute_iou() expects boxes1 to be batched, or to be unbatched. "
+            f"{fn_name}() expects boxes1 to be batched, or to be unbatched. "
             f"Received len(boxes1.shape)={boxes1_rank}, "
             f"len(boxes2.shape)={boxes2_rank}. Expected either "
             "len(boxes1.shape)=2 AND or len(boxes1.shape)=3."
         )
     if boxes2_rank not in [2, 3]:
         raise ValueError(
-            "compute_iou() expects boxes2 to be batched, or to be unbatched. "
+            f"{fn_name}() expects boxes2 to be batched, or to be unbatched. "
             f"Received len(boxes1.shape)={boxes1_rank}, "
             f"len(boxes2.shape)={boxes2_rank}. Expected either "
             "len(boxes2.shape)=2 AND or len(boxes2.shape)=3."
         )
 
+
+def _convert_boxes(boxes1, boxes2, bounding_box_format, images, image_shape):
     target_format = "yxyx"
     if bounding_box.is_relative(bounding_box_format):
         target_format = bounding_box.as_relative(target_format)
@@ -141,7 +276,10 @@ def compute_iou(
         images=images,
         image_shape=image_shape,
     )
+    return boxes1, boxes2
 
+
+def _pairwise_iou(boxes1, boxes2):
     intersect_area = _compute_intersection(boxes1, boxes2)
     boxes1_area = _compute_area(boxes1)
     boxes2_area = _compute_area(boxes2)
@@ -150,24 +288,165 @@ def compute_iou(
     boxes1_area = ops.expand_dims(boxes1_area, axis=-1)
     boxes2_area = ops.expand_dims(boxes2_area, axis=boxes2_axis)
     union_area = boxes1_area + boxes2_area - intersect_area
-    res = ops.divide(intersect_area, union_area + keras.backend.epsilon())
+    return ops.divide(intersect_area, union_area + keras.backend.epsilon())
+
 
+def _mask_iou(res, boxes1, boxes2, boxes1_rank, mask_val):
     if boxes1_rank == 2:
         perm = [1, 0]
     else:
         perm = [0, 2, 1]
 
-    if not use_masking:
-        return res
-
     mask_val_t = ops.cast(mask_val, res.dtype) * ops.ones_like(res)
     boxes1_mask = ops.less(ops.max(boxes1, axis=-1, keepdims=True), 0.0)
     boxes2_mask = ops.less(ops.max(boxes2, axis=-1, keepdims=True), 0.0)
     background_mask = ops.logical_or(
         boxes1_mask, ops.transpose(boxes2_mask, perm)
     )
-    iou_lookup_table = ops.where(background_mask, mask_val_t, res)
-    return iou_lookup_table
+    return ops.where(background_mask, mask_val_t, res)
+
+
+def _blockwise_top_k(
+    boxes1,
+    boxes2,
+    bounding_box_format,
+    k,
+    threshold,
+    block_size,
+    use_masking,
+    mask_val,
+    images,
+    image_shape,
+    fn_name,
+):
+    """Keeps the `k` highest ious of each row, looping over blocks of `boxes2`.
+
+    When `threshold` is set, the ious which are not above it are discarded, and
+    the number of ious above it is counted for each row.
+    """
+    if k < 1:
+        raise ValueError(
+            f"{fn_name}() expects k to be positive. Received k={k}."
+        )
+    boxes1, boxes2, num_boxes2, num_blocks = _prepare_blocks(
+        boxes1,
+        boxes2,
+        bounding_box_format,
+        block_size,
+        images,
+        image_shape,
+        fn_name,
+    )
+    k = min(k, num_boxes2)
+    rows_shape = _output_batch_shape(boxes1, boxes2) + [ops.shape(boxes1)[-2]]
+
+    def top_k_loop_body(ious, indices, num_matches, idx):
+        block_ious, columns = _block_ious(
+            boxes1,
+            boxes2,
+            idx,
+            block_size,
+            num_boxes2,
+            use_masking,
+            mask_val,
+        )
+        if threshold is not None:
+            matched = block_ious > threshold
+            num_matches += ops.cast(
+                ops.sum(ops.cast(matched, "int32"), axis=-1), "int32"
+            )
+            block_ious = ops.where(
+                matched, block_ious, ops.cast(float("-inf"), block_ious.dtype)
+            )
+        block_indices = ops.broadcast_to(columns, ops.shape(block_ious))
+        # Ties are broken by the lowest index, as the kept ious come first.
+        block_ious = ops.concatenate([ious, block_ious], axis=-1)
+        block_indices = ops.concatenate([indices, block_indices], axis=-1)
+        ious, top_k = ops.top_k(block_ious, k)
+        indices = ops.take_along_axis(block_indices, top_k, axis=-1)
+        return ious, indices, num_matches, idx + 1
+
+    ious, indices, num_matches, _ = ops.while_loop(
+        lambda _ious, _indices, _num_matches, idx: idx < num_blocks,
+        top_k_loop_body,
+        [
+            ops.full(rows_shape + [k], float("-inf"), boxes1.dtype),
+            ops.full(rows_shape + [k], -1, "int32"),
+            ops.zeros(rows_shape, "int32"),
+            ops.array(0, "int32"),
+        ],
+    )
+    return ious, indices, num_matches
+
+
+def _prepare_blocks(
+    boxes1,
+    boxes2,
+    bounding_box_format,
+    block_size,
+    images,
+    image_shape,
+    fn_name,
+):
+    """Converts the boxes, and pads `boxes2` to a multiple of `block_size`."""
+    _check_ranks(boxes1, boxes2, fn_name)
+    num_boxes2 = boxes2.shape[-2]
+    if num_boxes2 is None:
+        raise ValueError(
+            f"{fn_name}() expects the number of boxes in boxes2 to be known "
+            f"statically. Received boxes2.shape={boxes2.shape}."
+        )
+    if block_size < 1:
+        raise ValueError(
+            f"{fn_name}() expects block_size to be positive. Received "
+            f"block_size={block_size}."
+        )
+    boxes1, boxes2 = _convert_boxes(
+        boxes1, boxes2, bounding_box_format, images, image_shape
+    )
+    num_blocks = math.ceil(num_boxes2 / block_size)
+    pad = [[0, num_blocks * block_size - num_boxes2], [0, 0]]
+    if len(boxes2.shape) == 3:
+        pad = [[0, 0]] + pad
+    boxes2 = ops.pad(boxes2, pad)
+    return boxes1, boxes2, num_boxes2, num_blocks
+
+
+def _output_batch_shape(boxes1, boxes2):
+    if len(boxes1.shape) == 3:
+        return [ops.shape(boxes1)[0]]
+    if len(boxes2.shape) == 3:
+        return [ops.shape(boxes2)[0]]
+    return []
+
+
+def _block_ious(
+    boxes1, boxes2, idx, block_size, num_boxes2, use_masking, mask_val
+):
+    """Computes the ious with the `idx`-th block of the padded `boxes2`.
+
+    Returns the ious, where the columns of padding boxes are set to `-inf`,
+    and the indices of the columns in `boxes2`.
+    """
+    start = idx * block_size
+    if len(boxes2.shape) == 3:
+        block = ops.slice(
+            boxes2, [0, start, 0], [ops.shape(boxes2)[0], block_size, 4]
+        )
+    else:
+        block = ops.slice(boxes2, [start, 0], [block_size, 4])
+    block_ious = _pairwise_iou(boxes1, block)
+    if use_masking:
+        block_ious = _mask_iou(
+            block_ious, boxes1, block, len(boxes1.shape), mask_val
+        )
+    columns = ops.cast(start + ops.arange(block_size), "int32")
+    block_ious = ops.where(
+        columns < num_boxes2,
+        block_ious,
+        ops.cast(float("-inf"), block_ious.dtype),
+    )
+    return block_ious, columns
 
 
 def compute_ciou(box1, box2, bounding_box_format, eps=1e-7):
@@ -159,3 +159,70 @@ class IoUTest(tf.test.TestCase):
 
         result = iou_lib.compute_iou(sample_y_true, sample_y_pred, "yxyx")
         self.assertAllClose(expected_result, result)
+
+    def _random_boxes(self, shape):
+        corners = np.random.uniform(0, 100, size=shape + (2, 2))
+        return np.concatenate(
+            [corners.min(axis=-2), corners.max(axis=-2)], axis=-1
+        ).astype("float32")
+
+    def test_compute_iou_top_k(self):
+        boxes1 = self._random_boxes((50,))
+        boxes2 = self._random_boxes((70,))
+        expected = iou_lib.compute_iou(boxes1, boxes2, "yxyx")
+        expected_ious, expected_indices = tf.math.top_k(expected, 5)
+
+        ious, indices = iou_lib.compute_iou_top_k(
+            boxes1, boxes2, "yxyx", k=5, block_size=16
+        )
+        self.assertAllClose(ious, expected_ious)
+        self.assertAllClose(
+            tf.gather(expected, indices, batch_dims=1), expected_ious
+        )
+
+    def test_batched_compute_iou_top_k(self):
+        boxes1 = self._random_boxes((2, 50))
+        boxes2 = self._random_boxes((2, 70))
+        boxes2[:, :10] = -1
+        expected = iou_lib.compute_iou(boxes1, boxes2, "yxyx", use_masking=True)
+        expected_ious, _ = tf.math.top_k(expected, 70)
+
+        ious, indices = iou_lib.compute_iou_top_k(
+            boxes1, boxes2, "yxyx", k=80, block_size=32, use_masking=True
+        )
+        self.assertEqual(ious.shape, (2, 50, 70))
+        self.assertAllClose(ious, expected_ious)
+        self.assertAllClose(
+            tf.gather(expected, indices, batch_dims=2), expected_ious
+        )
+
+    def test_compute_iou_above_threshold(self):
+        boxes1 = self._random_boxes((2, 50))
+        boxes2 = self._random_boxes((70,))
+        expected = iou_lib.compute_iou(boxes1, boxes2, "yxyx")
+        expected_num_matches = np.sum(expected > 0.1, axis=-1)
+
+        ious, indices, num_matches = iou_lib.compute_iou_above_threshold(
+            boxes1, boxes2, "yxyx", threshold=0.1, max_matches=70, block_size=16
+        )
+        self.assertAllEqual(num_matches, expected_num_matches)
+        self.assertAllClose(
+            ious, np.where(ious > 0.1, -np.sort(-expected, axis=-1), -1)
+        )
+        self.assertAllEqual(np.sum(indices >= 0, axis=-1), expected_num_matches)
+        matched_ious = tf.gather(expected, np.maximum(indices, 0), batch_dims=2)
+        self.assertAllClose(np.where(indices >= 0, matched_ious, -1), ious)
+
+    def test_compute_iou_above_threshold_max_matches(self):
+        # Boxes with an iou of 1 with themselves, and 1/3 with the next one.
+        boxes = np.array([[0, i, 2, i + 2] for i in range(20)], "float32")
+
+        ious, indices, num_matches = iou_lib.compute_iou_above_threshold(
+            boxes, boxes, "xyxy", threshold=0.3, max_matches=2, block_size=8
+        )
+        self.assertAllEqual(num_matches, [2] + [3] * 18 + [2])
+        self.assertAllClose(ious[:, 0], np.ones(20))
+        self.assertAllClose(ious[:, 1], np.full(20, 1 / 3))
+        self.assertAllEqual(indices[:, 0], np.arange(20))
+        self.assertAllEqual(indices[1:, 1], np.arange(19))
+        self.assertEqual(indices[0, 1], 1)
@@ -0,0 +1,70 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import tensorflow as tf
+
+from keras_cv.backend.scope import tf_data
+from keras_cv.bounding_box.to_dense import to_dense
+
+
+@tf_data
+def to_padded(bounding_boxes, max_boxes=None, sentinel=-1, dtype=tf.float32):
+    """Converts bounding boxes to padded dense tensors with a box count.
+
+    The boxes are padded with `sentinel` like in `bounding_box.to_dense()`, and
+    the number of boxes whose class is not `sentinel` is added to the
+    dictionary as `"num_boxes"`. KerasCV preprocessing layers receiving
+    bounding boxes with a `"num_boxes"` keep them in this format instead of
+    converting them to ragged tensors, and mark the boxes which they discard
+    with a `sentinel` class in place. `"num_boxes"` is therefore the number of
+    valid boxes, and not the length of a prefix of valid boxes: the valid boxes
+    are the ones whose class is not `sentinel`, and `boxes[:num_boxes]` may
+    contain discarded boxes. They can be converted to ragged tensors with
+    `bounding_box.to_ragged()`, which drops `"num_boxes"`.
+
+    Usage:
+    ```python
+    bounding_boxes = {
+        "boxes": tf.ragged.constant([[[0, 0, 1, 1]], [[0, 0, 1, 1]] * 2]),
+        "classes": tf.ragged.constant([[0], [1, 2]]),
+    }
+    bounding_boxes = bounding_box.to_padded(bounding_boxes, max_boxes=3)
+    print(bounding_boxes["classes"])
+    # [[0, -1, -1], [1, 2, -1]]
+    print(bounding_boxes["num_boxes"])
+    # [1, 2]
+    ```
+
+    Args:
+        bounding_boxes: bounding boxes in KerasCV dictionary format, either
+            batched or unbatched.
+        max_boxes: (Optional) the number of boxes to pad ragged bounding boxes
+            to. Defaults to the largest number of boxes in the batch.
+        sentinel: (Optional) the class of the padding boxes, defaults to -1.
+        dtype: (Optional) the data type of the boxes and classes, defaults to
+            `tf.float32`.
+
+    Returns:
+        dictionary of dense `"boxes"` and `"classes"`, and an int32
+        `"num_boxes"` with the number of boxes of each image.
+    """
+    bounding_boxes = to_dense(
+        bounding_boxes, max_boxes=max_boxes, default_value=sentinel
+    )
+    for key in ["boxes", "classes", "confidence"]:
+        if key in bounding_boxes:
+            bounding_boxes[key] = tf.cast(bounding_boxes[key], dtype)
+    bounding_boxes["num_boxes"] = tf.reduce_sum(
+        tf.cast(bounding_boxes["classes"] != sentinel, tf.int32), axis=-1
+    )
+    return bounding_boxes
@@ -0,0 +1,56 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import tensorflow as tf
+
+from keras_cv import bounding_box
+
+
+class ToPaddedTest(tf.test.TestCase):
+    @pytest.mark.tf_keras_only
+    def test_converts_ragged_to_padded(self):
+        bounding_boxes = {
+            "boxes": tf.ragged.constant(
+                [[[0, 0, 1, 1]], [[0, 0, 1, 1], [0, 0, 1, 1], [0, 0, 1, 1]]]
+            ),
+            "classes": tf.ragged.constant([[0], [1, 2, 3]]),
+        }
+        bounding_boxes = bounding_box.to_padded(bounding_boxes, max_boxes=4)
+        self.assertEqual(bounding_boxes["boxes"].shape, [2, 4, 4])
+        self.assertAllEqual(
+            bounding_boxes["classes"], [[0, -1, -1, -1], [1, 2, 3, -1]]
+        )
+        self.assertAllEqual(bounding_boxes["num_boxes"], [1, 3])
+
+    def test_counts_boxes_marked_invalid_in_place(self):
+        bounding_boxes = {
+            "boxes": tf.zeros((2, 3, 4)),
+            "classes": tf.constant([[0, -1, 1], [-1, -1, -1]]),
+        }
+        bounding_boxes = bounding_box.to_padded(bounding_boxes)
+        self.assertAllEqual(bounding_boxes["num_boxes"], [2, 0])
+        self.assertEqual(bounding_boxes["classes"].dtype, tf.float32)
+
+    @pytest.mark.tf_keras_only
+    def test_to_ragged_drops_num_boxes(self):
+        bounding_boxes = bounding_box.to_padded(
+            {
+                "boxes": tf.zeros((2, 3, 4)),
+                "classes": tf.constant([[0, -1, 1], [-1, -1, -1]]),
+            }
+        )
+        bounding_boxes = bounding_box.to_ragged(bounding_boxes)
+        self.assertNotIn("num_boxes", bounding_boxes)
+        self.assertAllEqual(bounding_boxes["classes"].row_lengths(), [2, 0])
@@ -85,6 +85,9 @@ def to_ragged(bounding_boxes, sentinel=-1, dtype=tf.float32):
             confidence = tf.RaggedTensor.from_tensor(confidence)
 
     result = bounding_boxes.copy()
+    # The number of boxes of `bounding_box.to_padded()` is implied by the
+    # ragged tensors.
+    result.pop("num_boxes", None)
     result["boxes"] = tf.cast(boxes, dtype)
     result["classes"] = tf.cast(classes, dtype)
 
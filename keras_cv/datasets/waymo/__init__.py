@@ -15,6 +15,7 @@
 # Following symbols are only available when Waymo Open Dataset dependencies are
 # installed.
 from keras_cv.datasets.waymo.load import load
+from keras_cv.datasets.waymo.transformer import accumulate_frames
 from keras_cv.datasets.waymo.transformer import build_tensors_for_augmentation
 from keras_cv.datasets.waymo.transformer import build_tensors_from_wod_frame
 from keras_cv.datasets.waymo.transformer import convert_to_center_pillar_inputs
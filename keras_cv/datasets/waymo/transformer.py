@@ -57,6 +57,16 @@ WOD_FRAME_OUTPUT_SIGNATURE = {
     "label_point_nlz": tf.TensorSpec([None], tf.int32),
 }
 
+# Point tensors which are concatenated across frames by `accumulate_frames()`.
+_ACCUMULATED_POINT_KEYS = (
+    "point_xyz",
+    "point_feature",
+    "point_mask",
+    "point_range_image_row_col_sensor_id",
+    "label_point_class",
+    "label_point_nlz",
+)
+
 # Maximum number of points from all lidars excluding the top lidar. Please refer
 # to https://arxiv.org/pdf/1912.04838.pdf Figure 1 for sensor layouts.
 _MAX_NUM_NON_TOP_LIDAR_POINTS = 30000
@@ -772,6 +782,116 @@ def transform_to_vehicle_frame(
     return frame
 
 
+def accumulate_frames(
+    dataset: tf.data.Dataset, num_frames: int, max_time_gap_seconds=1.0
+) -> tf.data.Dataset:
+    """Accumulates point clouds of consecutive frames of a segment.
+
+    This is a streaming stage over a dataset of frames in global coordinates,
+    e.g. the output of `keras_cv.datasets.waymo.load()`. It keeps a ring buffer
+    of the last `num_frames - 1` frames of the current segment, so that every
+    frame is only parsed once. The points of the buffered frames are
+    transformed into the vehicle frame of the current frame to compensate for
+    the ego-motion, and concatenated after the points of the current frame.
+    The boxes of the current frame are transformed into its vehicle frame, as
+    in `transform_to_vehicle_frame()`.
+
+    The time offset in seconds between the current frame and the frame each
+    point comes from is appended as the last channel of "point_feature".
+
+    Frames are expected to be sorted by timestamp within each segment. A new
+    segment is detected when the timestamp does not increase, or when it
+    increases by more than `max_time_gap_seconds`, in which case the ring
+    buffer is cleared.
+
+    Args:
+      dataset: a dataset of dictionaries of feature tensors from Waymo Open
+        Dataset frames in global frame.
+      num_frames: the number of frames to accumulate, including the current
+        frame.
+      max_time_gap_seconds: the maximum time gap between two consecutive
+        frames of the same segment, defaults to 1.0.
+
+    Returns:
+      A dataset of dictionaries of feature tensors in vehicle frame, with the
+      point tensors of up to `num_frames` frames concatenated.
+    """
+    assert_waymo_open_dataset_installed(
+        "keras_cv.datasets.waymo.accumulate_frames()"
+    )
+    if num_frames < 1:
+        raise ValueError(
+            f"num_frames must be a positive integer. Received {num_frames}."
+        )
+    max_time_gap_micros = int(max_time_gap_seconds * 1e6)
+    element_spec = dataset.element_spec
+
+    def _get_slot(frame):
+        slot = {key: frame[key] for key in _ACCUMULATED_POINT_KEYS}
+        slot["timestamp_micros"] = frame["timestamp_micros"]
+        return slot
+
+    def _empty_slot():
+        slot = {
+            key: tf.zeros(
+                [0] + element_spec[key].shape.as_list()[1:],
+                dtype=element_spec[key].dtype,
+            )
+            for key in _ACCUMULATED_POINT_KEYS
+        }
+        slot["timestamp_micros"] = tf.constant(0, dtype=tf.int64)
+        return slot
+
+    def _clear_slot(slot, clear):
+        cleared_slot = {
+            key: slot[key][: tf.where(clear, 0, tf.shape(slot[key])[0])]
+            for key in _ACCUMULATED_POINT_KEYS
+        }
+        cleared_slot["timestamp_micros"] = slot["timestamp_micros"]
+        return cleared_slot
+
+    def _accumulate(ring_buffer, frame):
+        timestamp_micros = frame["timestamp_micros"]
+        if ring_buffer:
+            # ring_buffer[0] always holds the previous frame.
+            time_gap = timestamp_micros - ring_buffer[0]["timestamp_micros"]
+            new_segment = tf.logical_or(
+                time_gap <= 0, time_gap > max_time_gap_micros
+            )
+            ring_buffer = tuple(
+                _clear_slot(slot, new_segment) for slot in ring_buffer
+            )
+        slots = (_get_slot(frame),) + ring_buffer
+
+        accumulated_frame = dict(frame)
+        for key in _ACCUMULATED_POINT_KEYS:
+            accumulated_frame[key] = tf.concat(
+                [slot[key] for slot in slots], axis=0
+            )
+        # [N, 1]
+        point_time_offset = tf.concat(
+            [
+                tf.fill(
+                    [tf.shape(slot["point_xyz"])[0], 1],
+                    tf.cast(
+                        timestamp_micros - slot["timestamp_micros"], tf.float32
+                    )
+                    * 1e-6,
+                )
+                for slot in slots
+            ],
+            axis=0,
+        )
+        accumulated_frame["point_feature"] = tf.concat(
+            [accumulated_frame["point_feature"], point_time_offset], axis=-1
+        )
+        # Drop the oldest frame from the ring buffer.
+        return slots[:-1], transform_to_vehicle_frame(accumulated_frame)
+
+    ring_buffer = tuple(_empty_slot() for _ in range(num_frames - 1))
+    return dataset.scan(ring_buffer, _accumulate)
+
+
 def convert_to_center_pillar_inputs(
     frame: Dict[str, tf.Tensor]
 ) -> Dict[str, Any]:
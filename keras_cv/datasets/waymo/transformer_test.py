@@ -163,3 +163,46 @@ class WaymoOpenDatasetTransformerTest(tf.test.TestCase):
         self.assertEqual(boxes["mask"].shape, [1000])
         self.assertTrue(tf.math.reduce_any(boxes["mask"]))
         self.assertAllGreater(tf.math.reduce_max(boxes["classes"]), 0)
+
+    @pytest.mark.skipif(
+        "TEST_WAYMO_DEPS" not in os.environ
+        or os.environ["TEST_WAYMO_DEPS"] != "true",
+        reason="Requires Waymo Open Dataset package",
+    )
+    def test_accumulate_frames(self):
+        dataset = load(self.test_data_path)
+
+        def _next_frame(frame):
+            # Simulates the next frame of the segment, 0.1 seconds later.
+            frame = dict(frame)
+            frame["timestamp_micros"] = frame["timestamp_micros"] + 100000
+            return frame
+
+        dataset = dataset.concatenate(dataset.map(_next_frame))
+        dataset = transformer.accumulate_frames(dataset, num_frames=2)
+        first_example, second_example = list(dataset)
+
+        num_points = first_example["point_xyz"].shape[0]
+        self.assertEqual(first_example["point_feature"].shape, [num_points, 5])
+        self.assertAllEqual(
+            first_example["point_feature"][:, -1], tf.zeros([num_points])
+        )
+        self.assertAllClose(first_example["pose"], tf.eye(4))
+
+        # The second example accumulates points of both frames.
+        self.assertEqual(second_example["point_xyz"].shape, [2 * num_points, 3])
+        self.assertEqual(
+            second_example["point_feature"].shape, [2 * num_points, 5]
+        )
+        self.assertEqual(second_example["point_mask"].shape, [2 * num_points])
+        self.assertAllClose(
+            second_example["point_xyz"][num_points:],
+            first_example["point_xyz"],
+        )
+        self.assertAllClose(
+            second_example["point_feature"][num_points:, -1],
+            tf.fill([num_points], 0.1),
+        )
+        self.assertAllClose(
+            second_example["label_box"], first_example["label_box"]
+        )
@@ -88,6 +88,12 @@ from keras_cv.layers.preprocessing.solarization import Solarization
 from keras_cv.layers.preprocessing.vectorized_base_image_augmentation_layer import (  # noqa: E501
     VectorizedBaseImageAugmentationLayer,
 )
+from keras_cv.layers.preprocessing_3d.global_random_affine_3d import (
+    GlobalRandomAffine3D,
+)
+from keras_cv.layers.preprocessing_3d.vectorized_base_augmentation_layer_3d import (  # noqa: E501
+    VectorizedBaseAugmentationLayer3D,
+)
 from keras_cv.layers.preprocessing_3d.waymo.frustum_random_dropping_points import (  # noqa: E501
     FrustumRandomDroppingPoints,
 )
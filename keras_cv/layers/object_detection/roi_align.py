@@ -12,21 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict
-from typing import Mapping
+import math
 from typing import Optional
-from typing import Tuple
-
-import tensorflow as tf
-from tensorflow import keras
 
 from keras_cv import bounding_box
-from keras_cv.backend import assert_tf_keras
+from keras_cv.backend import keras
+from keras_cv.backend import ops
 
 
-def _feature_bilinear_interpolation(
-    features: tf.Tensor, kernel_y: tf.Tensor, kernel_x: tf.Tensor
-) -> tf.Tensor:
+def _feature_bilinear_interpolation(features, kernel_y, kernel_x):
     """
     Feature bilinear interpolation.
 
@@ -49,42 +43,27 @@ def _feature_bilinear_interpolation(
       A 5-D tensor representing feature crop of shape
       [batch_size, num_boxes, output_size, output_size, num_filters].
     """
-    features_shape = tf.shape(features)
-    batch_size, num_boxes, output_size, num_filters = (
-        features_shape[0],
-        features_shape[1],
-        features_shape[2],
-        features_shape[4],
-    )
-
-    output_size = output_size // 2
-    kernel_y = tf.reshape(kernel_y, [batch_size, num_boxes, output_size * 2, 1])
-    kernel_x = tf.reshape(kernel_x, [batch_size, num_boxes, 1, output_size * 2])
-    # Use implicit broadcast to generate the interpolation kernel. The
-    # multiplier `4` is for avg pooling.
-    interpolation_kernel = kernel_y * kernel_x * 4
-
-    # Interpolate the gathered features with computed interpolation kernels.
-    features *= tf.cast(
-        tf.expand_dims(interpolation_kernel, axis=-1), dtype=features.dtype
-    )
-    features = tf.reshape(
+    features_shape = ops.shape(features)
+    batch_size, num_boxes = features_shape[0], features_shape[1]
+    output_size = kernel_y.shape[2]
+    num_filters = features.shape[-1]
+
+    # [batch_size, num_boxes, output_size, 2, output_size, 2, 1]
+    interpolation_kernel = ops.reshape(
+        kernel_y, [batch_size, num_boxes, output_size, 2, 1, 1, 1]
+    ) * ops.reshape(kernel_x, [batch_size, num_boxes, 1, 1, output_size, 2, 1])
+
+    # Interpolate the gathered features with computed interpolation kernels,
+    # and sum the 2x2 neighbors of each sampling point.
+    features = ops.reshape(
         features,
-        [batch_size * num_boxes, output_size * 2, output_size * 2, num_filters],
-    )
-    features = tf.nn.avg_pool(features, [1, 2, 2, 1], [1, 2, 2, 1], "VALID")
-    features = tf.reshape(
-        features, [batch_size, num_boxes, output_size, output_size, num_filters]
+        [batch_size, num_boxes, output_size, 2, output_size, 2, num_filters],
     )
-    return features
+    features = features * ops.cast(interpolation_kernel, features.dtype)
+    return ops.sum(features, axis=[3, 5])
 
 
-def _compute_grid_positions(
-    boxes: tf.Tensor,
-    boundaries: tf.Tensor,
-    output_size: int,
-    sample_offset: float,
-) -> Tuple[tf.Tensor, tf.Tensor, tf.Tensor, tf.Tensor]:
+def _compute_grid_positions(boxes, boundaries, output_size, sample_offset):
     """
     Computes the grid position w.r.t. the corresponding feature map.
 
@@ -108,42 +87,23 @@ def _compute_grid_positions(
       box_grid_y0y1: Tensor of size [batch_size, boxes, output_size, 2]
       box_grid_x0x1: Tensor of size [batch_size, boxes, output_size, 2]
     """
-    boxes_shape = tf.shape(boxes)
-    batch_size, num_boxes = boxes_shape[0], boxes_shape[1]
-    if batch_size is None:
-        batch_size = tf.shape(boxes)[0]
-    box_grid_x = []
-    box_grid_y = []
-    for i in range(output_size):
-        box_grid_x.append(
-            boxes[:, :, 1] + (i + sample_offset) * boxes[:, :, 3] / output_size
-        )
-        box_grid_y.append(
-            boxes[:, :, 0] + (i + sample_offset) * boxes[:, :, 2] / output_size
-        )
-    box_grid_x = tf.stack(box_grid_x, axis=2)
-    box_grid_y = tf.stack(box_grid_y, axis=2)
+    grid = ops.cast(ops.arange(output_size), boxes.dtype) + sample_offset
+    # [batch_size, num_boxes, output_size]
+    box_grid_x = boxes[:, :, 1:2] + grid * boxes[:, :, 3:4] / output_size
+    box_grid_y = boxes[:, :, 0:1] + grid * boxes[:, :, 2:3] / output_size
 
-    box_grid_y0 = tf.floor(box_grid_y)
-    box_grid_x0 = tf.floor(box_grid_x)
-    box_grid_x0 = tf.maximum(tf.cast(0.0, dtype=box_grid_x0.dtype), box_grid_x0)
-    box_grid_y0 = tf.maximum(tf.cast(0.0, dtype=box_grid_y0.dtype), box_grid_y0)
+    box_grid_y0 = ops.maximum(ops.floor(box_grid_y), 0.0)
+    box_grid_x0 = ops.maximum(ops.floor(box_grid_x), 0.0)
 
-    box_grid_x0 = tf.minimum(
-        box_grid_x0, tf.expand_dims(boundaries[:, :, 1], -1)
-    )
-    box_grid_x1 = tf.minimum(
-        box_grid_x0 + 1, tf.expand_dims(boundaries[:, :, 1], -1)
-    )
-    box_grid_y0 = tf.minimum(
-        box_grid_y0, tf.expand_dims(boundaries[:, :, 0], -1)
-    )
-    box_grid_y1 = tf.minimum(
-        box_grid_y0 + 1, tf.expand_dims(boundaries[:, :, 0], -1)
-    )
+    boundary_y = boundaries[:, :, 0:1]
+    boundary_x = boundaries[:, :, 1:2]
+    box_grid_x0 = ops.minimum(box_grid_x0, boundary_x)
+    box_grid_x1 = ops.minimum(box_grid_x0 + 1, boundary_x)
+    box_grid_y0 = ops.minimum(box_grid_y0, boundary_y)
+    box_grid_y1 = ops.minimum(box_grid_y0 + 1, boundary_y)
 
-    box_gridx0x1 = tf.stack([box_grid_x0, box_grid_x1], axis=-1)
-    box_gridy0y1 = tf.stack([box_grid_y0, box_grid_y1], axis=-1)
+    box_gridx0x1 = ops.stack([box_grid_x0, box_grid_x1], axis=-1)
+    box_gridy0y1 = ops.stack([box_grid_y0, box_grid_y1], axis=-1)
 
     # The RoIAlign feature f can be computed by bilinear interpolation of four
     # neighboring feature points f0, f1, f2, and f3.
@@ -155,21 +115,17 @@ def _compute_grid_positions(
     lx = box_grid_x - box_grid_x0
     hy = 1.0 - ly
     hx = 1.0 - lx
-    kernel_y = tf.reshape(
-        tf.stack([hy, ly], axis=3), [batch_size, num_boxes, output_size, 2, 1]
-    )
-    kernel_x = tf.reshape(
-        tf.stack([hx, lx], axis=3), [batch_size, num_boxes, output_size, 2, 1]
-    )
+    kernel_y = ops.expand_dims(ops.stack([hy, ly], axis=3), axis=-1)
+    kernel_x = ops.expand_dims(ops.stack([hx, lx], axis=3), axis=-1)
     return kernel_y, kernel_x, box_gridy0y1, box_gridx0x1
 
 
 def multilevel_crop_and_resize(
-    features: Dict[str, tf.Tensor],
-    boxes: tf.Tensor,
+    features,
+    boxes,
     output_size: int = 7,
     sample_offset: float = 0.5,
-) -> tf.Tensor:
+):
     """
     Crop and resize on multilevel feature pyramid.
 
@@ -177,6 +133,10 @@ def multilevel_crop_and_resize(
     by first locating the box into the correct feature level, and then cropping
     and resizing it using the corresponding feature map of that level.
 
+    The boxes of all levels are cropped with a single gather from the
+    flattened feature pyramid, using only `keras_cv.backend.ops`, so this
+    works with every Keras backend.
+
     Args:
       features: A dictionary with key as pyramid level and value as features.
         The pyramid level keys need to be represented by strings like so:
@@ -193,189 +153,147 @@ def multilevel_crop_and_resize(
       A 5-D tensor representing feature crop of shape
       [batch_size, num_boxes, output_size, output_size, num_filters].
     """
-
-    with tf.name_scope("multilevel_crop_and_resize"):
-        levels_str = list(features.keys())
-        # Levels are represented by strings with a prefix "P" to represent
-        # pyramid levels. The integer level can be obtained by looking at
-        # the value that follows the "P".
-        levels = [int(level_str[1:]) for level_str in levels_str]
-        min_level = min(levels)
-        max_level = max(levels)
-        features_shape = tf.shape(features[f"P{min_level}"])
-        batch_size, max_feature_height, max_feature_width, num_filters = (
-            features_shape[0],
-            features_shape[1],
-            features_shape[2],
-            features_shape[3],
+    levels_str = list(features.keys())
+    # Levels are represented by strings with a prefix "P" to represent
+    # pyramid levels. The integer level can be obtained by looking at
+    # the value that follows the "P".
+    levels = [int(level_str[1:]) for level_str in levels_str]
+    min_level = min(levels)
+    max_level = max(levels)
+    _, max_feature_height, max_feature_width, num_filters = features[
+        f"P{min_level}"
+    ].shape
+    batch_size = ops.shape(features[f"P{min_level}"])[0]
+    num_boxes = ops.shape(boxes)[1]
+
+    # Stack feature pyramid into a features_all of shape
+    # [batch_size * sum(height_l * width_l), num_filters].
+    features_all = []
+    feature_heights = []
+    feature_widths = []
+    for level in range(min_level, max_level + 1):
+        shape = features[f"P{level}"].shape
+        feature_heights.append(shape[1])
+        feature_widths.append(shape[2])
+        # Concat tensor of [batch_size, height_l * width_l, num_filters] for
+        # each level.
+        features_all.append(
+            ops.reshape(features[f"P{level}"], [batch_size, -1, num_filters])
         )
+    features_r2 = ops.reshape(
+        ops.concatenate(features_all, axis=1), [-1, num_filters]
+    )
 
-        num_boxes = tf.shape(boxes)[1]
-
-        # Stack feature pyramid into a features_all of shape
-        # [batch_size, levels, height, width, num_filters].
-        features_all = []
-        feature_heights = []
-        feature_widths = []
-        for level in range(min_level, max_level + 1):
-            shape = features[f"P{level}"].get_shape().as_list()
-            feature_heights.append(shape[1])
-            feature_widths.append(shape[2])
-            # Concat tensor of [batch_size, height_l * width_l, num_filters] for
-            # each level.
-            features_all.append(
-                tf.reshape(features[f"P{level}"], [batch_size, -1, num_filters])
-            )
-        features_r2 = tf.reshape(tf.concat(features_all, 1), [-1, num_filters])
-
-        # Calculate height_l * width_l for each level.
-        level_dim_sizes = [
-            feature_widths[i] * feature_heights[i]
-            for i in range(len(feature_widths))
-        ]
-        # level_dim_offsets is accumulated sum of level_dim_size.
-        level_dim_offsets = [0]
-        for i in range(len(feature_widths) - 1):
-            level_dim_offsets.append(level_dim_offsets[i] + level_dim_sizes[i])
-        batch_dim_size = level_dim_offsets[-1] + level_dim_sizes[-1]
-        level_dim_offsets = tf.constant(level_dim_offsets, tf.int32)
-        height_dim_sizes = tf.constant(feature_widths, tf.int32)
-
-        # Assigns boxes to the right level.
-        box_width = boxes[:, :, 3] - boxes[:, :, 1]
-        box_height = boxes[:, :, 2] - boxes[:, :, 0]
-        areas_sqrt = tf.sqrt(
-            tf.cast(box_height, tf.float32) * tf.cast(box_width, tf.float32)
-        )
+    # Calculate height_l * width_l for each level.
+    level_dim_sizes = [
+        feature_widths[i] * feature_heights[i]
+        for i in range(len(feature_widths))
+    ]
+    # level_dim_offsets is accumulated sum of level_dim_size.
+    level_dim_offsets = [0]
+    for i in range(len(feature_widths) - 1):
+        level_dim_offsets.append(level_dim_offsets[i] + level_dim_sizes[i])
+    batch_dim_size = level_dim_offsets[-1] + level_dim_sizes[-1]
+    level_dim_offsets = ops.convert_to_tensor(level_dim_offsets, "int32")
+    height_dim_sizes = ops.convert_to_tensor(feature_widths, "int32")
+
+    # Assigns boxes to the right level.
+    box_width = boxes[:, :, 3] - boxes[:, :, 1]
+    box_height = boxes[:, :, 2] - boxes[:, :, 0]
+    areas_sqrt = ops.sqrt(
+        ops.cast(box_height, "float32") * ops.cast(box_width, "float32")
+    )
 
-        # following the FPN paper to divide by 224.
-        levels = tf.cast(
-            tf.math.floordiv(
-                tf.math.log(tf.math.divide_no_nan(areas_sqrt, 224.0)),
-                tf.math.log(2.0),
-            )
-            + 4.0,
-            dtype=tf.int32,
-        )
-        # Maps levels between [min_level, max_level].
-        levels = tf.minimum(max_level, tf.maximum(levels, min_level))
+    # following the FPN paper to divide by 224. Levels are clipped before
+    # casting, as empty boxes are assigned to the -inf level.
+    levels = ops.floor(ops.log(areas_sqrt / 224.0) / math.log(2.0)) + 4.0
+    # Maps levels between [min_level, max_level].
+    levels = ops.cast(ops.clip(levels, min_level, max_level), "int32")
 
-        # Projects box location and sizes to corresponding feature levels.
-        scale_to_level = tf.cast(
-            tf.pow(tf.constant(2.0), tf.cast(levels, tf.float32)),
-            dtype=boxes.dtype,
-        )
-        boxes /= tf.expand_dims(scale_to_level, axis=2)
-        box_width /= scale_to_level
-        box_height /= scale_to_level
-        boxes = tf.concat(
+    # Projects box location and sizes to corresponding feature levels.
+    scale_to_level = ops.cast(
+        ops.power(2.0, ops.cast(levels, "float32")), boxes.dtype
+    )
+    boxes = boxes / ops.expand_dims(scale_to_level, axis=2)
+    box_width = box_width / scale_to_level
+    box_height = box_height / scale_to_level
+    boxes = ops.concatenate(
+        [
+            boxes[:, :, 0:2],
+            ops.expand_dims(box_height, -1),
+            ops.expand_dims(box_width, -1),
+        ],
+        axis=-1,
+    )
+
+    # Maps levels to [0, max_level-min_level].
+    levels = levels - min_level
+    level_strides = ops.power(2.0, ops.cast(levels, "float32"))
+    boundary = ops.cast(
+        ops.stack(
             [
-                boxes[:, :, 0:2],
-                tf.expand_dims(box_height, -1),
-                tf.expand_dims(box_width, -1),
+                max_feature_height / level_strides - 1,
+                max_feature_width / level_strides - 1,
             ],
             axis=-1,
-        )
-
-        # Maps levels to [0, max_level-min_level].
-        levels -= min_level
-        level_strides = tf.pow([[2.0]], tf.cast(levels, tf.float32))
-        boundary = tf.cast(
-            tf.concat(
-                [
-                    tf.expand_dims(
-                        [[tf.cast(max_feature_height, tf.float32)]]
-                        / level_strides
-                        - 1,
-                        axis=-1,
-                    ),
-                    tf.expand_dims(
-                        [[tf.cast(max_feature_width, tf.float32)]]
-                        / level_strides
-                        - 1,
-                        axis=-1,
-                    ),
-                ],
-                axis=-1,
-            ),
-            boxes.dtype,
-        )
+        ),
+        boxes.dtype,
+    )
 
-        # Compute grid positions.
-        (
-            kernel_y,
-            kernel_x,
-            box_gridy0y1,
-            box_gridx0x1,
-        ) = _compute_grid_positions(boxes, boundary, output_size, sample_offset)
-
-        x_indices = tf.cast(
-            tf.reshape(box_gridx0x1, [batch_size, num_boxes, output_size * 2]),
-            dtype=tf.int32,
-        )
-        y_indices = tf.cast(
-            tf.reshape(box_gridy0y1, [batch_size, num_boxes, output_size * 2]),
-            dtype=tf.int32,
-        )
+    # Compute grid positions.
+    (
+        kernel_y,
+        kernel_x,
+        box_gridy0y1,
+        box_gridx0x1,
+    ) = _compute_grid_positions(boxes, boundary, output_size, sample_offset)
+
+    x_indices = ops.cast(
+        ops.reshape(box_gridx0x1, [batch_size, num_boxes, output_size * 2]),
+        "int32",
+    )
+    y_indices = ops.cast(
+        ops.reshape(box_gridy0y1, [batch_size, num_boxes, output_size * 2]),
+        "int32",
+    )
 
-        batch_size_offset = tf.tile(
-            tf.reshape(
-                tf.range(batch_size) * batch_dim_size, [batch_size, 1, 1, 1]
-            ),
-            [1, num_boxes, output_size * 2, output_size * 2],
-        )
-        # Get level offset for each box. Each box belongs to one level.
-        levels_offset = tf.tile(
-            tf.reshape(
-                tf.gather(level_dim_offsets, levels),
-                [batch_size, num_boxes, 1, 1],
-            ),
-            [1, 1, output_size * 2, output_size * 2],
-        )
-        y_indices_offset = tf.tile(
-            tf.reshape(
-                y_indices
-                * tf.expand_dims(tf.gather(height_dim_sizes, levels), -1),
-                [batch_size, num_boxes, output_size * 2, 1],
-            ),
-            [1, 1, 1, output_size * 2],
-        )
-        x_indices_offset = tf.tile(
-            tf.reshape(x_indices, [batch_size, num_boxes, 1, output_size * 2]),
-            [1, 1, output_size * 2, 1],
-        )
-        indices = tf.reshape(
-            batch_size_offset
-            + levels_offset
-            + y_indices_offset
-            + x_indices_offset,
-            [-1],
-        )
+    batch_size_offset = ops.reshape(
+        ops.arange(batch_size) * batch_dim_size, [-1, 1, 1, 1]
+    )
+    # Get level offset for each box. Each box belongs to one level.
+    levels_offset = ops.take(level_dim_offsets, levels)[:, :, None, None]
+    y_indices_offset = ops.expand_dims(
+        y_indices * ops.expand_dims(ops.take(height_dim_sizes, levels), -1),
+        axis=3,
+    )
+    x_indices_offset = ops.expand_dims(x_indices, axis=2)
+    # [batch_size, num_boxes, output_size * 2, output_size * 2]
+    indices = (
+        ops.cast(batch_size_offset, "int32")
+        + levels_offset
+        + y_indices_offset
+        + x_indices_offset
+    )
 
-        # TODO(tanzhenyu): replace tf.gather with tf.gather_nd and try to get
-        #  similar performance.
-        features_per_box = tf.reshape(
-            tf.gather(features_r2, indices),
-            [
-                batch_size,
-                num_boxes,
-                output_size * 2,
-                output_size * 2,
-                num_filters,
-            ],
-        )
+    features_per_box = ops.reshape(
+        ops.take(features_r2, ops.reshape(indices, [-1]), axis=0),
+        [
+            batch_size,
+            num_boxes,
+            output_size * 2,
+            output_size * 2,
+            num_filters,
+        ],
+    )
 
-        # Bilinear interpolation.
-        features_per_box = _feature_bilinear_interpolation(
-            features_per_box, kernel_y, kernel_x
-        )
-        return features_per_box
+    # Bilinear interpolation.
+    return _feature_bilinear_interpolation(features_per_box, kernel_y, kernel_x)
 
 
 # TODO(tanzhenyu): Remove this implementation once roi_pool has better
 #  performance as this is mostly a duplicate of
 #  https://github.com/tensorflow/models/blob/master/official/legacy/detection/ops/spatial_transform_ops.py#L324
-@keras.utils.register_keras_serializable(package="keras_cv")
+@keras.saving.register_keras_serializable(package="keras_cv")
 class _ROIAligner(keras.layers.Layer):
     """Performs ROIAlign for the second stage processing."""
 
@@ -395,7 +313,6 @@ class _ROIAligner(keras.layers.Layer):
           sample_offset: A `float` in [0, 1] of the subpixel sample offset.
           **kwargs: Additional keyword arguments passed to Layer.
         """
-        assert_tf_keras("keras_cv.layers._ROIAligner")
         self._config_dict = {
             "bounding_box_format": bounding_box_format,
             "crop_size": target_size,
@@ -405,8 +322,8 @@ class _ROIAligner(keras.layers.Layer):
 
     def call(
         self,
-        features: Mapping[str, tf.Tensor],
-        boxes: tf.Tensor,
+        features,
+        boxes,
         training: Optional[bool] = None,
     ):
         """
@@ -415,12 +332,12 @@ class _ROIAligner(keras.layers.Layer):
           features: A dictionary with key as pyramid level and value as
             features. The features are in shape of
             [batch_size, height_l, width_l, num_filters].
-          boxes: A 3-D `tf.Tensor` of shape [batch_size, num_boxes, 4]. Each row
+          boxes: A 3-D Tensor of shape [batch_size, num_boxes, 4]. Each row
             represents a box with [y1, x1, y2, x2] in un-normalized coordinates.
             from grid point.
           training: A `bool` of whether it is in training mode.
         Returns:
-          A 5-D `tf.Tensor` representing feature crop of shape
+          A 5-D Tensor representing feature crop of shape
           [batch_size, num_boxes, crop_size, crop_size, num_filters].
         """
         boxes = bounding_box.convert_format(
@@ -0,0 +1,83 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import tensorflow as tf
+
+from keras_cv.backend import ops
+from keras_cv.layers.object_detection.roi_align import _ROIAligner
+from keras_cv.layers.object_detection.roi_align import (
+    multilevel_crop_and_resize,
+)
+
+
+class ROIAlignTest(tf.test.TestCase):
+    def setUp(self):
+        self.features = {
+            "P2": np.reshape(np.arange(2 * 16 * 16), [2, 16, 16, 1]) / 100,
+            "P3": np.reshape(np.arange(2 * 8 * 8), [2, 8, 8, 1]) / 10,
+        }
+        self.features = {
+            k: v.astype("float32") for k, v in self.features.items()
+        }
+        self.boxes = np.array(
+            [
+                [[0, 0, 16, 16], [10, 20, 40, 60], [0, 0, 0, 0]],
+                [[4, 4, 30, 12], [50, 50, 64, 64], [1, 2, 200, 300]],
+            ],
+            dtype="float32",
+        )
+        # Computed with the previous per-level TensorFlow implementation.
+        # The last box is assigned to the highest level, and the empty box to
+        # the lowest one.
+        self.expected = np.reshape(
+            [
+                [0.17, 0.19, 0.49, 0.51],
+                [0.775, 0.825, 1.375, 1.425],
+                [0.0, 0.0, 0.0, 0.0],
+                [2.995, 3.005, 3.515, 3.525],
+                [4.83375, 4.85, 5.09375, 5.11],
+                [12.174998, 12.175003, 12.699982, 12.700195],
+            ],
+            [2, 3, 2, 2, 1],
+        )
+
+    def test_multilevel_crop_and_resize(self):
+        output = multilevel_crop_and_resize(
+            self.features, self.boxes, output_size=2
+        )
+        self.assertAllClose(ops.convert_to_numpy(output), self.expected)
+
+    def test_roi_aligner(self):
+        aligner = _ROIAligner("yxyx", target_size=2)
+        output = aligner(self.features, self.boxes)
+        self.assertAllClose(ops.convert_to_numpy(output), self.expected)
+
+    def test_output_shape(self):
+        features = {
+            f"P{level}": np.random.uniform(
+                size=(3, 64 // 2**level, 64 // 2**level, 4)
+            ).astype("float32")
+            for level in range(2, 6)
+        }
+        boxes = np.random.uniform(0, 64, size=(3, 10, 4)).astype("float32")
+        boxes = np.concatenate(
+            [
+                np.minimum(boxes[..., :2], boxes[..., 2:]),
+                np.maximum(boxes[..., :2], boxes[..., 2:]),
+            ],
+            axis=-1,
+        )
+        output = _ROIAligner("yxyx", target_size=7)(features, boxes)
+        self.assertEqual(output.shape, (3, 10, 7, 7, 4))
@@ -91,7 +91,8 @@ class ROIPooler(keras.layers.Layer):
           rois: [batch_size, N, 4] float Tensor, the region of interests to be
             pooled.
         Returns:
-          pooled_feature_map: [batch_size, N, target_size, C] float Tensor
+          pooled_feature_map: [batch_size, N, target_height, target_width, C]
+            float Tensor
         """
         # convert to relative format given feature map shape != image shape
         rois = bounding_box.convert_format(
@@ -100,62 +101,180 @@ class ROIPooler(keras.layers.Layer):
             target="rel_yxyx",
             image_shape=self.image_shape,
         )
-        pooled_feature_map = tf.vectorized_map(
-            self._pool_single_sample, (feature_map, rois)
+        height, width = feature_map.get_shape().as_list()[1:3]
+        # [batch_size, N, target_height], [batch_size, N, target_width]
+        height_start, height_end = self._get_bins(
+            rois[..., 0], rois[..., 2], height, self.target_height
         )
+        width_start, width_end = self._get_bins(
+            rois[..., 1], rois[..., 3], width, self.target_width
+        )
+
+        # The maximum of a bin is the maximum of the four, possibly
+        # overlapping, power of two sized blocks anchored at its corners,
+        # which are looked up in a sparse table of block maximums.
+        height_level, height_block_size = self._get_levels(
+            height_end - height_start, height
+        )
+        width_level, width_block_size = self._get_levels(
+            width_end - width_start, width
+        )
+        bins = (
+            height_start,
+            height_end - height_block_size,
+            height_level,
+            width_start,
+            width_end - width_block_size,
+            width_level,
+        )
+
+        # The bins of ROIs within the image span at most
+        # ceil(size / target_size) elements, so the sparse table only needs
+        # the blocks fitting in that size. The bins of ROIs larger than the
+        # image may need the blocks of every size.
+        num_height_levels = self._get_num_levels(height, self.target_height)
+        num_width_levels = self._get_num_levels(width, self.target_width)
+        max_height_levels = height.bit_length()
+        max_width_levels = width.bit_length()
+        if (num_height_levels, num_width_levels) == (
+            max_height_levels,
+            max_width_levels,
+        ):
+            return self._pool(
+                feature_map, bins, num_height_levels, num_width_levels
+            )
+        return tf.cond(
+            tf.logical_and(
+                tf.reduce_all(height_level < num_height_levels),
+                tf.reduce_all(width_level < num_width_levels),
+            ),
+            lambda: self._pool(
+                feature_map, bins, num_height_levels, num_width_levels
+            ),
+            lambda: self._pool(
+                feature_map, bins, max_height_levels, max_width_levels
+            ),
+        )
+
+    def _pool(self, feature_map, bins, num_height_levels, num_width_levels):
+        """Returns the maximum of each bin, from a sparse table with the given
+        number of levels, which must include the levels of all the bins."""
+        (
+            height_start,
+            height_block_start,
+            height_level,
+            width_start,
+            width_block_start,
+            width_level,
+        ) = bins
+        sparse_table = self._build_sparse_table(
+            feature_map, num_height_levels, num_width_levels
+        )
+        levels = (
+            height_level[..., :, tf.newaxis] * num_width_levels
+            + width_level[..., tf.newaxis, :]
+        )
+        batch_indices = tf.broadcast_to(
+            tf.range(tf.shape(levels)[0])[
+                :, tf.newaxis, tf.newaxis, tf.newaxis
+            ],
+            tf.shape(levels),
+        )
+        pooled_feature_map = None
+        for y in [height_start, height_block_start]:
+            for x in [width_start, width_block_start]:
+                indices = tf.stack(
+                    [
+                        levels,
+                        batch_indices,
+                        tf.broadcast_to(
+                            y[..., :, tf.newaxis], tf.shape(levels)
+                        ),
+                        tf.broadcast_to(
+                            x[..., tf.newaxis, :], tf.shape(levels)
+                        ),
+                    ],
+                    axis=-1,
+                )
+                block_max = tf.gather_nd(sparse_table, indices)
+                pooled_feature_map = (
+                    block_max
+                    if pooled_feature_map is None
+                    else tf.maximum(pooled_feature_map, block_max)
+                )
         return pooled_feature_map
 
-    def _pool_single_sample(self, args):
-        """
-        Args: tuple of
-          feature_map: [H, W, C] float Tensor
-          rois: [N, 4] float Tensor
+    @staticmethod
+    def _get_bins(roi_start, roi_end, size, target_size):
+        """Returns the quantized start (inclusive) and end (exclusive) of
+        each of the `target_size` bins of each ROI, clamped to the feature
+        map. Bins span at least one element."""
+        start = size * roi_start
+        step = size * (roi_end - roi_start) / target_size
+        # [..., target_size]
+        bin_start = (
+            start[..., tf.newaxis]
+            + tf.range(target_size, dtype=start.dtype) * step[..., tf.newaxis]
+        )
+        bin_end = bin_start + step[..., tf.newaxis]
+        bin_start = tf.cast(bin_start, tf.int32)
+        bin_end = tf.cast(bin_end, tf.int32)
+        # if feature_map shape smaller than roi, step would be 0
+        # in this case the result will be feature_map[0, 0, ...]
+        bin_end = bin_start + tf.maximum(1, bin_end - bin_start)
+        bin_start = tf.clip_by_value(bin_start, 0, size - 1)
+        bin_end = tf.clip_by_value(bin_end, bin_start + 1, size)
+        return bin_start, bin_end
+
+    @staticmethod
+    def _get_num_levels(size, target_size):
+        """Returns the number of power of two block sizes up to
+        ceil(size / target_size)."""
+        return (-(-size // target_size)).bit_length()
+
+    def _get_levels(self, bin_size, size):
+        """Returns the level of the largest power of two block fitting in
+        each bin, and the size of that block."""
+        # floor(log2(n)) for n in [1, size]
+        levels = tf.constant(
+            [0] + [n.bit_length() - 1 for n in range(1, size + 1)], tf.int32
+        )
+        level = tf.gather(levels, bin_size)
+        return level, tf.bitwise.left_shift(1, level)
+
+    def _build_sparse_table(
+        self, feature_map, num_height_levels, num_width_levels
+    ):
+        """Returns the maximums of the blocks of the first power of two
+        heights and widths, anchored at each position of the feature map.
+
         Returns:
-          pooled_feature_map: [target_size, C] float Tensor
+          [num_height_levels * num_width_levels, batch_size, H, W, C] Tensor,
+          with entries of blocks that would exceed the feature map unused.
         """
-        feature_map, rois = args
-        num_rois = rois.get_shape().as_list()[0]
-        height, width, channel = feature_map.get_shape().as_list()
-        # TODO (consider vectorize it for better performance)
-        for n in range(num_rois):
-            # [4]
-            roi = rois[n, :]
-            y_start = height * roi[0]
-            x_start = width * roi[1]
-            region_height = height * (roi[2] - roi[0])
-            region_width = width * (roi[3] - roi[1])
-            h_step = region_height / self.target_height
-            w_step = region_width / self.target_width
-            regions = []
-            for i in range(self.target_height):
-                for j in range(self.target_width):
-                    height_start = y_start + i * h_step
-                    height_end = height_start + h_step
-                    height_start = tf.cast(height_start, tf.int32)
-                    height_end = tf.cast(height_end, tf.int32)
-                    # if feature_map shape smaller than roi, h_step would be 0
-                    # in this case the result will be feature_map[0, 0, ...]
-                    height_end = height_start + tf.maximum(
-                        1, height_end - height_start
+        tables = []
+        row_table = feature_map
+        for height_level in range(num_height_levels):
+            if height_level > 0:
+                shift = 2 ** (height_level - 1)
+                row_table = tf.maximum(
+                    row_table,
+                    tf.concat(
+                        [row_table[:, shift:], row_table[:, :shift]], axis=1
+                    ),
+                )
+            table = row_table
+            for width_level in range(num_width_levels):
+                if width_level > 0:
+                    shift = 2 ** (width_level - 1)
+                    table = tf.maximum(
+                        table,
+                        tf.concat(
+                            [table[:, :, shift:], table[:, :, :shift]], axis=2
+                        ),
                     )
-                    width_start = x_start + j * w_step
-                    width_end = width_start + w_step
-                    width_start = tf.cast(width_start, tf.int32)
-                    width_end = tf.cast(width_end, tf.int32)
-                    width_end = width_start + tf.maximum(
-                        1, width_end - width_start
-                    )
-                    # [h_step, w_step, C]
-                    region = feature_map[
-                        height_start:height_end, width_start:width_end, :
-                    ]
-                    # target_height * target_width * [C]
-                    regions.append(tf.reduce_max(region, axis=[0, 1]))
-            regions = tf.reshape(
-                tf.stack(regions),
-                [self.target_height, self.target_width, channel],
-            )
-            return regions
+                tables.append(table)
+        return tf.stack(tables, axis=0)
 
     def get_config(self):
         config = {
@@ -42,7 +42,7 @@ class ROIPoolTest(tf.test.TestCase):
         # | 56, 57, 58, 59(max) | 60, 61, 62, 63(max)   |
         # --------------------------------------------
         expected_feature_map = tf.reshape(
-            tf.constant([27, 31, 59, 63]), [1, 2, 2, 1]
+            tf.constant([27, 31, 59, 63]), [1, 1, 2, 2, 1]
         )
         self.assertAllClose(expected_feature_map, pooled_feature_map)
 
@@ -68,7 +68,7 @@ class ROIPoolTest(tf.test.TestCase):
         # | 56, 57, 58(max)     | 59, 60, 61, 62(max)   | 63 (removed)
         # --------------------------------------------
         expected_feature_map = tf.reshape(
-            tf.constant([26, 30, 58, 62]), [1, 2, 2, 1]
+            tf.constant([26, 30, 58, 62]), [1, 1, 2, 2, 1]
         )
         self.assertAllClose(expected_feature_map, pooled_feature_map)
 
@@ -93,7 +93,7 @@ class ROIPoolTest(tf.test.TestCase):
         # | 48, 49, 50, 51(max) | 52, 53, 54, 55(max)   |
         # --------------------------------------------
         expected_feature_map = tf.reshape(
-            tf.constant([19, 23, 51, 55]), [1, 2, 2, 1]
+            tf.constant([19, 23, 51, 55]), [1, 1, 2, 2, 1]
         )
         self.assertAllClose(expected_feature_map, pooled_feature_map)
 
@@ -120,7 +120,7 @@ class ROIPoolTest(tf.test.TestCase):
         # | 56, 57, 58, 59(max) | 60, 61, 62, 63(max)   |
         # --------------------------------------------
         expected_feature_map = tf.reshape(
-            tf.constant([11, 15, 35, 39, 59, 63]), [1, 3, 2, 1]
+            tf.constant([11, 15, 35, 39, 59, 63]), [1, 1, 3, 2, 1]
         )
         self.assertAllClose(expected_feature_map, pooled_feature_map)
 
@@ -146,7 +146,7 @@ class ROIPoolTest(tf.test.TestCase):
         # | 56, 57(max) | 58, 59, 60(max)   | 61, 62, 63(max)   |
         # --------------------------------------------
         expected_feature_map = tf.reshape(
-            tf.constant([25, 28, 31, 57, 60, 63]), [1, 2, 3, 1]
+            tf.constant([25, 28, 31, 57, 60, 63]), [1, 1, 2, 3, 1]
         )
         self.assertAllClose(expected_feature_map, pooled_feature_map)
 
@@ -167,7 +167,8 @@ class ROIPoolTest(tf.test.TestCase):
         # ------------------repeated----------------------
         # | 12, 13(max) | 14, 15(max)   |
         expected_feature_map = tf.reshape(
-            tf.constant([1, 3, 1, 3, 5, 7, 9, 11, 9, 11, 13, 15]), [1, 6, 2, 1]
+            tf.constant([1, 3, 1, 3, 5, 7, 9, 11, 9, 11, 13, 15]),
+            [1, 1, 6, 2, 1],
         )
         self.assertAllClose(expected_feature_map, pooled_feature_map)
 
@@ -188,7 +189,7 @@ class ROIPoolTest(tf.test.TestCase):
         # --------------------------------------------
         expected_feature_map = tf.reshape(
             tf.constant([4, 4, 5, 6, 6, 7, 12, 12, 13, 14, 14, 15]),
-            [1, 2, 6, 1],
+            [1, 1, 2, 6, 1],
         )
         self.assertAllClose(expected_feature_map, pooled_feature_map)
 
@@ -202,7 +203,50 @@ class ROIPoolTest(tf.test.TestCase):
         rois = tf.reshape(tf.constant([0.0, 0.0, 0.0, 0.0]), [1, 1, 4])
         pooled_feature_map = roi_pooler(feature_map, rois)
         # all outputs should be top-left pixel
-        self.assertAllClose(tf.ones([1, 2, 2, 1]), pooled_feature_map)
+        self.assertAllClose(tf.ones([1, 1, 2, 2, 1]), pooled_feature_map)
+
+    def test_multiple_rois_and_images(self):
+        roi_pooler = ROIPooler(
+            "rel_yxyx", target_size=[2, 2], image_shape=[224, 224, 3]
+        )
+        feature_map = tf.reshape(tf.range(128), [2, 8, 8, 1])
+        rois = tf.constant(
+            [
+                [[0.0, 0.0, 1.0, 1.0], [0.0, 0.0, 0.5, 0.5]],
+                [[0.5, 0.5, 1.0, 1.0], [0.0, 0.0, 0.0, 0.0]],
+            ]
+        )
+        pooled_feature_map = roi_pooler(feature_map, rois)
+        expected_feature_map = tf.reshape(
+            tf.constant(
+                [27, 31, 59, 63, 9, 11, 25, 27]
+                + [109, 111, 125, 127, 64, 64, 64, 64]
+            ),
+            [2, 2, 2, 2, 1],
+        )
+        self.assertAllClose(expected_feature_map, pooled_feature_map)
+
+    def test_roi_larger_than_image(self):
+        roi_pooler = ROIPooler(
+            "rel_yxyx", target_size=[4, 4], image_shape=[224, 224, 3]
+        )
+        feature_map = tf.expand_dims(
+            tf.reshape(tf.range(64), [8, 8, 1]), axis=0
+        )
+        rois = tf.reshape(tf.constant([-1.0, -1.0, 2.0, 2.0]), [1, 1, 4])
+        # The bins are clamped to rows and columns [0, 1), [0, 4), [4, 8) and
+        # [7, 8), and the 4 elements of the second bin exceed the blocks
+        # needed by the ROIs within the image, of at most 8 / 4 elements.
+        expected_feature_map = tf.reshape(
+            tf.constant(
+                [0, 3, 7, 7, 24, 27, 31, 31, 56, 59, 63, 63, 56, 59, 63, 63]
+            ),
+            [1, 1, 4, 4, 1],
+        )
+        self.assertAllClose(expected_feature_map, roi_pooler(feature_map, rois))
+        self.assertAllClose(
+            expected_feature_map, tf.function(roi_pooler)(feature_map, rois)
+        )
 
     def test_invalid_image_shape(self):
         with self.assertRaisesRegex(ValueError, "dynamic shape"):
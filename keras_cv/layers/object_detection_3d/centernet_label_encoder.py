@@ -53,11 +53,34 @@ def _meshgrid(
     return mesh * voxel_size
 
 
+def _compute_point_offsets(
+    voxel_size: Sequence[float], max_radius: Sequence[float]
+) -> tf.Tensor:
+    """Computes the mesh grid of voxel offsets around a box center.
+
+    Args:
+      voxel_size: the size on each voxel dimension (xyz)
+      max_radius: the maximum radius on each voxel dimension (xyz)
+
+    Returns:
+      offsets tensor of shape [max_num_voxels_per_box, 3].
+    """
+    # convert radius from point unit to voxel unit.
+    max_radius_in_voxels = [
+        math.ceil(mr / vs) for mr, vs in zip(max_radius, voxel_size)
+    ]
+    # get the mesh grid based on max radius w.r.t each box
+    # [max_num_voxels_per_box, 3]
+    points_numpy = _meshgrid(max_radius_in_voxels, voxel_size=voxel_size)
+    return tf.constant(points_numpy, dtype=tf.float32)
+
+
 def compute_heatmap(
     box_3d: tf.Tensor,
     box_mask: tf.Tensor,
     voxel_size: Sequence[float],
     max_radius: Sequence[float],
+    point_offsets: tf.Tensor = None,
 ) -> Tuple[tf.Tensor, tf.Tensor, tf.Tensor, tf.Tensor]:
     """Compute heatmap for boxes.
 
@@ -66,6 +89,9 @@ def compute_heatmap(
       box_mask: box masking, [B, boxes]
       voxel_size: the size on each voxel dimension (xyz)
       max_radius: the maximum radius on each voxel dimension (xyz)
+      point_offsets: optional precomputed mesh grid of voxel offsets around
+        each box center, [max_voxels_per_box, 3]. Computed from `voxel_size`
+        and `max_radius` if not set.
 
     Returns:
       point_xyz: the point location w.r.t. vehicle frame, [B, boxes,
@@ -76,13 +102,8 @@ def compute_heatmap(
       box_id: the box id each point belongs to, [B, boxes, max_voxels_per_box]
 
     """
-    # convert radius from point unit to voxel unit.
-    max_radius_in_voxels = [
-        math.ceil(mr / vs) for mr, vs in zip(max_radius, voxel_size)
-    ]
-    # get the mesh grid based on max radius w.r.t each box
-    # [max_num_voxels_per_box, 3]
-    points_numpy = _meshgrid(max_radius_in_voxels, voxel_size=voxel_size)
+    if point_offsets is None:
+        point_offsets = _compute_point_offsets(voxel_size, max_radius)
 
     box_center = box_3d[:, :, :3]
     # voxelize and de-voxelize point_xyz
@@ -91,9 +112,7 @@ def compute_heatmap(
     # [B, N, max_num_voxels_per_box, 3]
     point_xyz = (
         box_center[:, :, tf.newaxis, :]
-        + tf.constant(points_numpy, dtype=tf.float32)[
-            tf.newaxis, tf.newaxis, :, :
-        ]
+        + tf.cast(point_offsets, dtype=tf.float32)[tf.newaxis, tf.newaxis, :, :]
     )
     # [B, N, max_num_voxels_per_box, 3]
     point_xyz = voxel_utils.point_to_voxel_coord(
@@ -201,7 +220,8 @@ def scatter_to_dense_heatmap(
       dense_heatmap: [B, H, W] heatmap value.
       dense_box_id: [B, H, W] box id associated with each feature map pixel.
         Only pixels with positive heatmap value have valid box id set. Other
-        locations have random values.
+        locations have random values. When several points fall into the same
+        pixel, the one with the largest heatmap value is kept.
 
     """
     # [B, N, 3]
@@ -228,42 +248,56 @@ def scatter_to_dense_heatmap(
     point_voxel_valid_mask = tf.math.logical_and(
         point_voxel_valid_mask, point_mask
     )
+    b, n = voxel_utils.combined_static_and_dynamic_shape(point_mask)
+    num_voxels = int(np.prod(voxel_spatial_size))
+    # [3]
+    strides = [int(np.prod(voxel_spatial_size[i + 1 :])) for i in range(3)]
     # [B, N]
-    point_voxel_xyz = point_voxel_xyz * tf.cast(
-        point_voxel_valid_mask[..., tf.newaxis], dtype=point_voxel_xyz.dtype
+    # flatten voxel coordinates into the [B * H * W * Z] dense grid by
+    # offsetting each sample by its batch index.
+    point_voxel_index = (
+        tf.reduce_sum(point_voxel_xyz * strides, axis=-1)
+        + (tf.range(b, dtype=point_voxel_xyz.dtype) * num_voxels)[:, tf.newaxis]
+    )
+    # out of range voxels are scattered to an extra trailing slot, which is
+    # dropped afterwards.
+    point_voxel_index = tf.where(
+        point_voxel_valid_mask, point_voxel_index, b * num_voxels
     )
-    # [B, N]
-    # filtered heatmap with out of range voxels.
-    heatmap = heatmap * tf.cast(point_voxel_valid_mask, dtype=heatmap.dtype)
-
-    # TODO(tanzheny): consider a batched implementation.
-    def fn(args):
-        """Calls scatter update."""
-        point_voxel_xyz_i, mask_i, heatmap_i, point_box_id_i = args
-        mask_index = tf.where(mask_i)
-
-        point_voxel_xyz_i = tf.gather_nd(point_voxel_xyz_i, mask_index)
-        heatmap_i = tf.gather_nd(heatmap_i, mask_index)
-        point_box_id_i = tf.gather_nd(point_box_id_i, mask_index)
-
-        # scatter from local heatmap to global heatmap based on point_xyz voxel
-        # units
-        dense_heatmap_i = tf.tensor_scatter_nd_update(
-            tf.zeros(voxel_spatial_size, dtype=heatmap_i.dtype),
-            point_voxel_xyz_i,
-            heatmap_i,
-        )
-        dense_box_id_i = tf.tensor_scatter_nd_update(
-            tf.zeros(voxel_spatial_size, dtype=tf.int32),
-            point_voxel_xyz_i,
-            point_box_id_i,
-        )
-        return dense_heatmap_i, dense_box_id_i
 
-    dense_heatmap, dense_box_id = tf.map_fn(
-        fn,
-        elems=[point_voxel_xyz, point_voxel_valid_mask, heatmap, point_box_id],
-        fn_output_signature=(heatmap.dtype, point_box_id.dtype),
+    # The heatmap is non-negative, so its float32 bit pattern preserves its
+    # order as an integer. Pack it into the high bits and the box id into the
+    # low bits of an int64 key, such that a single max scatter picks the
+    # largest heatmap value of every voxel together with its box id.
+    heatmap_bits = tf.bitcast(tf.cast(heatmap, tf.float32), tf.int32)
+    key = tf.bitwise.bitwise_or(
+        tf.bitwise.left_shift(tf.cast(heatmap_bits, tf.int64), 32),
+        tf.cast(point_box_id, tf.int64),
+    )
+    # [B * H * W * Z + 1]
+    dense_key = tf.tensor_scatter_nd_max(
+        tf.zeros([b * num_voxels + 1], dtype=tf.int64),
+        tf.reshape(point_voxel_index, [b * n, 1]),
+        tf.reshape(key, [b * n]),
+    )[:-1]
+    dense_shape = [b] + list(voxel_spatial_size)
+    # [B, H, W, Z]
+    dense_heatmap = tf.reshape(
+        tf.cast(
+            tf.bitcast(
+                tf.cast(tf.bitwise.right_shift(dense_key, 32), tf.int32),
+                tf.float32,
+            ),
+            heatmap.dtype,
+        ),
+        dense_shape,
+    )
+    # [B, H, W, Z]
+    dense_box_id = tf.reshape(
+        tf.cast(
+            tf.bitwise.bitwise_and(dense_key, 0xFFFFFFFF), point_box_id.dtype
+        ),
+        dense_shape,
     )
 
     return dense_heatmap, dense_box_id
@@ -354,6 +388,24 @@ class CenterNetLabelEncoder(keras.layers.Layer):
         self._num_classes = num_classes
         self._top_k_heatmap = top_k_heatmap
 
+    def build(self, input_shape):
+        # The voxel offsets around each box and the reference xyz locations of
+        # the feature map only depend on the layer config, so they are computed
+        # once here and broadcast over the batch in `call()`. Compute them
+        # eagerly so that they can be captured by any traced function.
+        with tf.init_scope():
+            # [max_num_voxels_per_box, 3]
+            self._point_offsets = _compute_point_offsets(
+                self._voxel_size, self._max_radius
+            )
+            # [H, W, Z, 3]
+            self._feature_map_ref_xyz = voxel_utils.compute_feature_map_ref_xyz(
+                self._voxel_size,
+                self._spatial_size,
+                tf.zeros([1, 3], dtype=tf.float32),
+            )[0]
+        super().build(input_shape)
+
     def call(self, inputs):
         """
         Args:
@@ -386,6 +438,7 @@ class CenterNetLabelEncoder(keras.layers.Layer):
             box_mask,
             self._voxel_size,
             self._max_radius,
+            point_offsets=self._point_offsets,
         )
         # heatmap - [B, H, W, Z]
         # scatter the localized heatmap to global heatmap in vehicle frame.
@@ -410,11 +463,10 @@ class CenterNetLabelEncoder(keras.layers.Layer):
         dense_box_3d = tf.reshape(
             tf.gather(box_3d, dense_box_id, batch_dims=1), [b, h, w, z, -1]
         )
-        global_xyz = tf.zeros([b, 3], dtype=point_xyz.dtype)
-        # [B, H, W, Z, 3]
-        feature_map_ref_xyz = voxel_utils.compute_feature_map_ref_xyz(
-            self._voxel_size, self._spatial_size, global_xyz
-        )
+        # [1, H, W, Z, 3]
+        feature_map_ref_xyz = tf.cast(
+            self._feature_map_ref_xyz, dtype=point_xyz.dtype
+        )[tf.newaxis]
         # convert from global box point xyz to offset w.r.t center of feature
         # map.
         # [B, H, W, Z, 3]
@@ -18,6 +18,9 @@ import tensorflow as tf
 from keras_cv.layers.object_detection_3d.centernet_label_encoder import (
     CenterNetLabelEncoder,
 )
+from keras_cv.layers.object_detection_3d.centernet_label_encoder import (
+    scatter_to_dense_heatmap,
+)
 
 
 class CenterNetLabelEncoderTest(tf.test.TestCase):
@@ -116,3 +119,40 @@ class CenterNetLabelEncoderTest(tf.test.TestCase):
         # last dimension only has x, y
         self.assertEqual(output["class_1"]["top_k_index"].shape, [2, 10, 2])
         self.assertEqual(output["class_2"]["top_k_index"], None)
+
+    def test_scatter_to_dense_heatmap_keeps_max_heatmap(self):
+        voxel_size = [1.0, 1.0, 1000]
+        spatial_size = [-2, 2, -2, 2, -20, 20]
+        # Points 0 and 1 of the first sample fall into the same voxel, point 2
+        # is out of range and point 3 is masked out.
+        point_xyz = tf.constant(
+            [
+                [[0.0, 0.0, 0], [0.4, 0.2, 0], [6.0, 0.0, 0], [-2.0, -2.0, 0]],
+                [[0.0, 0.0, 0], [-2.0, 1.0, 0], [1.0, 1.0, 0], [0.0, 0.0, 0]],
+            ]
+        )
+        point_mask = tf.constant(
+            [[True, True, True, False], [True, True, True, True]]
+        )
+        point_box_id = tf.constant([[0, 1, 2, 3], [0, 1, 2, 2]])
+        heatmap = tf.constant([[0.2, 0.7, 0.9, 0.9], [0.3, 0.4, 0.5, 0.1]])
+
+        dense_heatmap, dense_box_id = scatter_to_dense_heatmap(
+            point_xyz,
+            point_mask,
+            point_box_id,
+            heatmap,
+            voxel_size,
+            spatial_size,
+        )
+
+        expected_heatmap = tf.zeros([2, 4, 4, 1]).numpy()
+        expected_heatmap[0, 2, 2, 0] = 0.7
+        expected_heatmap[1, 2, 2, 0] = 0.3
+        expected_heatmap[1, 0, 3, 0] = 0.4
+        expected_heatmap[1, 3, 3, 0] = 0.5
+        self.assertAllClose(dense_heatmap, expected_heatmap)
+        positive = expected_heatmap > 0
+        self.assertAllEqual(
+            tf.boolean_mask(dense_box_id, positive), [1, 1, 0, 2]
+        )
@@ -134,7 +134,22 @@ class HeatmapDecoder(keras.layers.Layer):
         self.heatmap_threshold = heatmap_threshold
         self.voxel_size = voxel_size
         self.spatial_size = spatial_size
-        self.built = True
+
+    def build(self, input_shape):
+        # The reference xyz locations only depend on the layer config, so they
+        # are computed once here instead of on every forward pass. Compute
+        # them eagerly so that they can be captured by any traced function.
+        with tf.init_scope():
+            global_xyz = tf.zeros([1, 3], dtype=tf.float32)
+            # [1, H, W, 1, 3]
+            ref_xyz = voxel_utils.compute_feature_map_ref_xyz(
+                self.voxel_size, self.spatial_size, global_xyz
+            )
+            # [H, W, 3]
+            ref_xyz = tf.squeeze(ref_xyz, axis=[0, -2])
+            # [H * W, 3]
+            self._ref_xyz = tf.reshape(ref_xyz, [-1, 3])
+        super().build(input_shape)
 
     def call(
         self, prediction: tf.Tensor
@@ -182,16 +197,10 @@ class HeatmapDecoder(keras.layers.Layer):
         )
         # [B, max_num_box, 7]
         box_decoded = tf.reshape(box_decoded, [b, self.max_num_box, 7])
-        global_xyz = tf.zeros([b, 3], dtype=box_decoded.dtype)
-        ref_xyz = voxel_utils.compute_feature_map_ref_xyz(
-            self.voxel_size, self.spatial_size, global_xyz
-        )
-        # [B, H, W, 3]
-        ref_xyz = tf.squeeze(ref_xyz, axis=-2)
-        f = ref_xyz.get_shape().as_list()[-1]
-        ref_xyz = tf.reshape(ref_xyz, [b, h * w, f])
         # [B, max_num_box, 3]
-        ref_xyz = tf.gather(ref_xyz, top_index, batch_dims=1)
+        ref_xyz = tf.gather(
+            tf.cast(self._ref_xyz, dtype=box_decoded.dtype), top_index
+        )
 
         box_decoded_cxyz = ref_xyz + box_decoded[:, :, :3]
         box_decoded = tf.concat(
@@ -39,6 +39,7 @@ KEYPOINTS = "keypoints"
 SEGMENTATION_MASKS = "segmentation_masks"
 IS_DICT = "is_dict"
 USE_TARGETS = "use_targets"
+PADDED_BOUNDING_BOXES = "padded_bounding_boxes"
 
 
 base_class = (
@@ -87,6 +88,12 @@ class BaseImageAugmentationLayer(base_class):
           num_boxes, 4)
          * `"classes"` - Tensor of class labels for boxes with shape (num_boxes,
           num_classes) or (batch_size, num_boxes, num_classes).
+         * `"num_boxes"` - (Optional) the number of valid boxes of each image,
+          as returned by `bounding_box.to_padded()`. When present, the
+          bounding boxes stay padded instead of being converted to ragged
+          tensors. Layers mark the boxes they discard with a -1 class in
+          place, so the valid boxes are the ones whose class is not -1, and
+          not the first `num_boxes` boxes.
        Any other keys included in this dictionary will be ignored and unmodified
        by an augmentation layer.
 
@@ -154,6 +161,28 @@ class BaseImageAugmentationLayer(base_class):
     def force_output_dense_images(self, force_output_dense_images):
         self._force_output_dense_images = force_output_dense_images
 
+    @property
+    def force_output_dense_bounding_boxes(self):
+        """Control whether to force outputting of padded bounding boxes.
+
+        When enabled, the bounding boxes are converted to dense tensors padded
+        with -1 and counted by `"num_boxes"`, as returned by
+        `bounding_box.to_padded()`, instead of ragged tensors.
+        `"num_boxes"` counts the boxes whose class is not -1, which are not
+        necessarily the first boxes. Bounding boxes
+        which already contain `"num_boxes"` are always output in this format,
+        so only the first layer of a pipeline needs to enable it.
+        """
+        return getattr(self, "_force_output_dense_bounding_boxes", False)
+
+    @force_output_dense_bounding_boxes.setter
+    def force_output_dense_bounding_boxes(
+        self, force_output_dense_bounding_boxes
+    ):
+        self._force_output_dense_bounding_boxes = (
+            force_output_dense_bounding_boxes
+        )
+
     @property
     def auto_vectorize(self):
         """Control whether automatic vectorization occurs.
@@ -200,6 +229,12 @@ class BaseImageAugmentationLayer(base_class):
 
     # TODO(lukewood): promote to user facing API if needed
     def _compute_bounding_box_signature(self, bounding_boxes):
+        if "num_boxes" in bounding_boxes:
+            return {
+                "boxes": tf.TensorSpec(shape=[None, 4], dtype=tf.float32),
+                "classes": tf.TensorSpec(shape=[None], dtype=tf.float32),
+                "num_boxes": tf.TensorSpec(shape=[], dtype=tf.int32),
+            }
         return {
             "boxes": tf.RaggedTensorSpec(
                 shape=[None, 4],
@@ -475,7 +510,9 @@ class BaseImageAugmentationLayer(base_class):
             result[LABELS] = label
 
         if bounding_boxes is not None:
+            padded = "num_boxes" in bounding_boxes
             bounding_boxes = bounding_box.to_dense(bounding_boxes)
+            bounding_boxes.pop("num_boxes", None)
 
             bounding_boxes = self.augment_bounding_boxes(
                 bounding_boxes,
@@ -484,7 +521,10 @@ class BaseImageAugmentationLayer(base_class):
                 image=raw_image,
             )
 
-            bounding_boxes = bounding_box.to_ragged(bounding_boxes)
+            if padded:
+                bounding_boxes = bounding_box.to_padded(bounding_boxes)
+            else:
+                bounding_boxes = bounding_box.to_ragged(bounding_boxes)
             result[BOUNDING_BOXES] = bounding_boxes
 
         if keypoints is not None:
@@ -529,6 +569,9 @@ class BaseImageAugmentationLayer(base_class):
             inputs[BOUNDING_BOXES] = self._format_bounding_boxes(
                 inputs[BOUNDING_BOXES]
             )
+            metadata[PADDED_BOUNDING_BOXES] = (
+                "num_boxes" in inputs[BOUNDING_BOXES]
+            )
 
         if isinstance(inputs, dict) and TARGETS in inputs:
             # TODO(scottzhu): Check if it only contains the valid keys
@@ -549,9 +592,17 @@ class BaseImageAugmentationLayer(base_class):
                 "`bounding_boxes['classes'] = "
                 "tf.ones_like(bounding_boxes['boxes'])`."
             )
+        if self.force_output_dense_bounding_boxes:
+            bounding_boxes = bounding_box.to_padded(bounding_boxes)
         return bounding_boxes
 
     def _format_output(self, output, metadata):
+        if metadata.get(PADDED_BOUNDING_BOXES, False):
+            # Layers overriding `_batch_augment()` may return the bounding
+            # boxes without `"num_boxes"`, so the valid boxes are recounted.
+            output[BOUNDING_BOXES] = bounding_box.to_padded(
+                output[BOUNDING_BOXES]
+            )
         if not metadata[IS_DICT]:
             return output[IMAGES]
         elif metadata[USE_TARGETS]:
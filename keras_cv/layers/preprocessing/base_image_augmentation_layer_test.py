@@ -60,6 +60,20 @@ class VectorizeDisabledLayer(BaseImageAugmentationLayer):
         super().__init__(**kwargs)
 
 
+class DiscardRightBoxesLayer(BaseImageAugmentationLayer):
+    """Discards the boxes whose left edge is in the right half."""
+
+    def augment_image(self, image, transformation, **kwargs):
+        return image
+
+    def augment_bounding_boxes(self, bounding_boxes, transformation, **kwargs):
+        boxes, classes = bounding_boxes["boxes"], bounding_boxes["classes"]
+        return {
+            "boxes": boxes,
+            "classes": tf.where(boxes[..., 0] >= 0.5, -1.0, classes),
+        }
+
+
 class BaseImageAugmentationLayerTest(tf.test.TestCase):
     def test_augment_single_image(self):
         add_layer = RandomAddLayer(fixed_value=2.0)
@@ -261,3 +275,39 @@ class BaseImageAugmentationLayerTest(tf.test.TestCase):
         self.assertNotAllClose(
             segmentation_mask_diff[0], segmentation_mask_diff[1]
         )
+
+    def test_force_output_dense_bounding_boxes(self):
+        layer = DiscardRightBoxesLayer()
+        layer.force_output_dense_bounding_boxes = True
+        bounding_boxes = {
+            "boxes": tf.ragged.constant(
+                [[[0.1, 0, 1, 1], [0.6, 0, 1, 1]], [[0.7, 0, 1, 1]]],
+                ragged_rank=1,
+            ),
+            "classes": tf.ragged.constant([[1.0, 2.0], [3.0]]),
+        }
+
+        output = layer(
+            {"images": tf.zeros((2, 8, 8, 3)), "bounding_boxes": bounding_boxes}
+        )["bounding_boxes"]
+
+        self.assertIsInstance(output["boxes"], tf.Tensor)
+        self.assertEqual(output["boxes"].shape, (2, 2, 4))
+        self.assertAllEqual(output["classes"], [[1, -1], [-1, -1]])
+        self.assertAllEqual(output["num_boxes"], [1, 0])
+
+    def test_padded_bounding_boxes_stay_padded(self):
+        bounding_boxes = bounding_box.to_padded(
+            {
+                "boxes": np.array([[[0.1, 0, 1, 1], [0.6, 0, 1, 1]]] * 2),
+                "classes": np.array([[1, 2], [3, -1]]),
+            }
+        )
+
+        output = DiscardRightBoxesLayer()(
+            {"images": tf.zeros((2, 8, 8, 3)), "bounding_boxes": bounding_boxes}
+        )["bounding_boxes"]
+
+        self.assertIsInstance(output["classes"], tf.Tensor)
+        self.assertAllEqual(output["classes"], [[1, -1], [3, -1]])
+        self.assertAllEqual(output["num_boxes"], [1, 1])
@@ -13,6 +13,7 @@
 # limitations under the License.
 import tensorflow as tf
 
+from keras_cv import bounding_box
 from keras_cv.layers.preprocessing.mix_up import MixUp
 
 num_classes = 10
@@ -65,6 +66,25 @@ class MixUpTest(tf.test.TestCase):
         self.assertEqual(ys_bounding_boxes["classes"].shape, [2, 6])
         self.assertEqual(ys_segmentation_masks.shape, [2, 512, 512, 3])
 
+    def test_padded_bounding_boxes(self):
+        xs = tf.ones((2, 8, 8, 3))
+        ys_bounding_boxes = bounding_box.to_padded(
+            {
+                "boxes": tf.random.uniform((2, 3, 4), 0, 1),
+                "classes": tf.constant([[0, 1, -1], [2, -1, -1]]),
+            }
+        )
+
+        layer = MixUp()
+        outputs = layer({"images": xs, "bounding_boxes": ys_bounding_boxes})
+
+        self.assertEqual(outputs["bounding_boxes"]["classes"].shape, [2, 6])
+        classes = outputs["bounding_boxes"]["classes"]
+        self.assertAllEqual(
+            outputs["bounding_boxes"]["num_boxes"],
+            tf.reduce_sum(tf.cast(classes != -1, tf.int32), axis=-1),
+        )
+
     def test_mix_up_call_results_with_labels(self):
         xs = tf.cast(
             tf.stack(
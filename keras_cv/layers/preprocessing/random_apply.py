@@ -12,7 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import tensorflow as tf
+
+from keras_cv import bounding_box
 from keras_cv.backend import keras
+from keras_cv.layers.preprocessing.base_image_augmentation_layer import (
+    BOUNDING_BOXES,
+)
+from keras_cv.layers.preprocessing.base_image_augmentation_layer import IMAGES
 from keras_cv.layers.preprocessing.base_image_augmentation_layer import (
     BaseImageAugmentationLayer,
 )
@@ -22,10 +29,18 @@ from keras_cv.layers.preprocessing.base_image_augmentation_layer import (
 class RandomApply(BaseImageAugmentationLayer):
     """Apply provided layer to random elements in a batch.
 
+    Dense batches are passed to the underlying layer at once, and the outputs
+    of the randomly chosen samples are selected with a per-sample mask, so
+    vectorized layers run in batch mode. Batches with ragged tensors are
+    augmented sample by sample.
+
     Args:
         layer: a keras `Layer` or `BaseImageAugmentationLayer`. This layer will
-            be applied to randomly chosen samples in a batch. Layer should not
-            modify the size of provided inputs.
+            be applied to randomly chosen samples in a batch. Unless
+            `batchwise=True`, the layer should not modify the size of the
+            images, labels and segmentation masks. Bounding boxes and
+            keypoints are augmented sample by sample, so their number may
+            change.
         rate: controls the frequency of applying the layer. 1.0 means all
             elements in a batch will be modified. 0.0 means no elements will be
             modified. Defaults to 0.5.
@@ -35,8 +50,9 @@ class RandomApply(BaseImageAugmentationLayer):
             layer. This is useful when using `MixUp()`, `CutMix()`, `Mosaic()`,
             etc.
         auto_vectorize: bool, whether to use tf.vectorized_map or tf.map_fn for
-            batched input. Setting this to True might give better performance
-            but currently doesn't work with XLA. Defaults to False.
+            batched input with ragged tensors. Setting this to True might give
+            better performance but currently doesn't work with XLA. Defaults to
+            False.
         seed: integer, controls random behaviour.
 
     Example usage:
@@ -124,13 +140,78 @@ class RandomApply(BaseImageAugmentationLayer):
             else:
                 return inputs
         # non-batchwise augmentations
-        return super()._batch_augment(inputs)
+        if self._any_ragged(inputs):
+            return super()._batch_augment(inputs)
+        # The wrapped layer may modify the nested dictionaries of its inputs,
+        # whose original values are selected for the samples not augmented.
+        outputs = self._layer(tf.nest.map_structure(lambda x: x, inputs))
+        batch_size = tf.shape(inputs[IMAGES])[0]
+        should_augment = (
+            self._random_generator.random_uniform(shape=(batch_size,))
+            > 1.0 - self._rate
+        )
+        # Only the keys of both the inputs and the outputs can be selected.
+        result = dict(inputs)
+        for key in outputs.keys() & inputs.keys():
+            result[key] = tf.nest.map_structure(
+                lambda output, input: self._select(
+                    should_augment, output, input, key
+                ),
+                outputs[key],
+                inputs[key],
+            )
+        return result
+
+    def _select(self, should_augment, outputs, inputs, key):
+        """Selects the outputs of the augmented samples, and the inputs of
+        the other ones."""
+        if not outputs.shape.is_compatible_with(inputs.shape):
+            raise ValueError(
+                "RandomApply() can only select the outputs of the augmented "
+                "samples when the wrapped layer does not change the shape of "
+                f"its inputs, but the shape of `{key}` changed from "
+                f"{inputs.shape} to {outputs.shape}. Use `batchwise=True` to "
+                "augment whole batches instead. Received "
+                f"layer={self._layer}"
+            )
+        if not outputs.shape.is_fully_defined():
+            tf.debugging.assert_equal(
+                tf.shape(outputs),
+                tf.shape(inputs),
+                message=(
+                    "RandomApply() requires the wrapped layer to keep the "
+                    f"shape of `{key}`."
+                ),
+            )
+        should_augment = tf.reshape(
+            should_augment,
+            tf.concat(
+                [[-1], tf.ones([tf.rank(outputs) - 1], dtype=tf.int32)], 0
+            ),
+        )
+        return tf.where(should_augment, outputs, tf.cast(inputs, outputs.dtype))
 
     def _augment(self, inputs):
+        bounding_boxes = inputs.get(BOUNDING_BOXES, None)
         if self._should_augment():
-            return self._layer(inputs)
+            outputs = self._layer(inputs)
         else:
-            return inputs
+            outputs = inputs
+        if bounding_boxes is not None:
+            # The number of boxes may change, so the boxes are returned in the
+            # format of the output signature of the per-sample path.
+            outputs[BOUNDING_BOXES] = bounding_box.to_dense(
+                outputs[BOUNDING_BOXES]
+            )
+            if "num_boxes" in bounding_boxes:
+                outputs[BOUNDING_BOXES] = bounding_box.to_padded(
+                    outputs[BOUNDING_BOXES]
+                )
+            else:
+                outputs[BOUNDING_BOXES] = bounding_box.to_ragged(
+                    outputs[BOUNDING_BOXES]
+                )
+        return outputs
 
     def get_config(self):
         config = super().get_config()
@@ -36,6 +36,18 @@ class ZeroOut(BaseImageAugmentationLayer):
         return 0 * label
 
 
+class DuplicateBoxes(keras.layers.Layer):
+    """Duplicates all bounding boxes, for testing purposes."""
+
+    def call(self, inputs):
+        boxes = inputs["bounding_boxes"]
+        inputs["bounding_boxes"] = {
+            "boxes": tf.concat([boxes["boxes"], boxes["boxes"]], axis=-2),
+            "classes": tf.concat([boxes["classes"], boxes["classes"]], axis=-1),
+        }
+        return inputs
+
+
 class RandomApplyTest(tf.test.TestCase, parameterized.TestCase):
     rng = tf.random.Generator.from_seed(seed=1234)
 
@@ -116,6 +128,61 @@ class RandomApplyTest(tf.test.TestCase, parameterized.TestCase):
 
         self.assertAllEqual(outputs, tf.zeros_like(dummy_inputs))
 
+    def test_augments_labels_of_augmented_images(self):
+        dummy_inputs = self.rng.uniform(shape=(32, 8, 8, 3))
+        dummy_labels = tf.ones(shape=(32, 2))
+        layer = RandomApply(rate=0.5, layer=ZeroOut(), seed=1234)
+
+        outputs = layer({"images": dummy_inputs, "labels": dummy_labels})
+
+        self.assertAllEqual(
+            tf.reduce_all(outputs["images"] == 0, axis=[1, 2, 3]),
+            tf.reduce_all(outputs["labels"] == 0, axis=1),
+        )
+
+    def test_works_with_layers_changing_the_number_of_boxes(self):
+        images = tf.ones((4, 8, 8, 3))
+        bounding_boxes = {
+            "boxes": tf.ones((4, 2, 4)),
+            "classes": tf.ones((4, 2)),
+        }
+        layer = RandomApply(rate=0.5, layer=DuplicateBoxes(), seed=1234)
+
+        outputs = layer({"images": images, "bounding_boxes": bounding_boxes})
+
+        num_boxes = outputs["bounding_boxes"]["classes"].row_lengths()
+        self.assertAllInSet(num_boxes, [2, 4])
+        self.assertIn(2, num_boxes)
+        self.assertIn(4, num_boxes)
+
+    def test_works_with_layers_adding_keys(self):
+        images = tf.ones((4, 8, 8, 3))
+        layer = RandomApply(
+            rate=0.5,
+            layer=keras.layers.Lambda(
+                lambda x: {"images": 0 * x["images"], "extra": x["images"]}
+            ),
+            seed=1234,
+        )
+
+        outputs = layer({"images": images})
+
+        self.assertEqual(set(outputs.keys()), {"images"})
+
+    def test_raises_error_on_layers_changing_the_image_size(self):
+        layer = RandomApply(rate=0.5, layer=layers.Resizing(4, 4))
+
+        with self.assertRaisesRegex(ValueError, "shape of `images` changed"):
+            layer(tf.ones((4, 8, 8, 3)))
+
+    def test_works_with_ragged_images(self):
+        dummy_inputs = tf.ragged.stack([tf.ones((4, 4, 3)), tf.ones((6, 6, 3))])
+        layer = RandomApply(rate=1.0, layer=ZeroOut())
+
+        outputs = layer(dummy_inputs)
+
+        self.assertAllEqual(outputs.flat_values, tf.zeros((52, 3)))
+
     def test_works_with_xla(self):
         dummy_inputs = self.rng.uniform(shape=(32, 224, 224, 3))
         # auto_vectorize=True will crash XLA
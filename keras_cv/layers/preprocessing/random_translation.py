@@ -234,7 +234,6 @@ class RandomTranslation(VectorizedBaseImageAugmentationLayer):
             bounding_box_format="rel_xyxy",
             images=images,
         )
-        bounding_boxes = keras_cv.bounding_box.to_ragged(bounding_boxes)
 
         bounding_boxes = keras_cv.bounding_box.convert_format(
             bounding_boxes,
@@ -133,6 +133,10 @@ class Resizing(BaseImageAugmentationLayer):
             bounding_boxes["boxes"] = tf.expand_dims(
                 bounding_boxes["boxes"], axis=0
             )
+            if "num_boxes" in bounding_boxes:
+                bounding_boxes["num_boxes"] = tf.expand_dims(
+                    bounding_boxes["num_boxes"], axis=0
+                )
             inputs["bounding_boxes"] = bounding_boxes
 
         if segmentation_masks is not None:
@@ -152,6 +156,10 @@ class Resizing(BaseImageAugmentationLayer):
             outputs["bounding_boxes"]["boxes"] = tf.squeeze(
                 outputs["bounding_boxes"]["boxes"], axis=0
             )
+            if "num_boxes" in outputs["bounding_boxes"]:
+                outputs["bounding_boxes"]["num_boxes"] = tf.squeeze(
+                    outputs["bounding_boxes"]["num_boxes"], axis=0
+                )
             inputs["bounding_boxes"] = outputs["bounding_boxes"]
 
         if segmentation_masks is not None:
@@ -196,7 +204,9 @@ class Resizing(BaseImageAugmentationLayer):
             img_height = tf.cast(img_size[H_AXIS], self.compute_dtype)
             img_width = tf.cast(img_size[W_AXIS], self.compute_dtype)
             if bounding_boxes is not None:
+                padded = "num_boxes" in bounding_boxes
                 bounding_boxes = bounding_box.to_dense(bounding_boxes)
+                bounding_boxes.pop("num_boxes", None)
                 bounding_boxes = keras_cv.bounding_box.convert_format(
                     bounding_boxes,
                     image_shape=img_size,
@@ -239,7 +249,11 @@ class Resizing(BaseImageAugmentationLayer):
                 )
             inputs["images"] = image
 
-            if bounding_boxes is not None:
+            if bounding_boxes is not None and padded:
+                inputs["bounding_boxes"] = keras_cv.bounding_box.to_padded(
+                    bounding_boxes
+                )
+            elif bounding_boxes is not None:
                 inputs["bounding_boxes"] = keras_cv.bounding_box.to_ragged(
                     bounding_boxes
                 )
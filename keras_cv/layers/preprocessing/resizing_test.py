@@ -16,6 +16,7 @@ import pytest
 import tensorflow as tf
 from absl.testing import parameterized
 
+from keras_cv import bounding_box
 from keras_cv import layers as cv_layers
 
 
@@ -267,6 +268,33 @@ class ResizingTest(tf.test.TestCase, parameterized.TestCase):
             outputs["images"].shape.as_list(),
         )
 
+    @pytest.mark.tf_keras_only
+    def test_pad_to_size_with_padded_bounding_boxes(self):
+        images = tf.ragged.constant(
+            [np.ones((8, 8, 3)), np.ones((8, 4, 3))], dtype="float32"
+        )
+        boxes = {
+            "boxes": tf.constant(
+                [
+                    [[0, 0, 4, 4], [0, 0, 8, 8]],
+                    [[0, 0, 4, 4], [-1, -1, -1, -1]],
+                ],
+                dtype=tf.float32,
+            ),
+            "classes": tf.constant([[1, 2], [3, -1]], dtype=tf.float32),
+        }
+        boxes = bounding_box.to_padded(boxes)
+        layer = cv_layers.Resizing(
+            4, 4, pad_to_aspect_ratio=True, bounding_box_format="xyxy"
+        )
+        outputs = layer({"images": images, "bounding_boxes": boxes})
+        self.assertIsInstance(outputs["bounding_boxes"]["boxes"], tf.Tensor)
+        self.assertAllClose(
+            outputs["bounding_boxes"]["boxes"][:, 0],
+            [[0, 0, 2, 2], [0, 0, 2, 2]],
+        )
+        self.assertAllEqual(outputs["bounding_boxes"]["num_boxes"], [2, 1])
+
     @pytest.mark.tf_keras_only
     def test_pad_to_size_with_bounding_boxes_ragged_images_upsample(self):
         images = tf.ragged.constant(
@@ -93,6 +93,14 @@ class VectorizedBaseImageAugmentationLayer(base_class):
     method. When enabled, images and segmentation masks will be converted to
     dense tensor by `to_tensor()` if ragged.
 
+    Bounding boxes are output as ragged tensors, unless they contain
+    `"num_boxes"`, as returned by `bounding_box.to_padded()`, or
+    `self.force_output_dense_bounding_boxes = True`, in which case they stay
+    dense tensors padded with -1 and counted by `"num_boxes"`. The boxes which
+    layers discard are marked with a -1 class in place, so `"num_boxes"` is
+    the number of boxes whose class is not -1, and not the length of a prefix
+    of valid boxes.
+
     ```python
     class SubclassLayer(VectorizedBaseImageAugmentationLayer):
       def __init__(self):
@@ -137,6 +145,19 @@ class VectorizedBaseImageAugmentationLayer(base_class):
             force_output_dense_segmentation_masks
         )
 
+    @property
+    def force_output_dense_bounding_boxes(self):
+        """Control whether to force outputting of padded bounding boxes."""
+        return getattr(self, "_force_output_dense_bounding_boxes", False)
+
+    @force_output_dense_bounding_boxes.setter
+    def force_output_dense_bounding_boxes(
+        self, force_output_dense_bounding_boxes
+    ):
+        self._force_output_dense_bounding_boxes = (
+            force_output_dense_bounding_boxes
+        )
+
     def augment_ragged_image(self, image, transformation, **kwargs):
         """Augment an image from a ragged image batch during training.
 
@@ -334,6 +355,14 @@ class VectorizedBaseImageAugmentationLayer(base_class):
         keypoints = inputs.get(KEYPOINTS, None)
         segmentation_masks = inputs.get(SEGMENTATION_MASKS, None)
 
+        padded_bounding_boxes = (
+            bounding_boxes is not None and "num_boxes" in bounding_boxes
+        )
+        if padded_bounding_boxes:
+            # The boxes are counted again after they are augmented.
+            bounding_boxes = bounding_boxes.copy()
+            bounding_boxes.pop("num_boxes")
+
         batch_size = tf.shape(images)[0]
 
         transformations = self.get_random_transformation_batch(
@@ -384,7 +413,10 @@ class VectorizedBaseImageAugmentationLayer(base_class):
                 images=images,
                 raw_images=raw_images,
             )
-            bounding_boxes = bounding_box.to_ragged(bounding_boxes)
+            if padded_bounding_boxes:
+                bounding_boxes = bounding_box.to_padded(bounding_boxes)
+            else:
+                bounding_boxes = bounding_box.to_ragged(bounding_boxes)
             result[BOUNDING_BOXES] = bounding_boxes
 
         if keypoints is not None:
@@ -453,6 +485,10 @@ class VectorizedBaseImageAugmentationLayer(base_class):
                     inputs[BOUNDING_BOXES]["classes"] = tf.expand_dims(
                         inputs[BOUNDING_BOXES]["classes"], axis=0
                     )
+                    if "num_boxes" in inputs[BOUNDING_BOXES]:
+                        inputs[BOUNDING_BOXES]["num_boxes"] = tf.expand_dims(
+                            inputs[BOUNDING_BOXES]["num_boxes"], axis=0
+                        )
                 else:
                     inputs[key] = tf.expand_dims(inputs[key], axis=0)
 
@@ -486,6 +522,10 @@ class VectorizedBaseImageAugmentationLayer(base_class):
                     output[BOUNDING_BOXES]["classes"] = tf.squeeze(
                         output[BOUNDING_BOXES]["classes"], axis=0
                     )
+                    if "num_boxes" in output[BOUNDING_BOXES]:
+                        output[BOUNDING_BOXES]["num_boxes"] = tf.squeeze(
+                            output[BOUNDING_BOXES]["num_boxes"], axis=0
+                        )
                 else:
                     output[key] = tf.squeeze(output[key], axis=0)
 
@@ -542,4 +582,6 @@ class VectorizedBaseImageAugmentationLayer(base_class):
                 "`bounding_boxes['classes'] = "
                 "tf.ones_like(bounding_boxes['boxes'])`."
             )
+        if self.force_output_dense_bounding_boxes:
+            bounding_boxes = bounding_box.to_padded(bounding_boxes)
         return bounding_boxes
@@ -57,6 +57,21 @@ class VectorizedRandomAddLayer(VectorizedBaseImageAugmentationLayer):
         return segmentation_masks + transformations[:, None, None, None]
 
 
+class VectorizedDiscardRightBoxesLayer(VectorizedBaseImageAugmentationLayer):
+    """Discards the boxes whose left edge is in the right half."""
+
+    def augment_images(self, images, transformations, **kwargs):
+        return images
+
+    def augment_bounding_boxes(self, bounding_boxes, transformations, **kwargs):
+        bounding_boxes = bounding_box.to_dense(bounding_boxes)
+        boxes, classes = bounding_boxes["boxes"], bounding_boxes["classes"]
+        return {
+            "boxes": boxes,
+            "classes": tf.where(boxes[..., 0] >= 0.5, -1.0, classes),
+        }
+
+
 TF_ALL_TENSOR_TYPES = (tf.Tensor, tf.RaggedTensor, tf.SparseTensor)
 
 
@@ -546,3 +561,60 @@ class VectorizedBaseImageAugmentationLayerTest(tf.test.TestCase):
             {"images": images, "segmentation_masks": segmentation_masks}
         )
         self.assertTrue(isinstance(result["segmentation_masks"], tf.Tensor))
+
+    def test_force_output_dense_bounding_boxes(self):
+        layer = VectorizedDiscardRightBoxesLayer()
+        layer.force_output_dense_bounding_boxes = True
+        bounding_boxes = {
+            "boxes": tf.ragged.constant(
+                [[[0.1, 0, 1, 1], [0.6, 0, 1, 1]], [[0.7, 0, 1, 1]]],
+                ragged_rank=1,
+            ),
+            "classes": tf.ragged.constant([[1.0, 2.0], [3.0]]),
+        }
+
+        output = layer(
+            {"images": tf.zeros((2, 8, 8, 3)), "bounding_boxes": bounding_boxes}
+        )["bounding_boxes"]
+
+        self.assertIsInstance(output["boxes"], tf.Tensor)
+        self.assertEqual(output["boxes"].shape, (2, 2, 4))
+        self.assertAllEqual(output["classes"], [[1, -1], [-1, -1]])
+        self.assertAllEqual(output["num_boxes"], [1, 0])
+
+    def test_padded_bounding_boxes_stay_padded_in_tf_data(self):
+        bounding_boxes = bounding_box.to_padded(
+            {
+                "boxes": np.array([[[0.1, 0, 1, 1], [0.6, 0, 1, 1]]] * 4),
+                "classes": np.array([[1, 2], [3, -1]] * 2),
+            }
+        )
+        dataset = tf.data.Dataset.from_tensor_slices(
+            {"images": np.zeros((4, 8, 8, 3)), "bounding_boxes": bounding_boxes}
+        ).batch(2)
+        layer = VectorizedDiscardRightBoxesLayer()
+
+        dataset = dataset.map(layer).map(layer)
+
+        output = next(iter(dataset))["bounding_boxes"]
+        self.assertEqual(
+            dataset.element_spec["bounding_boxes"]["boxes"].shape,
+            (None, 2, 4),
+        )
+        self.assertIsInstance(output["classes"], tf.Tensor)
+        self.assertAllEqual(output["num_boxes"], [1, 1])
+
+    def test_unbatched_padded_bounding_boxes(self):
+        bounding_boxes = bounding_box.to_padded(
+            {
+                "boxes": np.array([[0.1, 0, 1, 1], [0.6, 0, 1, 1]]),
+                "classes": np.array([1, 2]),
+            }
+        )
+
+        output = VectorizedDiscardRightBoxesLayer()(
+            {"images": tf.zeros((8, 8, 3)), "bounding_boxes": bounding_boxes}
+        )["bounding_boxes"]
+
+        self.assertAllEqual(output["classes"], [1, -1])
+        self.assertAllEqual(output["num_boxes"], 1)
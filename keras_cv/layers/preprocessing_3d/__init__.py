@@ -15,6 +15,12 @@
 from keras_cv.layers.preprocessing_3d.base_augmentation_layer_3d import (
     BaseAugmentationLayer3D,
 )
+from keras_cv.layers.preprocessing_3d.global_random_affine_3d import (
+    GlobalRandomAffine3D,
+)
+from keras_cv.layers.preprocessing_3d.vectorized_base_augmentation_layer_3d import (  # noqa: E501
+    VectorizedBaseAugmentationLayer3D,
+)
 from keras_cv.layers.preprocessing_3d.waymo.frustum_random_dropping_points import (  # noqa: E501
     FrustumRandomDroppingPoints,
 )
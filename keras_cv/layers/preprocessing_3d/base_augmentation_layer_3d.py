@@ -289,3 +289,32 @@ def convert_from_model_format(inputs):
     boxes = tf.concat(box_tensors, axis=-1)
 
     return point_clouds, boxes
+
+
+def compact_by_mask(values, mask, size):
+    """Moves the rows of `values` selected by `mask` to the front.
+
+    This is a padded equivalent of running `tf.boolean_mask` on every leading
+    slice of `values` and re-padding the result: selected rows keep their
+    relative order, unselected rows are zeroed and the output always has
+    exactly `size` rows, so it can be applied to a whole batch at once.
+
+    Args:
+      values: float Tensor of shape [..., num_rows, num_features].
+      mask: boolean Tensor of shape [..., num_rows].
+      size: int, the number of rows in the output. The output is truncated
+        or zero padded to this size.
+
+    Returns:
+      float Tensor of shape [..., size, num_features].
+    """
+    batch_dims = mask.shape.rank - 1
+    num_padding = tf.maximum(size - tf.shape(mask)[-1], 0)
+    mask = tf.pad(mask, [[0, 0]] * batch_dims + [[0, num_padding]])
+    values = tf.pad(values, [[0, 0]] * batch_dims + [[0, num_padding], [0, 0]])
+    order = tf.argsort(
+        tf.cast(tf.logical_not(mask), tf.int32), axis=-1, stable=True
+    )[..., :size]
+    mask = tf.gather(mask, order, batch_dims=batch_dims)
+    values = tf.gather(values, order, batch_dims=batch_dims)
+    return tf.where(mask[..., tf.newaxis], values, tf.zeros_like(values))
@@ -0,0 +1,301 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tensorflow as tf
+from tensorflow import keras
+
+from keras_cv.bounding_box_3d import CENTER_XYZ_DXDYDZ_PHI
+from keras_cv.layers.preprocessing_3d import base_augmentation_layer_3d
+from keras_cv.layers.preprocessing_3d import (
+    vectorized_base_augmentation_layer_3d,
+)
+from keras_cv.point_cloud import wrap_angle_radians
+from keras_cv.point_cloud.point_cloud import _get_3d_rotation_matrix
+
+POINT_CLOUDS = base_augmentation_layer_3d.POINT_CLOUDS
+BOUNDING_BOXES = base_augmentation_layer_3d.BOUNDING_BOXES
+
+
+def _parse_factor(factor, name):
+    if not factor:
+        return 1.0, 1.0
+    if isinstance(factor, (int, float)):
+        factor = (factor, factor)
+    if factor[0] < 0 or factor[1] < 0:
+        raise ValueError(f"{name} must be >=0. Received {name}={factor}.")
+    if factor[0] > factor[1]:
+        raise ValueError(
+            f"The lower bound of {name} must be less than the upper bound. "
+            f"Received {name}={factor}."
+        )
+    return float(factor[0]), float(factor[1])
+
+
+@keras.utils.register_keras_serializable(package="keras_cv")
+class GlobalRandomAffine3D(
+    vectorized_base_augmentation_layer_3d.VectorizedBaseAugmentationLayer3D
+):
+    """A preprocessing layer which randomly flips, rotates, scales and
+    translates point clouds and bounding boxes during training.
+
+    This layer fuses `GlobalRandomFlip`, `GlobalRandomRotation`,
+    `GlobalRandomScaling` and `GlobalRandomTranslation`. The sampled flip,
+    rotation, scaling and translation of each sample are composed (in that
+    order) into a single 4x4 affine matrix, which is applied to the point
+    clouds and bounding box centers of the whole batch with a single matmul.
+    Compared to chaining the four layers, the point clouds are only read and
+    written once.
+
+    Input shape:
+      point_clouds: 3D (multi frames) float32 Tensor with shape
+        [num of frames, num of points, num of point features], or a 4D Tensor
+        with an additional leading batch dimension.
+        The first 5 features are [x, y, z, class, range].
+      bounding_boxes: 3D (multi frames) float32 Tensor with shape
+        [num of frames, num of boxes, num of box features], or a 4D Tensor
+        with an additional leading batch dimension. Boxes are expected
+        to follow the CENTER_XYZ_DXDYDZ_PHI format. Refer to
+        https://github.com/keras-team/keras-cv/blob/master/keras_cv/bounding_box_3d/formats.py
+        for more details on supported bounding box formats.
+
+    Output shape:
+      A dictionary of Tensors with the same shape as input Tensors.
+
+    Arguments:
+      flip_y_probability: A float scalar between 0 and 1 sets the probability
+        of flipping a sample over the Y axis, defaults to 0.0.
+      max_rotation_angle_x: A float scalar sets the maximum rotation angle (in
+        radians) along X axis.
+      max_rotation_angle_y: A float scalar sets the maximum rotation angle (in
+        radians) along Y axis.
+      max_rotation_angle_z: A float scalar sets the maximum rotation angle (in
+        radians) along Z axis.
+      x_factor: A tuple of float scalars or a float scalar sets the minimum and
+        maximum scaling factors for the X axis.
+      y_factor: A tuple of float scalars or a float scalar sets the minimum and
+        maximum scaling factors for the Y axis.
+      z_factor: A tuple of float scalars or a float scalar sets the minimum and
+        maximum scaling factors for the Z axis.
+      preserve_aspect_ratio: whether to use the X axis scaling factor for all
+        axes, defaults to False.
+      x_stddev: A float scalar sets the standard deviation of the translation
+        noise along the X axis.
+      y_stddev: A float scalar sets the standard deviation of the translation
+        noise along the Y axis.
+      z_stddev: A float scalar sets the standard deviation of the translation
+        noise along the Z axis.
+
+    Usage:
+    ```python
+    augmenter = keras_cv.layers.GlobalRandomAffine3D(
+        flip_y_probability=0.5,
+        max_rotation_angle_z=np.pi / 4,
+        x_factor=(0.95, 1.05),
+        preserve_aspect_ratio=True,
+        x_stddev=0.5,
+        y_stddev=0.5,
+    )
+    outputs = augmenter(
+        {"point_clouds": point_clouds, "bounding_boxes": bounding_boxes}
+    )
+    ```
+    """
+
+    def __init__(
+        self,
+        flip_y_probability=0.0,
+        max_rotation_angle_x=None,
+        max_rotation_angle_y=None,
+        max_rotation_angle_z=None,
+        x_factor=None,
+        y_factor=None,
+        z_factor=None,
+        preserve_aspect_ratio=False,
+        x_stddev=None,
+        y_stddev=None,
+        z_stddev=None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        if flip_y_probability < 0 or flip_y_probability > 1:
+            raise ValueError("flip_y_probability must be in [0, 1].")
+        max_rotation_angle_x = max_rotation_angle_x or 0.0
+        max_rotation_angle_y = max_rotation_angle_y or 0.0
+        max_rotation_angle_z = max_rotation_angle_z or 0.0
+        if max_rotation_angle_x < 0:
+            raise ValueError("max_rotation_angle_x must be >=0.")
+        if max_rotation_angle_y < 0:
+            raise ValueError("max_rotation_angle_y must be >=0.")
+        if max_rotation_angle_z < 0:
+            raise ValueError("max_rotation_angle_z must be >=0.")
+        x_factor = _parse_factor(x_factor, "x_factor")
+        y_factor = _parse_factor(y_factor, "y_factor")
+        z_factor = _parse_factor(z_factor, "z_factor")
+        x_stddev = x_stddev or 0.0
+        y_stddev = y_stddev or 0.0
+        z_stddev = z_stddev or 0.0
+        if x_stddev < 0 or y_stddev < 0 or z_stddev < 0:
+            raise ValueError("x_stddev, y_stddev and z_stddev must be >=0.")
+
+        self._flip_y_probability = flip_y_probability
+        self._max_rotation_angle_x = max_rotation_angle_x
+        self._max_rotation_angle_y = max_rotation_angle_y
+        self._max_rotation_angle_z = max_rotation_angle_z
+        self._x_factor = x_factor
+        self._y_factor = y_factor
+        self._z_factor = z_factor
+        self._preserve_aspect_ratio = preserve_aspect_ratio
+        self._x_stddev = x_stddev
+        self._y_stddev = y_stddev
+        self._z_stddev = z_stddev
+
+    def get_config(self):
+        return {
+            "flip_y_probability": self._flip_y_probability,
+            "max_rotation_angle_x": self._max_rotation_angle_x,
+            "max_rotation_angle_y": self._max_rotation_angle_y,
+            "max_rotation_angle_z": self._max_rotation_angle_z,
+            "x_factor": self._x_factor,
+            "y_factor": self._y_factor,
+            "z_factor": self._z_factor,
+            "preserve_aspect_ratio": self._preserve_aspect_ratio,
+            "x_stddev": self._x_stddev,
+            "y_stddev": self._y_stddev,
+            "z_stddev": self._z_stddev,
+        }
+
+    def get_random_transformation_batch(self, batch_size, **kwargs):
+        def uniform(minval, maxval):
+            return self._random_generator.random_uniform(
+                (batch_size,),
+                minval=minval,
+                maxval=maxval,
+                dtype=self.compute_dtype,
+            )
+
+        def normal(stddev):
+            return self._random_generator.random_normal(
+                (batch_size,), mean=0.0, stddev=stddev, dtype=self.compute_dtype
+            )
+
+        flip_y = tf.where(
+            uniform(0.0, 1.0) < self._flip_y_probability, -1.0, 1.0
+        )
+        rotation_x = uniform(
+            -self._max_rotation_angle_x, self._max_rotation_angle_x
+        )
+        rotation_y = uniform(
+            -self._max_rotation_angle_y, self._max_rotation_angle_y
+        )
+        rotation_z = uniform(
+            -self._max_rotation_angle_z, self._max_rotation_angle_z
+        )
+        scaling_x = uniform(*self._x_factor)
+        if self._preserve_aspect_ratio:
+            scaling_y = scaling_x
+            scaling_z = scaling_x
+        else:
+            scaling_y = uniform(*self._y_factor)
+            scaling_z = uniform(*self._z_factor)
+        scale = tf.stack([scaling_x, scaling_y, scaling_z], axis=-1)
+        translation = tf.stack(
+            [
+                normal(self._x_stddev),
+                normal(self._y_stddev),
+                normal(self._z_stddev),
+            ],
+            axis=-1,
+        )
+
+        # Points are row vectors, so the transforms compose left to right:
+        # [x, y, z, 1] @ flip @ rotation @ scaling @ translation.
+        flip = tf.linalg.diag(
+            tf.stack([tf.ones_like(flip_y), flip_y, tf.ones_like(flip_y)], -1)
+        )
+        # Note: Yaw->Z, Roll->X, Pitch->Y.
+        rotation = _get_3d_rotation_matrix(rotation_z, rotation_x, rotation_y)
+        linear = tf.matmul(tf.matmul(flip, rotation), tf.linalg.diag(scale))
+        # [batch, 4, 4]
+        affine = tf.concat(
+            [
+                tf.concat([linear, tf.zeros_like(linear[:, :, :1])], axis=-1),
+                tf.concat(
+                    [translation, tf.ones_like(translation[:, :1])], axis=-1
+                )[:, tf.newaxis, :],
+            ],
+            axis=1,
+        )
+        return {
+            "affine": affine,
+            "flip_y": flip_y,
+            "rotation_x": rotation_x,
+            "rotation_y": rotation_y,
+            "rotation_z": rotation_z,
+            "scale": scale,
+        }
+
+    def augment_point_clouds_bounding_boxes(
+        self, point_clouds, bounding_boxes, transformation, **kwargs
+    ):
+        # [batch, 1, 4, 4]
+        affine = transformation["affine"][:, tf.newaxis]
+
+        point_clouds_xyz = point_clouds[..., :3]
+        point_clouds_xyz = tf.matmul(
+            tf.concat(
+                [point_clouds_xyz, tf.ones_like(point_clouds_xyz[..., :1])],
+                axis=-1,
+            ),
+            affine,
+        )[..., :3]
+        point_clouds = tf.concat(
+            [point_clouds_xyz, point_clouds[..., 3:]], axis=-1
+        )
+
+        bounding_boxes_xyz = bounding_boxes[..., : CENTER_XYZ_DXDYDZ_PHI.Z + 1]
+        bounding_boxes_xyz = tf.matmul(
+            tf.concat(
+                [bounding_boxes_xyz, tf.ones_like(bounding_boxes_xyz[..., :1])],
+                axis=-1,
+            ),
+            affine,
+        )[..., :3]
+        bounding_boxes_dxdydz = (
+            bounding_boxes[
+                ..., CENTER_XYZ_DXDYDZ_PHI.DX : CENTER_XYZ_DXDYDZ_PHI.DZ + 1
+            ]
+            * transformation["scale"][:, tf.newaxis, tf.newaxis, :]
+        )
+        # Flipping over the Y axis negates the heading, and a rotation along
+        # the Z axis is compensated by subtracting the yaw.
+        bounding_boxes_heading = wrap_angle_radians(
+            bounding_boxes[
+                ..., CENTER_XYZ_DXDYDZ_PHI.PHI : CENTER_XYZ_DXDYDZ_PHI.PHI + 1
+            ]
+            * transformation["flip_y"][:, tf.newaxis, tf.newaxis, tf.newaxis]
+            - transformation["rotation_z"][
+                :, tf.newaxis, tf.newaxis, tf.newaxis
+            ]
+        )
+        bounding_boxes = tf.concat(
+            [
+                bounding_boxes_xyz,
+                bounding_boxes_dxdydz,
+                bounding_boxes_heading,
+                bounding_boxes[..., CENTER_XYZ_DXDYDZ_PHI.CLASS :],
+            ],
+            axis=-1,
+        )
+
+        return (point_clouds, bounding_boxes)
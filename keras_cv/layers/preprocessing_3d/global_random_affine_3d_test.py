@@ -0,0 +1,128 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import tensorflow as tf
+
+from keras_cv.layers.preprocessing_3d import base_augmentation_layer_3d
+from keras_cv.layers.preprocessing_3d.global_random_affine_3d import (
+    GlobalRandomAffine3D,
+)
+from keras_cv.layers.preprocessing_3d.waymo.global_random_flip import (
+    GlobalRandomFlip,
+)
+from keras_cv.layers.preprocessing_3d.waymo.global_random_rotation import (
+    GlobalRandomRotation,
+)
+from keras_cv.layers.preprocessing_3d.waymo.global_random_scaling import (
+    GlobalRandomScaling,
+)
+from keras_cv.layers.preprocessing_3d.waymo.global_random_translation import (
+    GlobalRandomTranslation,
+)
+
+POINT_CLOUDS = base_augmentation_layer_3d.POINT_CLOUDS
+BOUNDING_BOXES = base_augmentation_layer_3d.BOUNDING_BOXES
+
+
+class GlobalRandomAffine3DTest(tf.test.TestCase):
+    def test_augment_point_clouds_and_bounding_boxes(self):
+        add_layer = GlobalRandomAffine3D(
+            max_rotation_angle_z=1.0,
+            x_factor=(0.5, 1.5),
+            x_stddev=1.0,
+        )
+        point_clouds = np.random.random(size=(2, 50, 10)).astype("float32")
+        bounding_boxes = np.random.random(size=(2, 10, 7)).astype("float32")
+        inputs = {POINT_CLOUDS: point_clouds, BOUNDING_BOXES: bounding_boxes}
+        outputs = add_layer(inputs)
+        self.assertNotAllClose(inputs, outputs)
+
+    def test_not_augment_batch_point_clouds_and_bounding_boxes(self):
+        add_layer = GlobalRandomAffine3D()
+        point_clouds = np.random.random(size=(3, 2, 50, 10)).astype("float32")
+        bounding_boxes = np.random.random(size=(3, 2, 10, 7)).astype("float32")
+        inputs = {POINT_CLOUDS: point_clouds, BOUNDING_BOXES: bounding_boxes}
+        outputs = add_layer(inputs)
+        self.assertAllClose(inputs, outputs)
+
+    def test_flip_and_scaling_match_individual_layers(self):
+        add_layer = GlobalRandomAffine3D(
+            flip_y_probability=1.0, x_factor=2.0, y_factor=3.0, z_factor=4.0
+        )
+        point_clouds = np.random.random(size=(3, 2, 50, 10)).astype("float32")
+        bounding_boxes = np.random.random(size=(3, 2, 10, 7)).astype("float32")
+        inputs = {POINT_CLOUDS: point_clouds, BOUNDING_BOXES: bounding_boxes}
+        outputs = add_layer(inputs)
+
+        expected_outputs = GlobalRandomScaling(
+            x_factor=2.0, y_factor=3.0, z_factor=4.0
+        )(GlobalRandomFlip()(inputs))
+        self.assertAllClose(outputs, expected_outputs)
+
+    def test_fused_transformation_matches_chained_layers(self):
+        add_layer = GlobalRandomAffine3D(
+            flip_y_probability=1.0,
+            max_rotation_angle_x=0.5,
+            max_rotation_angle_y=0.5,
+            max_rotation_angle_z=1.0,
+            x_factor=(0.5, 1.5),
+            y_factor=(0.5, 1.5),
+            z_factor=(0.5, 1.5),
+            x_stddev=1.0,
+            y_stddev=1.0,
+            z_stddev=1.0,
+        )
+        point_clouds = np.random.random(size=(3, 2, 50, 10)).astype("float32")
+        bounding_boxes = np.random.random(size=(3, 2, 10, 8)).astype("float32")
+        transformation = add_layer.get_random_transformation_batch(3)
+        outputs = add_layer.augment_point_clouds_bounding_boxes(
+            point_clouds, bounding_boxes, transformation
+        )
+
+        # Replay the same transformation with the individual layers.
+        expected_outputs = (
+            GlobalRandomFlip().augment_point_clouds_bounding_boxes(
+                point_clouds, bounding_boxes, transformation=None
+            )
+        )
+        expected_outputs = (
+            GlobalRandomRotation().augment_point_clouds_bounding_boxes(
+                *expected_outputs,
+                transformation={
+                    "rotation_x": transformation["rotation_x"],
+                    "rotation_y": transformation["rotation_y"],
+                    "rotation_z": transformation["rotation_z"],
+                },
+            )
+        )
+        expected_outputs = (
+            GlobalRandomScaling().augment_point_clouds_bounding_boxes(
+                *expected_outputs,
+                transformation={"scale": transformation["scale"]},
+            )
+        )
+        expected_outputs = GlobalRandomTranslation().augment_point_clouds_bounding_boxes(  # noqa: E501
+            *expected_outputs,
+            transformation={"translation": transformation["affine"][:, 3, :3]},
+        )
+        self.assertAllClose(outputs[0], expected_outputs[0], atol=1e-5)
+        self.assertAllClose(outputs[1], expected_outputs[1], atol=1e-5)
+
+    def test_invalid_arguments_raise_error(self):
+        with self.assertRaisesRegexp(ValueError, "flip_y_probability"):
+            GlobalRandomAffine3D(flip_y_probability=2.0)
+        with self.assertRaisesRegexp(ValueError, "max_rotation_angle_z"):
+            GlobalRandomAffine3D(max_rotation_angle_z=-1.0)
+        with self.assertRaisesRegexp(ValueError, "x_factor"):
+            GlobalRandomAffine3D(x_factor=(1.5, 0.5))
@@ -0,0 +1,135 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tensorflow as tf
+from tensorflow import keras
+
+from keras_cv.layers.preprocessing_3d import base_augmentation_layer_3d
+
+POINT_CLOUDS = base_augmentation_layer_3d.POINT_CLOUDS
+BOUNDING_BOXES = base_augmentation_layer_3d.BOUNDING_BOXES
+
+
+@keras.utils.register_keras_serializable(package="keras_cv")
+class VectorizedBaseAugmentationLayer3D(
+    base_augmentation_layer_3d.BaseAugmentationLayer3D
+):
+    """Abstract base layer for vectorized data augmentation for 3D perception.
+
+    Unlike `BaseAugmentationLayer3D`, which augments one sample at a time under
+    `tf.vectorized_map()` or `tf.map_fn()`, this layer samples the random
+    transformations of a whole batch at once and augments the batch with a
+    single call. Unbatched inputs are augmented as a batch of one.
+
+    This layer requires you to implement one method:
+    `augment_point_clouds_bounding_boxes()`, which augments a batch of point
+    clouds and bounding boxes during training. You can also implement
+    `get_random_transformation_batch()`, which should produce a batch of random
+    transformation settings. The transformation object, which must be a batched
+    Tensor or a dictionary where each item is a batched Tensor, will be passed
+    to `augment_point_clouds_bounding_boxes`.
+
+    Example:
+
+    ```python
+    class RandomTranslateZ(VectorizedBaseAugmentationLayer3D):
+
+      def get_random_transformation_batch(self, batch_size, **kwargs):
+        return self._random_generator.random_normal((batch_size,))
+
+      def augment_point_clouds_bounding_boxes(
+          self, point_clouds, bounding_boxes, transformation, **kwargs
+      ):
+        translation = transformation[:, tf.newaxis, tf.newaxis]
+        point_clouds = tf.concat(
+            [
+                point_clouds[..., :2],
+                point_clouds[..., 2:3] + translation[..., tf.newaxis],
+                point_clouds[..., 3:],
+            ],
+            axis=-1,
+        )
+        ...
+        return point_clouds, bounding_boxes
+    ```
+    """
+
+    def augment_point_clouds_bounding_boxes(
+        self, point_clouds, bounding_boxes, transformation, **kwargs
+    ):
+        """Augment a batch of point cloud frames during training.
+
+        Args:
+          point_clouds: 4D point cloud input tensor to the layer with shape
+            [batch, num of frames, num of points, num of point features].
+          bounding_boxes: 4D bounding boxes tensor to the layer with shape
+            [batch, num of frames, num of boxes, num of box features].
+          transformation: The transformation object produced by
+            `get_random_transformation_batch`. Used to coordinate the
+            randomness between point clouds and bounding boxes.
+
+        Returns:
+          a tuple of augmented point clouds and bounding boxes with the same
+          shapes as the inputs.
+        """
+        raise NotImplementedError()
+
+    def get_random_transformation_batch(
+        self, batch_size, point_clouds=None, bounding_boxes=None, **kwargs
+    ):
+        """Produce random transformation configs for a batch of inputs.
+
+        Args:
+          batch_size: the batch size of transformations configuration to
+            sample.
+          point_clouds: 4D point clouds tensor from inputs.
+          bounding_boxes: 4D bounding boxes tensor from inputs.
+
+        Returns:
+          Any type of object, which will be forwarded to
+          `augment_point_clouds_bounding_boxes` as the `transformation`
+          parameter.
+        """
+        return None
+
+    def _augment(self, inputs):
+        # Augment unbatched inputs as a batch of one.
+        batched_inputs = dict(inputs)
+        for key in (POINT_CLOUDS, BOUNDING_BOXES):
+            batched_inputs[key] = tf.expand_dims(inputs[key], axis=0)
+        outputs = self._batch_augment(batched_inputs)
+        for key in (POINT_CLOUDS, BOUNDING_BOXES):
+            outputs[key] = tf.squeeze(outputs[key], axis=0)
+        return outputs
+
+    def _batch_augment(self, inputs):
+        point_clouds = inputs[POINT_CLOUDS]
+        bounding_boxes = inputs[BOUNDING_BOXES]
+        transformation = self.get_random_transformation_batch(
+            tf.shape(point_clouds)[0],
+            point_clouds=point_clouds,
+            bounding_boxes=bounding_boxes,
+        )
+        point_clouds, bounding_boxes = self.augment_point_clouds_bounding_boxes(
+            point_clouds,
+            bounding_boxes=bounding_boxes,
+            transformation=transformation,
+        )
+
+        result = {POINT_CLOUDS: point_clouds, BOUNDING_BOXES: bounding_boxes}
+
+        # preserve any additional inputs unmodified by this layer.
+        for key in inputs.keys() - result.keys():
+            result[key] = inputs[key]
+        return result
@@ -0,0 +1,110 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import tensorflow as tf
+
+from keras_cv.layers.preprocessing_3d import base_augmentation_layer_3d
+from keras_cv.layers.preprocessing_3d import (
+    vectorized_base_augmentation_layer_3d,
+)
+
+POINT_CLOUDS = base_augmentation_layer_3d.POINT_CLOUDS
+BOUNDING_BOXES = base_augmentation_layer_3d.BOUNDING_BOXES
+
+
+class VectorizedRandomAddLayer(
+    vectorized_base_augmentation_layer_3d.VectorizedBaseAugmentationLayer3D
+):
+    def __init__(self, translate_noise=(0.0, 0.0, 0.0), **kwargs):
+        super().__init__(**kwargs)
+        self._translate_noise = translate_noise
+
+    def get_random_transformation_batch(self, batch_size, **kwargs):
+        return {
+            "translation": self._random_generator.random_normal(
+                (batch_size, 3), mean=0.0, stddev=self._translate_noise
+            )
+        }
+
+    def augment_point_clouds_bounding_boxes(
+        self, point_clouds, bounding_boxes, transformation, **kwargs
+    ):
+        translation = transformation["translation"][:, tf.newaxis, tf.newaxis]
+        point_clouds_xyz = point_clouds[..., :3] + translation
+        bounding_boxes_xyz = bounding_boxes[..., :3] + translation
+        return (
+            tf.concat([point_clouds_xyz, point_clouds[..., 3:]], axis=-1),
+            tf.concat([bounding_boxes_xyz, bounding_boxes[..., 3:]], axis=-1),
+        )
+
+
+class VectorizedBaseAugmentationLayer3DTest(tf.test.TestCase):
+    def test_augment_point_clouds_and_bounding_boxes(self):
+        add_layer = VectorizedRandomAddLayer(translate_noise=(1.0, 1.0, 1.0))
+        point_clouds = np.random.random(size=(2, 50, 10)).astype("float32")
+        bounding_boxes = np.random.random(size=(2, 10, 7)).astype("float32")
+        dummy = np.random.random(size=(2, 10, 7)).astype("float32")
+        inputs = {
+            POINT_CLOUDS: point_clouds,
+            BOUNDING_BOXES: bounding_boxes,
+            "dummy": dummy,
+        }
+        outputs = add_layer(inputs)
+
+        self.assertEqual(outputs[POINT_CLOUDS].shape, point_clouds.shape)
+        self.assertEqual(outputs[BOUNDING_BOXES].shape, bounding_boxes.shape)
+        self.assertAllEqual(inputs["dummy"], outputs["dummy"])
+        self.assertNotAllClose(inputs, outputs)
+
+    def test_augment_batch_uses_one_transformation_per_sample(self):
+        add_layer = VectorizedRandomAddLayer(translate_noise=(1.0, 1.0, 1.0))
+        point_clouds = np.zeros((3, 2, 50, 10)).astype("float32")
+        bounding_boxes = np.zeros((3, 2, 10, 7)).astype("float32")
+        inputs = {POINT_CLOUDS: point_clouds, BOUNDING_BOXES: bounding_boxes}
+        outputs = add_layer(inputs)
+
+        translation = outputs[POINT_CLOUDS][:, :1, :1, :3]
+        # All points and boxes of a sample are translated the same way, and
+        # samples are translated independently.
+        self.assertAllClose(
+            outputs[POINT_CLOUDS][..., :3],
+            tf.broadcast_to(translation, (3, 2, 50, 3)),
+        )
+        self.assertAllClose(
+            outputs[BOUNDING_BOXES][..., :3],
+            tf.broadcast_to(translation, (3, 2, 10, 3)),
+        )
+        self.assertNotAllClose(translation[0], translation[1])
+
+    def test_augment_batch_with_unknown_batch_size(self):
+        add_layer = VectorizedRandomAddLayer(translate_noise=(1.0, 1.0, 1.0))
+
+        @tf.function(
+            input_signature=[
+                {
+                    POINT_CLOUDS: tf.TensorSpec([None, 2, 50, 10]),
+                    BOUNDING_BOXES: tf.TensorSpec([None, 2, 10, 7]),
+                }
+            ]
+        )
+        def augment(inputs):
+            return add_layer(inputs)
+
+        point_clouds = np.random.random(size=(3, 2, 50, 10)).astype("float32")
+        bounding_boxes = np.random.random(size=(3, 2, 10, 7)).astype("float32")
+        outputs = augment(
+            {POINT_CLOUDS: point_clouds, BOUNDING_BOXES: bounding_boxes}
+        )
+        self.assertEqual(outputs[POINT_CLOUDS].shape, point_clouds.shape)
+        self.assertEqual(outputs[BOUNDING_BOXES].shape, bounding_boxes.shape)
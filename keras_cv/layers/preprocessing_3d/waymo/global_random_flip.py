@@ -7,6 +7,9 @@ from tensorflow import keras
 
 from keras_cv.bounding_box_3d import CENTER_XYZ_DXDYDZ_PHI
 from keras_cv.layers.preprocessing_3d import base_augmentation_layer_3d
+from keras_cv.layers.preprocessing_3d import (
+    vectorized_base_augmentation_layer_3d,
+)
 from keras_cv.point_cloud import wrap_angle_radians
 
 POINT_CLOUDS = base_augmentation_layer_3d.POINT_CLOUDS
@@ -14,7 +17,9 @@ BOUNDING_BOXES = base_augmentation_layer_3d.BOUNDING_BOXES
 
 
 @keras.utils.register_keras_serializable(package="keras_cv")
-class GlobalRandomFlip(base_augmentation_layer_3d.BaseAugmentationLayer3D):
+class GlobalRandomFlip(
+    vectorized_base_augmentation_layer_3d.VectorizedBaseAugmentationLayer3D
+):
     """A preprocessing layer which flips point clouds and bounding boxes with
     respect to the specified axis during training.
 
@@ -7,15 +7,20 @@ from tensorflow import keras
 
 from keras_cv.bounding_box_3d import CENTER_XYZ_DXDYDZ_PHI
 from keras_cv.layers.preprocessing_3d import base_augmentation_layer_3d
-from keras_cv.point_cloud import coordinate_transform
+from keras_cv.layers.preprocessing_3d import (
+    vectorized_base_augmentation_layer_3d,
+)
 from keras_cv.point_cloud import wrap_angle_radians
+from keras_cv.point_cloud.point_cloud import _get_3d_rotation_matrix
 
 POINT_CLOUDS = base_augmentation_layer_3d.POINT_CLOUDS
 BOUNDING_BOXES = base_augmentation_layer_3d.BOUNDING_BOXES
 
 
 @keras.utils.register_keras_serializable(package="keras_cv")
-class GlobalRandomRotation(base_augmentation_layer_3d.BaseAugmentationLayer3D):
+class GlobalRandomRotation(
+    vectorized_base_augmentation_layer_3d.VectorizedBaseAugmentationLayer3D
+):
     """A preprocessing layer which randomly rotates point clouds and bounding
     boxes along X, Y and Z axes during training.
 
@@ -83,56 +88,56 @@ class GlobalRandomRotation(base_augmentation_layer_3d.BaseAugmentationLayer3D):
             "max_rotation_angle_z": self._max_rotation_angle_z,
         }
 
-    def get_random_transformation(self, **kwargs):
+    def get_random_transformation_batch(self, batch_size, **kwargs):
         random_rotation_x = self._random_generator.random_uniform(
-            (),
+            (batch_size,),
             minval=-self._max_rotation_angle_x,
             maxval=self._max_rotation_angle_x,
             dtype=self.compute_dtype,
         )
         random_rotation_y = self._random_generator.random_uniform(
-            (),
+            (batch_size,),
             minval=-self._max_rotation_angle_y,
             maxval=self._max_rotation_angle_y,
             dtype=self.compute_dtype,
         )
         random_rotation_z = self._random_generator.random_uniform(
-            (),
+            (batch_size,),
             minval=-self._max_rotation_angle_z,
             maxval=self._max_rotation_angle_z,
             dtype=self.compute_dtype,
         )
         return {
-            "pose": tf.stack(
-                [
-                    0,
-                    0,
-                    0,
-                    random_rotation_z,
-                    random_rotation_x,
-                    random_rotation_y,
-                ],
-                axis=0,
-            )
+            "rotation_x": random_rotation_x,
+            "rotation_y": random_rotation_y,
+            "rotation_z": random_rotation_z,
         }
 
     def augment_point_clouds_bounding_boxes(
         self, point_clouds, bounding_boxes, transformation, **kwargs
     ):
-        pose = transformation["pose"]
-        point_clouds_xyz = coordinate_transform(point_clouds[..., :3], pose)
+        # Note: Yaw->Z, Roll->X, Pitch->Y.
+        # [batch, 1, 3, 3]
+        rotation_matrix = _get_3d_rotation_matrix(
+            transformation["rotation_z"],
+            transformation["rotation_x"],
+            transformation["rotation_y"],
+        )[:, tf.newaxis]
+        point_clouds_xyz = tf.matmul(point_clouds[..., :3], rotation_matrix)
         point_clouds = tf.concat(
             [point_clouds_xyz, point_clouds[..., 3:]], axis=-1
         )
 
-        bounding_boxes_xyz = coordinate_transform(
-            bounding_boxes[..., : CENTER_XYZ_DXDYDZ_PHI.Z + 1], pose
+        bounding_boxes_xyz = tf.matmul(
+            bounding_boxes[..., : CENTER_XYZ_DXDYDZ_PHI.Z + 1], rotation_matrix
         )
         bounding_boxes_heading = wrap_angle_radians(
             tf.expand_dims(
                 bounding_boxes[..., CENTER_XYZ_DXDYDZ_PHI.PHI], axis=-1
             )
-            - pose[3]
+            - transformation["rotation_z"][
+                :, tf.newaxis, tf.newaxis, tf.newaxis
+            ]
         )
         bounding_boxes = tf.concat(
             [
@@ -7,13 +7,18 @@ from tensorflow import keras
 
 from keras_cv.bounding_box_3d import CENTER_XYZ_DXDYDZ_PHI
 from keras_cv.layers.preprocessing_3d import base_augmentation_layer_3d
+from keras_cv.layers.preprocessing_3d import (
+    vectorized_base_augmentation_layer_3d,
+)
 
 POINT_CLOUDS = base_augmentation_layer_3d.POINT_CLOUDS
 BOUNDING_BOXES = base_augmentation_layer_3d.BOUNDING_BOXES
 
 
 @keras.utils.register_keras_serializable(package="keras_cv")
-class GlobalRandomScaling(base_augmentation_layer_3d.BaseAugmentationLayer3D):
+class GlobalRandomScaling(
+    vectorized_base_augmentation_layer_3d.VectorizedBaseAugmentationLayer3D
+):
     """A preprocessing layer which randomly scales point clouds and bounding
     boxes along X, Y, and Z axes during training.
 
@@ -132,21 +137,21 @@ class GlobalRandomScaling(base_augmentation_layer_3d.BaseAugmentationLayer3D):
             "preserve_aspect_ratio": self._preserve_aspect_ratio,
         }
 
-    def get_random_transformation(self, **kwargs):
+    def get_random_transformation_batch(self, batch_size, **kwargs):
         random_scaling_x = self._random_generator.random_uniform(
-            (),
+            (batch_size,),
             minval=self._min_x_factor,
             maxval=self._max_x_factor,
             dtype=self.compute_dtype,
         )
         random_scaling_y = self._random_generator.random_uniform(
-            (),
+            (batch_size,),
             minval=self._min_y_factor,
             maxval=self._max_y_factor,
             dtype=self.compute_dtype,
         )
         random_scaling_z = self._random_generator.random_uniform(
-            (),
+            (batch_size,),
             minval=self._min_z_factor,
             maxval=self._max_z_factor,
             dtype=self.compute_dtype,
@@ -154,20 +159,22 @@ class GlobalRandomScaling(base_augmentation_layer_3d.BaseAugmentationLayer3D):
         if not self._preserve_aspect_ratio:
             return {
                 "scale": tf.stack(
-                    [random_scaling_x, random_scaling_y, random_scaling_z]
+                    [random_scaling_x, random_scaling_y, random_scaling_z],
+                    axis=-1,
                 )
             }
         else:
             return {
                 "scale": tf.stack(
-                    [random_scaling_x, random_scaling_x, random_scaling_x]
+                    [random_scaling_x, random_scaling_x, random_scaling_x],
+                    axis=-1,
                 )
             }
 
     def augment_point_clouds_bounding_boxes(
         self, point_clouds, bounding_boxes, transformation, **kwargs
     ):
-        scale = transformation["scale"][tf.newaxis, tf.newaxis, :]
+        scale = transformation["scale"][:, tf.newaxis, tf.newaxis, :]
         point_clouds_xyz = point_clouds[..., :3] * scale
         point_clouds = tf.concat(
             [point_clouds_xyz, point_clouds[..., 3:]], axis=-1
@@ -7,7 +7,9 @@ from tensorflow import keras
 
 from keras_cv.bounding_box_3d import CENTER_XYZ_DXDYDZ_PHI
 from keras_cv.layers.preprocessing_3d import base_augmentation_layer_3d
-from keras_cv.point_cloud import coordinate_transform
+from keras_cv.layers.preprocessing_3d import (
+    vectorized_base_augmentation_layer_3d,
+)
 
 POINT_CLOUDS = base_augmentation_layer_3d.POINT_CLOUDS
 BOUNDING_BOXES = base_augmentation_layer_3d.BOUNDING_BOXES
@@ -15,7 +17,7 @@ BOUNDING_BOXES = base_augmentation_layer_3d.BOUNDING_BOXES
 
 @keras.utils.register_keras_serializable(package="keras_cv")
 class GlobalRandomTranslation(
-    base_augmentation_layer_3d.BaseAugmentationLayer3D
+    vectorized_base_augmentation_layer_3d.VectorizedBaseAugmentationLayer3D
 ):
     """A preprocessing layer which randomly translates point clouds and bounding
     boxes along X, Y, and Z axes during training.
@@ -66,44 +68,47 @@ class GlobalRandomTranslation(
             "z_stddev": self._z_stddev,
         }
 
-    def get_random_transformation(self, **kwargs):
+    def get_random_transformation_batch(self, batch_size, **kwargs):
         random_x_translation = self._random_generator.random_normal(
-            (), mean=0.0, stddev=self._x_stddev, dtype=self.compute_dtype
+            (batch_size,),
+            mean=0.0,
+            stddev=self._x_stddev,
+            dtype=self.compute_dtype,
         )
         random_y_translation = self._random_generator.random_normal(
-            (), mean=0.0, stddev=self._y_stddev, dtype=self.compute_dtype
+            (batch_size,),
+            mean=0.0,
+            stddev=self._y_stddev,
+            dtype=self.compute_dtype,
         )
         random_z_translation = self._random_generator.random_normal(
-            (),
+            (batch_size,),
             mean=0.0,
             stddev=self._z_stddev,
             dtype=self.compute_dtype,
         )
         return {
-            "pose": tf.stack(
+            "translation": tf.stack(
                 [
                     random_x_translation,
                     random_y_translation,
                     random_z_translation,
-                    0.0,
-                    0.0,
-                    0.0,
                 ],
-                axis=0,
+                axis=-1,
             )
         }
 
     def augment_point_clouds_bounding_boxes(
         self, point_clouds, bounding_boxes, transformation, **kwargs
     ):
-        pose = transformation["pose"]
-        point_clouds_xyz = coordinate_transform(point_clouds[..., :3], pose)
+        translation = transformation["translation"][:, tf.newaxis, tf.newaxis]
+        point_clouds_xyz = point_clouds[..., :3] + translation
         point_clouds = tf.concat(
             [point_clouds_xyz, point_clouds[..., 3:]], axis=-1
         )
 
-        bounding_boxes_xyz = coordinate_transform(
-            bounding_boxes[..., : CENTER_XYZ_DXDYDZ_PHI.Z + 1], pose
+        bounding_boxes_xyz = (
+            bounding_boxes[..., : CENTER_XYZ_DXDYDZ_PHI.Z + 1] + translation
         )
         bounding_boxes = tf.concat(
             [
@@ -40,7 +40,9 @@ class GroupPointsByBoundingBoxes(
       additional items for OBJECT_POINT_CLOUDS (shape [num of frames, num of
       valid boxes, max num of points, num of point features]) and
       OBJECT_BOUNDING_BOXES (shape [num of frames, num of valid boxes, num of
-      box features]).
+      box features]). Batched inputs produce an additional leading batch
+      dimension, where num of valid boxes is the largest number of valid boxes
+      in the batch and the remaining boxes and points are zero padded.
 
     Arguments:
       label_index: An optional int scalar sets the target object index.
@@ -93,65 +95,90 @@ class GroupPointsByBoundingBoxes(
     def augment_point_clouds_bounding_boxes(
         self, point_clouds, bounding_boxes, **kwargs
     ):
+        # Both unbatched [num of frames, ...] and batched [batch, num of
+        # frames, ...] inputs are supported, all ops below broadcast over the
+        # leading dimensions.
+        batch_dims = point_clouds.shape.rank - 3
+        # Filter bounding boxes using the current frame.
+        # [..., num of boxes]
+        bounding_boxes_class = bounding_boxes[
+            ..., 0, :, CENTER_XYZ_DXDYDZ_PHI.CLASS
+        ]
         if self._label_index:
-            bounding_boxes_mask = (
-                bounding_boxes[0, :, CENTER_XYZ_DXDYDZ_PHI.CLASS]
-                == self._label_index
-            )
-            object_bounding_boxes = tf.boolean_mask(
-                bounding_boxes, bounding_boxes_mask, axis=1
-            )
+            bounding_boxes_mask = bounding_boxes_class == self._label_index
         else:
-            bounding_boxes_mask = (
-                bounding_boxes[0, :, CENTER_XYZ_DXDYDZ_PHI.CLASS] > 0.0
-            )
-            object_bounding_boxes = tf.boolean_mask(
-                bounding_boxes, bounding_boxes_mask, axis=1
-            )
+            bounding_boxes_mask = bounding_boxes_class > 0.0
 
+        # [..., num of frames, num of points, num of boxes].
         points_in_bounding_boxes = is_within_box3d(
-            point_clouds[:, :, :3], object_bounding_boxes[:, :, :7]
+            point_clouds[..., :3], bounding_boxes[..., :7]
         )
-        # Filter bounding boxes using the current frame.
-        # [num_boxes]
-        min_points_filter = (
-            tf.reduce_sum(
-                tf.cast(points_in_bounding_boxes[0], dtype=tf.int32), axis=0
-            )
-            >= self._min_points_per_bounding_boxes
+        num_points_in_bounding_boxes = tf.reduce_sum(
+            tf.cast(points_in_bounding_boxes[..., 0, :, :], dtype=tf.int32),
+            axis=-2,
         )
-
-        object_bounding_boxes = tf.boolean_mask(
-            object_bounding_boxes, min_points_filter, axis=1
+        bounding_boxes_mask = tf.math.logical_and(
+            bounding_boxes_mask,
+            num_points_in_bounding_boxes >= self._min_points_per_bounding_boxes,
         )
 
-        points_in_bounding_boxes = tf.boolean_mask(
-            points_in_bounding_boxes, min_points_filter, axis=2
+        # Move valid bounding boxes to the front, and only keep as many boxes
+        # as the sample with the most valid boxes in the batch has.
+        num_valid_bounding_boxes = tf.reduce_max(
+            tf.reduce_sum(tf.cast(bounding_boxes_mask, tf.int32), axis=-1)
         )
-        # [num of frames, num of boxes, num of points].
-        points_in_bounding_boxes = tf.transpose(
-            points_in_bounding_boxes, [0, 2, 1]
+        box_index = tf.argsort(
+            tf.cast(~bounding_boxes_mask, tf.int32), axis=-1, stable=True
+        )[..., :num_valid_bounding_boxes]
+        bounding_boxes_mask = tf.gather(
+            bounding_boxes_mask, box_index, batch_dims=batch_dims
         )
-        points_in_bounding_boxes = tf.cast(points_in_bounding_boxes, tf.int32)
-        sort_valid_index = tf.argsort(
-            points_in_bounding_boxes, axis=-1, direction="DESCENDING"
+        # [..., num of frames, num of valid boxes].
+        box_index = tf.broadcast_to(
+            box_index[..., tf.newaxis, :],
+            tf.concat(
+                [tf.shape(point_clouds)[:-2], tf.shape(box_index)[-1:]],
+                axis=0,
+            ),
         )
-        sort_valid_mask = tf.gather(
-            points_in_bounding_boxes, sort_valid_index, axis=2, batch_dims=2
-        )[:, :, : self._max_points_per_bounding_boxes]
-        # [num of frames, num of boxes, self._max_points_per_bounding_boxes, num
-        # of point features].
-        object_point_clouds = point_clouds[:, tf.newaxis, :, :]
-        num_valid_bounding_boxes = tf.shape(object_bounding_boxes)[1]
-        object_point_clouds = tf.tile(
-            object_point_clouds, [1, num_valid_bounding_boxes, 1, 1]
+        object_bounding_boxes = tf.gather(
+            bounding_boxes, box_index, batch_dims=batch_dims + 1
+        )
+        object_bounding_boxes = tf.where(
+            bounding_boxes_mask[..., tf.newaxis, :, tf.newaxis],
+            object_bounding_boxes,
+            0.0,
         )
-        object_point_clouds = tf.gather(
-            object_point_clouds, sort_valid_index, axis=2, batch_dims=2
-        )[:, :, : self._max_points_per_bounding_boxes, :]
 
+        # [..., num of frames, num of valid boxes, num of points].
+        points_in_bounding_boxes = tf.gather(
+            tf.linalg.matrix_transpose(points_in_bounding_boxes),
+            box_index,
+            batch_dims=batch_dims + 1,
+        )
+        points_in_bounding_boxes = tf.math.logical_and(
+            points_in_bounding_boxes,
+            bounding_boxes_mask[..., tf.newaxis, :, tf.newaxis],
+        )
+        # Move points in each box to the front while keeping their order.
+        # [..., num of frames, num of valid boxes,
+        # self._max_points_per_bounding_boxes].
+        point_index = tf.argsort(
+            tf.cast(~points_in_bounding_boxes, tf.int32), axis=-1, stable=True
+        )[..., : self._max_points_per_bounding_boxes]
+        point_mask = tf.gather(
+            points_in_bounding_boxes, point_index, batch_dims=batch_dims + 2
+        )
+        # [..., num of frames, num of valid boxes,
+        # self._max_points_per_bounding_boxes, num of point features].
+        object_point_clouds = tf.gather(
+            point_clouds,
+            point_index,
+            axis=batch_dims + 1,
+            batch_dims=batch_dims + 1,
+        )
         object_point_clouds = tf.where(
-            sort_valid_mask[:, :, :, tf.newaxis] > 0, object_point_clouds, 0.0
+            point_mask[..., tf.newaxis], object_point_clouds, 0.0
         )
 
         return (
@@ -236,32 +263,14 @@ class GroupPointsByBoundingBoxes(
         # TODO(ianstenbit): Support the model input format.
         point_clouds = inputs[POINT_CLOUDS]
         bounding_boxes = inputs[BOUNDING_BOXES]
-        if point_clouds.shape.rank == 3 and bounding_boxes.shape.rank == 3:
-            return self._augment(inputs)
-        elif point_clouds.shape.rank == 4 and bounding_boxes.shape.rank == 4:
-            batch = point_clouds.get_shape().as_list()[0]
-            object_point_clouds_list = []
-            object_bounding_boxes_list = []
-            for i in range(batch):
-                (
-                    object_point_clouds,
-                    object_bounding_boxes,
-                ) = self.augment_point_clouds_bounding_boxes(
-                    inputs[POINT_CLOUDS][i], inputs[BOUNDING_BOXES][i]
-                )
-                object_point_clouds_list += [object_point_clouds]
-                object_bounding_boxes_list += [object_bounding_boxes]
-            # object_point_clouds shape [num of frames, num of valid boxes,
-            # max num of points, num of point features].
-            inputs[OBJECT_POINT_CLOUDS] = tf.concat(
-                object_point_clouds_list, axis=-3
-            )
-            # object_bounding_boxes shape [num of frames, num of valid
+        if point_clouds.shape.rank in (3, 4) and (
+            bounding_boxes.shape.rank == point_clouds.shape.rank
+        ):
+            # object_point_clouds shape [(batch), num of frames, num of valid
+            # boxes, max num of points, num of point features].
+            # object_bounding_boxes shape [(batch), num of frames, num of valid
             # boxes, num of box features].
-            inputs[OBJECT_BOUNDING_BOXES] = tf.concat(
-                object_bounding_boxes_list, axis=-2
-            )
-            return inputs
+            return self._augment(inputs)
         else:
             raise ValueError(
                 "Point clouds augmentation layers are expecting inputs "
@@ -117,15 +117,17 @@ class GroupPointsByBoundingBoxesTest(tf.test.TestCase):
         object_point_clouds = np.array(
             [
                 [
-                    [[0, 1, 2, 3, 4], [0, -1, 2, 3, 4]],
-                    [[10, 1, 2, 3, 4], [0, 0, 0, 0, 0]],
+                    [
+                        [[0, 1, 2, 3, 4], [0, -1, 2, 3, 4]],
+                        [[10, 1, 2, 3, 4], [0, 0, 0, 0, 0]],
+                    ]
                 ]
-                * 3
+                * 2
             ]
-            * 2
+            * 3
         ).astype("float32")
         object_bounding_boxes = np.array(
-            [[[0, 0, 0, 4, 4, 4, 0, 1], [10, 1, 2, 2, 2, 2, 0, 1]] * 3] * 2
+            [[[[0, 0, 0, 4, 4, 4, 0, 1], [10, 1, 2, 2, 2, 2, 0, 1]]] * 2] * 3
         ).astype("float32")
         self.assertAllClose(inputs[POINT_CLOUDS], outputs[POINT_CLOUDS])
         self.assertAllClose(inputs[BOUNDING_BOXES], outputs[BOUNDING_BOXES])
@@ -140,6 +142,77 @@ class GroupPointsByBoundingBoxesTest(tf.test.TestCase):
             outputs[OBJECT_BOUNDING_BOXES], object_bounding_boxes
         )
 
+    def test_augment_batch_with_different_number_of_valid_boxes(self):
+        add_layer = GroupPointsByBoundingBoxes(
+            label_index=1,
+            min_points_per_bounding_boxes=1,
+            max_points_per_bounding_boxes=2,
+        )
+        point_clouds = np.array(
+            [
+                [
+                    [0, 1, 2, 3, 4],
+                    [10, 1, 2, 3, 4],
+                    [0, -1, 2, 3, 4],
+                    [100, 100, 2, 3, 4],
+                ]
+            ]
+            * 2
+        ).astype("float32")
+        bounding_boxes = np.array(
+            [
+                [
+                    [
+                        [0, 0, 0, 4, 4, 4, 0, 1],
+                        [10, 1, 2, 2, 2, 2, 0, 1],
+                        [20, 20, 20, 1, 1, 1, 0, 1],
+                    ]
+                ]
+                * 2,
+                [
+                    [
+                        [20, 20, 20, 1, 1, 1, 0, 1],
+                        [10, 1, 2, 2, 2, 2, 0, 1],
+                        [0, 0, 0, 4, 4, 4, 0, 2],
+                    ]
+                ]
+                * 2,
+            ]
+        ).astype("float32")
+        inputs = {
+            POINT_CLOUDS: np.stack([point_clouds] * 2),
+            BOUNDING_BOXES: bounding_boxes,
+        }
+        outputs = tf.function(add_layer)(inputs)
+        object_point_clouds = np.array(
+            [
+                [
+                    [
+                        [[0, 1, 2, 3, 4], [0, -1, 2, 3, 4]],
+                        [[10, 1, 2, 3, 4], [0, 0, 0, 0, 0]],
+                    ]
+                ]
+                * 2,
+                [
+                    [
+                        [[10, 1, 2, 3, 4], [0, 0, 0, 0, 0]],
+                        [[0, 0, 0, 0, 0], [0, 0, 0, 0, 0]],
+                    ]
+                ]
+                * 2,
+            ]
+        ).astype("float32")
+        object_bounding_boxes = np.array(
+            [
+                [[[0, 0, 0, 4, 4, 4, 0, 1], [10, 1, 2, 2, 2, 2, 0, 1]]] * 2,
+                [[[10, 1, 2, 2, 2, 2, 0, 1], [0, 0, 0, 0, 0, 0, 0, 0]]] * 2,
+            ]
+        ).astype("float32")
+        self.assertAllClose(outputs[OBJECT_POINT_CLOUDS], object_point_clouds)
+        self.assertAllClose(
+            outputs[OBJECT_BOUNDING_BOXES], object_bounding_boxes
+        )
+
     @pytest.mark.skipif(
         "TEST_CUSTOM_OPS" not in os.environ
         or os.environ["TEST_CUSTOM_OPS"] != "true",
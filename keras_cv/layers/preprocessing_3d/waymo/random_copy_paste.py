@@ -9,11 +9,27 @@ from keras_cv.bounding_box_3d import CENTER_XYZ_DXDYDZ_PHI
 from keras_cv.layers.preprocessing_3d import base_augmentation_layer_3d
 from keras_cv.ops import iou_3d
 from keras_cv.point_cloud import is_within_any_box3d
+from keras_cv.point_cloud.point_cloud import _get_shape
 
 POINT_CLOUDS = base_augmentation_layer_3d.POINT_CLOUDS
 BOUNDING_BOXES = base_augmentation_layer_3d.BOUNDING_BOXES
 OBJECT_POINT_CLOUDS = base_augmentation_layer_3d.OBJECT_POINT_CLOUDS
 OBJECT_BOUNDING_BOXES = base_augmentation_layer_3d.OBJECT_BOUNDING_BOXES
+compact_by_mask = base_augmentation_layer_3d.compact_by_mask
+
+
+def _pairwise_iou_3d(bounding_boxes):
+    """Computes pairwise IoUs of [..., num of boxes, 7] bounding boxes."""
+    if bounding_boxes.shape.rank == 2:
+        return iou_3d(bounding_boxes, bounding_boxes)
+    # The IoU custom op only supports a single set of boxes.
+    return tf.map_fn(
+        _pairwise_iou_3d,
+        bounding_boxes,
+        fn_output_signature=tf.TensorSpec(
+            [None, None], dtype=bounding_boxes.dtype
+        ),
+    )
 
 
 @keras.utils.register_keras_serializable(package="keras_cv")
@@ -98,69 +114,89 @@ class RandomCopyPaste(base_augmentation_layer_3d.BaseAugmentationLayer3D):
         **kwargs
     ):
         del point_clouds
+        # Both unbatched [num of frames, ...] and batched [batch, num of
+        # frames, ...] inputs are supported. Instead of dropping objects,
+        # objects which should not be pasted are zeroed out so that the padded
+        # layout is kept.
+        batch_dims = bounding_boxes.shape.rank - 3
+        batch_shape = tf.shape(bounding_boxes)[:batch_dims]
         num_paste_bounding_boxes = self._random_generator.random_uniform(
-            (),
+            batch_shape,
             minval=self._min_paste_bounding_boxes,
             maxval=self._max_paste_bounding_boxes,
         )
         num_paste_bounding_boxes = tf.cast(
             num_paste_bounding_boxes, dtype=tf.int32
         )
-        num_existing_bounding_boxes = tf.shape(bounding_boxes)[1]
+        num_existing_bounding_boxes = tf.shape(bounding_boxes)[-2]
+        object_class = object_bounding_boxes[
+            ..., 0, :, CENTER_XYZ_DXDYDZ_PHI.CLASS
+        ]
         if self._label_index:
-            object_mask = (
-                object_bounding_boxes[0, :, CENTER_XYZ_DXDYDZ_PHI.CLASS]
-                == self._label_index
-            )
-            object_point_clouds = tf.boolean_mask(
-                object_point_clouds, object_mask, axis=1
-            )
-            object_bounding_boxes = tf.boolean_mask(
-                object_bounding_boxes, object_mask, axis=1
-            )
-        shuffle_index = tf.range(tf.shape(object_point_clouds)[1])
-        shuffle_index = tf.random.shuffle(shuffle_index)
+            object_mask = object_class == self._label_index
+        else:
+            object_mask = object_class > 0.0
+
+        # Shuffle objects, moving invalid objects to the back.
+        shuffle_keys = self._random_generator.random_uniform(
+            tf.shape(object_mask)
+        )
+        shuffle_index = tf.argsort(
+            tf.where(object_mask, shuffle_keys, 2.0), axis=-1, stable=True
+        )
+        object_mask = tf.gather(
+            object_mask, shuffle_index, batch_dims=batch_dims
+        )
+        shuffle_index = tf.broadcast_to(
+            shuffle_index[..., tf.newaxis, :],
+            tf.shape(object_bounding_boxes)[:-1],
+        )
         object_point_clouds = tf.gather(
-            object_point_clouds, shuffle_index, axis=1
+            object_point_clouds, shuffle_index, batch_dims=batch_dims + 1
         )
         object_bounding_boxes = tf.gather(
-            object_bounding_boxes, shuffle_index, axis=1
+            object_bounding_boxes, shuffle_index, batch_dims=batch_dims + 1
         )
 
         # Load at most 5 times num_paste_bounding_boxes to check overlaps.
         num_compare_bounding_boxes = tf.math.minimum(
             num_paste_bounding_boxes * 5,
-            tf.shape(object_point_clouds)[1],
+            tf.reduce_sum(tf.cast(object_mask, tf.int32), axis=-1),
+        )
+        object_index = tf.range(tf.shape(object_mask)[-1])
+        compare_mask = (
+            object_index < num_compare_bounding_boxes[..., tf.newaxis]
         )
 
-        object_point_clouds = object_point_clouds[
-            :, :num_compare_bounding_boxes, :
-        ]
-        object_bounding_boxes = object_bounding_boxes[
-            :, :num_compare_bounding_boxes, :
-        ]
         # Use the current frame to check overlap between existing bounding boxes
         # and pasted bounding boxes
         all_bounding_boxes = tf.concat(
-            [bounding_boxes, object_bounding_boxes], axis=1
-        )[0, :, :7]
-        iou = iou_3d(all_bounding_boxes, all_bounding_boxes)
+            [bounding_boxes, object_bounding_boxes], axis=-2
+        )[..., 0, :, :7]
+        iou = _pairwise_iou_3d(all_bounding_boxes)
         iou = tf.linalg.band_part(iou, -1, 0)
-        iou_sum = tf.reduce_sum(iou[num_existing_bounding_boxes:], axis=1)
-        # A non overlapping bounding box has a 1.0 IoU with itself.
-        non_overlapping_mask = tf.reshape(iou_sum <= 1, [-1])
-        object_point_clouds = tf.boolean_mask(
-            object_point_clouds, non_overlapping_mask, axis=1
+        iou_sum = tf.reduce_sum(
+            iou[..., num_existing_bounding_boxes:, :], axis=-1
         )
-        object_bounding_boxes = tf.boolean_mask(
-            object_bounding_boxes, non_overlapping_mask, axis=1
+        # A non overlapping bounding box has a 1.0 IoU with itself. Boxes
+        # beyond the compared ones are sorted last, so they never contribute
+        # to the lower triangular sums of the compared boxes.
+        non_overlapping_mask = tf.math.logical_and(iou_sum <= 1, compare_mask)
+        paste_mask = tf.math.logical_and(
+            non_overlapping_mask,
+            tf.math.cumsum(tf.cast(non_overlapping_mask, tf.int32), axis=-1)
+            <= num_paste_bounding_boxes[..., tf.newaxis],
+        )
+        object_point_clouds = tf.where(
+            paste_mask[..., tf.newaxis, :, tf.newaxis, tf.newaxis],
+            object_point_clouds,
+            0.0,
+        )
+        object_bounding_boxes = tf.where(
+            paste_mask[..., tf.newaxis, :, tf.newaxis],
+            object_bounding_boxes,
+            0.0,
         )
-        object_point_clouds = object_point_clouds[
-            :, :num_paste_bounding_boxes, :
-        ]
-        object_bounding_boxes = object_bounding_boxes[
-            :, :num_paste_bounding_boxes, :
-        ]
         return {
             OBJECT_POINT_CLOUDS: object_point_clouds,
             OBJECT_BOUNDING_BOXES: object_bounding_boxes,
@@ -171,63 +207,45 @@ class RandomCopyPaste(base_augmentation_layer_3d.BaseAugmentationLayer3D):
     ):
         additional_object_point_clouds = transformation[OBJECT_POINT_CLOUDS]
         additional_object_bounding_boxes = transformation[OBJECT_BOUNDING_BOXES]
-        original_point_clouds_shape = point_clouds.get_shape().as_list()
-        original_object_bounding_boxes = bounding_boxes.get_shape().as_list()
+        num_points = _get_shape(point_clouds)[-2]
+        num_bounding_boxes = _get_shape(bounding_boxes)[-2]
         points_in_paste_bounding_boxes = is_within_any_box3d(
             point_clouds[..., :3], additional_object_bounding_boxes[..., :7]
         )
-        num_frames = point_clouds.get_shape().as_list()[0]
-        point_clouds_list = []
-        bounding_boxes_list = []
-        for frame_index in range(num_frames):
-            # Remove background point clouds that are in object_bounding_boxes.
-            existing_point_clouds_mask = ~points_in_paste_bounding_boxes[
-                frame_index, :
-            ] & tf.math.greater(point_clouds[frame_index, :, 3], 0.0)
-            existing_point_clouds = tf.boolean_mask(
-                point_clouds[frame_index], existing_point_clouds_mask, axis=0
-            )
-            paste_point_clouds = tf.boolean_mask(
-                additional_object_point_clouds[frame_index],
-                tf.math.greater(
-                    additional_object_point_clouds[frame_index, :, :, 3], 0.0
-                ),
-                axis=0,
-            )
-            point_clouds_list += [
-                tf.concat([paste_point_clouds, existing_point_clouds], axis=0)
-            ]
-
-            existing_bounding_boxes = tf.boolean_mask(
-                bounding_boxes[frame_index],
-                tf.math.greater(
-                    bounding_boxes[frame_index, :, CENTER_XYZ_DXDYDZ_PHI.CLASS],
-                    0.0,
-                ),
-            )
-            paste_bounding_boxes = tf.boolean_mask(
-                additional_object_bounding_boxes[frame_index],
-                tf.math.greater(
-                    additional_object_bounding_boxes[
-                        frame_index, :, CENTER_XYZ_DXDYDZ_PHI.CLASS
-                    ],
-                    0.0,
-                ),
-                axis=0,
-            )
-            bounding_boxes_list += [
-                tf.concat(
-                    [paste_bounding_boxes, existing_bounding_boxes], axis=0
-                )
-            ]
-
-        point_clouds = tf.ragged.stack(point_clouds_list)
-        bounding_boxes = tf.ragged.stack(bounding_boxes_list)
-
-        return (
-            point_clouds.to_tensor(shape=original_point_clouds_shape),
-            bounding_boxes.to_tensor(shape=original_object_bounding_boxes),
+        # Remove background point clouds that are in object_bounding_boxes.
+        existing_point_clouds_mask = ~points_in_paste_bounding_boxes & (
+            tf.math.greater(point_clouds[..., 3], 0.0)
+        )
+        # [..., num of frames, num of objects * num of object points, num of
+        # point features].
+        object_point_clouds_shape = _get_shape(additional_object_point_clouds)
+        paste_point_clouds = tf.reshape(
+            additional_object_point_clouds,
+            object_point_clouds_shape[:-3]
+            + [-1, object_point_clouds_shape[-1]],
         )
+        point_clouds = compact_by_mask(
+            tf.concat([paste_point_clouds, point_clouds], axis=-2),
+            tf.concat(
+                [
+                    tf.math.greater(paste_point_clouds[..., 3], 0.0),
+                    existing_point_clouds_mask,
+                ],
+                axis=-1,
+            ),
+            num_points,
+        )
+        bounding_boxes = tf.concat(
+            [additional_object_bounding_boxes, bounding_boxes], axis=-2
+        )
+        bounding_boxes = compact_by_mask(
+            bounding_boxes,
+            tf.math.greater(
+                bounding_boxes[..., CENTER_XYZ_DXDYDZ_PHI.CLASS], 0.0
+            ),
+            num_bounding_boxes,
+        )
+        return (point_clouds, bounding_boxes)
 
     def _augment(self, inputs):
         result = inputs
@@ -255,30 +273,10 @@ class RandomCopyPaste(base_augmentation_layer_3d.BaseAugmentationLayer3D):
         # TODO(ianstenbit): Support the model input format.
         point_clouds = inputs[POINT_CLOUDS]
         bounding_boxes = inputs[BOUNDING_BOXES]
-        if point_clouds.shape.rank == 3 and bounding_boxes.shape.rank == 3:
+        if point_clouds.shape.rank in (3, 4) and (
+            bounding_boxes.shape.rank == point_clouds.shape.rank
+        ):
             return self._augment(inputs)
-        elif point_clouds.shape.rank == 4 and bounding_boxes.shape.rank == 4:
-            batch = point_clouds.get_shape().as_list()[0]
-            point_clouds_list = []
-            bounding_boxes_list = []
-            for i in range(batch):
-                no_batch_inputs = {
-                    POINT_CLOUDS: inputs[POINT_CLOUDS][i],
-                    BOUNDING_BOXES: inputs[BOUNDING_BOXES][i],
-                    OBJECT_POINT_CLOUDS: inputs[OBJECT_POINT_CLOUDS][i],
-                    OBJECT_BOUNDING_BOXES: inputs[OBJECT_BOUNDING_BOXES][i],
-                }
-                no_batch_result = self._augment(no_batch_inputs)
-                point_clouds_list += [
-                    no_batch_result[POINT_CLOUDS][tf.newaxis, ...]
-                ]
-                bounding_boxes_list += [
-                    no_batch_result[BOUNDING_BOXES][tf.newaxis, ...]
-                ]
-
-            inputs[POINT_CLOUDS] = tf.concat(point_clouds_list, axis=0)
-            inputs[BOUNDING_BOXES] = tf.concat(bounding_boxes_list, axis=0)
-            return inputs
         else:
             raise ValueError(
                 "Point clouds augmentation layers are expecting inputs "
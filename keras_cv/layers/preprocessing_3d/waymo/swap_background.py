@@ -8,12 +8,14 @@ from tensorflow import keras
 from keras_cv.bounding_box_3d import CENTER_XYZ_DXDYDZ_PHI
 from keras_cv.layers.preprocessing_3d import base_augmentation_layer_3d
 from keras_cv.point_cloud import is_within_any_box3d
+from keras_cv.point_cloud.point_cloud import _get_shape
 
 POINT_CLOUDS = base_augmentation_layer_3d.POINT_CLOUDS
 BOUNDING_BOXES = base_augmentation_layer_3d.BOUNDING_BOXES
 ADDITIONAL_POINT_CLOUDS = base_augmentation_layer_3d.ADDITIONAL_POINT_CLOUDS
 ADDITIONAL_BOUNDING_BOXES = base_augmentation_layer_3d.ADDITIONAL_BOUNDING_BOXES
 POINTCLOUD_LABEL_INDEX = base_augmentation_layer_3d.POINTCLOUD_LABEL_INDEX
+compact_by_mask = base_augmentation_layer_3d.compact_by_mask
 
 
 @keras.utils.register_keras_serializable(package="keras_cv")
@@ -63,16 +65,22 @@ class SwapBackground(base_augmentation_layer_3d.BaseAugmentationLayer3D):
         **kwargs
     ):
         # Use the current frame bounding boxes to determine valid bounding
-        # boxes.
-        bounding_boxes = tf.boolean_mask(
+        # boxes. Invalid bounding boxes are zeroed out instead of dropped so
+        # that batched inputs keep their padded layout; zero sized boxes do
+        # not contain any points.
+        bounding_boxes = tf.where(
+            bounding_boxes[..., 0:1, :, CENTER_XYZ_DXDYDZ_PHI.CLASS, tf.newaxis]
+            > 0,
             bounding_boxes,
-            bounding_boxes[0, :, CENTER_XYZ_DXDYDZ_PHI.CLASS] > 0,
-            axis=1,
+            0.0,
         )
-        additional_bounding_boxes = tf.boolean_mask(
+        additional_bounding_boxes = tf.where(
+            additional_bounding_boxes[
+                ..., 0:1, :, CENTER_XYZ_DXDYDZ_PHI.CLASS, tf.newaxis
+            ]
+            > 0,
             additional_bounding_boxes,
-            additional_bounding_boxes[0, :, CENTER_XYZ_DXDYDZ_PHI.CLASS] > 0,
-            axis=1,
+            0.0,
         )
 
         # Remove objects in point_clouds.
@@ -116,39 +124,33 @@ class SwapBackground(base_augmentation_layer_3d.BaseAugmentationLayer3D):
     def augment_point_clouds_bounding_boxes(
         self, point_clouds, bounding_boxes, transformation, **kwargs
     ):
-        original_bounding_boxes_shape = bounding_boxes.get_shape().as_list()
-        original_point_clouds_shape = point_clouds.get_shape().as_list()
-        point_clouds = transformation[POINT_CLOUDS]
-        additional_point_clouds = transformation[ADDITIONAL_POINT_CLOUDS]
-        num_frames = original_point_clouds_shape[0]
-        point_clouds_list = []
-        for frame_index in range(num_frames):
-            background_point_clouds = tf.boolean_mask(
-                point_clouds[frame_index],
-                point_clouds[frame_index, :, POINTCLOUD_LABEL_INDEX] > 0,
-                axis=0,
-            )
-            object_point_clouds = tf.boolean_mask(
-                additional_point_clouds[frame_index],
-                additional_point_clouds[frame_index, :, POINTCLOUD_LABEL_INDEX]
-                > 0,
-                axis=0,
-            )
-
-            point_clouds_list += [
-                tf.concat(
-                    [object_point_clouds, background_point_clouds], axis=0
-                )
-            ]
-
-        point_clouds = tf.ragged.stack(point_clouds_list)
-        bounding_boxes = tf.RaggedTensor.from_tensor(
-            transformation[ADDITIONAL_BOUNDING_BOXES]
+        num_points = _get_shape(point_clouds)[-2]
+        num_bounding_boxes = _get_shape(bounding_boxes)[-2]
+        background_point_clouds = transformation[POINT_CLOUDS]
+        object_point_clouds = transformation[ADDITIONAL_POINT_CLOUDS]
+        point_clouds = compact_by_mask(
+            tf.concat([object_point_clouds, background_point_clouds], axis=-2),
+            tf.concat(
+                [
+                    object_point_clouds[..., POINTCLOUD_LABEL_INDEX] > 0,
+                    background_point_clouds[..., POINTCLOUD_LABEL_INDEX] > 0,
+                ],
+                axis=-1,
+            ),
+            num_points,
+        )
+        additional_bounding_boxes = transformation[ADDITIONAL_BOUNDING_BOXES]
+        additional_bounding_boxes_mask = tf.broadcast_to(
+            additional_bounding_boxes[..., 0:1, :, CENTER_XYZ_DXDYDZ_PHI.CLASS]
+            > 0,
+            tf.shape(additional_bounding_boxes)[:-1],
         )
-        return (
-            point_clouds.to_tensor(shape=original_point_clouds_shape),
-            bounding_boxes.to_tensor(shape=original_bounding_boxes_shape),
+        bounding_boxes = compact_by_mask(
+            additional_bounding_boxes,
+            additional_bounding_boxes_mask,
+            num_bounding_boxes,
         )
+        return (point_clouds, bounding_boxes)
 
     def _augment(self, inputs):
         result = inputs
@@ -172,3 +174,7 @@ class SwapBackground(base_augmentation_layer_3d.BaseAugmentationLayer3D):
             {POINT_CLOUDS: point_clouds, BOUNDING_BOXES: bounding_boxes}
         )
         return result
+
+    def _batch_augment(self, inputs):
+        # All the ops above broadcast over the batch dimension.
+        return self._augment(inputs)
@@ -266,3 +266,56 @@ class SwapBackgroundTest(tf.test.TestCase):
         )
         self.assertAllClose(outputs[POINT_CLOUDS], augmented_point_clouds)
         self.assertAllClose(outputs[BOUNDING_BOXES], augmented_bounding_boxes)
+
+    def test_augment_batch_with_unknown_batch_size(self):
+        add_layer = SwapBackground()
+        point_clouds = np.array(
+            [[[0, 1, 2, 3, 4], [10, 1, 2, 3, 4], [20, 20, 21, 1, 0]]] * 2
+        ).astype("float32")
+        bounding_boxes = np.array(
+            [[[0, 0, 0, 4, 4, 4, 0, 1], [0, 0, 0, 0, 0, 0, 0, 0]]] * 2
+        ).astype("float32")
+        additional_point_clouds = np.array(
+            [[[100, 101, 2, 3, 4], [0, 0, 2, 0, 2], [10, 10, 10, 10, 10]]] * 2
+        ).astype("float32")
+        additional_bounding_boxes = np.array(
+            [[[100, 100, 2, 5, 5, 5, 0, 1], [0, 0, 0, 0, 0, 0, 0, 0]]] * 2
+        ).astype("float32")
+        inputs = {
+            POINT_CLOUDS: np.stack([point_clouds] * 3),
+            BOUNDING_BOXES: np.stack([bounding_boxes] * 3),
+            ADDITIONAL_POINT_CLOUDS: np.stack([additional_point_clouds] * 3),
+            ADDITIONAL_BOUNDING_BOXES: np.stack(
+                [additional_bounding_boxes] * 3
+            ),
+        }
+
+        @tf.function(
+            input_signature=[
+                {
+                    key: tf.TensorSpec([None, 2, None, None])
+                    for key in inputs.keys()
+                }
+            ]
+        )
+        def augment(inputs):
+            return add_layer(inputs)
+
+        outputs = augment(inputs)
+        augmented_point_clouds = np.array(
+            [
+                [
+                    [
+                        [100, 101, 2, 3, 4],
+                        [10, 1, 2, 3, 4],
+                        [20, 20, 21, 1, 0],
+                    ]
+                ]
+                * 2
+            ]
+            * 3
+        ).astype("float32")
+        self.assertAllClose(outputs[POINT_CLOUDS], augmented_point_clouds)
+        self.assertAllClose(
+            outputs[BOUNDING_BOXES], inputs[ADDITIONAL_BOUNDING_BOXES]
+        )
@@ -269,6 +269,23 @@ class SerializationTest(tf.test.TestCase, parameterized.TestCase):
                 "max_noise_level": 0.1,
             },
         ),
+        (
+            "GlobalRandomAffine3D",
+            cv_layers.GlobalRandomAffine3D,
+            {
+                "flip_y_probability": 0.5,
+                "max_rotation_angle_x": 0.1,
+                "max_rotation_angle_y": 0.2,
+                "max_rotation_angle_z": 0.3,
+                "x_factor": (0.9, 1.1),
+                "y_factor": (0.8, 1.2),
+                "z_factor": (0.7, 1.3),
+                "preserve_aspect_ratio": False,
+                "x_stddev": 0.2,
+                "y_stddev": 1.0,
+                "z_stddev": 0.0,
+            },
+        ),
         (
             "GlobalRandomDroppingPoints",
             cv_layers.GlobalRandomDroppingPoints,
@@ -15,6 +15,7 @@
 from keras_cv.losses.centernet_box_loss import CenterNetBoxLoss
 from keras_cv.losses.ciou_loss import CIoULoss
 from keras_cv.losses.focal import FocalLoss
+from keras_cv.losses.focal import SparseFocalLoss
 from keras_cv.losses.giou_loss import GIoULoss
 from keras_cv.losses.iou_loss import IoULoss
 from keras_cv.losses.penalty_reduced_focal_loss import (
@@ -81,9 +81,13 @@ class FocalLoss(keras.losses.Loss):
             y_true = self._smooth_labels(y_true)
 
         if self.from_logits:
+            # The cross-entropy is computed from the logits in the stable
+            # form `softplus(x) - x * y`, rather than from the probabilities,
+            # which saturate for large logits.
+            cross_entropy = ops.softplus(y_pred) - y_pred * y_true
             y_pred = ops.sigmoid(y_pred)
-
-        cross_entropy = ops.binary_crossentropy(y_true, y_pred)
+        else:
+            cross_entropy = ops.binary_crossentropy(y_true, y_pred)
 
         alpha = ops.where(
             ops.equal(y_true, 1.0), self.alpha, (1.0 - self.alpha)
@@ -115,3 +119,124 @@ class FocalLoss(keras.losses.Loss):
             }
         )
         return config
+
+
+@keras.saving.register_keras_serializable(package="keras_cv")
+class SparseFocalLoss(keras.losses.Loss):
+    """Implements Focal loss for integer class targets.
+
+    Computes the same loss as `FocalLoss` on one-hot encoded targets, without
+    materializing the one-hot targets. The loss of every class is first
+    computed as a negative, and the loss of the target class is then corrected
+    with a gather, so only a few tensors of the shape of `y_pred` are created.
+    The cross-entropy is computed from the logits with the stable log-sigmoid
+    form.
+
+    `y_true` holds a class index for each box, `-1` for background boxes, which
+    are negatives for all classes, and `ignore_class` for boxes which do not
+    contribute to the loss. The default `ignore_class` of `-2` matches the
+    targets of the KerasCV object detection label encoders.
+
+    Args:
+        alpha: a float value between 0 and 1 representing a weighting factor
+            used to deal with class imbalance. Positive classes and negative
+            classes have alpha and (1 - alpha) as their weighting factors
+            respectively. Defaults to 0.25.
+        gamma: a positive float value representing the tunable focusing
+            parameter, defaults to 2.
+        from_logits: Whether `y_pred` is expected to be a logits tensor. By
+            default, `y_pred` is assumed to encode a probability distribution.
+            Default to `False`.
+        ignore_class: optional integer, the class index of boxes which are
+            ignored. Set to `None` to not ignore any box. Defaults to `-2`.
+
+    References:
+        - [Focal Loss paper](https://arxiv.org/abs/1708.02002)
+
+    Standalone usage:
+    ```python
+    y_true = np.random.randint(-2, 4, size=[10])
+    y_pred = np.random.uniform(size=[10, 4], low=-4, high=4)
+    loss = SparseFocalLoss(from_logits=True)
+    loss(y_true, y_pred)
+    ```
+    Usage with the `compile()` API:
+    ```python
+    model.compile(
+        optimizer='adam',
+        loss=keras_cv.losses.SparseFocalLoss(from_logits=True),
+    )
+    ```
+    """
+
+    def __init__(
+        self,
+        alpha=0.25,
+        gamma=2,
+        from_logits=False,
+        ignore_class=-2,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.alpha = float(alpha)
+        self.gamma = float(gamma)
+        self.from_logits = from_logits
+        self.ignore_class = ignore_class
+
+    def call(self, y_true, y_pred):
+        y_pred = ops.convert_to_tensor(y_pred)
+        y_true = ops.cast(y_true, "int32")
+
+        if self.from_logits:
+            logits = y_pred
+        else:
+            epsilon = keras.backend.epsilon()
+            y_pred = ops.clip(y_pred, epsilon, 1.0 - epsilon)
+            logits = ops.log(y_pred) - ops.log(1.0 - y_pred)
+
+        # The loss of all classes with a target of 0, where the cross-entropy
+        # is `-log(1 - sigmoid(x)) = softplus(x)`.
+        negative_loss = ops.sum(
+            ops.power(ops.sigmoid(logits), self.gamma) * ops.softplus(logits),
+            axis=-1,
+        )
+        loss = (1.0 - self.alpha) * negative_loss
+
+        # Swaps the negative loss of the target class for its positive loss,
+        # where the cross-entropy is `-log(sigmoid(x)) = softplus(-x)`.
+        target_logits = ops.take_along_axis(
+            logits, ops.expand_dims(ops.maximum(y_true, 0), axis=-1), axis=-1
+        )[..., 0]
+        target_probs = ops.sigmoid(target_logits)
+        positive_loss = (
+            self.alpha
+            * ops.power(1.0 - target_probs, self.gamma)
+            * ops.softplus(-target_logits)
+        )
+        target_negative_loss = (
+            (1.0 - self.alpha)
+            * ops.power(target_probs, self.gamma)
+            * ops.softplus(target_logits)
+        )
+        correction = positive_loss - target_negative_loss
+        loss = loss + ops.where(
+            y_true >= 0, correction, ops.zeros_like(correction)
+        )
+
+        if self.ignore_class is not None:
+            loss = ops.where(
+                y_true == self.ignore_class, ops.zeros_like(loss), loss
+            )
+        return loss
+
+    def get_config(self):
+        config = super().get_config()
+        config.update(
+            {
+                "alpha": self.alpha,
+                "gamma": self.gamma,
+                "from_logits": self.from_logits,
+                "ignore_class": self.ignore_class,
+            }
+        )
+        return config
@@ -15,10 +15,9 @@
 import numpy as np
 import tensorflow as tf
 
-from keras_cv.backend import keras
 from keras_cv.backend import ops
-from keras_cv.backend.config import multi_backend
 from keras_cv.losses import FocalLoss
+from keras_cv.losses import SparseFocalLoss
 
 
 class FocalTest(tf.test.TestCase):
@@ -67,16 +66,60 @@ class FocalTest(tf.test.TestCase):
         focal_loss_on_logits = FocalLoss(from_logits=True)
         focal_loss = FocalLoss()
 
-        # TODO(ianstenbit): This probably warrants some more investigation.
-        # In the current implementation, I've verified that training RetinaNet
-        # works in all backends with this implementation.
-        # TF backend somehow has different numerics.
-        expected_loss = (
-            31.11176
-            if multi_backend() and keras.backend.backend() != "tensorflow"
-            else 925.28081
+        self.assertAllClose(focal_loss_on_logits(y_true, y_logits), 925.28081)
+        self.assertAllClose(focal_loss(y_true, y_pred), 31.11176)
+
+
+class SparseFocalTest(tf.test.TestCase):
+    def test_output_shape(self):
+        y_true = np.random.randint(-2, 4, size=[2, 5])
+        y_pred = np.random.uniform(size=[2, 5, 4], low=-4, high=4)
+
+        focal_loss = SparseFocalLoss(from_logits=True, reduction="none")
+
+        self.assertAllEqual(focal_loss(y_true, y_pred).shape, [2, 5])
+
+    def test_matches_focal_loss_on_one_hot_targets(self):
+        rng = np.random.default_rng(1337)
+        y_true = rng.integers(-2, 10, size=(2, 8))
+        y_logits = rng.uniform(low=-20, high=20, size=(2, 8, 10)).astype(
+            "float32"
         )
+        one_hot = np.eye(10)[np.maximum(y_true, 0)] * (y_true >= 0)[..., None]
+        sample_weight = (y_true != -2).astype("float32")
+
+        sparse_loss = SparseFocalLoss(from_logits=True, reduction="sum")
+        focal_loss = FocalLoss(from_logits=True, reduction="sum")
+
         self.assertAllClose(
-            focal_loss_on_logits(y_true, y_logits), expected_loss
+            sparse_loss(y_true, y_logits),
+            focal_loss(one_hot, y_logits, sample_weight=sample_weight),
         )
-        self.assertAllClose(focal_loss(y_true, y_pred), 31.11176)
+
+    def test_probabilities(self):
+        rng = np.random.default_rng(1337)
+        y_true = rng.integers(-1, 10, size=(2, 8))
+        y_pred = rng.uniform(low=0.01, high=0.99, size=(2, 8, 10)).astype(
+            "float32"
+        )
+        one_hot = np.eye(10)[np.maximum(y_true, 0)] * (y_true >= 0)[..., None]
+
+        self.assertAllClose(
+            SparseFocalLoss()(y_true, y_pred),
+            FocalLoss()(one_hot, y_pred),
+            rtol=1e-4,
+        )
+
+    def test_ignore_class(self):
+        y_true = np.array([[-2, -2, 1]])
+        y_logits = np.random.uniform(size=[1, 3, 4], low=-4, high=4)
+
+        loss = SparseFocalLoss(from_logits=True, reduction="none")(
+            y_true, y_logits
+        )
+        loss_without_ignore = SparseFocalLoss(
+            from_logits=True, ignore_class=None, reduction="none"
+        )(y_true, y_logits)
+
+        self.assertAllEqual(loss[0, :2], [0.0, 0.0])
+        self.assertAllGreater(loss_without_ignore, 0.0)
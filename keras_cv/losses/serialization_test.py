@@ -34,6 +34,11 @@ class SerializationTest(tf.test.TestCase, parameterized.TestCase):
             {},
         ),
         ("SimCLRLoss", cv_losses.SimCLRLoss, {"temperature": 0.5}),
+        (
+            "SparseFocalLoss",
+            cv_losses.SparseFocalLoss,
+            {"alpha": 0.25, "gamma": 2, "from_logits": True},
+        ),
         ("SmoothL1Loss", cv_losses.SmoothL1Loss, {}),
     )
     def test_loss_serialization(self, loss_cls, init_args):
@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import tensorflow as tf
+
 from keras_cv.backend import keras
 from keras_cv.backend import ops
+from keras_cv.backend.config import multi_backend
 
 LARGE_NUM = 1e9
 
@@ -25,22 +28,57 @@ def l2_normalize(x, axis):
     return ops.multiply(x, norm)
 
 
+def _all_gather(projections):
+    """Gathers the projections of all replicas, and returns them with the
+    index of the first local projection in the gathered projections."""
+    replica_context = tf.distribute.get_replica_context()
+    if replica_context is None or replica_context.num_replicas_in_sync == 1:
+        return projections, 0
+    batch_sizes = replica_context.all_gather(tf.shape(projections)[:1], axis=0)
+    offset = tf.reduce_sum(
+        batch_sizes[: replica_context.replica_id_in_sync_group]
+    )
+    # The gradient of `all_gather` sums the gradients of every replica, so
+    # local projections also receive the gradients of their use as
+    # negatives on the other replicas.
+    return replica_context.all_gather(projections, axis=0), offset
+
+
 class SimCLRLoss(keras.losses.Loss):
     """Implements SimCLR Cosine Similarity loss.
 
     SimCLR loss is used for contrastive self-supervised learning.
 
+    The loss is computed with a log-sum-exp over the logits of the positive
+    and negative pairs of each projection, without materializing one-hot
+    labels, so it takes O(batch_size * global_batch_size) memory.
+
     Args:
         temperature: a float value between 0 and 1, used as a scaling factor for
             cosine similarity.
+        gather_across_replicas: bool, whether to use the projections of all the
+            replicas of a `tf.distribute` strategy as negatives, instead of
+            only the local ones. The projections are all-gathered, and each
+            replica computes the loss of its local projections. Only supported
+            with the TensorFlow backend. Defaults to False.
 
     References:
         - [SimCLR paper](https://arxiv.org/pdf/2002.05709)
     """
 
-    def __init__(self, temperature, **kwargs):
+    def __init__(self, temperature, gather_across_replicas=False, **kwargs):
         super().__init__(**kwargs)
+        if (
+            gather_across_replicas
+            and multi_backend()
+            and keras.backend.backend() != "tensorflow"
+        ):
+            raise NotImplementedError(
+                "`gather_across_replicas` is only supported with the "
+                "TensorFlow backend."
+            )
         self.temperature = temperature
+        self.gather_across_replicas = gather_across_replicas
 
     def call(self, projections_1, projections_2):
         """Computes SimCLR loss for a pair of projections in a contrastive
@@ -63,41 +101,71 @@ class SimCLRLoss(keras.losses.Loss):
         projections_1 = l2_normalize(projections_1, axis=1)
         projections_2 = l2_normalize(projections_2, axis=1)
 
-        # Produce artificial labels, 1 for each image in the batch.
+        if self.gather_across_replicas:
+            all_projections_1, offset = _all_gather(projections_1)
+            all_projections_2, _ = _all_gather(projections_2)
+        else:
+            all_projections_1, all_projections_2 = projections_1, projections_2
+            offset = 0
+
+        # Masks the similarity of each projection with itself.
         batch_size = ops.shape(projections_1)[0]
-        labels = ops.one_hot(ops.arange(batch_size), batch_size * 2)
-        masks = ops.one_hot(ops.arange(batch_size), batch_size)
+        global_batch_size = ops.shape(all_projections_1)[0]
+        masks = ops.equal(
+            ops.expand_dims(ops.arange(batch_size) + offset, 1),
+            ops.expand_dims(ops.arange(global_batch_size), 0),
+        )
+        positives = (
+            ops.sum(projections_1 * projections_2, axis=1) / self.temperature
+        )
 
-        # Compute logits
-        logits_11 = (
-            ops.matmul(projections_1, ops.transpose(projections_1))
-            / self.temperature
+        loss_a = self._contrastive_loss(
+            projections_1,
+            all_projections_2,
+            all_projections_1,
+            positives,
+            masks,
         )
-        logits_11 = logits_11 - ops.cast(masks * LARGE_NUM, logits_11.dtype)
-        logits_22 = (
-            ops.matmul(projections_2, ops.transpose(projections_2))
-            / self.temperature
+        loss_b = self._contrastive_loss(
+            projections_2,
+            all_projections_1,
+            all_projections_2,
+            positives,
+            masks,
         )
-        logits_22 = logits_22 - ops.cast(masks * LARGE_NUM, logits_22.dtype)
-        logits_12 = (
-            ops.matmul(projections_1, ops.transpose(projections_2))
+
+        return loss_a + loss_b
+
+    def _contrastive_loss(
+        self, projections, other_projections, same_projections, positives, masks
+    ):
+        """Returns the cross-entropy of each projection's positive pair,
+        against its pairs with the projections of both views."""
+        logits_other = (
+            ops.matmul(projections, ops.transpose(other_projections))
             / self.temperature
         )
-        logits_21 = (
-            ops.matmul(projections_2, ops.transpose(projections_1))
+        logits_same = (
+            ops.matmul(projections, ops.transpose(same_projections))
             / self.temperature
         )
-
-        loss_a = keras.losses.categorical_crossentropy(
-            labels, ops.concatenate([logits_12, logits_11], 1), from_logits=True
+        logits_same = logits_same - ops.cast(masks, logits_same.dtype) * (
+            LARGE_NUM
         )
-        loss_b = keras.losses.categorical_crossentropy(
-            labels, ops.concatenate([logits_21, logits_22], 1), from_logits=True
+        return (
+            ops.logaddexp(
+                ops.logsumexp(logits_other, axis=1),
+                ops.logsumexp(logits_same, axis=1),
+            )
+            - positives
         )
 
-        return loss_a + loss_b
-
     def get_config(self):
         config = super().get_config()
-        config.update({"temperature": self.temperature})
+        config.update(
+            {
+                "temperature": self.temperature,
+                "gather_across_replicas": self.gather_across_replicas,
+            }
+        )
         return config
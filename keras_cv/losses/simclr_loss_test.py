@@ -59,3 +59,55 @@ class SimCLRLossTest(tf.test.TestCase):
 
         simclr_loss = SimCLRLoss(temperature=0.1)
         self.assertAllClose(simclr_loss(projections_1, projections_2), 5.726100)
+
+    def test_gather_across_replicas(self):
+        cpus = tf.config.list_physical_devices("CPU")
+        try:
+            tf.config.set_logical_device_configuration(
+                cpus[0], [tf.config.LogicalDeviceConfiguration()] * 2
+            )
+        except RuntimeError:
+            # Logical devices can only be configured before TF initializes.
+            if len(tf.config.list_logical_devices("CPU")) < 2:
+                self.skipTest("Requires 2 logical CPU devices.")
+        strategy = tf.distribute.MirroredStrategy(["/cpu:0", "/cpu:1"])
+        projections_1 = tf.random.normal((8, 16))
+        projections_2 = tf.random.normal((8, 16))
+
+        simclr_loss = SimCLRLoss(temperature=0.5, reduction="none")
+        with tf.GradientTape() as tape:
+            tape.watch([projections_1, projections_2])
+            expected_loss = simclr_loss(projections_1, projections_2)
+        expected_gradients = tape.gradient(
+            expected_loss, [projections_1, projections_2]
+        )
+
+        distributed_loss = SimCLRLoss(
+            temperature=0.5, reduction="none", gather_across_replicas=True
+        )
+
+        @tf.function
+        def replica_fn(projections):
+            projections_1, projections_2 = projections
+            with tf.GradientTape() as tape:
+                tape.watch([projections_1, projections_2])
+                loss = distributed_loss(projections_1, projections_2)
+            return loss, tape.gradient(loss, [projections_1, projections_2])
+
+        dataset = tf.data.Dataset.from_tensor_slices(
+            (projections_1, projections_2)
+        ).batch(8)
+        projections = next(
+            iter(strategy.experimental_distribute_dataset(dataset))
+        )
+        loss, gradients = strategy.run(replica_fn, args=(projections,))
+
+        self.assertAllClose(
+            tf.concat(strategy.experimental_local_results(loss), 0),
+            expected_loss,
+        )
+        for gradient, expected_gradient in zip(gradients, expected_gradients):
+            self.assertAllClose(
+                tf.concat(strategy.experimental_local_results(gradient), 0),
+                expected_gradient,
+            )
@@ -112,8 +112,13 @@ from keras_cv.models.backbones.resnet_v2.resnet_v2_aliases import (
 from keras_cv.models.backbones.resnet_v2.resnet_v2_backbone import (
     ResNetV2Backbone,
 )
+from keras_cv.models.batch_norm_folding import fold_batch_normalization
 from keras_cv.models.classification.image_classifier import ImageClassifier
+from keras_cv.models.object_detection.bucketed_inference import (
+    BucketedPredictor,
+)
 from keras_cv.models.object_detection.retinanet.retinanet import RetinaNet
+from keras_cv.models.object_detection.sliced_inference import sliced_predict
 from keras_cv.models.object_detection.yolo_v8.yolo_v8_backbone import (
     YOLOV8Backbone,
 )
@@ -123,6 +128,9 @@ from keras_cv.models.object_detection.yolo_v8.yolo_v8_detector import (
 from keras_cv.models.object_detection_3d.center_pillar import (
     MultiHeadCenterPillar,
 )
+from keras_cv.models.quantization import QuantizedModel
+from keras_cv.models.quantization import evaluate_quantization
+from keras_cv.models.quantization import quantize_int8
 from keras_cv.models.segmentation import DeepLabV3Plus
 from keras_cv.models.stable_diffusion import StableDiffusion
 from keras_cv.models.stable_diffusion import StableDiffusionV2
@@ -0,0 +1,203 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Folds batch normalization layers into convolutions for inference."""
+
+import numpy as np
+
+from keras_cv.backend import keras
+from keras_cv.backend import ops
+from keras_cv.backend.config import multi_backend
+
+_FOLDABLE_CONV_LAYERS = (
+    keras.layers.Conv2D,
+    keras.layers.DepthwiseConv2D,
+)
+
+
+def fold_batch_normalization(model):
+    """Returns an inference model with batch normalizations folded into convs.
+
+    Every `BatchNormalization` layer which directly follows a `Conv2D` or a
+    `DepthwiseConv2D` layer is removed, and its moving statistics, scale and
+    offset are folded into the kernel and bias of the convolution. The
+    convolution then runs with a bias, followed directly by the activation of
+    the block, which TensorFlow fuses into a single op for its supported
+    activations. Nested models, such as the backbone of a task, are folded
+    recursively.
+
+    A convolution is only folded when the batch normalization is the only
+    consumer of its output, which is not an output of the model, when it has no
+    activation of its own, and when both layers are called once and normalize
+    the channels-last axis. Other batch normalizations, for example the
+    pre-activation ones of `ResNetV2Backbone`, are kept.
+
+    The returned model computes the same outputs as `model` in inference mode,
+    up to floating point error, but it is a plain functional `keras.Model`. It
+    has neither the task-specific methods of `model`, such as the prediction
+    decoding of `YOLOV8Detector`, nor the training behavior of batch
+    normalization, so it should only be used for inference and export.
+
+    Args:
+        model: a built functional model, such as a KerasCV `Backbone` or
+            `Task`.
+
+    Returns:
+        A functional `keras.Model` with the batch normalizations folded.
+
+    Example:
+    ```python
+    backbone = keras_cv.models.ResNet50Backbone.from_preset(
+        "resnet50_imagenet"
+    )
+    inference_backbone = keras_cv.models.fold_batch_normalization(backbone)
+    inference_backbone.predict(images)
+    ```
+    """
+    folded_layers = _find_foldable_layers(model)
+    folded_convs = {conv.name: bn for conv, bn in folded_layers}
+    folded_bns = {bn.name for _, bn in folded_layers}
+
+    def clone_function(layer):
+        if isinstance(layer, keras.Model):
+            return fold_batch_normalization(layer)
+        if layer.name in folded_bns:
+            return _FoldedBatchNormalization(name=layer.name)
+        config = layer.get_config()
+        if layer.name in folded_convs:
+            config["use_bias"] = True
+        return layer.__class__.from_config(config)
+
+    input_tensors = [
+        keras.Input(
+            batch_shape=x.shape, dtype=x.dtype, name=_producing_layer(x).name
+        )
+        for x in model.inputs
+    ]
+    if multi_backend():
+        # `clone_model()` of Keras Core calls the constructor of subclassed
+        # functional models, such as backbones, with the inputs and outputs.
+        outputs = model._run_through_graph(
+            input_tensors, operation_fn=clone_function
+        )
+        folded_model = keras.Model(input_tensors, outputs, name=model.name)
+    else:
+        folded_model = keras.models.clone_model(
+            model, input_tensors=input_tensors, clone_function=clone_function
+        )
+
+    for layer in model.layers:
+        if (
+            isinstance(layer, keras.Model)
+            or layer.name in folded_bns
+            or not layer.weights
+        ):
+            continue
+        folded_layer = folded_model.get_layer(layer.name)
+        if layer.name in folded_convs:
+            folded_layer.set_weights(
+                _fold_weights(layer, folded_convs[layer.name])
+            )
+        else:
+            folded_layer.set_weights(layer.get_weights())
+    return folded_model
+
+
+@keras.saving.register_keras_serializable(package="keras_cv")
+class _FoldedBatchNormalization(keras.layers.Layer):
+    """Replaces a batch normalization folded into the previous convolution.
+
+    Unlike `keras.layers.Identity`, accepts the `training` and `mask`
+    arguments of the batch normalization call.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.supports_masking = True
+
+    def call(self, inputs, training=None, mask=None):
+        return inputs
+
+
+def _producing_layer(tensor):
+    if multi_backend():
+        return tensor._keras_history.operation
+    return tensor._keras_history.layer
+
+
+def _find_foldable_layers(model):
+    """Returns the (conv, batch normalization) pairs which can be folded."""
+    output_ids = {id(output) for output in model.outputs}
+    pairs = []
+    for layer in model.layers:
+        if not isinstance(layer, keras.layers.BatchNormalization):
+            continue
+        if len(layer._inbound_nodes) != 1:
+            continue
+        conv = _producing_layer(layer.input)
+        if not isinstance(conv, _FOLDABLE_CONV_LAYERS):
+            continue
+        if (
+            len(conv._inbound_nodes) != 1
+            or len(conv._outbound_nodes) != 1
+            or id(conv.output) in output_ids
+            or conv.activation is not keras.activations.linear
+            or conv.data_format != "channels_last"
+        ):
+            continue
+        axis = layer.axis
+        if isinstance(axis, (list, tuple)):
+            if len(axis) != 1:
+                continue
+            axis = axis[0]
+        if axis not in (-1, len(layer.input.shape) - 1):
+            continue
+        pairs.append((conv, layer))
+    return pairs
+
+
+def _fold_weights(conv, bn):
+    """Returns the kernel and bias of `conv` followed by `bn`."""
+    # The kernel of `DepthwiseConv2D` is named `depthwise_kernel` in Keras 2,
+    # so the weights are read in order rather than by name.
+    weights = conv.get_weights()
+    dtype = weights[0].dtype
+    kernel = weights[0].astype("float64")
+    filters = (
+        kernel.shape[2] * kernel.shape[3]
+        if isinstance(conv, keras.layers.DepthwiseConv2D)
+        else kernel.shape[3]
+    )
+    bias = weights[1].astype("float64") if conv.use_bias else np.zeros(filters)
+
+    def get_value(name, default):
+        # Keras Core does not create the attributes of disabled weights.
+        variable = getattr(bn, name, None)
+        if variable is None:
+            return np.full(filters, default)
+        return ops.convert_to_numpy(variable).astype("float64")
+
+    gamma = get_value("gamma", 1.0)
+    beta = get_value("beta", 0.0)
+    mean = get_value("moving_mean", 0.0)
+    variance = get_value("moving_variance", 1.0)
+
+    scale = gamma / np.sqrt(variance + bn.epsilon)
+    # The output channels are the last axis of a conv kernel, and the last two
+    # axes of a depthwise conv kernel.
+    if isinstance(conv, keras.layers.DepthwiseConv2D):
+        kernel = kernel * np.reshape(scale, kernel.shape[2:])
+    else:
+        kernel = kernel * scale
+    bias = (bias - mean) * scale + beta
+    return [kernel.astype(dtype), bias.astype(dtype)]
@@ -0,0 +1,143 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for fold_batch_normalization."""
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from keras_cv.backend import keras
+from keras_cv.backend import ops
+from keras_cv.models.backbones.mobilenet_v3.mobilenet_v3_backbone import (
+    MobileNetV3Backbone,
+)
+from keras_cv.models.backbones.resnet_v1.resnet_v1_backbone import (
+    ResNetBackbone,
+)
+from keras_cv.models.backbones.resnet_v2.resnet_v2_backbone import (
+    ResNetV2Backbone,
+)
+from keras_cv.models.batch_norm_folding import fold_batch_normalization
+from keras_cv.models.classification.image_classifier import ImageClassifier
+
+
+def randomize_batch_normalization(model):
+    rng = np.random.default_rng(0)
+    for layer in model._flatten_layers():
+        if isinstance(layer, keras.layers.BatchNormalization):
+            layer.set_weights(
+                [
+                    rng.uniform(0.5, 1.5, w.shape).astype("float32")
+                    if i in (0, 3)
+                    else rng.normal(size=w.shape).astype("float32")
+                    for i, w in enumerate(layer.get_weights())
+                ]
+            )
+
+
+def count_batch_normalization(model):
+    return sum(
+        isinstance(layer, keras.layers.BatchNormalization)
+        for layer in model._flatten_layers()
+    )
+
+
+class FoldBatchNormalizationTest(tf.test.TestCase):
+    def setUp(self):
+        self.images = np.random.uniform(size=(2, 64, 64, 3)).astype("float32")
+
+    def assert_same_outputs(self, model, folded_model):
+        self.assertAllClose(
+            ops.convert_to_numpy(model(self.images, training=False)),
+            ops.convert_to_numpy(folded_model(self.images, training=False)),
+            atol=1e-4,
+            rtol=1e-4,
+        )
+
+    def test_sequential_conv_batch_norm(self):
+        inputs = keras.Input((64, 64, 3))
+        x = keras.layers.Conv2D(8, 3, use_bias=False)(inputs)
+        x = keras.layers.BatchNormalization()(x)
+        x = keras.layers.ReLU()(x)
+        x = keras.layers.DepthwiseConv2D(3, depth_multiplier=2)(x)
+        x = keras.layers.BatchNormalization(center=False, scale=False)(x)
+        model = keras.Model(inputs, x)
+        randomize_batch_normalization(model)
+
+        folded_model = fold_batch_normalization(model)
+
+        self.assertEqual(count_batch_normalization(folded_model), 0)
+        self.assert_same_outputs(model, folded_model)
+
+    def test_keeps_unfoldable_batch_norm(self):
+        inputs = keras.Input((64, 64, 3))
+        x = keras.layers.Conv2D(8, 3, activation="relu")(inputs)
+        x = keras.layers.BatchNormalization()(x)
+        y = keras.layers.Conv2D(8, 3, padding="same")(x)
+        z = keras.layers.BatchNormalization()(y)
+        model = keras.Model(inputs, [y, z])
+        randomize_batch_normalization(model)
+
+        folded_model = fold_batch_normalization(model)
+
+        self.assertEqual(count_batch_normalization(folded_model), 2)
+        self.assert_same_outputs(model, folded_model)
+
+    @pytest.mark.large
+    def test_resnet_backbone(self):
+        model = ResNetBackbone(
+            stackwise_filters=[8, 16],
+            stackwise_blocks=[1, 1],
+            stackwise_strides=[1, 2],
+            include_rescaling=False,
+            input_shape=(64, 64, 3),
+        )
+        randomize_batch_normalization(model)
+
+        folded_model = fold_batch_normalization(model)
+
+        self.assertEqual(count_batch_normalization(folded_model), 0)
+        self.assert_same_outputs(model, folded_model)
+
+    @pytest.mark.large
+    def test_mobilenet_v3_backbone(self):
+        model = MobileNetV3Backbone.from_preset(
+            "mobilenet_v3_small", input_shape=(64, 64, 3)
+        )
+        randomize_batch_normalization(model)
+
+        folded_model = fold_batch_normalization(model)
+
+        self.assertEqual(count_batch_normalization(folded_model), 0)
+        self.assert_same_outputs(model, folded_model)
+
+    @pytest.mark.large
+    def test_image_classifier(self):
+        backbone = ResNetV2Backbone(
+            stackwise_filters=[8, 16],
+            stackwise_blocks=[2, 2],
+            stackwise_strides=[1, 2],
+            include_rescaling=False,
+            input_shape=(64, 64, 3),
+        )
+        model = ImageClassifier(backbone=backbone, num_classes=4)
+        randomize_batch_normalization(model)
+
+        folded_model = fold_batch_normalization(model)
+
+        self.assertLess(
+            count_batch_normalization(folded_model),
+            count_batch_normalization(model),
+        )
+        self.assert_same_outputs(model, folded_model)
@@ -0,0 +1,251 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shape-bucketed inference of object detectors."""
+
+import collections
+import math
+
+import tensorflow as tf
+
+from keras_cv import bounding_box
+from keras_cv.backend import keras
+from keras_cv.backend import ops
+
+
+class BucketedPredictor:
+    """Runs an object detector on images of varying sizes without retracing.
+
+    The `predict_step()` of KerasCV detectors, such as `YOLOV8Detector` and
+    `RetinaNet`, derives its anchors from the shape of the images, so every new
+    image size traces, and with `jit_compile=True` compiles, a new predict
+    function. `BucketedPredictor` instead pads every batch of images at the
+    bottom and right to the smallest of a fixed set of `buckets` which fits
+    them, and keeps one function per bucket, so the detector is only traced
+    once per bucket.
+
+    The size of every image before padding is passed to the functions as a
+    tensor, and the decoded boxes are clipped to it, so the detections in the
+    padding are discarded, and the boxes in relative formats are relative to
+    the image before padding. Images larger than every bucket are padded to a
+    multiple of `pad_to_multiple_of` instead, and counted as misses.
+
+    Args:
+        model: a KerasCV object detector, which decodes its predictions with
+            `decode_predictions(predictions, images)` into a dictionary of
+            `"boxes"`, `"classes"`, `"confidence"` and `"num_detections"` in
+            `model.bounding_box_format`.
+        buckets: a list of `(height, width)` image sizes, or of ints for
+            square sizes. The sizes should be multiples of the largest stride
+            of `model`, for example 32 for `YOLOV8Detector`, or 128 for
+            `RetinaNet`.
+        pad_to_multiple_of: (Optional) the multiple to which the images which
+            do not fit in any bucket are padded. Defaults to 128, the largest
+            stride of `RetinaNet`.
+        jit_compile: (Optional) whether to compile the forward pass of `model`
+            with XLA. XLA compiles one program per bucket and batch size.
+            Defaults to `False`.
+
+    Attributes:
+        num_traces: a `collections.Counter` of the number of times the
+            function of each bucket was traced.
+        bucket_hits: a `collections.Counter` of the number of batches run in
+            each bucket.
+        num_misses: the number of batches which did not fit in any bucket.
+
+    Usage:
+    ```python
+    model = keras_cv.models.YOLOV8Detector.from_preset(
+        "yolo_v8_m_pascalvoc", bounding_box_format="xywh"
+    )
+    predictor = keras_cv.models.BucketedPredictor(
+        model, buckets=[(384, 640), (640, 640), (640, 1024)]
+    )
+    for images in image_stream:
+        predictions = predictor.predict(images)
+    print(predictor.num_traces, predictor.hit_rate)
+    ```
+    """
+
+    def __init__(
+        self, model, buckets, pad_to_multiple_of=128, jit_compile=False
+    ):
+        if keras.backend.backend() != "tensorflow":
+            raise ValueError(
+                "`BucketedPredictor` requires the TensorFlow backend. "
+                f"Received backend={keras.backend.backend()}"
+            )
+        if not buckets:
+            raise ValueError(
+                "`BucketedPredictor` expects at least one bucket. Received "
+                f"buckets={buckets}"
+            )
+        self.model = model
+        self.buckets = sorted(
+            [
+                (bucket, bucket) if isinstance(bucket, int) else tuple(bucket)
+                for bucket in buckets
+            ],
+            key=lambda bucket: (bucket[0] * bucket[1], bucket),
+        )
+        self.pad_to_multiple_of = pad_to_multiple_of
+        self.jit_compile = jit_compile
+        self._functions = {}
+        self.reset_counters()
+
+    @property
+    def hit_rate(self):
+        """The fraction of the batches which fit in a bucket."""
+        num_hits = sum(self.bucket_hits.values())
+        num_batches = num_hits + self.num_misses
+        return num_hits / num_batches if num_batches else 0.0
+
+    def reset_counters(self):
+        self.num_traces = collections.Counter()
+        self.bucket_hits = collections.Counter()
+        self.num_misses = 0
+
+    def predict(self, images):
+        """Returns the decoded predictions of `model` for a batch of images.
+
+        Args:
+            images: a batch of images of shape
+                `(batch, height, width, channels)`, or a list of images of
+                shape `(height, width, channels)` with different sizes.
+
+        Returns:
+            A dictionary of `"boxes"`, `"classes"`, `"confidence"` and
+            `"num_detections"`, in the same structure as `model.predict()`.
+            The boxes of each image are relative to the image before padding.
+        """
+        if isinstance(images, (list, tuple)):
+            image_sizes = [image.shape[:2] for image in images]
+        else:
+            image_sizes = [images.shape[1:3]] * images.shape[0]
+        height = max(size[0] for size in image_sizes)
+        width = max(size[1] for size in image_sizes)
+
+        bucket = next(
+            (b for b in self.buckets if b[0] >= height and b[1] >= width),
+            None,
+        )
+        if bucket is None:
+            multiple = self.pad_to_multiple_of
+            bucket = (
+                math.ceil(height / multiple) * multiple,
+                math.ceil(width / multiple) * multiple,
+            )
+            self.num_misses += 1
+        else:
+            self.bucket_hits[bucket] += 1
+
+        if isinstance(images, (list, tuple)):
+            images = ops.stack(
+                [_pad_image(image, bucket) for image in images], axis=0
+            )
+        else:
+            images = _pad_image(images, bucket)
+        function = self._functions.get(bucket)
+        if function is None:
+            function = self._make_function(bucket, images.shape[-1])
+            self._functions[bucket] = function
+        predictions = function(
+            ops.cast(images, self.model.compute_dtype),
+            ops.convert_to_tensor(image_sizes, "int32"),
+        )
+        return {
+            key: ops.convert_to_numpy(value)
+            for key, value in predictions.items()
+        }
+
+    def _make_function(self, bucket, channels):
+        model = self.model
+        forward = tf.function(
+            lambda images: model(images, training=False),
+            jit_compile=self.jit_compile,
+        )
+
+        def predict(images, image_sizes):
+            # Only runs when the function is traced.
+            self.num_traces[bucket] += 1
+            predictions = model.decode_predictions(forward(images), images)
+            return _clip_to_image_sizes(
+                predictions, model.bounding_box_format, images, image_sizes
+            )
+
+        return tf.function(
+            predict,
+            input_signature=[
+                tf.TensorSpec(
+                    (None,) + bucket + (channels,), model.compute_dtype
+                ),
+                tf.TensorSpec((None, 2), "int32"),
+            ],
+        )
+
+
+def _pad_image(images, size):
+    height, width = images.shape[-3:-1]
+    padding = [[0, size[0] - height], [0, size[1] - width], [0, 0]]
+    if len(images.shape) == 4:
+        padding = [[0, 0]] + padding
+    return ops.pad(images, padding)
+
+
+def _clip_to_image_sizes(predictions, bounding_box_format, images, sizes):
+    """Clips the boxes to the image sizes, and discards the empty boxes."""
+    boxes = bounding_box.convert_format(
+        predictions["boxes"],
+        source=bounding_box_format,
+        target="xyxy",
+        images=images,
+    )
+    sizes = ops.cast(sizes, boxes.dtype)
+    max_xy = ops.concatenate([sizes[:, ::-1], sizes[:, ::-1]], axis=-1)
+    boxes = ops.clip(boxes, 0, max_xy[:, None, :])
+
+    max_detections = ops.shape(boxes)[1]
+    indices = ops.cast(ops.arange(max_detections), "int32")[None, :]
+    valid = (
+        (indices < ops.cast(predictions["num_detections"][:, None], "int32"))
+        & (boxes[..., 2] > boxes[..., 0])
+        & (boxes[..., 3] > boxes[..., 1])
+    )
+    # Moves the valid detections first, in their original order.
+    order = ops.cast(
+        ops.argsort(
+            ops.where(valid, indices, indices + max_detections), axis=-1
+        ),
+        "int32",
+    )
+    valid = ops.take_along_axis(valid, order, axis=-1)
+    boxes = ops.take_along_axis(boxes, order[..., None], axis=1)
+
+    if bounding_box.is_relative(bounding_box_format):
+        boxes = bounding_box.convert_format(
+            boxes / max_xy[:, None, :],
+            source="rel_xyxy",
+            target=bounding_box_format,
+        )
+    else:
+        boxes = bounding_box.convert_format(
+            boxes, source="xyxy", target=bounding_box_format
+        )
+    result = {
+        "boxes": ops.where(valid[..., None], boxes, -1),
+        "num_detections": ops.sum(ops.cast(valid, "int32"), axis=-1),
+    }
+    for key in ("classes", "confidence"):
+        values = ops.take_along_axis(predictions[key], order, axis=-1)
+        result[key] = ops.where(valid, values, ops.cast(-1, values.dtype))
+    return result
@@ -0,0 +1,141 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from keras_cv import bounding_box
+from keras_cv.backend import keras
+from keras_cv.backend import ops
+from keras_cv.models.object_detection.bucketed_inference import (
+    BucketedPredictor,
+)
+from keras_cv.models.object_detection.yolo_v8.yolo_v8_backbone import (
+    YOLOV8Backbone,
+)
+from keras_cv.models.object_detection.yolo_v8.yolo_v8_detector import (
+    YOLOV8Detector,
+)
+
+
+class PaddingDetector(keras.Model):
+    """Detects a box covering each whole (padded) image, and a box in the
+    bottom right corner of each image, in the padding of the smaller images."""
+
+    def __init__(self, bounding_box_format):
+        inputs = keras.Input((None, None, 3))
+        outputs = keras.layers.GlobalAveragePooling2D()(inputs)
+        super().__init__(inputs, outputs)
+        self.bounding_box_format = bounding_box_format
+
+    def decode_predictions(self, predictions, images):
+        batch = ops.shape(images)[0]
+        height = ops.cast(ops.shape(images)[1], "float32")
+        width = ops.cast(ops.shape(images)[2], "float32")
+        boxes = ops.stack(
+            [
+                ops.stack([0.0, 0.0, width, height]),
+                ops.stack([width - 10, height - 10, width, height]),
+            ]
+        )
+        boxes = ops.tile(boxes[None], [batch, 1, 1])
+        boxes = bounding_box.convert_format(
+            boxes, source="xyxy", target=self.bounding_box_format, images=images
+        )
+        return {
+            "boxes": boxes,
+            "classes": ops.tile(ops.convert_to_tensor([[1, 2]]), [batch, 1]),
+            "confidence": ops.tile(
+                ops.convert_to_tensor([[0.9, 0.8]]), [batch, 1]
+            ),
+            "num_detections": ops.tile(ops.convert_to_tensor([2]), [batch]),
+        }
+
+
+@pytest.mark.tf_keras_only
+class BucketedPredictorTest(tf.test.TestCase):
+    def test_clips_to_the_image_sizes(self):
+        predictor = BucketedPredictor(PaddingDetector("xyxy"), buckets=[64])
+        images = [np.zeros((40, 50, 3)), np.zeros((64, 64, 3))]
+
+        predictions = predictor.predict(images)
+
+        self.assertAllEqual(predictions["num_detections"], [1, 2])
+        self.assertAllClose(
+            predictions["boxes"],
+            [
+                [[0, 0, 50, 40], [-1, -1, -1, -1]],
+                [[0, 0, 64, 64], [54, 54, 64, 64]],
+            ],
+        )
+        self.assertAllEqual(predictions["classes"], [[1, -1], [1, 2]])
+        self.assertAllClose(predictions["confidence"], [[0.9, -1], [0.9, 0.8]])
+
+    def test_relative_format(self):
+        predictor = BucketedPredictor(
+            PaddingDetector("rel_xywh"), buckets=[(64, 128)]
+        )
+
+        predictions = predictor.predict(np.zeros((1, 32, 100, 3)))
+
+        self.assertAllClose(predictions["boxes"][0, 0], [0, 0, 1, 1])
+
+    def test_traces_once_per_bucket(self):
+        predictor = BucketedPredictor(
+            PaddingDetector("xyxy"), buckets=[(64, 64), 32]
+        )
+        self.assertEqual(predictor.buckets, [(32, 32), (64, 64)])
+
+        for size in [(20, 30), (32, 32), (40, 60), (64, 50), (10, 10)]:
+            predictor.predict(np.zeros((2,) + size + (3,)))
+        predictor.predict([np.zeros((40, 20, 3)), np.zeros((20, 40, 3))])
+
+        self.assertEqual(predictor.num_traces, {(32, 32): 1, (64, 64): 1})
+        self.assertEqual(predictor.bucket_hits, {(32, 32): 3, (64, 64): 3})
+        self.assertEqual(predictor.num_misses, 0)
+        self.assertEqual(predictor.hit_rate, 1.0)
+
+    def test_images_larger_than_the_buckets(self):
+        predictor = BucketedPredictor(
+            PaddingDetector("xyxy"), buckets=[32], pad_to_multiple_of=16
+        )
+
+        predictions = predictor.predict(np.zeros((1, 40, 30, 3)))
+
+        self.assertAllClose(predictions["boxes"][0, 0], [0, 0, 30, 40])
+        self.assertEqual(predictor.num_misses, 1)
+        self.assertEqual(predictor.num_traces, {(48, 32): 1})
+        self.assertEqual(predictor.hit_rate, 0.0)
+
+        predictor.reset_counters()
+        self.assertEqual(predictor.num_misses, 0)
+
+    @pytest.mark.large
+    def test_yolo_v8_detector(self):
+        model = YOLOV8Detector(
+            num_classes=3,
+            bounding_box_format="xywh",
+            backbone=YOLOV8Backbone.from_preset("yolo_v8_xs_backbone"),
+            fpn_depth=1,
+        )
+        predictor = BucketedPredictor(model, buckets=[(128, 160)])
+
+        for size in [(100, 160), (128, 120)]:
+            predictions = predictor.predict(
+                np.random.uniform(size=(2,) + size + (3,)) * 255
+            )
+            self.assertEqual(predictions["boxes"].shape, (2, 100, 4))
+            self.assertEqual(predictions["num_detections"].shape, (2,))
+        self.assertEqual(predictor.num_traces, {(128, 160): 1})
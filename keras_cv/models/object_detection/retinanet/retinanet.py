@@ -334,8 +334,10 @@ class RetinaNet(Task):
                 Preconfigured losses are provided when the string "huber" or
                 "smoothl1" are passed.
             classification_loss: a Keras loss to use for box classification.
-                A preconfigured `FocalLoss` is provided when the string "focal"
-                is passed.
+                A preconfigured `SparseFocalLoss` is provided when the string
+                "focal" is passed. A `SparseFocalLoss` receives the integer
+                class targets of the anchors, and any other loss receives
+                one-hot encoded targets.
             weight_decay: a float for variable weight decay.
             metrics: KerasCV object detection metrics that accept decoded
                 bounding boxes as their inputs. Examples of this metric type
@@ -419,9 +421,15 @@ class RetinaNet(Task):
                 "parameter?"
             )
 
-        cls_labels = ops.one_hot(
-            ops.cast(classes, "int32"), self.num_classes, dtype="float32"
-        )
+        if isinstance(
+            self.classification_loss, keras_cv.losses.SparseFocalLoss
+        ):
+            # Avoids materializing one-hot targets for all anchors.
+            cls_labels = classes
+        else:
+            cls_labels = ops.one_hot(
+                ops.cast(classes, "int32"), self.num_classes, dtype="float32"
+            )
         positive_mask = ops.cast(ops.greater(classes, -1.0), dtype="float32")
         normalizer = ops.sum(positive_mask)
         cls_weights = ops.cast(ops.not_equal(classes, -2.0), dtype="float32")
@@ -597,7 +605,9 @@ def _parse_classification_loss(loss):
 
     # case insensitive comparison
     if loss.lower() == "focal":
-        return keras_cv.losses.FocalLoss(from_logits=True, reduction="sum")
+        return keras_cv.losses.SparseFocalLoss(
+            from_logits=True, reduction="sum"
+        )
 
     raise ValueError(
         "Expected `classification_loss` to be either a Keras Loss, "
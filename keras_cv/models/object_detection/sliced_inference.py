@@ -0,0 +1,251 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Sliced inference of object detectors on large images."""
+
+import math
+
+from keras_cv import bounding_box
+from keras_cv import layers
+from keras_cv.backend import ops
+
+# The distance in pixels under which a box touches the edge of a tile.
+_EDGE_TOLERANCE = 2
+
+
+def sliced_predict(
+    model,
+    images,
+    tile_size,
+    overlap=0.2,
+    batch_size=32,
+    include_full_image=False,
+    discard_truncated=True,
+    iou_threshold=None,
+    max_detections=None,
+):
+    """Runs an object detector on overlapping tiles of large images.
+
+    Small objects in large images, such as aerial or retail shelf images, are
+    lost when the images are resized to the input size of a detector, while
+    running the detector on the full images multiplies its memory and number
+    of anchors. `sliced_predict()` instead cuts every image into overlapping
+    tiles of `tile_size`, runs the tiles of all the images through
+    `model.predict()` in batches of `batch_size`, translates the detections
+    of every tile to the coordinates of its image, and merges the duplicated
+    detections of objects which span several tiles with
+    `keras_cv.layers.NonMaxSuppression`.
+
+    An object which is cut by the edge of a tile is usually detected as a
+    truncated box, whose IoU with the box of the full object is too small for
+    them to be merged. By default, the detections touching an edge of their
+    tile which is not an edge of the image are therefore discarded: objects
+    smaller than the overlap of the tiles are fully contained in another tile,
+    and larger objects are detected in the full images when
+    `include_full_image=True`.
+
+    Args:
+        model: an object detector, such as `keras_cv.models.YOLOV8Detector`
+            or `keras_cv.models.RetinaNet`, whose `predict()` method returns a
+            dictionary of `"boxes"`, `"classes"`, `"confidence"` and
+            `"num_detections"` in `model.bounding_box_format`.
+        images: a batch of images of shape `(batch, height, width, channels)`.
+            Images smaller than `tile_size` are padded.
+        tile_size: the `(height, width)` of the tiles, or an int for square
+            tiles.
+        overlap: (Optional) the fraction of `tile_size` by which neighboring
+            tiles overlap, defaults to 0.2. Objects smaller than the overlap
+            are fully contained in at least one tile.
+        batch_size: (Optional) the number of tiles per batch passed to
+            `model.predict()`, defaults to 32.
+        include_full_image: (Optional) whether to also run `model` on each
+            full image resized to `tile_size`, to detect the objects which are
+            too large to fit in a tile. Defaults to `False`.
+        discard_truncated: (Optional) whether to discard the detections which
+            touch an edge of their tile which is not an edge of the image.
+            Defaults to `True`.
+        iou_threshold: (Optional) the IoU above which the detections of
+            different tiles are merged. Defaults to the `iou_threshold` of
+            `model.prediction_decoder`, or 0.5.
+        max_detections: (Optional) the maximum number of detections per image.
+            Defaults to the `max_detections` of `model.prediction_decoder`, or
+            100.
+
+    Returns:
+        A dictionary of `"boxes"`, `"classes"`, `"confidence"` and
+        `"num_detections"`, in the same structure as `model.predict()`, with
+        the boxes in `model.bounding_box_format` relative to `images`.
+
+    Example:
+    ```python
+    model = keras_cv.models.YOLOV8Detector.from_preset(
+        "yolo_v8_m_pascalvoc", bounding_box_format="xywh"
+    )
+    # A batch of 4K images.
+    images = np.random.uniform(size=(2, 2160, 3840, 3)) * 255
+    predictions = keras_cv.models.sliced_predict(
+        model, images, tile_size=640, overlap=0.2
+    )
+    ```
+    """
+    if isinstance(tile_size, int):
+        tile_size = (tile_size, tile_size)
+    if not 0 <= overlap < 1:
+        raise ValueError(
+            f"`overlap` must be in the range [0, 1). Received overlap={overlap}"
+        )
+    decoder = getattr(model, "prediction_decoder", None)
+    if iou_threshold is None:
+        iou_threshold = getattr(decoder, "iou_threshold", 0.5)
+    if max_detections is None:
+        max_detections = getattr(decoder, "max_detections", 100)
+
+    images = ops.convert_to_tensor(images)
+    batch, height, width = images.shape[:3]
+    tile_height, tile_width = tile_size
+    padded_height = max(height, tile_height)
+    padded_width = max(width, tile_width)
+    if (padded_height, padded_width) != (height, width):
+        images = ops.pad(
+            images,
+            [
+                [0, 0],
+                [0, padded_height - height],
+                [0, padded_width - width],
+                [0, 0],
+            ],
+        )
+    origins = [
+        (y, x)
+        for y in _tile_starts(padded_height, tile_height, overlap)
+        for x in _tile_starts(padded_width, tile_width, overlap)
+    ]
+
+    # The tiles are ordered by tile, then by image.
+    tiles = ops.concatenate(
+        [
+            ops.slice(
+                images,
+                [0, y, x, 0],
+                [batch, tile_height, tile_width, images.shape[3]],
+            )
+            for y, x in origins
+        ],
+        axis=0,
+    )
+    offsets = [[x, y, x, y] for y, x in origins]
+    scales = [[1.0, 1.0, 1.0, 1.0]] * len(origins)
+    # Whether the left, top, right and bottom edges of each tile are inside
+    # the image.
+    inner_edges = [
+        [x > 0, y > 0, x + tile_width < width, y + tile_height < height]
+        for y, x in origins
+    ]
+    if include_full_image:
+        tiles = ops.concatenate(
+            [
+                tiles,
+                ops.image.resize(images[:, :height, :width], tile_size),
+            ],
+            axis=0,
+        )
+        offsets.append([0, 0, 0, 0])
+        scale_y, scale_x = height / tile_height, width / tile_width
+        scales.append([scale_x, scale_y, scale_x, scale_y])
+        inner_edges.append([False] * 4)
+
+    predictions = model.predict(tiles, batch_size=batch_size, verbose=0)
+    num_tiles = len(offsets)
+    boxes = bounding_box.convert_format(
+        predictions["boxes"],
+        source=model.bounding_box_format,
+        target="xyxy",
+        image_shape=(tile_height, tile_width, images.shape[3]),
+    )
+    boxes = ops.reshape(boxes, (num_tiles, batch, -1, 4))
+    touches_edges = ops.concatenate(
+        [
+            boxes[..., :2] <= _EDGE_TOLERANCE,
+            boxes[..., 2:3] >= tile_width - _EDGE_TOLERANCE,
+            boxes[..., 3:] >= tile_height - _EDGE_TOLERANCE,
+        ],
+        axis=-1,
+    )
+    truncated = ops.any(
+        touches_edges & ops.convert_to_tensor(inner_edges)[:, None, None, :],
+        axis=-1,
+    )
+    offsets = ops.convert_to_tensor(offsets, dtype=boxes.dtype)
+    scales = ops.convert_to_tensor(scales, dtype=boxes.dtype)
+    boxes = boxes * scales[:, None, None, :] + offsets[:, None, None, :]
+    # Clips the boxes of the tiles overlapping the padding of the images.
+    boxes = ops.clip(
+        boxes,
+        0,
+        ops.convert_to_tensor([width, height, width, height], boxes.dtype),
+    )
+
+    num_detections = ops.reshape(predictions["num_detections"], (-1, batch))
+    max_tile_detections = predictions["boxes"].shape[1]
+    valid = ops.arange(max_tile_detections)[None, None, :] < ops.cast(
+        num_detections[:, :, None], "int32"
+    )
+    if discard_truncated:
+        valid = valid & ~truncated
+    classes = ops.cast(
+        ops.reshape(predictions["classes"], (num_tiles, batch, -1)), "int32"
+    )
+    confidence = ops.reshape(
+        ops.cast(predictions["confidence"], boxes.dtype),
+        (num_tiles, batch, -1),
+    )
+    # Scores the class of each valid detection with its confidence, and every
+    # other class with -1, which is below the confidence threshold of the
+    # merging.
+    class_prediction = ops.where(
+        valid[..., None],
+        ops.one_hot(classes, model.num_classes) * (confidence[..., None] + 1)
+        - 1,
+        -1,
+    )
+
+    def merge_tiles(x):
+        # Moves the batch axis first, and concatenates the detections of all
+        # the tiles of each image.
+        x = ops.transpose(x, [1, 0, 2, 3])
+        return ops.reshape(x, (batch, -1, x.shape[-1]))
+
+    merged = layers.NonMaxSuppression(
+        bounding_box_format="xyxy",
+        from_logits=False,
+        iou_threshold=iou_threshold,
+        confidence_threshold=0.0,
+        max_detections=max_detections,
+    )(merge_tiles(boxes), merge_tiles(class_prediction))
+    merged["boxes"] = bounding_box.convert_format(
+        merged["boxes"],
+        source="xyxy",
+        target=model.bounding_box_format,
+        image_shape=(height, width, images.shape[3]),
+    )
+    return {key: ops.convert_to_numpy(value) for key, value in merged.items()}
+
+
+def _tile_starts(size, tile_size, overlap):
+    """Returns the offsets of the tiles covering `size` with `overlap`."""
+    if size <= tile_size:
+        return [0]
+    stride = max(int(tile_size * (1 - overlap)), 1)
+    num_tiles = math.ceil((size - tile_size) / stride) + 1
+    # The last tile is aligned with the end of the image.
+    return [min(i * stride, size - tile_size) for i in range(num_tiles)]
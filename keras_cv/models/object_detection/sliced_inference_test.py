@@ -0,0 +1,164 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from keras_cv import bounding_box
+from keras_cv.backend import ops
+from keras_cv.models.object_detection.sliced_inference import _tile_starts
+from keras_cv.models.object_detection.sliced_inference import sliced_predict
+from keras_cv.models.object_detection.yolo_v8.yolo_v8_backbone import (
+    YOLOV8Backbone,
+)
+from keras_cv.models.object_detection.yolo_v8.yolo_v8_detector import (
+    YOLOV8Detector,
+)
+
+
+class BrightSquareDetector:
+    """Detects the bounding box of the pixels brighter than 0.5 in each image,
+    with their class as the value of the second channel."""
+
+    def __init__(self, bounding_box_format, max_detections=4):
+        self.bounding_box_format = bounding_box_format
+        self.num_classes = 3
+        self.max_detections = max_detections
+        self.num_predict_calls = 0
+
+    def predict(self, images, batch_size, verbose):
+        self.num_predict_calls += 1
+        images = ops.convert_to_numpy(images)
+        boxes = -np.ones((len(images), self.max_detections, 4), "float32")
+        classes = -np.ones((len(images), self.max_detections), "float32")
+        confidence = -np.ones((len(images), self.max_detections), "float32")
+        num_detections = np.zeros((len(images),), "int32")
+        for i, image in enumerate(images):
+            ys, xs = np.nonzero(image[..., 0] > 0.5)
+            if len(ys) == 0:
+                continue
+            boxes[i, 0] = [xs.min(), ys.min(), xs.max() + 1, ys.max() + 1]
+            classes[i, 0] = image[ys[0], xs[0], 1]
+            confidence[i, 0] = 0.9
+            num_detections[i] = 1
+        boxes = bounding_box.convert_format(
+            boxes,
+            source="xyxy",
+            target=self.bounding_box_format,
+            images=images,
+        )
+        return {
+            "boxes": ops.convert_to_numpy(boxes),
+            "classes": classes,
+            "confidence": confidence,
+            "num_detections": num_detections,
+        }
+
+
+class SlicedInferenceTest(tf.test.TestCase):
+    def test_tile_starts(self):
+        self.assertEqual(_tile_starts(100, 100, 0.2), [0])
+        self.assertEqual(_tile_starts(50, 100, 0.2), [0])
+        self.assertEqual(_tile_starts(250, 100, 0.2), [0, 80, 150])
+        self.assertEqual(_tile_starts(260, 100, 0.0), [0, 100, 160])
+
+    def test_merges_detections_across_tiles(self):
+        images = np.zeros((2, 150, 230, 3), "float32")
+        # Spans the seams of the tiles of the first image.
+        images[0, 70:90, 90:110] = [1, 2, 0]
+        images[1, 10:20, 200:220] = [1, 1, 0]
+        model = BrightSquareDetector("xyxy")
+
+        predictions = sliced_predict(model, images, tile_size=100, overlap=0.5)
+
+        self.assertEqual(model.num_predict_calls, 1)
+        self.assertAllEqual(predictions["num_detections"], [1, 1])
+        self.assertAllClose(
+            predictions["boxes"][:, 0],
+            [[90, 70, 110, 90], [200, 10, 220, 20]],
+        )
+        self.assertAllEqual(predictions["classes"][:, 0], [2, 1])
+        self.assertAllClose(predictions["confidence"][:, 0], [0.9, 0.9])
+
+    def test_relative_format_and_padding(self):
+        images = np.zeros((1, 60, 300, 3), "float32")
+        images[0, 30:60, 280:300] = 1
+        model = BrightSquareDetector("rel_xywh")
+
+        predictions = sliced_predict(
+            model, images, tile_size=(100, 100), overlap=0.2
+        )
+
+        self.assertAllClose(
+            predictions["boxes"][0, 0],
+            [280 / 300, 30 / 60, 20 / 300, 30 / 60],
+        )
+
+    def test_include_full_image(self):
+        images = np.zeros((1, 200, 200, 3), "float32")
+        # Larger than the tiles.
+        images[0, 20:180, 20:180] = 1
+        model = BrightSquareDetector("xyxy")
+
+        predictions = sliced_predict(
+            model, images, tile_size=100, include_full_image=True
+        )
+
+        num_detections = predictions["num_detections"][0]
+        self.assertIn(
+            [20, 20, 180, 180],
+            predictions["boxes"][0, :num_detections].round().tolist(),
+        )
+
+    def test_keep_truncated(self):
+        images = np.zeros((1, 100, 200, 3), "float32")
+        images[0, 40:60, 90:110] = 1
+        model = BrightSquareDetector("xyxy")
+
+        predictions = sliced_predict(
+            model, images, tile_size=100, overlap=0.0, discard_truncated=False
+        )
+
+        self.assertAllEqual(predictions["num_detections"], [2])
+        self.assertAllClose(
+            predictions["boxes"][0, :2], [[90, 40, 100, 60], [100, 40, 110, 60]]
+        )
+
+    def test_invalid_overlap(self):
+        with self.assertRaisesRegex(ValueError, "overlap"):
+            sliced_predict(
+                BrightSquareDetector("xyxy"),
+                np.zeros((1, 100, 100, 3)),
+                tile_size=50,
+                overlap=1.0,
+            )
+
+    @pytest.mark.large
+    def test_yolo_v8_detector(self):
+        model = YOLOV8Detector(
+            num_classes=3,
+            bounding_box_format="xywh",
+            backbone=YOLOV8Backbone.from_preset("yolo_v8_xs_backbone"),
+            fpn_depth=1,
+        )
+        images = np.random.uniform(size=(2, 200, 300, 3)) * 255
+
+        predictions = sliced_predict(
+            model, images, tile_size=128, batch_size=8, max_detections=10
+        )
+
+        self.assertEqual(predictions["boxes"].shape, (2, 10, 4))
+        self.assertEqual(predictions["classes"].shape, (2, 10))
+        self.assertEqual(predictions["num_detections"].shape, (2,))
@@ -0,0 +1,325 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Post-training INT8 quantization of KerasCV models for CPU inference."""
+
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from keras_cv import bounding_box
+from keras_cv.backend import keras
+from keras_cv.backend import ops
+
+
+def quantize_int8(
+    model,
+    calibration_data,
+    num_calibration_steps=100,
+    num_threads=None,
+):
+    """Quantizes a KerasCV model to INT8 for CPU inference.
+
+    The model is converted to a TensorFlow Lite model with full integer
+    quantization:
+    1. The ranges of the activations are calibrated by running the model on
+        `num_calibration_steps` batches of `calibration_data`.
+    2. The kernels of the convolutions are quantized to int8 per output
+        channel. The kernels of the dense layers are quantized per output
+        channel when the installed TensorFlow Lite converter supports it, and
+        per tensor otherwise.
+    3. The activations are quantized to int8 with the calibrated ranges. The
+        inputs and outputs of the model stay float32, so the quantized model
+        is a drop-in replacement for `model`.
+
+    The returned `QuantizedModel` runs the model with the TensorFlow Lite
+    interpreter, and decodes the predictions of detectors with the
+    `prediction_decoder` of `model`, so that its outputs can be compared with
+    the ones of `model` using `keras_cv.models.evaluate_quantization()`.
+
+    Args:
+        model: a KerasCV `Task` or `Backbone`, such as `YOLOV8Detector` or
+            `ImageClassifier`. Only the TensorFlow backend is supported.
+        calibration_data: a `tf.data.Dataset` of representative images. The
+            dataset may yield batches of images, tuples whose first element
+            is a batch of images, or dictionaries with an `"images"` key, such
+            as the datasets used to train `model`.
+        num_calibration_steps: (Optional) the number of batches of
+            `calibration_data` used to calibrate the activation ranges,
+            defaults to 100.
+        num_threads: (Optional) the number of threads used by the TensorFlow
+            Lite interpreter, defaults to `None`, which lets the interpreter
+            decide.
+
+    Returns:
+        A `QuantizedModel`.
+
+    Example:
+    ```python
+    model = keras_cv.models.YOLOV8Detector.from_preset(
+        "yolo_v8_m_pascalvoc", bounding_box_format="xywh"
+    )
+    quantized_model = keras_cv.models.quantize_int8(
+        model, train_ds, num_calibration_steps=50
+    )
+    predictions = quantized_model.predict(images)
+    report = keras_cv.models.evaluate_quantization(
+        model, quantized_model, eval_ds.take(20)
+    )
+    ```
+    """
+    if keras.backend.backend() != "tensorflow":
+        raise ValueError(
+            "`quantize_int8()` requires the TensorFlow backend. Received "
+            f"backend={keras.backend.backend()}"
+        )
+    calibration_data = calibration_data.map(_get_images)
+
+    input_shape = list(model.input_shape)
+    if None in input_shape[1:]:
+        # Converts the model for the image size of the calibration data.
+        data_shape = next(iter(calibration_data)).shape
+        input_shape = [
+            dim if dim is not None else data_dim
+            for dim, data_dim in zip(input_shape, data_shape)
+        ]
+    input_shape[0] = None
+    call = tf.function(
+        lambda images: model(images, training=False)
+    ).get_concrete_function(tf.TensorSpec(input_shape, model.input.dtype))
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([call], model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = lambda: (
+        {"images": images}
+        for images in calibration_data.take(num_calibration_steps)
+    )
+    # Newer converters quantize the dense layers per tensor unless this is
+    # disabled, while older ones do not support per channel dense layers.
+    dense_per_tensor = (
+        "_experimental_disable_per_channel_quantization_for_dense_layers"
+    )
+    if hasattr(converter, dense_per_tensor):
+        setattr(converter, dense_per_tensor, False)
+    return QuantizedModel(
+        converter.convert(), model=model, num_threads=num_threads
+    )
+
+
+class QuantizedModel:
+    """A KerasCV model quantized to INT8 by `quantize_int8()`.
+
+    Args:
+        model_content: the TensorFlow Lite flatbuffer of the quantized model.
+        model: (Optional) the float KerasCV model which was quantized. If it
+            has a `decode_predictions()` method, such as detectors, it is
+            used to decode the outputs of `predict()`.
+        num_threads: (Optional) the number of threads used by the TensorFlow
+            Lite interpreter.
+    """
+
+    def __init__(self, model_content, model=None, num_threads=None):
+        self.model_content = model_content
+        self.model = model
+        self._interpreter = tf.lite.Interpreter(
+            model_content=model_content, num_threads=num_threads
+        )
+        self._runner = self._interpreter.get_signature_runner()
+
+    def __call__(self, images):
+        """Returns the raw outputs of the quantized model for a batch."""
+        outputs = self._runner(images=ops.convert_to_numpy(images))
+        if list(outputs) == ["output_0"]:
+            return outputs["output_0"]
+        return outputs
+
+    def predict(self, x, batch_size=32):
+        """Returns the predictions of the quantized model.
+
+        Like `keras.Model.predict()`, the predictions of detectors are decoded
+        with the `prediction_decoder` of the float model.
+
+        Args:
+            x: a batch of images, or a `tf.data.Dataset` yielding batches of
+                images in any of the structures accepted by `quantize_int8()`.
+            batch_size: (Optional) the batch size used when `x` is a batch of
+                images, defaults to 32.
+        """
+        if not isinstance(x, tf.data.Dataset):
+            x = tf.data.Dataset.from_tensor_slices(x).batch(batch_size)
+        outputs = [
+            self.predict_on_batch(images) for images in x.map(_get_images)
+        ]
+        return tf.nest.map_structure(
+            lambda *batches: np.concatenate(batches, axis=0), *outputs
+        )
+
+    def predict_on_batch(self, images):
+        """Returns the decoded predictions for a batch of images."""
+        return _decode_predictions(self.model, self(images), images)
+
+    def save(self, filepath):
+        """Saves the TensorFlow Lite flatbuffer of the quantized model."""
+        with open(filepath, "wb") as f:
+            f.write(self.model_content)
+
+
+def evaluate_quantization(
+    model, quantized_model, dataset, iou_threshold=0.5, num_warmup_steps=1
+):
+    """Reports the accuracy drift and CPU throughput of a quantized model.
+
+    The float `model` and the `quantized_model` are run on the same batches
+    of `dataset`. The report contains the mean absolute error between the raw
+    outputs of both models, and the following comparisons of their decoded
+    predictions:
+    - For classifiers, whose predictions are a single `(batch, classes)`
+        tensor, the report contains the fraction of images whose top-1 class
+        is the same for both models. If `dataset` yields `(images, labels)`
+        tuples, the top-1 accuracy of both models is reported as well.
+    - For detectors, the report contains the fraction of the detections of
+        `model` which `quantized_model` detects with the same class and an IoU
+        of at least `iou_threshold`.
+
+    Args:
+        model: the float KerasCV model.
+        quantized_model: the `QuantizedModel` of `model`.
+        dataset: a `tf.data.Dataset` of validation batches, in any of the
+            structures accepted by `quantize_int8()`.
+        iou_threshold: (Optional) the IoU above which two detections match,
+            defaults to 0.5.
+        num_warmup_steps: (Optional) the number of batches which are not
+            included in the throughput, defaults to 1.
+
+    Returns:
+        A dictionary with the accuracy metrics and the throughputs of both
+        models, in images per second, in the `"float_images_per_second"` and
+        `"quantized_images_per_second"` keys.
+    """
+    call = tf.function(lambda images: model(images, training=False))
+    errors = []
+    matches = {"top_1_agreement": [], "detection_agreement": []}
+    correct = {"float_accuracy": [], "quantized_accuracy": []}
+    times = {"float": 0.0, "quantized": 0.0}
+    num_images = 0
+    for step, batch in enumerate(dataset):
+        images = _get_images(batch)
+        t0 = time.time()
+        float_outputs = tf.nest.map_structure(
+            ops.convert_to_numpy, call(images)
+        )
+        float_predictions = _decode_predictions(model, float_outputs, images)
+        t1 = time.time()
+        quantized_outputs = quantized_model(images)
+        quantized_predictions = _decode_predictions(
+            model, quantized_outputs, images
+        )
+        t2 = time.time()
+        if step >= num_warmup_steps:
+            times["float"] += t1 - t0
+            times["quantized"] += t2 - t1
+            num_images += int(images.shape[0])
+
+        errors.extend(
+            np.abs(float_output - quantized_output).ravel()
+            for float_output, quantized_output in zip(
+                tf.nest.flatten(float_outputs),
+                tf.nest.flatten(quantized_outputs),
+            )
+        )
+        if isinstance(float_predictions, dict):
+            matches["detection_agreement"].append(
+                _match_detections(
+                    float_predictions,
+                    quantized_predictions,
+                    model.bounding_box_format,
+                    images,
+                    iou_threshold,
+                )
+            )
+            continue
+        float_classes = np.argmax(float_predictions, axis=-1)
+        quantized_classes = np.argmax(quantized_predictions, axis=-1)
+        matches["top_1_agreement"].append(float_classes == quantized_classes)
+        if isinstance(batch, tuple) and len(batch) > 1:
+            labels = ops.convert_to_numpy(batch[1])
+            if labels.ndim == float_classes.ndim + 1:
+                labels = np.argmax(labels, axis=-1)
+            correct["float_accuracy"].append(float_classes == labels)
+            correct["quantized_accuracy"].append(quantized_classes == labels)
+
+    report = {"mean_absolute_error": float(np.mean(np.concatenate(errors)))}
+    report.update(
+        {
+            name: float(np.mean(np.concatenate(values)))
+            for name, values in {**matches, **correct}.items()
+            if values
+        }
+    )
+    if num_images:
+        report["float_images_per_second"] = num_images / times["float"]
+        report["quantized_images_per_second"] = num_images / times["quantized"]
+    return report
+
+
+def _get_images(*batch):
+    # `tf.data.Dataset.map()` passes the elements of tuples as arguments.
+    batch = batch if len(batch) > 1 else batch[0]
+    if isinstance(batch, dict):
+        return batch["images"]
+    if isinstance(batch, tuple):
+        return batch[0]
+    return batch
+
+
+def _decode_predictions(model, outputs, images):
+    if not hasattr(model, "decode_predictions"):
+        return outputs
+    predictions = model.decode_predictions(
+        outputs, ops.convert_to_tensor(images)
+    )
+    return tf.nest.map_structure(ops.convert_to_numpy, predictions)
+
+
+def _match_detections(
+    float_predictions,
+    quantized_predictions,
+    bounding_box_format,
+    images,
+    iou_threshold,
+):
+    """Returns whether each float detection is matched by a quantized one."""
+    matched = []
+    for i, num_detections in enumerate(float_predictions["num_detections"]):
+        num_detections = int(num_detections)
+        if num_detections == 0:
+            continue
+        num_quantized = int(quantized_predictions["num_detections"][i])
+        if num_quantized == 0:
+            matched.append(np.zeros(num_detections, dtype=bool))
+            continue
+        ious = ops.convert_to_numpy(
+            bounding_box.compute_iou(
+                float_predictions["boxes"][i, :num_detections],
+                quantized_predictions["boxes"][i, :num_quantized],
+                bounding_box_format=bounding_box_format,
+                images=images[i],
+            )
+        )
+        same_class = (
+            float_predictions["classes"][i, :num_detections, None]
+            == quantized_predictions["classes"][i, None, :num_quantized]
+        )
+        matched.append(np.any((ious >= iou_threshold) & same_class, axis=-1))
+    return np.concatenate(matched) if matched else np.zeros(0, dtype=bool)
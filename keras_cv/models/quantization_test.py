@@ -0,0 +1,128 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for INT8 quantization."""
+
+import os
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from keras_cv.models.backbones.resnet_v1.resnet_v1_backbone import (
+    ResNetBackbone,
+)
+from keras_cv.models.classification.image_classifier import ImageClassifier
+from keras_cv.models.object_detection.yolo_v8.yolo_v8_backbone import (
+    YOLOV8Backbone,
+)
+from keras_cv.models.object_detection.yolo_v8.yolo_v8_detector import (
+    YOLOV8Detector,
+)
+from keras_cv.models.quantization import evaluate_quantization
+from keras_cv.models.quantization import quantize_int8
+
+
+@pytest.mark.tf_keras_only
+class QuantizationTest(tf.test.TestCase):
+    def setUp(self):
+        self.images = tf.random.uniform((8, 64, 64, 3), maxval=255)
+        self.labels = tf.one_hot(
+            tf.random.uniform((8,), maxval=4, dtype="int32"), 4
+        )
+
+    def build_classifier(self):
+        backbone = ResNetBackbone(
+            stackwise_filters=[8, 16],
+            stackwise_blocks=[1, 1],
+            stackwise_strides=[1, 2],
+            include_rescaling=True,
+        )
+        return ImageClassifier(backbone=backbone, num_classes=4)
+
+    def test_quantized_classifier(self):
+        model = self.build_classifier()
+        dataset = tf.data.Dataset.from_tensor_slices(
+            (self.images, self.labels)
+        ).batch(4)
+
+        quantized_model = quantize_int8(model, dataset)
+        predictions = quantized_model.predict(self.images, batch_size=4)
+
+        self.assertEqual(predictions.shape, (8, 4))
+        self.assertAllClose(
+            predictions, model.predict(self.images), atol=0.05, rtol=0
+        )
+
+    def test_evaluate_classifier(self):
+        model = self.build_classifier()
+        dataset = tf.data.Dataset.from_tensor_slices(
+            (self.images, self.labels)
+        ).batch(2)
+        quantized_model = quantize_int8(model, dataset)
+
+        report = evaluate_quantization(model, quantized_model, dataset)
+
+        self.assertEqual(
+            set(report),
+            {
+                "mean_absolute_error",
+                "top_1_agreement",
+                "float_accuracy",
+                "quantized_accuracy",
+                "float_images_per_second",
+                "quantized_images_per_second",
+            },
+        )
+        self.assertGreaterEqual(report["top_1_agreement"], 0.0)
+        self.assertLessEqual(report["top_1_agreement"], 1.0)
+
+    def test_save(self):
+        model = self.build_classifier()
+        dataset = tf.data.Dataset.from_tensor_slices(self.images).batch(4)
+        quantized_model = quantize_int8(model, dataset)
+        path = os.path.join(self.get_temp_dir(), "model.tflite")
+
+        quantized_model.save(path)
+
+        interpreter = tf.lite.Interpreter(model_path=path)
+        self.assertEqual(
+            interpreter.get_signature_list()["serving_default"]["inputs"],
+            ["images"],
+        )
+
+    @pytest.mark.large
+    def test_quantized_detector(self):
+        model = YOLOV8Detector(
+            num_classes=4,
+            bounding_box_format="xywh",
+            backbone=YOLOV8Backbone.from_preset("yolo_v8_xs_backbone"),
+            fpn_depth=1,
+        )
+        dataset = tf.data.Dataset.from_tensor_slices(
+            {"images": self.images}
+        ).batch(4)
+
+        quantized_model = quantize_int8(model, dataset, num_calibration_steps=1)
+        predictions = quantized_model.predict(dataset)
+        report = evaluate_quantization(model, quantized_model, dataset)
+
+        self.assertEqual(
+            set(predictions),
+            {"boxes", "classes", "confidence", "num_detections"},
+        )
+        self.assertEqual(predictions["boxes"].shape[:1], (8,))
+        self.assertIn("detection_agreement", report)
+        self.assertTrue(
+            np.isfinite(report["quantized_images_per_second"]).all()
+        )
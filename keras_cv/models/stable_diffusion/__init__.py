@@ -18,6 +18,7 @@ from keras_cv.models.stable_diffusion.diffusion_model import DiffusionModel
 from keras_cv.models.stable_diffusion.diffusion_model import DiffusionModelV2
 from keras_cv.models.stable_diffusion.image_encoder import ImageEncoder
 from keras_cv.models.stable_diffusion.noise_scheduler import NoiseScheduler
+from keras_cv.models.stable_diffusion.serving import BatchingServer
 from keras_cv.models.stable_diffusion.stable_diffusion import StableDiffusion
 from keras_cv.models.stable_diffusion.stable_diffusion import StableDiffusionV2
 from keras_cv.models.stable_diffusion.text_encoder import TextEncoder
@@ -15,6 +15,9 @@
 import tensorflow as tf
 from tensorflow import keras
 
+from keras_cv.models.stable_diffusion.__internal__.layers.chunked_attention import (  # noqa: E501
+    chunked_attention,
+)
 from keras_cv.models.stable_diffusion.__internal__.layers.padded_conv2d import (
     PaddedConv2D,
 )
@@ -37,18 +40,10 @@ class AttentionBlock(keras.layers.Layer):
         # Compute attention
         shape = tf.shape(q)
         h, w, c = shape[1], shape[2], shape[3]
-        q = tf.reshape(q, (-1, h * w, c))  # b, hw, c
-        k = tf.transpose(k, (0, 3, 1, 2))
-        k = tf.reshape(k, (-1, c, h * w))  # b, c, hw
-        y = q @ k
-        y = y * 1 / tf.sqrt(tf.cast(c, self.compute_dtype))
-        y = keras.activations.softmax(y)
-
-        # Attend to values
-        v = tf.transpose(v, (0, 3, 1, 2))
-        v = tf.reshape(v, (-1, c, h * w))
-        y = tf.transpose(y, (0, 2, 1))
-        x = v @ y
-        x = tf.transpose(x, (0, 2, 1))
+        q = tf.reshape(q, (-1, 1, h * w, c))  # b, 1, hw, c
+        k = tf.reshape(k, (-1, 1, h * w, c))  # b, 1, hw, c
+        v = tf.reshape(v, (-1, 1, h * w, c))  # b, 1, hw, c
+        scale = 1 / tf.sqrt(tf.cast(c, self.compute_dtype))
+        x = chunked_attention(q, k, v, scale)
         x = tf.reshape(x, (-1, h, w, c))
         return self.proj_out(x) + inputs
@@ -0,0 +1,149 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tensorflow as tf
+
+QUERY_CHUNK_SIZE = 1024
+KEY_CHUNK_SIZE = 4096
+
+
+def _pad_to_multiple(x, multiple, axis):
+    length = tf.shape(x)[axis]
+    num_padding = (multiple - length % multiple) % multiple
+    paddings = [[0, 0]] * x.shape.rank
+    paddings[axis] = [0, num_padding]
+    return tf.pad(x, paddings)
+
+
+def chunked_attention(
+    query,
+    key,
+    value,
+    scale,
+    query_chunk_size=QUERY_CHUNK_SIZE,
+    key_chunk_size=KEY_CHUNK_SIZE,
+):
+    """Computes softmax attention without materializing the full score matrix.
+
+    The queries are processed in chunks of `query_chunk_size`. For each query
+    chunk, the keys and values are consumed in chunks of `key_chunk_size` while
+    keeping a running maximum, a running softmax denominator and a running
+    weighted sum of the values (online softmax). The peak memory of the scores
+    is therefore `query_chunk_size * key_chunk_size` per head instead of
+    `query_length * key_length`. When both lengths fit into a single chunk,
+    this falls back to regular attention.
+
+    Args:
+      query: Tensor of shape [batch, num_heads, query_length, head_size].
+      key: Tensor of shape [batch, num_heads, key_length, head_size].
+      value: Tensor of shape [batch, num_heads, key_length, head_size].
+      scale: the factor the query-key dot products are multiplied by.
+      query_chunk_size: the number of queries processed at a time.
+      key_chunk_size: the number of keys and values processed at a time.
+
+    Returns:
+      Tensor of shape [batch, num_heads, query_length, head_size].
+    """
+    query_length = query.shape[2]
+    key_length = key.shape[2]
+    if (
+        query_length is not None
+        and key_length is not None
+        and query_length <= query_chunk_size
+        and key_length <= key_chunk_size
+    ):
+        weights = tf.nn.softmax(tf.matmul(query, key, transpose_b=True) * scale)
+        return tf.matmul(weights, value)
+
+    shape = tf.shape(query)
+    batch_size, num_heads, head_size = shape[0], shape[1], shape[3]
+    query_length = shape[2]
+    key_length = tf.shape(key)[2]
+    query_chunk_size = tf.minimum(query_chunk_size, query_length)
+    key_chunk_size = tf.minimum(key_chunk_size, key_length)
+
+    # [num_query_chunks, batch, num_heads, query_chunk_size, head_size]
+    query = _pad_to_multiple(query * scale, query_chunk_size, axis=2)
+    query = tf.transpose(
+        tf.reshape(
+            query, [batch_size, num_heads, -1, query_chunk_size, head_size]
+        ),
+        (2, 0, 1, 3, 4),
+    )
+    # [num_key_chunks, batch, num_heads, key_chunk_size, head_size]
+    key = _pad_to_multiple(key, key_chunk_size, axis=2)
+    key = tf.transpose(
+        tf.reshape(key, [batch_size, num_heads, -1, key_chunk_size, head_size]),
+        (2, 0, 1, 3, 4),
+    )
+    value = _pad_to_multiple(value, key_chunk_size, axis=2)
+    value = tf.transpose(
+        tf.reshape(
+            value, [batch_size, num_heads, -1, key_chunk_size, head_size]
+        ),
+        (2, 0, 1, 3, 4),
+    )
+    # [num_key_chunks, key_chunk_size], True for padded keys.
+    key_padding_mask = tf.reshape(
+        tf.range(tf.shape(key)[0] * key_chunk_size) >= key_length,
+        [-1, key_chunk_size],
+    )
+    num_key_chunks = tf.shape(key)[0]
+
+    def attend_to_query_chunk(query_chunk):
+        def attend_to_key_chunk(i, weighted_value, weight_sum, max_score):
+            # [batch, num_heads, query_chunk_size, key_chunk_size]
+            score = tf.matmul(query_chunk, key[i], transpose_b=True)
+            score = tf.where(
+                key_padding_mask[i],
+                tf.constant(-float("inf"), score.dtype),
+                score,
+            )
+            new_max_score = tf.maximum(
+                max_score, tf.reduce_max(score, axis=-1, keepdims=True)
+            )
+            # Rescale the running sums to the new maximum.
+            correction = tf.exp(max_score - new_max_score)
+            weights = tf.exp(score - new_max_score)
+            weighted_value = weighted_value * correction + tf.matmul(
+                weights, value[i]
+            )
+            weight_sum = weight_sum * correction + tf.reduce_sum(
+                weights, axis=-1, keepdims=True
+            )
+            return i + 1, weighted_value, weight_sum, new_max_score
+
+        stats_shape = tf.concat([tf.shape(query_chunk)[:-1], [1]], axis=0)
+        _, weighted_value, weight_sum, _ = tf.while_loop(
+            lambda i, *_: i < num_key_chunks,
+            attend_to_key_chunk,
+            (
+                tf.constant(0),
+                tf.zeros_like(query_chunk),
+                tf.zeros(stats_shape, dtype=query_chunk.dtype),
+                tf.fill(
+                    stats_shape, tf.constant(-float("inf"), query_chunk.dtype)
+                ),
+            ),
+        )
+        return weighted_value / weight_sum
+
+    # Chunks are processed one at a time to bound the peak memory.
+    # [num_query_chunks, batch, num_heads, query_chunk_size, head_size]
+    outputs = tf.map_fn(attend_to_query_chunk, query, parallel_iterations=1)
+    outputs = tf.reshape(
+        tf.transpose(outputs, (1, 2, 0, 3, 4)),
+        [batch_size, num_heads, -1, head_size],
+    )
+    return outputs[:, :, :query_length, :]
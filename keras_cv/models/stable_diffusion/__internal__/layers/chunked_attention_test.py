@@ -0,0 +1,94 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tensorflow as tf
+from absl.testing import parameterized
+
+from keras_cv.models.stable_diffusion.__internal__.layers.attention_block import (  # noqa: E501
+    AttentionBlock,
+)
+from keras_cv.models.stable_diffusion.__internal__.layers.chunked_attention import (  # noqa: E501
+    chunked_attention,
+)
+
+
+def full_attention(query, key, value, scale):
+    score = tf.matmul(query, key, transpose_b=True) * scale
+    return tf.matmul(tf.nn.softmax(score), value)
+
+
+class ChunkedAttentionTest(tf.test.TestCase, parameterized.TestCase):
+    @parameterized.named_parameters(
+        ("single_chunk", 64, 64, 64, 64),
+        ("query_chunks", 64, 64, 16, 64),
+        ("key_chunks", 64, 64, 64, 16),
+        ("uneven_chunks", 50, 77, 16, 24),
+        ("short_keys", 100, 7, 32, 32),
+    )
+    def test_matches_full_attention(
+        self, query_length, key_length, query_chunk_size, key_chunk_size
+    ):
+        query = tf.random.normal((2, 3, query_length, 8))
+        key = tf.random.normal((2, 3, key_length, 8)) * 4.0
+        value = tf.random.normal((2, 3, key_length, 8))
+
+        outputs = chunked_attention(
+            query,
+            key,
+            value,
+            scale=8**-0.5,
+            query_chunk_size=query_chunk_size,
+            key_chunk_size=key_chunk_size,
+        )
+
+        self.assertAllClose(
+            outputs,
+            full_attention(query, key, value, 8**-0.5),
+            rtol=1e-5,
+            atol=1e-5,
+        )
+
+    def test_dynamic_shapes(self):
+        query = tf.random.normal((1, 2, 40, 4))
+        key = tf.random.normal((1, 2, 30, 4))
+        value = tf.random.normal((1, 2, 30, 4))
+
+        @tf.function(input_signature=[tf.TensorSpec((None, None, None, 4))] * 3)
+        def attention(query, key, value):
+            return chunked_attention(
+                query, key, value, 0.5, query_chunk_size=16, key_chunk_size=8
+            )
+
+        self.assertAllClose(
+            attention(query, key, value),
+            full_attention(query, key, value, 0.5),
+            rtol=1e-5,
+            atol=1e-5,
+        )
+
+    def test_attention_block(self):
+        layer = AttentionBlock(32)
+        inputs = tf.random.normal((2, 48, 48, 32))
+        outputs = layer(inputs)
+
+        x = layer.norm(inputs)
+        q, k, v = [
+            tf.reshape(t(x), (2, 1, -1, 32))
+            for t in (layer.q, layer.k, layer.v)
+        ]
+        expected = full_attention(q, k, v, 32**-0.5)
+        expected = (
+            layer.proj_out(tf.reshape(expected, (2, 48, 48, 32))) + inputs
+        )
+        self.assertAllClose(outputs, expected, rtol=1e-4, atol=1e-4)
@@ -26,7 +26,14 @@ from keras_cv.models.stable_diffusion.__internal__.layers.resnet_block import (
 
 
 class Decoder(keras.Sequential):
-    def __init__(self, img_height, img_width, name=None, download_weights=True):
+    def __init__(
+        self,
+        img_height,
+        img_width,
+        name=None,
+        download_weights=True,
+        cache_dir=None,
+    ):
         super().__init__(
             [
                 keras.layers.Input((img_height // 8, img_width // 8, 4)),
@@ -65,5 +72,6 @@ class Decoder(keras.Sequential):
             decoder_weights_fpath = keras.utils.get_file(
                 origin="https://huggingface.co/fchollet/stable-diffusion/resolve/main/kcv_decoder.h5",  # noqa: E501
                 file_hash="ad350a65cc8bc4a80c8103367e039a3329b4231c2469a1093869a345f55b1962",  # noqa: E501
+                cache_dir=cache_dir,
             )
             self.load_weights(decoder_weights_fpath)
@@ -15,6 +15,9 @@
 import tensorflow as tf
 from tensorflow import keras
 
+from keras_cv.models.stable_diffusion.__internal__.layers.chunked_attention import (  # noqa: E501
+    chunked_attention,
+)
 from keras_cv.models.stable_diffusion.__internal__.layers.padded_conv2d import (
     PaddedConv2D,
 )
@@ -28,6 +31,7 @@ class DiffusionModel(keras.Model):
         max_text_length,
         name=None,
         download_weights=True,
+        cache_dir=None,
     ):
         context = keras.layers.Input((max_text_length, 768))
         t_embed_input = keras.layers.Input((320,))
@@ -110,6 +114,7 @@ class DiffusionModel(keras.Model):
             diffusion_model_weights_fpath = keras.utils.get_file(
                 origin="https://huggingface.co/fchollet/stable-diffusion/resolve/main/kcv_diffusion_model.h5",  # noqa: E501
                 file_hash="8799ff9763de13d7f30a683d653018e114ed24a6a819667da4f5ee10f9e805fe",  # noqa: E501
+                cache_dir=cache_dir,
             )
             self.load_weights(diffusion_model_weights_fpath)
 
@@ -122,6 +127,7 @@ class DiffusionModelV2(keras.Model):
         max_text_length,
         name=None,
         download_weights=True,
+        cache_dir=None,
     ):
         context = keras.layers.Input((max_text_length, 1024))
         t_embed_input = keras.layers.Input((320,))
@@ -204,6 +210,7 @@ class DiffusionModelV2(keras.Model):
             diffusion_model_weights_fpath = keras.utils.get_file(
                 origin="https://huggingface.co/ianstenbit/keras-sd2.1/resolve/main/diffusion_model_v2_1.h5",  # noqa: E501
                 file_hash="c31730e91111f98fe0e2dbde4475d381b5287ebb9672b1821796146a25c5132d",  # noqa: E501
+                cache_dir=cache_dir,
             )
             self.load_weights(diffusion_model_weights_fpath)
 
@@ -316,14 +323,10 @@ class CrossAttention(keras.layers.Layer):
         )
 
         q = tf.transpose(q, (0, 2, 1, 3))  # (bs, num_heads, time, head_size)
-        k = tf.transpose(k, (0, 2, 3, 1))  # (bs, num_heads, head_size, time)
+        k = tf.transpose(k, (0, 2, 1, 3))  # (bs, num_heads, time, head_size)
         v = tf.transpose(v, (0, 2, 1, 3))  # (bs, num_heads, time, head_size)
 
-        score = td_dot(q, k) * self.scale
-        weights = keras.activations.softmax(
-            score
-        )  # (bs, num_heads, time, time)
-        attn = td_dot(weights, v)
+        attn = chunked_attention(q, k, v, self.scale)
         attn = tf.transpose(
             attn, (0, 2, 1, 3)
         )  # (bs, time, num_heads, head_size)
@@ -356,10 +359,3 @@ class GEGLU(keras.layers.Layer):
             gate * 0.7978845608 * (1 + 0.044715 * (gate**2))
         )
         return x * 0.5 * gate * (1 + tanh_res)
-
-
-def td_dot(a, b):
-    aa = tf.reshape(a, (-1, a.shape[2], a.shape[3]))
-    bb = tf.reshape(b, (-1, b.shape[2], b.shape[3]))
-    cc = keras.backend.batch_dot(aa, bb)
-    return tf.reshape(cc, (-1, a.shape[1], cc.shape[1], cc.shape[2]))
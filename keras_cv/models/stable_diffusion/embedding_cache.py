@@ -0,0 +1,92 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Bounded LRU cache for Stable Diffusion text embeddings."""
+
+import collections
+
+
+class EmbeddingCache:
+    """A bounded least-recently-used cache of text embeddings.
+
+    Embeddings are keyed on the tuple of token ids they were encoded from, and
+    the least recently used embedding is evicted once `max_size` embeddings
+    are cached. The cache also records a fingerprint of the text encoder the
+    embeddings were computed with: `validate()` clears the cache whenever a
+    different fingerprint is passed.
+
+    Args:
+        max_size: int, the maximum number of cached embeddings. A value of 0
+            disables caching.
+
+    Attributes:
+        hits: int, the number of lookups that found a cached embedding.
+        misses: int, the number of lookups that did not.
+
+    Example:
+
+    ```python
+    cache = EmbeddingCache(max_size=2)
+    cache.put((49406, 320, 49407), embedding)
+    cache.get((49406, 320, 49407))  # returns `embedding`, cache.hits == 1
+    ```
+    """
+
+    def __init__(self, max_size):
+        if max_size < 0:
+            raise ValueError(
+                f"`max_size` must be non-negative. Received max_size={max_size}"
+            )
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._fingerprint = None
+        self._embeddings = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._embeddings)
+
+    def get(self, token_ids):
+        """Returns the embedding cached for `token_ids`, or None."""
+        key = tuple(token_ids)
+        if key not in self._embeddings:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._embeddings.move_to_end(key)
+        return self._embeddings[key]
+
+    def put(self, token_ids, embedding):
+        """Caches `embedding` for `token_ids`, evicting the least recently
+        used embedding if the cache is full."""
+        if self.max_size == 0:
+            return
+        key = tuple(token_ids)
+        self._embeddings[key] = embedding
+        self._embeddings.move_to_end(key)
+        while len(self._embeddings) > self.max_size:
+            self._embeddings.popitem(last=False)
+
+    def validate(self, fingerprint):
+        """Clears the cache if `fingerprint` differs from the fingerprint of
+        the text encoder the cached embeddings were computed with."""
+        if self._fingerprint is None or self._fingerprint != fingerprint:
+            self._embeddings.clear()
+            self._fingerprint = fingerprint
+
+    def clear(self):
+        """Removes all cached embeddings and resets the counters."""
+        self._embeddings.clear()
+        self._fingerprint = None
+        self.hits = 0
+        self.misses = 0
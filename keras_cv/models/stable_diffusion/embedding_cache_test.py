@@ -0,0 +1,59 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tensorflow as tf
+
+from keras_cv.models.stable_diffusion.embedding_cache import EmbeddingCache
+
+
+class EmbeddingCacheTest(tf.test.TestCase):
+    def test_hits_and_misses(self):
+        cache = EmbeddingCache(max_size=2)
+        self.assertIsNone(cache.get([1, 2]))
+        cache.put([1, 2], "a")
+        self.assertEqual(cache.get([1, 2]), "a")
+        self.assertEqual(cache.get((1, 2)), "a")
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = EmbeddingCache(max_size=2)
+        cache.put([1], "a")
+        cache.put([2], "b")
+        # Uses [1], so that [2] is the least recently used embedding.
+        cache.get([1])
+        cache.put([3], "c")
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get([2]))
+        self.assertEqual(cache.get([1]), "a")
+        self.assertEqual(cache.get([3]), "c")
+
+    def test_validate_clears_on_new_fingerprint(self):
+        cache = EmbeddingCache(max_size=2)
+        cache.validate((1.0, 2.0))
+        cache.put([1], "a")
+        cache.validate((1.0, 2.0))
+        self.assertEqual(cache.get([1]), "a")
+        cache.validate((1.0, 3.0))
+        self.assertIsNone(cache.get([1]))
+
+    def test_disabled_cache(self):
+        cache = EmbeddingCache(max_size=0)
+        cache.put([1], "a")
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get([1]))
+
+    def test_negative_max_size(self):
+        with self.assertRaisesRegex(ValueError, "max_size"):
+            EmbeddingCache(max_size=-1)
@@ -28,7 +28,7 @@ from keras_cv.models.stable_diffusion.__internal__.layers.resnet_block import (
 class ImageEncoder(keras.Sequential):
     """ImageEncoder is the VAE Encoder for StableDiffusion."""
 
-    def __init__(self, download_weights=True):
+    def __init__(self, download_weights=True, cache_dir=None):
         super().__init__(
             [
                 keras.layers.Input((None, None, 3)),
@@ -63,5 +63,6 @@ class ImageEncoder(keras.Sequential):
             image_encoder_weights_fpath = keras.utils.get_file(
                 origin="https://huggingface.co/fchollet/stable-diffusion/resolve/main/vae_encoder.h5",  # noqa: E501
                 file_hash="c60fb220a40d090e0f86a6ab4c312d113e115c87c40ff75d11ffcf380aab7ebb",  # noqa: E501
+                cache_dir=cache_dir,
             )
             self.load_weights(image_encoder_weights_fpath)
@@ -0,0 +1,229 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Dynamic request batching for serving StableDiffusion."""
+
+import collections
+import concurrent.futures
+import dataclasses
+import queue
+import random
+import threading
+import time
+from typing import Optional
+
+from keras_cv.models.stable_diffusion.stable_diffusion import StableDiffusion
+
+
+@dataclasses.dataclass
+class _Request:
+    prompt: str
+    negative_prompt: Optional[str]
+    seed: Optional[int]
+    group_key: tuple
+    future: concurrent.futures.Future
+
+
+class BatchingServer:
+    """Serves StableDiffusion `text_to_image` requests in dynamic batches.
+
+    Requests submitted concurrently are collected for up to
+    `batch_window_seconds` after the first one arrives. They are grouped by
+    (img_height, img_width, num_steps, unconditional_guidance_scale), and each
+    group runs a single batched diffusion loop of up to `max_batch_size`
+    prompts. Results are returned to each caller through a
+    `concurrent.futures.Future`.
+
+    Args:
+        model_fn: a callable taking `img_height` and `img_width` and returning
+            a StableDiffusion model for that resolution. Models are created on
+            first use and reused. Defaults to `StableDiffusion`.
+        max_batch_size: int, the maximum number of prompts run in a single
+            diffusion loop, defaults to 8.
+        batch_window_seconds: float, how long to wait for more requests after
+            the first request of a batch arrives, defaults to 0.05.
+
+    Example:
+
+    ```python
+    with BatchingServer(max_batch_size=4) as server:
+        futures = [
+            server.submit("A horse in a field", seed=i) for i in range(4)
+        ]
+        images = [future.result() for future in futures]
+    ```
+    """
+
+    def __init__(
+        self,
+        model_fn=StableDiffusion,
+        max_batch_size=8,
+        batch_window_seconds=0.05,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(
+                "`max_batch_size` must be a positive integer. Received "
+                f"max_batch_size={max_batch_size}."
+            )
+        self.model_fn = model_fn
+        self.max_batch_size = max_batch_size
+        self.batch_window_seconds = batch_window_seconds
+        self._models = {}
+        self._requests = queue.Queue()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Starts the background thread serving the requests."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._serve, name="stable_diffusion_server", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Serves the pending requests and stops the background thread."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def submit(
+        self,
+        prompt,
+        negative_prompt=None,
+        img_height=512,
+        img_width=512,
+        num_steps=50,
+        unconditional_guidance_scale=7.5,
+        seed=None,
+    ):
+        """Submits a request to generate one image.
+
+        Args:
+            prompt: a string to generate the image for.
+            negative_prompt: an optional string to negatively guide the image
+                generation, defaults to None.
+            img_height: int, height of the image to generate, defaults to 512.
+                It is rounded to a multiple of 128, like in `StableDiffusion`.
+            img_width: int, width of the image to generate, defaults to 512.
+                It is rounded to a multiple of 128, like in `StableDiffusion`.
+            num_steps: int, number of diffusion steps, defaults to 50.
+            unconditional_guidance_scale: float, defaults to 7.5.
+            seed: optional integer used to seed the diffusion noise.
+
+        Returns:
+            A `concurrent.futures.Future` resolving to the generated uint8
+            image of shape (img_height, img_width, 3), with the rounded image
+            size.
+        """
+        if self._thread is None:
+            raise RuntimeError(
+                "The server is not running. Call `start()` before submitting "
+                "requests."
+            )
+        # The models round the image size to multiples of 128, so requests
+        # of sizes rounding to the same shape are batched together.
+        img_height = round(img_height / 128) * 128
+        img_width = round(img_width / 128) * 128
+        future = concurrent.futures.Future()
+        self._requests.put(
+            _Request(
+                prompt=prompt,
+                negative_prompt=negative_prompt,
+                seed=seed,
+                group_key=(
+                    img_height,
+                    img_width,
+                    num_steps,
+                    unconditional_guidance_scale,
+                ),
+                future=future,
+            )
+        )
+        return future
+
+    def _serve(self):
+        while not (self._stop_event.is_set() and self._requests.empty()):
+            try:
+                requests = [self._requests.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.batch_window_seconds
+            while True:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    requests.append(self._requests.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            groups = collections.defaultdict(list)
+            for request in requests:
+                groups[request.group_key].append(request)
+            for group_key, group in groups.items():
+                for i in range(0, len(group), self.max_batch_size):
+                    self._run_batch(
+                        group_key, group[i : i + self.max_batch_size]
+                    )
+
+    def _run_batch(self, group_key, requests):
+        requests = [
+            r for r in requests if r.future.set_running_or_notify_cancel()
+        ]
+        if not requests:
+            return
+        img_height, img_width, num_steps, guidance_scale = group_key
+        try:
+            model = self._get_model(img_height, img_width)
+            negative_prompts = [r.negative_prompt for r in requests]
+            if all(p is None for p in negative_prompts):
+                negative_prompts = None
+            else:
+                # An empty prompt is tokenized to the unconditional tokens.
+                negative_prompts = [p or "" for p in negative_prompts]
+            images = model.text_to_image(
+                [r.prompt for r in requests],
+                negative_prompt=negative_prompts,
+                num_steps=num_steps,
+                unconditional_guidance_scale=guidance_scale,
+                seed=[
+                    random.randrange(2**31) if r.seed is None else r.seed
+                    for r in requests
+                ],
+            )
+        except Exception as e:
+            for request in requests:
+                request.future.set_exception(e)
+            return
+        for request, image in zip(requests, images):
+            request.future.set_result(image)
+
+    def _get_model(self, img_height, img_width):
+        key = (img_height, img_width)
+        if key not in self._models:
+            self._models[key] = self.model_fn(
+                img_height=img_height, img_width=img_width
+            )
+        return self._models[key]
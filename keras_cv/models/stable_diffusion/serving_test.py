@@ -0,0 +1,117 @@
+# Copyright 2023 The KerasCV Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import tensorflow as tf
+
+from keras_cv.models.stable_diffusion.serving import BatchingServer
+
+
+class FakeStableDiffusion:
+    def __init__(self, img_height, img_width):
+        self.img_height = img_height
+        self.img_width = img_width
+        self.calls = []
+
+    def text_to_image(self, prompt, negative_prompt=None, seed=None, **kwargs):
+        if "fail" in prompt:
+            raise ValueError("Failed to generate.")
+        self.calls.append(
+            dict(
+                prompt=prompt,
+                negative_prompt=negative_prompt,
+                seed=seed,
+                **kwargs,
+            )
+        )
+        # Encodes the seed of each prompt in the generated image.
+        return np.stack(
+            [
+                np.full((self.img_height, self.img_width, 3), s % 256, "uint8")
+                for s in seed
+            ]
+        )
+
+
+class BatchingServerTest(tf.test.TestCase):
+    def test_batches_concurrent_requests(self):
+        server = BatchingServer(
+            FakeStableDiffusion, max_batch_size=2, batch_window_seconds=1.0
+        )
+        with server:
+            futures = [
+                server.submit("a", img_height=128, img_width=128, seed=1),
+                server.submit("b", img_height=128, img_width=128, seed=2),
+                server.submit("c", img_height=128, img_width=128, seed=3),
+                server.submit("d", img_height=256, img_width=128, seed=4),
+                server.submit(
+                    "e", img_height=128, img_width=128, num_steps=10, seed=5
+                ),
+            ]
+            images = [future.result(timeout=10) for future in futures]
+
+        for image, seed in zip(images, [1, 2, 3, 4, 5]):
+            self.assertAllEqual(image, np.full(image.shape, seed))
+        self.assertEqual(images[3].shape, (256, 128, 3))
+
+        model = server._models[(128, 128)]
+        self.assertEqual(
+            [call["prompt"] for call in model.calls], [["a", "b"], ["c"], ["e"]]
+        )
+        self.assertEqual(
+            [call["num_steps"] for call in model.calls], [50, 50, 10]
+        )
+        self.assertEqual(server._models[(256, 128)].calls[0]["prompt"], ["d"])
+
+    def test_batches_sizes_rounding_to_the_same_shape(self):
+        server = BatchingServer(FakeStableDiffusion, batch_window_seconds=1.0)
+        with server:
+            futures = [
+                server.submit("a", img_height=500, img_width=512, seed=1),
+                server.submit("b", img_height=512, img_width=530, seed=2),
+            ]
+            images = [future.result(timeout=10) for future in futures]
+
+        self.assertEqual(list(server._models), [(512, 512)])
+        self.assertEqual(
+            server._models[(512, 512)].calls[0]["prompt"], ["a", "b"]
+        )
+        self.assertEqual(images[0].shape, (512, 512, 3))
+
+    def test_negative_prompts(self):
+        with BatchingServer(
+            FakeStableDiffusion, batch_window_seconds=1.0
+        ) as server:
+            futures = [
+                server.submit("a", img_height=128, img_width=128),
+                server.submit(
+                    "b", negative_prompt="c", img_height=128, img_width=128
+                ),
+            ]
+            [future.result(timeout=10) for future in futures]
+
+        call = server._models[(128, 128)].calls[0]
+        self.assertEqual(call["negative_prompt"], ["", "c"])
+        self.assertEqual(len(call["seed"]), 2)
+
+    def test_propagates_exceptions(self):
+        with BatchingServer(FakeStableDiffusion) as server:
+            future = server.submit("fail", img_height=128, img_width=128)
+            with self.assertRaisesRegex(ValueError, "Failed to generate"):
+                future.result(timeout=10)
+
+    def test_submit_requires_running_server(self):
+        server = BatchingServer(FakeStableDiffusion)
+        with self.assertRaisesRegex(RuntimeError, "not running"):
+            server.submit("a")
@@ -24,7 +24,10 @@ The current implementation is a rewrite of the initial TF/Keras port by
 Divam Gupta.
 """
 
+import concurrent.futures
 import math
+import time
+import weakref
 
 import numpy as np
 import tensorflow as tf
@@ -36,11 +39,22 @@ from keras_cv.models.stable_diffusion.constants import _UNCONDITIONAL_TOKENS
 from keras_cv.models.stable_diffusion.decoder import Decoder
 from keras_cv.models.stable_diffusion.diffusion_model import DiffusionModel
 from keras_cv.models.stable_diffusion.diffusion_model import DiffusionModelV2
+from keras_cv.models.stable_diffusion.embedding_cache import EmbeddingCache
 from keras_cv.models.stable_diffusion.image_encoder import ImageEncoder
 from keras_cv.models.stable_diffusion.text_encoder import TextEncoder
 from keras_cv.models.stable_diffusion.text_encoder import TextEncoderV2
 
 MAX_PROMPT_LENGTH = 77
+# Maximum number of latent tiles decoded at once by the tiled decoder.
+_DECODER_TILE_BATCH_SIZE = 4
+
+
+def _get_tile_starts(size, tile_size, overlap):
+    """Returns the start offsets of overlapping tiles covering `size`."""
+    if tile_size >= size:
+        return [0]
+    starts = list(range(0, size - tile_size, tile_size - overlap))
+    return starts + [size - tile_size]
 
 
 class StableDiffusionBase:
@@ -51,6 +65,10 @@ class StableDiffusionBase:
         img_height=512,
         img_width=512,
         jit_compile=False,
+        decoder_tile_size=None,
+        decoder_tile_overlap=64,
+        text_embedding_cache_size=0,
+        weights_cache_dir=None,
     ):
         # UNet requires multiples of 2**7 = 128
         img_height = round(img_height / 128) * 128
@@ -58,13 +76,33 @@ class StableDiffusionBase:
         self.img_height = img_height
         self.img_width = img_width
 
+        if decoder_tile_size is not None:
+            # The decoder upsamples latents by 8x.
+            decoder_tile_size = round(decoder_tile_size / 8) * 8
+            decoder_tile_overlap = round(decoder_tile_overlap / 8) * 8
+            if decoder_tile_overlap < 0 or (
+                decoder_tile_overlap >= decoder_tile_size
+            ):
+                raise ValueError(
+                    "`decoder_tile_overlap` must be non-negative and smaller "
+                    "than `decoder_tile_size`. Received "
+                    f"decoder_tile_size={decoder_tile_size}, "
+                    f"decoder_tile_overlap={decoder_tile_overlap}."
+                )
+        self.decoder_tile_size = decoder_tile_size
+        self.decoder_tile_overlap = decoder_tile_overlap
+
         # lazy initialize the component models and the tokenizer
         self._image_encoder = None
         self._text_encoder = None
         self._diffusion_model = None
         self._decoder = None
+        self._tile_decoder = None
         self._tokenizer = None
 
+        self._text_embedding_cache = EmbeddingCache(text_embedding_cache_size)
+        self.weights_cache_dir = weights_cache_dir
+
         self.jit_compile = jit_compile
 
     def text_to_image(
@@ -76,7 +114,30 @@ class StableDiffusionBase:
         unconditional_guidance_scale=7.5,
         seed=None,
     ):
+        """Generates images from a prompt, or from a list of prompts.
+
+        Args:
+            prompt: a string, or a list of strings to generate images for in a
+                single batched diffusion loop. Each prompt must be 77 tokens or
+                shorter.
+            negative_prompt: a string, or a list of strings with one negative
+                prompt per prompt, defaults to None. See `generate_image`.
+            batch_size: int, number of images to generate per prompt, defaults
+                to 1.
+            num_steps: int, number of diffusion steps, defaults to 50.
+            unconditional_guidance_scale: float, defaults to 7.5. See
+                `generate_image`.
+            seed: integer, or a list of integers with one seed per prompt,
+                used to seed the random generation of diffusion noise.
+
+        Returns:
+            A uint8 array of `batch_size` images per prompt, with the images
+            of each prompt next to each other.
+        """
         encoded_text = self.encode_text(prompt)
+        if isinstance(prompt, (list, tuple)):
+            encoded_text = np.repeat(encoded_text, batch_size, axis=0)
+            batch_size = batch_size * len(prompt)
 
         return self.generate_image(
             encoded_text,
@@ -97,7 +158,13 @@ class StableDiffusionBase:
         between two prompts.
 
         Args:
-            prompt: a string to encode, must be 77 tokens or shorter.
+            prompt: a string to encode, or a list of strings to encode with a
+                single text encoder call. Each prompt must be 77 tokens or
+                shorter.
+
+        Returns:
+            The text encoding of shape (1, 77, 768) for a single prompt, or
+            (number of prompts, 77, 768) for a list of prompts.
 
         Example:
 
@@ -109,20 +176,70 @@ class StableDiffusionBase:
         img = model.generate_image(encoded_text)
         ```
         """
-        # Tokenize prompt (i.e. starting context)
-        inputs = self.tokenizer.encode(prompt)
-        if len(inputs) > MAX_PROMPT_LENGTH:
-            raise ValueError(
-                f"Prompt is too long (should be <= {MAX_PROMPT_LENGTH} tokens)"
-            )
-        phrase = inputs + [49407] * (MAX_PROMPT_LENGTH - len(inputs))
-        phrase = tf.convert_to_tensor([phrase], dtype=tf.int32)
+        prompts = [prompt] if isinstance(prompt, str) else list(prompt)
+        # Tokenize prompts (i.e. starting context)
+        phrases = []
+        for inputs in map(self.tokenizer.encode, prompts):
+            if len(inputs) > MAX_PROMPT_LENGTH:
+                raise ValueError(
+                    "Prompt is too long "
+                    f"(should be <= {MAX_PROMPT_LENGTH} tokens)"
+                )
+            phrases.append(inputs + [49407] * (MAX_PROMPT_LENGTH - len(inputs)))
+        return self._encode_tokens(phrases)
 
-        context = self.text_encoder.predict_on_batch(
-            [phrase, self._get_pos_ids()]
-        )
+    def _encode_tokens(self, phrases):
+        """Encodes lists of `MAX_PROMPT_LENGTH` token ids.
 
-        return context
+        Phrases whose encodings are cached are looked up, and all the other
+        phrases are encoded with a single text encoder call.
+        """
+        cache = self._text_embedding_cache
+        if cache.max_size > 0:
+            # Only the identity of the text encoder is checked, as reading its
+            # weights on every lookup would cost more than a cache hit saves,
+            # which is why the cache is opt-in.
+            # A weak reference does not compare equal to a new text encoder
+            # which reuses the `id()` of a deleted one.
+            cache.validate(weakref.ref(self.text_encoder))
+        contexts = [None] * len(phrases)
+        # Maps the token ids of each phrase to encode to its indices.
+        missing_phrases = {}
+        for i, phrase in enumerate(phrases):
+            if cache.max_size > 0:
+                contexts[i] = cache.get(phrase)
+            if contexts[i] is None:
+                missing_phrases.setdefault(tuple(phrase), []).append(i)
+
+        if missing_phrases:
+            tokens = tf.convert_to_tensor(
+                list(missing_phrases.keys()), dtype=tf.int32
+            )
+            pos_ids = tf.repeat(self._get_pos_ids(), len(missing_phrases), 0)
+            encoded = self.text_encoder.predict_on_batch([tokens, pos_ids])
+            for (phrase, indices), context in zip(
+                missing_phrases.items(), encoded
+            ):
+                context = context[np.newaxis]
+                cache.put(phrase, context)
+                for i in indices:
+                    contexts[i] = context
+
+        # Returns a copy so that the cached encodings are never modified.
+        return np.concatenate(contexts, axis=0)
+
+    @property
+    def text_embedding_cache(self):
+        """text_embedding_cache returns the LRU cache of text encodings.
+
+        Encodings of prompts, negative prompts and of the unconditional
+        context are cached on their token ids. The cache is cleared when the
+        text encoder is replaced, but not when its weights are modified in
+        place, e.g. with `load_weights()` or by fine-tuning: call
+        `text_embedding_cache.clear()` afterwards. Its `hits` and `misses`
+        attributes count the cache lookups.
+        """
+        return self._text_embedding_cache
 
     def generate_image(
         self,
@@ -146,7 +263,9 @@ class StableDiffusionBase:
             batch_size: int, number of images to generate, defaults to 1.
             negative_prompt: a string containing information to negatively guide
                 the image generation (e.g. by removing or altering certain
-                aspects of the generated image), defaults to None.
+                aspects of the generated image), defaults to None. Can also be
+                a list of strings, in which case each negative prompt guides
+                an equal share of consecutive images of the batch.
             num_steps: int, number of diffusion steps (controls image quality),
                 defaults to 50.
             unconditional_guidance_scale: float, controlling how closely the
@@ -160,7 +279,8 @@ class StableDiffusionBase:
                 used to seed diffusion for every generated image.
             seed: integer which is used to seed the random generation of
                 diffusion noise, only to be specified if `diffusion_noise` is
-                None.
+                None. Can also be a list of integers, in which case each seed
+                is used for an equal share of consecutive images of the batch.
 
         Example:
 
@@ -184,16 +304,9 @@ class StableDiffusionBase:
             )
 
         context = self._expand_tensor(encoded_text, batch_size)
-
-        if negative_prompt is None:
-            unconditional_context = tf.repeat(
-                self._get_unconditional_context(), batch_size, axis=0
-            )
-        else:
-            unconditional_context = self.encode_text(negative_prompt)
-            unconditional_context = self._expand_tensor(
-                unconditional_context, batch_size
-            )
+        unconditional_context = self._get_negative_context(
+            negative_prompt, batch_size
+        )
 
         if diffusion_noise is not None:
             diffusion_noise = tf.squeeze(diffusion_noise)
@@ -205,8 +318,140 @@ class StableDiffusionBase:
         else:
             latent = self._get_initial_diffusion_noise(batch_size, seed)
 
-        # Iterative reverse diffusion stage
         timesteps = tf.range(1, 1000, 1000 // num_steps)
+        latent = self._diffuse(
+            latent,
+            context,
+            unconditional_context,
+            timesteps,
+            unconditional_guidance_scale,
+        )
+        return self._decode_to_image(latent)
+
+    def image_to_image(
+        self,
+        prompt,
+        image,
+        strength=0.5,
+        negative_prompt=None,
+        num_steps=50,
+        unconditional_guidance_scale=7.5,
+        seed=None,
+    ):
+        """Generates images from a prompt, starting from existing images.
+
+        The images are encoded with `image_encoder`, and noised to the
+        diffusion timestep implied by `strength`. Only the remaining
+        `strength * num_steps` diffusion steps are then run, so low strengths
+        are proportionally cheaper than `text_to_image`.
+
+        Args:
+            prompt: a string, or a list of strings with one prompt per equal
+                share of consecutive images. Each prompt must be 77 tokens or
+                shorter.
+            image: uint8 image of shape (height, width, 3), or batch of images
+                of shape (batch_size, height, width, 3), with values in
+                [0, 255]. Images are resized to (img_height, img_width).
+            strength: float in (0, 1], how much the images are transformed.
+                Small values keep the images mostly unchanged, and 1 ignores
+                them entirely, like `text_to_image`. Defaults to 0.5.
+            negative_prompt: a string, or a list of strings, defaults to None.
+                See `generate_image`.
+            num_steps: int, number of diffusion steps of the full schedule,
+                defaults to 50. Only `strength * num_steps` of them are run.
+            unconditional_guidance_scale: float, defaults to 7.5. See
+                `generate_image`.
+            seed: integer, or a list of integers, used to seed the noise added
+                to the encoded images. See `generate_image`.
+
+        Returns:
+            A uint8 array of one generated image per input image.
+
+        Example:
+
+        ```python
+        from keras_cv.models import StableDiffusion
+
+        model = StableDiffusion(img_height=512, img_width=512)
+        image = model.text_to_image("A horse in a field", seed=1)
+        edited = model.image_to_image(
+            "A zebra in a field", image, strength=0.4, seed=1
+        )
+        ```
+        """
+        if not 0 < strength <= 1:
+            raise ValueError(
+                "`strength` must be in the range (0, 1]. Received "
+                f"strength={strength}."
+            )
+        image = tf.convert_to_tensor(image)
+        if image.shape.rank == 3:
+            image = image[tf.newaxis]
+        batch_size = image.shape[0]
+        image = tf.image.resize(
+            tf.cast(image, "float32"), (self.img_height, self.img_width)
+        )
+        image = image / 127.5 - 1
+
+        encoded_text = self.encode_text(prompt)
+        if isinstance(prompt, str):
+            context = self._expand_tensor(encoded_text, batch_size)
+        else:
+            context = np.repeat(
+                encoded_text,
+                self._get_group_size(batch_size, prompt, "prompt"),
+                axis=0,
+            )
+        unconditional_context = self._get_negative_context(
+            negative_prompt, batch_size
+        )
+
+        # Only the first `strength` of the schedule is run, in reverse, so
+        # the images are noised to the last of these timesteps.
+        timesteps = tf.range(1, 1000, 1000 // num_steps)
+        num_remaining_steps = max(1, round(len(timesteps) * strength))
+        timesteps = timesteps[:num_remaining_steps]
+        alpha = _ALPHAS_CUMPROD[int(timesteps[-1])]
+        latent = self.image_encoder.predict_on_batch(image)
+        noise = self._get_initial_diffusion_noise(batch_size, seed)
+        latent = math.sqrt(alpha) * latent + math.sqrt(1 - alpha) * noise
+
+        latent = self._diffuse(
+            latent,
+            context,
+            unconditional_context,
+            timesteps,
+            unconditional_guidance_scale,
+        )
+        return self._decode_to_image(latent)
+
+    def _get_negative_context(self, negative_prompt, batch_size):
+        """Returns the unconditional context of each image of the batch."""
+        if negative_prompt is None:
+            return tf.repeat(
+                self._get_unconditional_context(), batch_size, axis=0
+            )
+        if isinstance(negative_prompt, str):
+            return self._expand_tensor(
+                self.encode_text(negative_prompt), batch_size
+            )
+        return np.repeat(
+            self.encode_text(negative_prompt),
+            self._get_group_size(batch_size, negative_prompt, "negative"),
+            axis=0,
+        )
+
+    def _diffuse(
+        self,
+        latent,
+        context,
+        unconditional_context,
+        timesteps,
+        unconditional_guidance_scale,
+    ):
+        """Runs the reverse diffusion from the last of `timesteps` down to
+        the first one."""
+        batch_size = latent.shape[0]
         alphas, alphas_prev = self._get_initial_alphas(timesteps)
         progbar = keras.utils.Progbar(len(timesteps))
         iteration = 0
@@ -231,21 +476,105 @@ class StableDiffusionBase:
             )
             iteration += 1
             progbar.update(iteration)
+        return latent
 
-        # Decoding stage
-        decoded = self.decoder.predict_on_batch(latent)
+    def _decode_to_image(self, latent):
+        decoded = self._decode(latent)
         decoded = ((decoded + 1) / 2) * 255
         return np.clip(decoded, 0, 255).astype("uint8")
 
-    def _get_unconditional_context(self):
-        unconditional_tokens = tf.convert_to_tensor(
-            [_UNCONDITIONAL_TOKENS], dtype=tf.int32
+    def _decode(self, latent):
+        """Decodes latents, in overlapping tiles if `decoder_tile_size` is
+        set."""
+        if self.decoder_tile_size is None or (
+            self.decoder_tile_size >= self.img_height
+            and self.decoder_tile_size >= self.img_width
+        ):
+            return self.decoder.predict_on_batch(latent)
+
+        latent = np.asarray(latent)
+        batch_size = latent.shape[0]
+        # Tile sizes in latent units.
+        tile_height = min(self.decoder_tile_size, self.img_height) // 8
+        tile_width = min(self.decoder_tile_size, self.img_width) // 8
+        overlap = self.decoder_tile_overlap // 8
+        tile_origins = [
+            (y, x)
+            for y in _get_tile_starts(latent.shape[1], tile_height, overlap)
+            for x in _get_tile_starts(latent.shape[2], tile_width, overlap)
+        ]
+
+        # Blend the seams by weighting each pixel of a tile with its distance
+        # to the tile border, ramping up over the overlap.
+        ramp = max(self.decoder_tile_overlap, 1)
+        weight_y = np.minimum(
+            np.arange(tile_height * 8) + 0.5,
+            np.arange(tile_height * 8)[::-1] + 0.5,
         )
-        unconditional_context = self.text_encoder.predict_on_batch(
-            [unconditional_tokens, self._get_pos_ids()]
+        weight_x = np.minimum(
+            np.arange(tile_width * 8) + 0.5,
+            np.arange(tile_width * 8)[::-1] + 0.5,
         )
+        weight = np.minimum(
+            np.minimum(weight_y[:, np.newaxis], weight_x[np.newaxis, :]) / ramp,
+            1.0,
+        )[np.newaxis, :, :, np.newaxis]
 
-        return unconditional_context
+        decoded = np.zeros(
+            (batch_size, self.img_height, self.img_width, 3), dtype="float32"
+        )
+        decoded_weight = np.zeros(
+            (1, self.img_height, self.img_width, 1), dtype="float32"
+        )
+        # Decode as many tiles at once as there are images in the batch, so
+        # the peak memory is bounded by the tile size instead of image size.
+        tiles_per_step = max(1, _DECODER_TILE_BATCH_SIZE // batch_size)
+        for i in range(0, len(tile_origins), tiles_per_step):
+            origins = tile_origins[i : i + tiles_per_step]
+            tiles = np.concatenate(
+                [
+                    latent[:, y : y + tile_height, x : x + tile_width]
+                    for y, x in origins
+                ],
+                axis=0,
+            )
+            decoded_tiles = np.asarray(
+                self._get_tile_decoder(
+                    tile_height, tile_width
+                ).predict_on_batch(tiles)
+            )
+            for j, (y, x) in enumerate(origins):
+                decoded_tile = decoded_tiles[
+                    j * batch_size : (j + 1) * batch_size
+                ]
+                y, x = y * 8, x * 8
+                decoded[:, y : y + tile_height * 8, x : x + tile_width * 8] += (
+                    decoded_tile * weight
+                )
+                decoded_weight[
+                    :, y : y + tile_height * 8, x : x + tile_width * 8
+                ] += weight
+        return decoded / decoded_weight
+
+    def _get_tile_decoder(self, tile_height, tile_width):
+        """Returns a decoder for tiles of the given latent size, which calls
+        the layers of `decoder` and so shares its variables."""
+        layers = self.decoder.layers
+        if (
+            self._tile_decoder is None
+            or self._tile_decoder.layers[1:] != layers
+        ):
+            inputs = keras.layers.Input((tile_height, tile_width, 4))
+            outputs = inputs
+            for layer in layers:
+                outputs = layer(outputs)
+            self._tile_decoder = keras.Model(inputs, outputs)
+            if self.jit_compile:
+                self._tile_decoder.compile(jit_compile=True)
+        return self._tile_decoder
+
+    def _get_unconditional_context(self):
+        return self._encode_tokens([_UNCONDITIONAL_TOKENS])
 
     def _expand_tensor(self, text_embedding, batch_size):
         """Extends a tensor by repeating it to fit the shape of the given batch
@@ -257,6 +586,98 @@ class StableDiffusionBase:
             )
         return text_embedding
 
+    def preload(self, include_image_encoder=False, max_workers=None):
+        """Builds the component models and the tokenizer concurrently.
+
+        Components are otherwise built lazily on first use, one after the
+        other, so the first generated image pays for downloading and loading
+        all the weights. `preload` builds them in a thread pool instead, so
+        that weight downloads and loading overlap. Weights are loaded from
+        `weights_cache_dir` when already downloaded there.
+
+        Args:
+            include_image_encoder: bool, whether to also build the image
+                encoder, only used by `image_to_image`. Defaults to False.
+            max_workers: int, optional maximum number of threads. Defaults to
+                one thread per component.
+
+        Returns:
+            A dict mapping the name of each component to the time in seconds
+            it took to build, and "total" to the wall time of `preload`.
+        """
+        names = ["tokenizer", "text_encoder", "diffusion_model", "decoder"]
+        if include_image_encoder:
+            names.append("image_encoder")
+
+        def build(name):
+            start = time.perf_counter()
+            getattr(self, name)
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or len(names)
+        ) as executor:
+            timings = dict(zip(names, executor.map(build, names)))
+        timings["total"] = time.perf_counter() - start
+        return timings
+
+    def warmup(self, batch_size=1, include_image_encoder=False):
+        """Preloads the component models and runs each of them once.
+
+        Running every component once on dummy inputs traces, and compiles
+        with XLA when `jit_compile` is set, the functions used to generate
+        `batch_size` images, so the first request does not pay for it.
+        Other batch sizes are traced on first use.
+
+        Args:
+            batch_size: int, the number of images per generation to warm up
+                for, defaults to 1.
+            include_image_encoder: bool, whether to also warm up the image
+                encoder used by `image_to_image`. Defaults to False.
+
+        Returns:
+            A dict with the time in seconds spent in "preload", in "compile"
+            running the dummy steps, and the "total" cold start time.
+
+        Example:
+
+        ```python
+        model = StableDiffusion(jit_compile=True, weights_cache_dir="/models")
+        print(model.warmup())
+        ```
+        """
+        start = time.perf_counter()
+        preload_time = self.preload(
+            include_image_encoder=include_image_encoder
+        )["total"]
+
+        compile_start = time.perf_counter()
+        # Runs the text encoder directly, as cached encodings would skip it.
+        context = self.text_encoder.predict_on_batch(
+            [
+                tf.convert_to_tensor([_UNCONDITIONAL_TOKENS], dtype=tf.int32),
+                self._get_pos_ids(),
+            ]
+        )
+        context = tf.repeat(context, batch_size, axis=0)
+        latent = tf.zeros(
+            (batch_size, self.img_height // 8, self.img_width // 8, 4)
+        )
+        t_emb = self._get_timestep_embedding(1, batch_size)
+        latent = self.diffusion_model.predict_on_batch([latent, t_emb, context])
+        self._decode(latent)
+        if include_image_encoder:
+            self.image_encoder.predict_on_batch(
+                tf.zeros((batch_size, self.img_height, self.img_width, 3))
+            )
+        end = time.perf_counter()
+        return {
+            "preload": preload_time,
+            "compile": end - compile_start,
+            "total": end - start,
+        }
+
     @property
     def image_encoder(self):
         """image_encoder returns the VAE Encoder with pretrained weights.
@@ -269,7 +690,7 @@ class StableDiffusionBase:
         ```
         """
         if self._image_encoder is None:
-            self._image_encoder = ImageEncoder()
+            self._image_encoder = ImageEncoder(cache_dir=self.weights_cache_dir)
             if self.jit_compile:
                 self._image_encoder.compile(jit_compile=True)
         return self._image_encoder
@@ -289,7 +710,11 @@ class StableDiffusionBase:
         modified.
         """
         if self._decoder is None:
-            self._decoder = Decoder(self.img_height, self.img_width)
+            self._decoder = Decoder(
+                self.img_height,
+                self.img_width,
+                cache_dir=self.weights_cache_dir,
+            )
             if self.jit_compile:
                 self._decoder.compile(jit_compile=True)
         return self._decoder
@@ -301,7 +726,7 @@ class StableDiffusionBase:
         needs to be modified.
         """
         if self._tokenizer is None:
-            self._tokenizer = SimpleTokenizer()
+            self._tokenizer = SimpleTokenizer(cache_dir=self.weights_cache_dir)
         return self._tokenizer
 
     def _get_timestep_embedding(
@@ -323,6 +748,15 @@ class StableDiffusionBase:
         return alphas, alphas_prev
 
     def _get_initial_diffusion_noise(self, batch_size, seed):
+        if isinstance(seed, (list, tuple)):
+            group_size = self._get_group_size(batch_size, seed, "seed")
+            return tf.concat(
+                [
+                    self._get_initial_diffusion_noise(group_size, s)
+                    for s in seed
+                ],
+                axis=0,
+            )
         if seed is not None:
             return tf.random.stateless_normal(
                 (batch_size, self.img_height // 8, self.img_width // 8, 4),
@@ -333,6 +767,17 @@ class StableDiffusionBase:
                 (batch_size, self.img_height // 8, self.img_width // 8, 4)
             )
 
+    @staticmethod
+    def _get_group_size(batch_size, values, name):
+        """Returns the number of consecutive images each of `values` applies
+        to."""
+        if not values or batch_size % len(values) != 0:
+            raise ValueError(
+                f"The number of values in `{name}` must divide the batch size. "
+                f"Received {name}={values} and batch_size={batch_size}."
+            )
+        return batch_size // len(values)
+
     @staticmethod
     def _get_pos_ids():
         return tf.convert_to_tensor(
@@ -362,6 +807,26 @@ class StableDiffusion(StableDiffusionBase):
         jit_compile: bool, whether to compile the underlying models to XLA.
             This can lead to a significant speedup on some systems. Defaults to
             False.
+        decoder_tile_size: int, optional size in pixels of the square tiles
+            used to decode the final latent. When set, the latent is decoded in
+            overlapping tiles whose seams are blended, which bounds the decoder
+            memory by the tile size rather than the image size. Rounded to a
+            multiple of 8. Defaults to None, which decodes the whole image at
+            once.
+        decoder_tile_overlap: int, overlap in pixels between neighbouring
+            decoder tiles, only used if `decoder_tile_size` is set. Rounded to
+            a multiple of 8. Defaults to 64.
+        text_embedding_cache_size: int, the maximum number of text encodings
+            kept in the LRU cache of `text_embedding_cache`, keyed on the
+            prompt token ids. The cache is not cleared when the text encoder
+            weights are modified in place, e.g. with `load_weights()`, by
+            fine-tuning or by textual inversion, so
+            `text_embedding_cache.clear()` must then be called. Defaults to 0,
+            which disables the cache.
+        weights_cache_dir: str, optional local directory to download the
+            pretrained weights and the tokenizer vocabulary to, and to load
+            them from when already downloaded. Files are stored in its
+            `models` subdirectory. Defaults to None, which uses `~/.keras`.
 
     Example:
 
@@ -390,8 +855,20 @@ class StableDiffusion(StableDiffusionBase):
         img_height=512,
         img_width=512,
         jit_compile=False,
+        decoder_tile_size=None,
+        decoder_tile_overlap=64,
+        text_embedding_cache_size=0,
+        weights_cache_dir=None,
     ):
-        super().__init__(img_height, img_width, jit_compile)
+        super().__init__(
+            img_height,
+            img_width,
+            jit_compile,
+            decoder_tile_size=decoder_tile_size,
+            decoder_tile_overlap=decoder_tile_overlap,
+            text_embedding_cache_size=text_embedding_cache_size,
+            weights_cache_dir=weights_cache_dir,
+        )
         print(
             "By using this model checkpoint, you acknowledge that its usage is "
             "subject to the terms of the CreativeML Open RAIL-M license at "
@@ -405,7 +882,9 @@ class StableDiffusion(StableDiffusionBase):
         needs to be modified.
         """
         if self._text_encoder is None:
-            self._text_encoder = TextEncoder(MAX_PROMPT_LENGTH)
+            self._text_encoder = TextEncoder(
+                MAX_PROMPT_LENGTH, cache_dir=self.weights_cache_dir
+            )
             if self.jit_compile:
                 self._text_encoder.compile(jit_compile=True)
         return self._text_encoder
@@ -418,7 +897,10 @@ class StableDiffusion(StableDiffusionBase):
         """
         if self._diffusion_model is None:
             self._diffusion_model = DiffusionModel(
-                self.img_height, self.img_width, MAX_PROMPT_LENGTH
+                self.img_height,
+                self.img_width,
+                MAX_PROMPT_LENGTH,
+                cache_dir=self.weights_cache_dir,
             )
             if self.jit_compile:
                 self._diffusion_model.compile(jit_compile=True)
@@ -447,6 +929,26 @@ class StableDiffusionV2(StableDiffusionBase):
         jit_compile: bool, whether to compile the underlying models to XLA.
             This can lead to a significant speedup on some systems. Defaults to
             False.
+        decoder_tile_size: int, optional size in pixels of the square tiles
+            used to decode the final latent. When set, the latent is decoded in
+            overlapping tiles whose seams are blended, which bounds the decoder
+            memory by the tile size rather than the image size. Rounded to a
+            multiple of 8. Defaults to None, which decodes the whole image at
+            once.
+        decoder_tile_overlap: int, overlap in pixels between neighbouring
+            decoder tiles, only used if `decoder_tile_size` is set. Rounded to
+            a multiple of 8. Defaults to 64.
+        text_embedding_cache_size: int, the maximum number of text encodings
+            kept in the LRU cache of `text_embedding_cache`, keyed on the
+            prompt token ids. The cache is not cleared when the text encoder
+            weights are modified in place, e.g. with `load_weights()`, by
+            fine-tuning or by textual inversion, so
+            `text_embedding_cache.clear()` must then be called. Defaults to 0,
+            which disables the cache.
+        weights_cache_dir: str, optional local directory to download the
+            pretrained weights and the tokenizer vocabulary to, and to load
+            them from when already downloaded. Files are stored in its
+            `models` subdirectory. Defaults to None, which uses `~/.keras`.
     Example:
 
     ```python
@@ -475,8 +977,20 @@ class StableDiffusionV2(StableDiffusionBase):
         img_height=512,
         img_width=512,
         jit_compile=False,
+        decoder_tile_size=None,
+        decoder_tile_overlap=64,
+        text_embedding_cache_size=0,
+        weights_cache_dir=None,
     ):
-        super().__init__(img_height, img_width, jit_compile)
+        super().__init__(
+            img_height,
+            img_width,
+            jit_compile,
+            decoder_tile_size=decoder_tile_size,
+            decoder_tile_overlap=decoder_tile_overlap,
+            text_embedding_cache_size=text_embedding_cache_size,
+            weights_cache_dir=weights_cache_dir,
+        )
         print(
             "By using this model checkpoint, you acknowledge that its usage is "
             "subject to the terms of the CreativeML Open RAIL++-M license at "
@@ -490,7 +1004,9 @@ class StableDiffusionV2(StableDiffusionBase):
         needs to be modified.
         """
         if self._text_encoder is None:
-            self._text_encoder = TextEncoderV2(MAX_PROMPT_LENGTH)
+            self._text_encoder = TextEncoderV2(
+                MAX_PROMPT_LENGTH, cache_dir=self.weights_cache_dir
+            )
             if self.jit_compile:
                 self._text_encoder.compile(jit_compile=True)
         return self._text_encoder
@@ -503,7 +1019,10 @@ class StableDiffusionV2(StableDiffusionBase):
         """
         if self._diffusion_model is None:
             self._diffusion_model = DiffusionModelV2(
-                self.img_height, self.img_width, MAX_PROMPT_LENGTH
+                self.img_height,
+                self.img_width,
+                MAX_PROMPT_LENGTH,
+                cache_dir=self.weights_cache_dir,
             )
             if self.jit_compile:
                 self._diffusion_model.compile(jit_compile=True)
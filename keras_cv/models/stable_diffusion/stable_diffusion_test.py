@@ -12,10 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from unittest import mock
+
+import numpy as np
+import pytest
 import tensorflow as tf
 from tensorflow.keras import mixed_precision
 
 from keras_cv.models import StableDiffusion
+from keras_cv.models.stable_diffusion.decoder import Decoder
+from keras_cv.models.stable_diffusion.diffusion_model import DiffusionModel
+from keras_cv.models.stable_diffusion.image_encoder import ImageEncoder
+from keras_cv.models.stable_diffusion.stable_diffusion import _get_tile_starts
+from keras_cv.models.stable_diffusion.text_encoder import TextEncoder
+
+
+class FakeTokenizer:
+    def encode(self, text):
+        return [49406] + [ord(c) for c in text] + [49407]
+
+
+class FakeDiffusionModel:
+    def __init__(self):
+        self.num_calls = 0
+
+    def predict_on_batch(self, inputs):
+        self.num_calls += 1
+        return tf.zeros_like(inputs[0])
 
 
 class StableDiffusionTest(tf.test.TestCase):
@@ -62,6 +85,224 @@ class StableDiffusionTest(tf.test.TestCase):
                 seed=1337,
             )
 
+    def test_get_tile_starts(self):
+        self.assertEqual(_get_tile_starts(16, 16, 2), [0])
+        self.assertEqual(_get_tile_starts(16, 8, 2), [0, 6, 8])
+        self.assertEqual(_get_tile_starts(16, 8, 0), [0, 8])
+
+    def test_tiled_decode(self):
+        stablediff = StableDiffusion(
+            128, 256, decoder_tile_size=64, decoder_tile_overlap=16
+        )
+        stablediff._decoder = Decoder(128, 256, download_weights=False)
+        latent = tf.random.normal((2, 16, 32, 4))
+
+        decoded = stablediff._decode(latent)
+
+        self.assertEqual(decoded.shape, (2, 128, 256, 3))
+        self.assertTrue(np.all(np.isfinite(decoded)))
+        tile_decoder = stablediff._tile_decoder
+        self.assertEqual(tile_decoder.input_shape, (None, 8, 8, 4))
+        self.assertEqual(
+            [id(weight) for weight in tile_decoder.weights],
+            [id(weight) for weight in stablediff.decoder.weights],
+        )
+
+    def test_tiled_decode_matches_full_decode(self):
+        stablediff = StableDiffusion(
+            128, 256, decoder_tile_size=64, decoder_tile_overlap=16
+        )
+        # The convolution only reads the neighbouring latent pixels, so the
+        # tiles differ from the full decode only next to their borders.
+        stablediff._decoder = tf.keras.Sequential(
+            [
+                tf.keras.layers.Input((16, 32, 4)),
+                tf.keras.layers.Conv2D(3, 3, padding="same"),
+                tf.keras.layers.UpSampling2D(8),
+            ]
+        )
+        latent = tf.random.normal((2, 16, 32, 4))
+
+        decoded = stablediff._decode(latent)
+        expected = stablediff.decoder.predict_on_batch(latent)
+
+        # The latent rows and columns on the inner borders of the tiles.
+        seam_rows = np.zeros(16, dtype=bool)
+        for y in _get_tile_starts(16, 8, 2):
+            seam_rows[[y, y + 7]] = True
+        seam_columns = np.zeros(32, dtype=bool)
+        for x in _get_tile_starts(32, 8, 2):
+            seam_columns[[x, x + 7]] = True
+        seam_rows[[0, -1]] = seam_columns[[0, -1]] = False
+        seams = seam_rows[:, np.newaxis] | seam_columns[np.newaxis, :]
+        seams = np.repeat(np.repeat(seams, 8, axis=0), 8, axis=1)
+        self.assertTrue(np.any(seams) and not np.all(seams))
+        self.assertAllClose(decoded[:, ~seams], expected[:, ~seams], atol=1e-5)
+        # The tiles are blended across the seams, which bounds the error of
+        # the zero padding on their borders.
+        self.assertLess(
+            np.mean(np.abs(decoded - expected)[:, seams]),
+            0.25 * np.mean(np.abs(expected)),
+        )
+
+    def test_tiled_decode_falls_back_to_full_decode(self):
+        stablediff = StableDiffusion(128, 128, decoder_tile_size=256)
+        stablediff._decoder = Decoder(128, 128, download_weights=False)
+        latent = tf.random.normal((1, 16, 16, 4))
+
+        self.assertAllClose(
+            stablediff._decode(latent),
+            stablediff.decoder.predict_on_batch(latent),
+        )
+        self.assertIsNone(stablediff._tile_decoder)
+
+    def test_invalid_decoder_tile_overlap(self):
+        with self.assertRaisesRegex(ValueError, "decoder_tile_overlap"):
+            StableDiffusion(
+                128, 128, decoder_tile_size=64, decoder_tile_overlap=64
+            )
+
+    def test_text_embedding_cache(self):
+        stablediff = StableDiffusion(128, 128, text_embedding_cache_size=32)
+        stablediff._text_encoder = TextEncoder(77, download_weights=False)
+        cache = stablediff.text_embedding_cache
+
+        unconditional_context = stablediff._get_unconditional_context()
+        self.assertAllClose(
+            stablediff._get_unconditional_context(), unconditional_context
+        )
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Replacing the text encoder invalidates the cache.
+        stablediff._text_encoder = TextEncoder(77, download_weights=False)
+        self.assertNotAllClose(
+            stablediff._get_unconditional_context(), unconditional_context
+        )
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        # Changing the text encoder weights in place requires a clear().
+        unconditional_context = stablediff._get_unconditional_context()
+        embedding = stablediff.text_encoder.layers[2].token_embedding
+        embedding.embeddings.assign(embedding.embeddings * 2.0)
+        cache.clear()
+        self.assertNotAllClose(
+            stablediff._get_unconditional_context(), unconditional_context
+        )
+
+    def test_text_embedding_cache_is_disabled_by_default(self):
+        stablediff = StableDiffusion(128, 128)
+        stablediff._text_encoder = TextEncoder(77, download_weights=False)
+        unconditional_context = stablediff._get_unconditional_context()
+
+        embedding = stablediff.text_encoder.layers[2].token_embedding
+        embedding.embeddings.assign(embedding.embeddings * 2.0)
+
+        self.assertNotAllClose(
+            stablediff._get_unconditional_context(), unconditional_context
+        )
+        self.assertEqual(len(stablediff.text_embedding_cache), 0)
+
+    def test_text_embedding_cache_hit_skips_text_encoder_weights(self):
+        stablediff = StableDiffusion(128, 128, text_embedding_cache_size=32)
+        stablediff._text_encoder = TextEncoder(77, download_weights=False)
+        unconditional_context = stablediff._get_unconditional_context()
+
+        error = AssertionError("The text encoder was used on a cache hit.")
+        with mock.patch.object(
+            TextEncoder, "weights", new_callable=mock.PropertyMock
+        ) as weights, mock.patch.object(
+            stablediff.text_encoder, "predict_on_batch", side_effect=error
+        ):
+            weights.side_effect = error
+            self.assertAllClose(
+                stablediff._get_unconditional_context(), unconditional_context
+            )
+        self.assertEqual(stablediff.text_embedding_cache.hits, 1)
+
+    def test_batched_encode_tokens(self):
+        stablediff = StableDiffusion(128, 128, text_embedding_cache_size=32)
+        stablediff._text_encoder = TextEncoder(77, download_weights=False)
+        phrases = [[49406, i] + [49407] * 75 for i in range(3)]
+        cached = stablediff._encode_tokens(phrases[:1])
+
+        encoded = stablediff._encode_tokens(phrases)
+
+        self.assertEqual(encoded.shape, (3, 77, 768))
+        self.assertAllClose(encoded[:1], cached)
+        self.assertAllClose(
+            encoded[2:], stablediff._encode_tokens(phrases[2:]), atol=1e-5
+        )
+
+    def test_initial_diffusion_noise_with_seed_per_prompt(self):
+        stablediff = StableDiffusion(128, 128)
+        noise = stablediff._get_initial_diffusion_noise(4, [1, 2])
+        self.assertAllClose(
+            noise[2:], stablediff._get_initial_diffusion_noise(2, 2)
+        )
+        with self.assertRaisesRegex(ValueError, "must divide the batch size"):
+            stablediff._get_initial_diffusion_noise(3, [1, 2])
+
+    def test_image_to_image_runs_remaining_steps(self):
+        stablediff = StableDiffusion(128, 128)
+        stablediff._tokenizer = FakeTokenizer()
+        stablediff._text_encoder = TextEncoder(77, download_weights=False)
+        stablediff._image_encoder = ImageEncoder(download_weights=False)
+        stablediff._diffusion_model = FakeDiffusionModel()
+        stablediff._decoder = Decoder(128, 128, download_weights=False)
+
+        images = stablediff.image_to_image(
+            "a b",
+            np.zeros((2, 96, 96, 3), dtype="uint8"),
+            strength=0.3,
+            num_steps=10,
+            seed=1,
+        )
+
+        self.assertEqual(images.shape, (2, 128, 128, 3))
+        # 3 remaining steps, with a conditional and an unconditional call each.
+        self.assertEqual(stablediff.diffusion_model.num_calls, 6)
+        with self.assertRaisesRegex(ValueError, "must be in the range"):
+            stablediff.image_to_image("a b", np.zeros((128, 128, 3)), 0)
+
+    @pytest.mark.large  # Runs the diffusion model, so mark as large.
+    def test_warmup(self):
+        stablediff = StableDiffusion(128, 128)
+        stablediff._tokenizer = FakeTokenizer()
+        stablediff._text_encoder = TextEncoder(77, download_weights=False)
+        stablediff._diffusion_model = DiffusionModel(
+            128, 128, 77, download_weights=False
+        )
+        stablediff._decoder = Decoder(128, 128, download_weights=False)
+
+        timings = stablediff.warmup(batch_size=2)
+
+        self.assertEqual(set(timings), {"preload", "compile", "total"})
+        self.assertGreaterEqual(timings["total"], timings["compile"])
+        self.assertEqual(len(stablediff.text_embedding_cache), 0)
+
+    @pytest.mark.large  # Runs the full diffusion loop, so mark as large.
+    def test_batched_text_to_image(self):
+        stablediff = StableDiffusion(128, 128)
+        stablediff._tokenizer = FakeTokenizer()
+        stablediff._text_encoder = TextEncoder(77, download_weights=False)
+        stablediff._diffusion_model = DiffusionModel(
+            128, 128, 77, download_weights=False
+        )
+        stablediff._decoder = Decoder(128, 128, download_weights=False)
+
+        images = stablediff.text_to_image(
+            ["a b", "c"],
+            negative_prompt=["d", "e"],
+            num_steps=2,
+            seed=[1, 2],
+        )
+
+        self.assertEqual(images.shape, (2, 128, 128, 3))
+        image = stablediff.text_to_image(
+            "c", negative_prompt="e", num_steps=2, seed=2
+        )
+        self.assertAllClose(images[1:], image, atol=2)
+
 
 if __name__ == "__main__":
     tf.test.main()
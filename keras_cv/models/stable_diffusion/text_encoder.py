@@ -19,7 +19,12 @@ from tensorflow.experimental import numpy as tfnp
 
 class TextEncoder(keras.Model):
     def __init__(
-        self, max_length, vocab_size=49408, name=None, download_weights=True
+        self,
+        max_length,
+        vocab_size=49408,
+        name=None,
+        download_weights=True,
+        cache_dir=None,
     ):
         tokens = keras.layers.Input(
             shape=(max_length,), dtype="int32", name="tokens"
@@ -37,13 +42,19 @@ class TextEncoder(keras.Model):
             text_encoder_weights_fpath = keras.utils.get_file(
                 origin="https://huggingface.co/fchollet/stable-diffusion/resolve/main/kcv_encoder.h5",  # noqa: E501
                 file_hash="4789e63e07c0e54d6a34a29b45ce81ece27060c499a709d556c7755b42bb0dc4",  # noqa: E501
+                cache_dir=cache_dir,
             )
             self.load_weights(text_encoder_weights_fpath)
 
 
 class TextEncoderV2(keras.Model):
     def __init__(
-        self, max_length, vocab_size=49408, name=None, download_weights=True
+        self,
+        max_length,
+        vocab_size=49408,
+        name=None,
+        download_weights=True,
+        cache_dir=None,
     ):
         tokens = keras.layers.Input(
             shape=(max_length,), dtype="int32", name="tokens"
@@ -61,6 +72,7 @@ class TextEncoderV2(keras.Model):
             text_encoder_weights_fpath = keras.utils.get_file(
                 origin="https://huggingface.co/ianstenbit/keras-sd2.1/resolve/main/text_encoder_v2_1.h5",  # noqa: E501
                 file_hash="985002e68704e1c5c3549de332218e99c5b9b745db7171d5f31fcd9a6089f25b",  # noqa: E501
+                cache_dir=cache_dir,
             )
             self.load_weights(text_encoder_weights_fpath)
 
@@ -166,56 +166,39 @@ def _get_3d_rotation_matrix(yaw, roll, pitch):
       pitch: float tensor representing a pitch angle in radians.
 
     Returns:
-      A [3, 3] tensor corresponding to a rotation matrix.
+      A [..., 3, 3] tensor corresponding to a rotation matrix, where the
+      leading dimensions are the shape of the angles.
 
     """
+    yaw = tf.convert_to_tensor(yaw)
+    roll = tf.convert_to_tensor(roll, dtype=yaw.dtype)
+    pitch = tf.convert_to_tensor(pitch, dtype=yaw.dtype)
 
-    def _UnitX(angle):
+    def _Matrix(entries, angle):
         return tf.reshape(
-            [
-                1.0,
-                0.0,
-                0.0,
-                0.0,
-                tf.cos(angle),
-                -tf.sin(angle),
-                0.0,
-                tf.sin(angle),
-                tf.cos(angle),
-            ],
-            shape=[3, 3],
+            tf.stack(entries, axis=-1),
+            tf.concat([tf.shape(angle), [3, 3]], axis=0),
+        )
+
+    def _UnitX(angle):
+        zero, one = tf.zeros_like(angle), tf.ones_like(angle)
+        cos, sin = tf.cos(angle), tf.sin(angle)
+        return _Matrix(
+            [one, zero, zero, zero, cos, -sin, zero, sin, cos], angle
         )
 
     def _UnitY(angle):
-        return tf.reshape(
-            [
-                tf.cos(angle),
-                0.0,
-                tf.sin(angle),
-                0.0,
-                1.0,
-                0.0,
-                -tf.sin(angle),
-                0.0,
-                tf.cos(angle),
-            ],
-            shape=[3, 3],
+        zero, one = tf.zeros_like(angle), tf.ones_like(angle)
+        cos, sin = tf.cos(angle), tf.sin(angle)
+        return _Matrix(
+            [cos, zero, sin, zero, one, zero, -sin, zero, cos], angle
         )
 
     def _UnitZ(angle):
-        return tf.reshape(
-            [
-                tf.cos(angle),
-                -tf.sin(angle),
-                0.0,
-                tf.sin(angle),
-                tf.cos(angle),
-                0.0,
-                0.0,
-                0.0,
-                1.0,
-            ],
-            shape=[3, 3],
+        zero, one = tf.zeros_like(angle), tf.ones_like(angle)
+        cos, sin = tf.cos(angle), tf.sin(angle)
+        return _Matrix(
+            [cos, -sin, zero, sin, cos, zero, zero, zero, one], angle
         )
 
     return tf.matmul(tf.matmul(_UnitZ(yaw), _UnitX(roll)), _UnitY(pitch))
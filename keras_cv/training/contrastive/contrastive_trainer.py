@@ -37,6 +37,20 @@ class ContrastiveTrainer(keras.Model):
             Note that this should be specified iff training with labeled images.
             This predicts class labels based on the feature map produced by the
             encoder and is usually a 1 or 2-layer dense MLP.
+        fuse_views: bool, whether to run the encoder once on the concatenation
+            of both augmented views instead of once per view, which is faster
+            with small batch sizes. Both views must then have the same shape.
+            Note that batch statistics, e.g. of `BatchNormalization` layers,
+            are then computed over both views. Defaults to False.
+        probe_on_views: bool, whether to train the probe on the encoder
+            features of the first augmented view, which are already computed,
+            instead of running the encoder on the raw images. Defaults to
+            False.
+        probe_update_frequency: int, the number of training steps between
+            updates of the probe. The other steps apply zero gradients to the
+            probe, so `probe_optimizer` should not use momentum for them to
+            leave the probe unchanged. Defaults to 1, which updates the probe
+            at every step.
 
     Returns:
       A `keras.Model` instance.
@@ -83,6 +97,9 @@ class ContrastiveTrainer(keras.Model):
         augmenter,
         projector,
         probe=None,
+        fuse_views=False,
+        probe_on_views=False,
+        probe_update_frequency=1,
     ):
         super().__init__()
 
@@ -116,7 +133,16 @@ class ContrastiveTrainer(keras.Model):
         self.projectors = (
             projector if type(projector) is tuple else (projector, projector)
         )
+        if probe_update_frequency < 1:
+            raise ValueError(
+                "`probe_update_frequency` must be a positive integer. "
+                f"Received probe_update_frequency={probe_update_frequency}."
+            )
+
         self.probe = probe
+        self.fuse_views = fuse_views
+        self.probe_on_views = probe_on_views
+        self.probe_update_frequency = probe_update_frequency
 
         self.loss_metric = keras.metrics.Mean(name="loss")
 
@@ -221,9 +247,21 @@ class ContrastiveTrainer(keras.Model):
         augmented_images_0 = data["augmented_images_0"]
         augmented_images_1 = data["augmented_images_1"]
 
+        # Read before the encoder update, which increments the iterations.
+        should_update_probe = (
+            self.optimizer.iterations % self.probe_update_frequency == 0
+        )
+
         with tf.GradientTape() as tape:
-            features_0 = self.encoder(augmented_images_0, training=True)
-            features_1 = self.encoder(augmented_images_1, training=True)
+            if self.fuse_views:
+                features = self.encoder(
+                    tf.concat([augmented_images_0, augmented_images_1], 0),
+                    training=True,
+                )
+                features_0, features_1 = tf.split(features, 2, axis=0)
+            else:
+                features_0 = self.encoder(augmented_images_0, training=True)
+                features_1 = self.encoder(augmented_images_1, training=True)
 
             projections_0 = self.projectors[0](features_0, training=True)
             projections_1 = self.projectors[1](features_1, training=True)
@@ -260,22 +298,43 @@ class ContrastiveTrainer(keras.Model):
                 raise ValueError(
                     "Targets must be provided when a probe is specified"
                 )
-            with tf.GradientTape() as tape:
-                features = tf.stop_gradient(
-                    self.encoder(images, training=False)
-                )
-                class_logits = self.probe(features, training=True)
-                probe_loss = self.probe_loss(labels, class_logits)
-            gradients = tape.gradient(probe_loss, self.probe.trainable_weights)
-            self.probe_optimizer.apply_gradients(
-                zip(gradients, self.probe.trainable_weights)
-            )
-            self.probe_loss_metric.update_state(probe_loss)
-            for metric in self.probe_metrics:
-                metric.update_state(labels, class_logits)
+            self._update_probe(images, labels, features_0, should_update_probe)
 
         return {metric.name: metric.result() for metric in self.metrics}
 
+    def _update_probe(self, images, labels, view_features, should_update):
+        """Runs one training step of the probe and returns its loss.
+
+        The step runs at every training step, as `apply_gradients()` can not
+        be called in a `tf.cond()` under a `tf.distribute` strategy. Its
+        gradients, loss and metrics are weighted by 0 when `should_update` is
+        False.
+        """
+        update_weight = tf.cast(should_update, tf.float32)
+        if self.probe_on_views:
+            features = tf.stop_gradient(view_features)
+        else:
+            features = tf.stop_gradient(self.encoder(images, training=False))
+        with tf.GradientTape() as tape:
+            class_logits = self.probe(features, training=True)
+            probe_loss = self.probe_loss(labels, class_logits)
+        gradients = tape.gradient(probe_loss, self.probe.trainable_weights)
+        gradients = [
+            gradient * tf.cast(update_weight, gradient.dtype)
+            for gradient in gradients
+        ]
+        self.probe_optimizer.apply_gradients(
+            zip(gradients, self.probe.trainable_weights)
+        )
+        self.probe_loss_metric.update_state(
+            probe_loss, sample_weight=update_weight
+        )
+        for metric in self.probe_metrics:
+            metric.update_state(
+                labels, class_logits, sample_weight=update_weight
+            )
+        return tf.cast(probe_loss, tf.float32)
+
     def call(self, inputs):
         raise NotImplementedError(
             "ContrastiveTrainer.call() is not implemented - "
@@ -24,6 +24,60 @@ from keras_cv.losses import SimCLRLoss
 from keras_cv.models import DenseNet121Backbone
 from keras_cv.training import ContrastiveTrainer
 
+# Splits the CPU in two logical devices for the distributed test, which must be
+# done before the devices are initialized.
+try:
+    tf.config.set_logical_device_configuration(
+        tf.config.list_physical_devices("CPU")[0],
+        [tf.config.LogicalDeviceConfiguration()] * 2,
+    )
+except RuntimeError:
+    pass
+
+
+class DistributedContrastiveTrainerTest(tf.test.TestCase):
+    def test_probe_update_frequency_with_mirrored_strategy(self):
+        devices = tf.config.list_logical_devices("CPU")
+        if len(devices) < 2:
+            self.skipTest("Requires two logical CPU devices.")
+        strategy = tf.distribute.MirroredStrategy(devices[:2])
+        with strategy.scope():
+            encoder = keras.Sequential(
+                [
+                    keras.Input((8, 8, 3)),
+                    layers.Conv2D(4, 3),
+                    layers.GlobalAveragePooling2D(),
+                ]
+            )
+            trainer = ContrastiveTrainer(
+                encoder=encoder,
+                augmenter=preprocessing.RandomFlip("horizontal"),
+                projector=layers.Dense(8),
+                probe=layers.Dense(2),
+                probe_update_frequency=2,
+            )
+            trainer.compile(
+                encoder_optimizer=optimizers.SGD(),
+                encoder_loss=SimCLRLoss(temperature=0.5),
+                probe_optimizer=optimizers.SGD(),
+                # The probe loss is called directly, so it can not be reduced
+                # automatically under a `tf.distribute` strategy.
+                probe_loss=keras.losses.CategoricalCrossentropy(
+                    from_logits=True, reduction="sum"
+                ),
+            )
+
+        images = tf.random.uniform((4, 8, 8, 3))
+        targets = tf.one_hot([0, 1, 0, 1], 2)
+        probe_weights = []
+        for _ in range(3):
+            trainer.fit(images, targets, batch_size=4, verbose=0)
+            probe_weights.append(trainer.probe.kernel.numpy())
+
+        # The probe is updated at the first and third steps only.
+        self.assertAllClose(probe_weights[0], probe_weights[1])
+        self.assertNotAllClose(probe_weights[1], probe_weights[2])
+
 
 # TODO(jbischof): revisit "extra_large" tag once development resumes.
 # These tests are currently some of the slowest in our repo.
@@ -114,6 +168,33 @@ class ContrastiveTrainerTest(tf.test.TestCase):
         trainer_without_probing.fit(images)
         trainer_without_probing.fit(images, targets)
 
+    def test_train_with_fused_views_and_probe_frequency(self):
+        trainer = ContrastiveTrainer(
+            encoder=self.build_encoder(),
+            augmenter=self.build_augmenter(),
+            projector=self.build_projector(),
+            probe=self.build_probe(num_classes=20),
+            fuse_views=True,
+            probe_on_views=True,
+            probe_update_frequency=2,
+        )
+
+        images = tf.random.uniform((4, 50, 50, 3))
+        targets = tf.ones((4, 20))
+
+        trainer.compile(
+            encoder_optimizer=optimizers.Adam(),
+            encoder_loss=SimCLRLoss(temperature=0.5),
+            probe_optimizer=optimizers.Adam(),
+            probe_loss=keras.losses.CategoricalCrossentropy(from_logits=True),
+        )
+
+        trainer.fit(images, targets, batch_size=2)
+        # The probe optimizer runs at every step, with zero gradients when the
+        # probe is not updated.
+        self.assertEqual(trainer.optimizer.iterations, 2)
+        self.assertEqual(trainer.probe_optimizer.iterations, 2)
+
     def test_inference_not_supported(self):
         trainer = ContrastiveTrainer(
             encoder=self.build_encoder(),